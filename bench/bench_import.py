@@ -0,0 +1,61 @@
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import List
+
+# 新しいプロセスでimportと最初の参照にかかる時間(秒)を出力するコード
+_IMPORT_CODE = "\n".join([
+    "import time",
+    "start = time.perf_counter()",
+    "import py_workdays",
+    "imported = time.perf_counter()",
+    "import datetime",
+    "py_workdays.check_workday(datetime.date(2021,1,4))",
+    "queried = time.perf_counter()",
+    "print(imported - start, queried - imported)",
+])
+
+
+def measure_import(repeat: int) -> List[List[float]]:
+    """
+    importの時間と最初の参照(祝日の読み込み)の時間をrepeat回計測する
+
+    Parameters
+    ----------
+    repeat: int
+        計測する回数．毎回新しいプロセスで計測する
+
+    Returns
+    -------
+    [importの時間のリスト, 最初の参照の時間のリスト]
+    """
+    import_times: List[float] = []
+    first_query_times: List[float] = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", _IMPORT_CODE], capture_output=True, text=True, check=True).stdout
+        import_time, first_query_time = (float(value) for value in output.split())
+        import_times.append(import_time)
+        first_query_times.append(first_query_time)
+    return [import_times, first_query_times]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="py_workdaysのimport時間の計測")
+    parser.add_argument("--repeat", type=int, default=10, help="計測する回数")
+    parser.add_argument("--max-import-ms", type=float, default=None, help="importの時間の中央値の上限．超えると終了コード1")
+    args = parser.parse_args()
+
+    import_times, first_query_times = measure_import(args.repeat)
+    import_ms = statistics.median(import_times) * 1000
+    first_query_ms = statistics.median(first_query_times) * 1000
+    print(f"import: {import_ms:.2f} ms (median of {args.repeat})")
+    print(f"first query: {first_query_ms:.2f} ms (median of {args.repeat})")
+
+    if args.max_import_ms is not None and import_ms > args.max_import_ms:
+        print(f"import time regressed: {import_ms:.2f} ms > {args.max_import_ms:.2f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+import argparse
+import datetime
+import hashlib
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from pytz import timezone
+
+import py_workdays
+from py_workdays import config
+
+from bench_import import measure_import
+
+# 結果のjsonの形式のバージョン．項目を変えたら上げる
+_RESULT_FORMAT_VERSION = 1
+
+# 結果が再現するように祝日データの範囲と計測する日時を固定する
+_HOLIDAY_YEAR_RANGE = (2020, 2030)
+_BASE_DATETIME = datetime.datetime(2024, 1, 4, 10, 0, 0)
+_BENCH_TIMEZONE = "Asia/Tokyo"
+
+_EXTRACT_FUNCTION_NAMES = ("extract_workdays_bool", "extract_intraday_bool", "extract_workdays_intraday_bool")
+
+
+def _time_call(func: Callable[[], Any], repeat: int, min_total_seconds: float=0.2) -> Dict[str, float]:
+    """
+    funcの1回あたりの時間(秒)を計測する．1回の計測がmin_total_seconds以上になるように呼ぶ回数を決め，repeat回計測する
+
+    Returns
+    -------
+    1回あたりの時間の中央値・最小値と1回の計測で呼んだ回数
+    """
+    timer = timeit.Timer(func)
+    number = 1
+    while timer.timeit(number) < min_total_seconds and number < 10**7:
+        number *= 10
+    seconds = [total / number for total in timer.repeat(repeat=repeat, number=number)]
+    return {"median": statistics.median(seconds), "min": min(seconds), "number": number}
+
+
+def _result(group: str, name: str, params: Dict[str, Any], timing: Dict[str, float], elements: Optional[int]=None) -> Dict[str, Any]:
+    """
+    結果の1行．elementsを与えた場合はスループット(要素/秒)も記録する
+    """
+    result = {"group": group, "name": name, "params": params, **timing}
+    if elements is not None:
+        result["elements_per_second"] = elements / timing["median"]
+    return result
+
+
+def bench_scalar(repeat: int) -> List[Dict[str, Any]]:
+    """
+    スカラーの関数の1回あたりの時間をnaive・awareな入力について計測する
+    """
+    select_date = _BASE_DATETIME.date()
+    end_date = select_date + timedelta(days=365)
+    delta = timedelta(hours=30)
+    datetimes = {
+        "naive": _BASE_DATETIME,
+        "aware": timezone(_BENCH_TIMEZONE).localize(_BASE_DATETIME),
+    }
+
+    date_calls: Dict[str, Callable[[], Any]] = {
+        "check_workday": lambda: py_workdays.check_workday(select_date),
+        "get_next_workday": lambda: py_workdays.get_next_workday(select_date, days=5),
+        "get_previous_workday": lambda: py_workdays.get_previous_workday(select_date, days=5),
+        "get_near_workday": lambda: py_workdays.get_near_workday(select_date),
+        "get_workdays": lambda: py_workdays.get_workdays(select_date, end_date),
+        "get_workdays_number": lambda: py_workdays.get_workdays_number(select_date, 20),
+        "count_workdays": lambda: py_workdays.count_workdays(select_date, end_date),
+        "get_workday_ordinal": lambda: py_workdays.get_workday_ordinal(select_date),
+        "get_workday_from_ordinal": lambda: py_workdays.get_workday_from_ordinal(1000),
+    }
+    results = [_result("scalar", name, {}, _time_call(call, repeat)) for name, call in date_calls.items()]
+
+    for kind, select_datetime in datetimes.items():
+        end_datetime = select_datetime + timedelta(days=30)
+        datetime_calls: Dict[str, Callable[[], Any]] = {
+            "check_workday_intraday": lambda: py_workdays.check_workday_intraday(select_datetime),
+            "get_next_border_workday_intraday": lambda: py_workdays.get_next_border_workday_intraday(select_datetime),
+            "get_previous_border_workday_intraday": lambda: py_workdays.get_previous_border_workday_intraday(select_datetime),
+            "get_near_workday_intraday": lambda: py_workdays.get_near_workday_intraday(select_datetime),
+            "add_workday_intraday_datetime": lambda: py_workdays.add_workday_intraday_datetime(select_datetime, delta),
+            "get_timedelta_workdays_intraday": lambda: py_workdays.get_timedelta_workdays_intraday(select_datetime, end_datetime),
+        }
+        for name, call in datetime_calls.items():
+            results.append(_result("scalar", name, {"input": kind}, _time_call(call, repeat)))
+    return results
+
+
+def _bench_datetime_index(size: int) -> pd.DatetimeIndex:
+    """
+    約1年間に等間隔に並ぶsize個の日時(秒単位)
+    """
+    step_seconds = max(1, 365 * 86400 // size)
+    start = np.datetime64(_BASE_DATETIME, "s")
+    return pd.DatetimeIndex(start + np.arange(size, dtype=np.int64) * np.timedelta64(step_seconds, "s"))
+
+
+def bench_extract(repeat: int, sizes: List[int]) -> List[Dict[str, Any]]:
+    """
+    抽出関数のスループットを，データ数・naive/awareな入力・ソート済みの高速化ごとに計測する．
+    awareな入力はカレンダーのタイムゾーンを設定してUTCの値をそのまま判定する
+    """
+    results: List[Dict[str, Any]] = []
+    for size in sizes:
+        naive_index = _bench_datetime_index(size)
+        aware_index = naive_index.tz_localize("UTC")
+        out = np.empty(size, dtype=np.bool_)
+        for kind, dt_index, tz in [("naive", naive_index, None), ("aware", aware_index, _BENCH_TIMEZONE)]:
+            config.timezone = tz
+            try:
+                for name in _EXTRACT_FUNCTION_NAMES:
+                    extract_func = getattr(py_workdays, name)
+                    for assume_sorted in (False, True):
+                        timing = _time_call(
+                            lambda: extract_func(dt_index, out=out, assume_sorted=assume_sorted),
+                            repeat,
+                            min_total_seconds=0.05
+                        )
+                        params = {"input": kind, "size": size, "assume_sorted": assume_sorted}
+                        results.append(_result("extract", name, params, timing, elements=size))
+            finally:
+                config.timezone = None
+        del naive_index, aware_index, out
+    return results
+
+
+def bench_config_reload(repeat: int) -> List[Dict[str, Any]]:
+    """
+    祝日データの読み込み直しにかかる時間をcsvから読む場合とコンパイル済みのカレンダーを利用する場合について計測する
+    """
+    results: List[Dict[str, Any]] = []
+    compiled_cache_path = config.compiled_cache_path
+    try:
+        for source, cache_path in [("csv", None), ("compiled", compiled_cache_path)]:
+            if source == "compiled" and cache_path is None:
+                continue
+            config.compiled_cache_path = cache_path
+            config._set_holidays()  # 設定の変更時と同じ読み込み直し(コンパイル済みのカレンダーを作成する)
+            timing = _time_call(config._set_holidays, repeat, min_total_seconds=0.05)
+            results.append(_result("config", "reload_holidays", {"source": source}, timing))
+    finally:
+        config.compiled_cache_path = compiled_cache_path
+    return results
+
+
+def bench_import(repeat: int) -> List[Dict[str, Any]]:
+    """
+    新しいプロセスでのimportと最初の参照の時間を計測する
+    """
+    import_times, first_query_times = measure_import(repeat)
+    return [
+        _result("import", name, {}, {"median": statistics.median(seconds), "min": min(seconds), "number": 1})
+        for name, seconds in [("import", import_times), ("first_query", first_query_times)]
+    ]
+
+
+def _git_commit() -> Optional[str]:
+    """
+    計測したコミットのハッシュ．gitが無い場合はNone
+    """
+    try:
+        output = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True, cwd=Path(__file__).parent)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def metadata() -> Dict[str, Any]:
+    """
+    結果を比較するための環境の情報．祝日データはcsvのハッシュを記録する
+    """
+    return {
+        "format_version": _RESULT_FORMAT_VERSION,
+        "commit": _git_commit(),
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": sys.version,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "parallel_config": py_workdays.get_parallel_config(),
+        "holiday_year_range": list(_HOLIDAY_YEAR_RANGE),
+        "holiday_csv_sha256": {
+            str(csv_path): hashlib.sha256(csv_path.read_bytes()).hexdigest() for csv_path in config.csv_source_paths
+        },
+    }
+
+
+def _result_key(result: Dict[str, Any]) -> str:
+    return json.dumps([result["group"], result["name"], result["params"]], sort_keys=True)
+
+
+def compare_results(results: List[Dict[str, Any]], baseline_results: List[Dict[str, Any]], max_regression: float) -> List[str]:
+    """
+    基準の結果と比較し，中央値がmax_regressionの割合より遅くなったものを返す
+
+    Parameters
+    ----------
+    results: list of dict
+        今回の結果
+    baseline_results: list of dict
+        基準の結果(以前のコミットのjsonの"results")
+    max_regression: float
+        許容する遅くなった割合．0.2なら1.2倍まで
+
+    Returns
+    -------
+    遅くなったものの説明のリスト
+    """
+    baseline_medians = {_result_key(result): result["median"] for result in baseline_results}
+    regressions: List[str] = []
+    for result in results:
+        baseline_median = baseline_medians.get(_result_key(result))
+        if baseline_median is None:
+            continue
+        ratio = result["median"] / baseline_median
+        if ratio > 1 + max_regression:
+            regressions.append(f"{result['group']}.{result['name']} {result['params']}: {ratio:.2f}x slower")
+    return regressions
+
+
+def _format_seconds(seconds: float) -> str:
+    for unit, scale in [("s", 1.0), ("ms", 1e-3), ("us", 1e-6)]:
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="py_workdaysのスカラー・抽出関数・設定の読み込み・importの計測")
+    parser.add_argument("--repeat", type=int, default=5, help="計測する回数")
+    parser.add_argument("--max-size", type=int, default=10**6, help="抽出関数のデータ数の上限．1e3から10倍ずつ計測する(1e8まで)")
+    parser.add_argument("--groups", nargs="+", default=["scalar", "extract", "config", "import"], help="計測するグループ")
+    parser.add_argument("--output", type=Path, default=None, help="結果を保存するjsonのパス")
+    parser.add_argument("--compare", type=Path, default=None, help="比較する基準の結果のjsonのパス")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="比較で許容する遅くなった割合．超えると終了コード1")
+    args = parser.parse_args()
+
+    missing_paths = [str(csv_path) for csv_path in config.csv_source_paths if not csv_path.exists()]
+    if len(missing_paths) > 0:  # 計測中は通信しない
+        sys.exit(f"holiday csv not found: {missing_paths}. call py_workdays.initialize_source() before benchmarking.")
+
+    config.holiday_start_year, config.holiday_end_year = _HOLIDAY_YEAR_RANGE
+    py_workdays.set_scalar_cache_config(maxsize=0)  # キャッシュせずにRust側の呼び出しを計測する
+    sizes = [10**exponent for exponent in range(3, 9) if 10**exponent <= args.max_size]
+
+    results: List[Dict[str, Any]] = []
+    if "scalar" in args.groups:
+        results += bench_scalar(args.repeat)
+    if "extract" in args.groups:
+        results += bench_extract(args.repeat, sizes)
+    if "config" in args.groups:
+        results += bench_config_reload(args.repeat)
+    if "import" in args.groups:
+        results += bench_import(args.repeat)
+
+    for result in results:
+        throughput = result.get("elements_per_second")
+        throughput_str = f"  {throughput / 1e6:.1f} M/s" if throughput is not None else ""
+        print(f"{result['group']}.{result['name']} {result['params']}: {_format_seconds(result['median'])}{throughput_str}")
+
+    if args.output is not None:
+        args.output.write_text(json.dumps({"metadata": metadata(), "results": results}, indent=2))
+        print(f"saved: {args.output}")
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text())
+        regressions = compare_results(results, baseline["results"], args.max_regression)
+        for regression in regressions:
+            print(f"regressed: {regression}")
+        if len(regressions) > 0:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
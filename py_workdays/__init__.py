@@ -1,11 +1,70 @@
-from .py_workdays import get_workdays, check_workday, get_next_workday, get_previous_workday, get_near_workday, get_workdays_number
-
-from .intraday import check_workday_intraday, get_next_border_workday_intraday, get_previous_border_workday_intraday, get_near_workday_intraday
-from .intraday import add_workday_intraday_datetime, get_timedelta_workdays_intraday
-
-from .extract import extract_workdays_bool, extract_intraday_bool, extract_workdays_intraday_bool
-
-from .config import config
-from .py_workdays import PyWorkdaysError
-
-# __doc__ = py_workdays.__doc__
\ No newline at end of file
+import importlib
+from typing import Any, Dict, List, TYPE_CHECKING
+
+from .py_workdays import get_workdays, get_workdays_number
+from .workdays import check_workday, get_next_workday, get_previous_workday, get_near_workday
+from .py_workdays import count_workdays, get_workday_ordinal, get_workday_from_ordinal
+
+from .intraday import check_workday_intraday, get_next_border_workday_intraday, get_previous_border_workday_intraday, get_near_workday_intraday
+from .intraday import add_workday_intraday_datetime, get_timedelta_workdays_intraday
+
+from .py_workdays import set_parallel_config, get_parallel_config
+from .py_workdays import set_metrics_config, get_metrics_snapshot, reset_metrics
+from .py_workdays import SessionCursor
+from .cache import set_scalar_cache_config, get_scalar_cache_info
+
+from .config import config, initialize_source
+from .py_workdays import PyWorkdaysError
+
+if TYPE_CHECKING:
+    from .extract import extract_workdays_bool, extract_intraday_bool, extract_workdays_intraday_bool
+    from .extract import extract_workdays_intraday_ranges
+    from .vectorized import get_next_workday_array, get_previous_workday_array, get_near_workday_array
+    from .vectorized import count_workdays_array, get_workday_ordinal_array, get_workday_from_ordinal_array
+    from .vectorized import add_workday_intraday_array, get_timedelta_workdays_intraday_array
+    from .vectorized import to_business_time, from_business_time, get_near_workday_intraday_array
+    from .vectorized import get_workday_session_labels, WorkdaySessionLabels
+    from .vectorized import workday_intraday_range, iter_workday_intraday_range
+    from .offsets import WorkdayIntradayOffset
+    from .refresh import refresh_holidays
+    from .calendar import Calendar
+
+# numpy・pandasを利用するもの．importを軽くするため初めて参照するときにモジュールをimportする
+_LAZY_ATTRIBUTE_MODULES: Dict[str, str] = {
+    "extract_workdays_bool": "extract",
+    "extract_intraday_bool": "extract",
+    "extract_workdays_intraday_bool": "extract",
+    "extract_workdays_intraday_ranges": "extract",
+    "get_next_workday_array": "vectorized",
+    "get_previous_workday_array": "vectorized",
+    "get_near_workday_array": "vectorized",
+    "count_workdays_array": "vectorized",
+    "get_workday_ordinal_array": "vectorized",
+    "get_workday_from_ordinal_array": "vectorized",
+    "add_workday_intraday_array": "vectorized",
+    "get_timedelta_workdays_intraday_array": "vectorized",
+    "to_business_time": "vectorized",
+    "from_business_time": "vectorized",
+    "get_near_workday_intraday_array": "vectorized",
+    "get_workday_session_labels": "vectorized",
+    "WorkdaySessionLabels": "vectorized",
+    "workday_intraday_range": "vectorized",
+    "iter_workday_intraday_range": "vectorized",
+    "WorkdayIntradayOffset": "offsets",
+    "refresh_holidays": "refresh",
+    "Calendar": "calendar",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTE_MODULES:
+        attribute = getattr(importlib.import_module(f".{_LAZY_ATTRIBUTE_MODULES[name]}", __name__), name)
+        globals()[name] = attribute  # 以降はモジュールの属性として参照される
+        return attribute
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTE_MODULES))
+
+# __doc__ = py_workdays.__doc__
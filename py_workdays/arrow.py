@@ -0,0 +1,133 @@
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+import pyarrow as pa
+from typing import Any, Callable, List, Optional, Tuple
+
+from .extract import _naive_int64_values
+
+
+def _arrow_chunks(values: Any) -> Tuple[List[pa.Array], Callable[[List[pa.Array]], Any]]:
+    """
+    pyarrowのArray・ChunkedArrayあるいはpolarsのSeriesを，コピーせずにArrowのチャンクのリストに変換する．
+    チャンクごとの結果を入力と同じ形式にする関数も返す
+    """
+    if isinstance(values, pa.Array):
+        return [values], lambda result_chunks: result_chunks[0]
+    if isinstance(values, pa.ChunkedArray):
+        return values.chunks, lambda result_chunks: pa.chunked_array(result_chunks, type=pa.bool_())
+
+    if type(values).__module__.split(".")[0] == "polars":
+        import polars as pl
+        # Arrow C stream interfaceがあればpolarsのチャンクのまま受け取る
+        chunked = pa.chunked_array(values) if hasattr(values, "__arrow_c_stream__") else values.to_arrow()
+        if isinstance(chunked, pa.Array):
+            chunked = pa.chunked_array([chunked])
+        name = values.name
+        return chunked.chunks, lambda result_chunks: pl.Series(name, pa.chunked_array(result_chunks, type=pa.bool_()))
+
+    raise TypeError(f"unsupported arrow-like input: {type(values)!r}")
+
+
+def _timestamp_int64_values(chunk: pa.Array) -> npt.NDArray[np.int64]:
+    """
+    Arrowのtimestampのチャンクの値のバッファを，コピーせずにint64のndarrayとしてviewする(nullの位置の値は不定)
+    """
+    if len(chunk) == 0:
+        return np.array([], dtype=np.int64)
+    data_buffer = chunk.buffers()[1]
+    int_64_values: npt.NDArray[np.int64] = np.frombuffer(data_buffer, dtype=np.int64, count=chunk.offset + len(chunk))[chunk.offset:]
+    return int_64_values
+
+
+def _null_mask(chunk: pa.Array) -> Optional[npt.NDArray[np.bool_]]:
+    """
+    チャンクのnullの位置．nullが無い場合はNone
+    """
+    if chunk.null_count == 0:
+        return None
+    null_mask: npt.NDArray[np.bool_] = chunk.is_null().to_numpy(zero_copy_only=False)
+    return null_mask
+
+
+def _null_to_nat(int_64_values: npt.NDArray[np.int64], null_mask: Optional[npt.NDArray[np.bool_]]) -> npt.NDArray[np.int64]:
+    """
+    nullの位置の値(不定)をNaTに置き換える．nullが無い場合はコピーしない
+    """
+    if null_mask is None:
+        return int_64_values
+    nat_values: npt.NDArray[np.int64] = np.where(null_mask, np.iinfo(np.int64).min, int_64_values)
+    return nat_values
+
+
+def _arrow_date_int64_values(values: Any) -> Tuple[npt.NDArray[np.int64], str]:
+    """
+    Arrowのdate32・date64・timestampの配列(pyarrowのArray・ChunkedArray，polarsのDate・DatetimeのSeries)を，
+    datetime64の値をもつint64のndarrayとその時間単位に変換する．nullはNaTとする．
+    タイムゾーンをもつtimestampはそのタイムゾーンのローカル時間とする
+    """
+    chunks, _ = _arrow_chunks(values)
+    int_64_chunks: List[npt.NDArray[np.int64]] = []
+    unit = "D"  # ChunkedArrayのチャンクは同じ型なので単位も同じ
+    for chunk in chunks:
+        if len(chunk) == 0:
+            continue
+        if pa.types.is_date32(chunk.type):
+            unit = "D"
+            int_64_values = np.frombuffer(chunk.buffers()[1], dtype=np.int32, count=chunk.offset + len(chunk))[chunk.offset:].astype(np.int64)
+            int_64_values = _null_to_nat(int_64_values, _null_mask(chunk))
+        elif pa.types.is_date64(chunk.type):
+            unit = "ms"
+            int_64_values = _null_to_nat(_timestamp_int64_values(chunk), _null_mask(chunk))
+        elif pa.types.is_timestamp(chunk.type):
+            unit = chunk.type.unit
+            int_64_values = _null_to_nat(_timestamp_int64_values(chunk), _null_mask(chunk))
+            if chunk.type.tz is not None:
+                local_index = pd.DatetimeIndex(int_64_values.view(f"datetime64[{unit}]")).tz_localize("UTC").tz_convert(chunk.type.tz)
+                int_64_values, unit = _naive_int64_values(local_index)
+        else:
+            raise TypeError(f"arrow array must be date or timestamp type: {chunk.type}")
+        int_64_chunks.append(int_64_values)
+
+    if len(int_64_chunks) == 1:
+        return np.ascontiguousarray(int_64_chunks[0]), unit
+    return np.concatenate(int_64_chunks + [np.array([], dtype=np.int64)]), unit
+
+
+def _extract_arrow_bool(engine: Any, method_name: str, values: Any, utc: bool, assume_sorted: bool) -> Any:
+    """
+    Arrowのtimestampの配列(pyarrowのArray・ChunkedArray，polarsのDatetimeのSeries)をチャンクごとにコピーせずに読み，
+    engineの抽出関数method_nameの結果をArrowのbooleanの配列として返す．nullはnullとなる．
+    タイムゾーンをもつ配列はカレンダーのタイムゾーンが設定されていればUTCの値をそのまま利用し，
+    設定されていなければ配列のタイムゾーンのローカル時間に変換して判定する．
+    nullの位置の値(不定)は，ソート済みの判定に使う場合と変換する場合のみNaTに置き換える
+    (要素ごとの判定ではnullの位置の結果はマスクされるのでコピーしない)
+    """
+    chunks, wrap_result = _arrow_chunks(values)
+    extract_naive = getattr(engine, method_name)
+    result_chunks: List[pa.Array] = []
+    for chunk in chunks:
+        if not pa.types.is_timestamp(chunk.type):
+            raise TypeError(f"arrow array must be timestamp type: {chunk.type}")
+        unit, tz = chunk.type.unit, chunk.type.tz
+        null_mask = _null_mask(chunk)
+        int_64_values = _timestamp_int64_values(chunk)
+        is_utc = utc
+        if tz is not None and not engine.has_timezone():
+            # 変換でコピーするので，不定な値が範囲外とならないように先に置き換える
+            local_index = pd.DatetimeIndex(_null_to_nat(int_64_values, null_mask).view(f"datetime64[{unit}]")).tz_localize("UTC").tz_convert(tz)
+            int_64_values, unit = _naive_int64_values(local_index)
+            is_utc = False
+        else:
+            if tz is not None:
+                is_utc = True  # タイムゾーンをもつtimestampの値はUTC
+            if assume_sorted:
+                int_64_values = _null_to_nat(int_64_values, null_mask)  # 不定な値をソート済みの判定に使わない
+
+        extracted_bool: npt.NDArray[np.bool_] = extract_naive(int_64_values, unit=unit, utc=is_utc, assume_sorted=assume_sorted)
+        result_chunks.append(pa.array(extracted_bool, type=pa.bool_(), mask=null_mask))
+    return wrap_result(result_chunks)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,154 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from . import py_workdays as _py_workdays
+
+
+class ScalarCache():
+    """
+    スカラーの関数の結果を保持するLRUキャッシュ．カレンダー(モジュールあるいはCalendar)ごとにもつ．
+    祝日・休日曜日・営業時間境界が変更されるとclearされる．Rust側の関数で直接変更された場合も
+    カレンダーの版の番号が変わるため，以前の結果は利用されない
+
+    Parameters
+    ----------
+    maxsize: int
+        保持する結果の最大数．0の場合はキャッシュしない
+    """
+    def __init__(self, maxsize: int=0) -> None:
+        self._lock = threading.Lock()
+        self._results: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._maxsize = maxsize
+        self._hits = 0
+        self._misses = 0
+        self._version: Optional[int] = None
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: int) -> None:
+        assert(isinstance(maxsize, int) and maxsize >= 0)
+        with self._lock:
+            self._maxsize = maxsize
+            while len(self._results) > maxsize:
+                self._results.popitem(last=False)
+
+    def call(self, key: Hashable, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        keyの結果を保持していればそれを返し，そうでなければfunc(*args)を呼んで保持する
+        """
+        if self._maxsize == 0:
+            return func(*args)
+
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                self._hits += 1
+                return self._results[key]
+            self._misses += 1
+
+        result = func(*args)
+        with self._lock:
+            self._results[key] = result
+            if len(self._results) > self._maxsize:
+                self._results.popitem(last=False)  # 最も古く使われたものを削除
+        return result
+
+    def sync_version(self, version: int) -> None:
+        """
+        カレンダーの版の番号が変わっていれば保持している結果を削除する
+        """
+        with self._lock:
+            if self._version != version:
+                self._results.clear()
+                self._version = version
+
+    def clear(self) -> None:
+        """
+        保持している結果を削除する．ヒット・ミスの回数はそのまま
+        """
+        with self._lock:
+            self._results.clear()
+
+    def info(self) -> Dict[str, int]:
+        """
+        ヒット・ミスの回数と現在のサイズ
+        """
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses, "maxsize": self._maxsize, "currsize": len(self._results)}
+
+    def reset_info(self) -> None:
+        """
+        ヒット・ミスの回数を0に戻す
+        """
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+
+
+# モジュールの関数が利用するキャッシュ
+_module_scalar_cache = ScalarCache()
+
+
+def _scalar_cache(engine: Any) -> ScalarCache:
+    """
+    engine(モジュールあるいはCalendar)のキャッシュ
+    """
+    if engine is _py_workdays:
+        return _module_scalar_cache
+    scalar_cache: ScalarCache = engine._scalar_cache
+    return scalar_cache
+
+
+def _rust_function(engine: Any, name: str) -> Callable[..., Any]:
+    """
+    engine(モジュールあるいはCalendar)のRust側の関数．Calendarの場合はPython側で上書きしていない基底クラスのメソッド
+    """
+    if engine is _py_workdays:
+        return getattr(_py_workdays, name)  # type: ignore
+    return getattr(_py_workdays.Calendar, name).__get__(engine)  # type: ignore
+
+
+def _cached_call(engine: Any, key: Tuple[Hashable, ...], func: Callable[..., Any], *args: Any) -> Any:
+    """
+    engine(モジュールあるいはCalendar)のキャッシュを利用してfunc(*args)を呼ぶ．
+    キーにカレンダーの版の番号を含めるため，計算中に変更された場合も古い結果は返さない
+    """
+    scalar_cache = _scalar_cache(engine)
+    if scalar_cache.maxsize == 0:
+        return func(*args)
+    version: int = engine.get_calendar_version()
+    scalar_cache.sync_version(version)
+    return scalar_cache.call((version,) + key, func, *args)
+
+
+def set_scalar_cache_config(maxsize: int=0) -> None:
+    """
+    モジュールのスカラーの関数(check_workday，get_next_workday，get_near_workday_intradayなど)の
+    結果をLRUで保持するキャッシュの設定を更新．祝日・休日曜日・営業時間境界が変更されると自動でclearされる
+    (py_workdays.py_workdaysの関数で直接変更した場合も含む)
+
+    Parameters
+    ----------
+    maxsize: int
+        保持する結果の最大数．0の場合はキャッシュしない(デフォルト)
+    """
+    _module_scalar_cache.maxsize = maxsize
+
+
+def get_scalar_cache_info() -> Dict[str, int]:
+    """
+    モジュールのスカラーの関数のキャッシュの状態を取得
+
+    Returns
+    -------
+    "hits"，"misses"，"maxsize"，"currsize"をキーにもつ辞書
+    """
+    return _module_scalar_cache.info()
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,330 @@
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from datetime import timedelta, datetime, date, tzinfo
+from mmap import mmap
+from typing import Tuple, Optional, Any, Union, List, Set, Dict, Iterator
+
+from .py_workdays import Calendar as _Calendar
+from . import intraday, extract, vectorized, workdays
+from .cache import ScalarCache
+
+
+class Calendar(_Calendar):
+    """
+    祝日・休日曜日・営業時間境界とその前計算テーブルを個別にもつカレンダー．
+    モジュールの関数と同名のメソッドをもち，複数のカレンダーを同時に利用できる．
+
+    Parameters
+    ----------
+    holidays_csv_paths: Optional[List[str]]
+        祝日のcsvのパス．Noneの場合は祝日なし
+    start_year: Optional[int]
+        利用する開始年．Noneの場合は現在年の5年前
+    end_year: Optional[int]
+        利用する終了年．Noneの場合は現在年の2年後
+    holiday_weekdays: Optional[Set[int]]
+        休日曜日のセット．Noneの場合は土日
+    intraday_borders: Optional[List[Border]]
+        営業時間境界のリスト．Noneの場合は東京証券取引所の営業時間
+    timezone: Optional[Union[str, tzinfo]]
+        営業日・営業時間のローカル時間のタイムゾーン．Noneの場合は設定しない
+
+    Examples
+    --------
+    >>> ose_night = Calendar(
+            holidays_csv_paths=[str(py_workdays.config.csv_source_paths[0])],
+            intraday_borders=[{"start": datetime.time(16, 30), "end": datetime.time(23, 59, 59)}]
+        )
+    >>> ose_night.check_workday_intraday(datetime.datetime(2021,1,4,20,0,0))
+    True
+    """
+    def __new__(cls, *args: Any, timezone: Optional[Union[str, tzinfo]]=None, **kwargs: Any) -> "Calendar":
+        calendar: Calendar = super().__new__(cls, *args, **kwargs)
+        calendar._scalar_cache = ScalarCache()
+        calendar.timezone = timezone
+        return calendar
+
+    def set_holidays_csvs(self, holidays_csv_paths: List[str], start_year: int, end_year: int) -> None:
+        """
+        csvを読み込んで利用できる祝日の更新をする
+        """
+        super().set_holidays_csvs(holidays_csv_paths, start_year, end_year)
+        self._scalar_cache.clear()
+
+    def set_range_holidays(self, holidays: Union[List[date], npt.NDArray[np.datetime64], pd.DatetimeIndex, Any], start_year: int, end_year: int) -> None:
+        """
+        祝日のリストから祝日の更新をする．datetime64のndarray・pd.DatetimeIndex・Arrowの日付の配列も利用できる
+        """
+        holiday_values = extract._holiday_int64_values(holidays)
+        if holiday_values is not None:
+            int_64_values, unit = holiday_values
+            super().set_range_holidays_naive(int_64_values, start_year, end_year, unit=unit)
+        else:
+            super().set_range_holidays(holidays, start_year, end_year)
+        self._scalar_cache.clear()
+
+    def add_range_holidays(self, holidays: Union[List[date], npt.NDArray[np.datetime64], pd.DatetimeIndex, Any], start_year: int, end_year: int) -> None:
+        """
+        祝日のリストから祝日の追加をする．datetime64のndarray・pd.DatetimeIndex・Arrowの日付の配列も利用できる
+        """
+        holiday_values = extract._holiday_int64_values(holidays)
+        if holiday_values is not None:
+            int_64_values, unit = holiday_values
+            super().add_range_holidays_naive(int_64_values, start_year, end_year, unit=unit)
+        else:
+            super().add_range_holidays(holidays, start_year, end_year)
+        self._scalar_cache.clear()
+
+    def set_holiday_year_range(self, start_year: int, end_year: int) -> None:
+        """
+        祝日を読み込み直さずに利用する年の範囲を変更する
+        """
+        super().set_holiday_year_range(start_year, end_year)
+        self._scalar_cache.clear()
+
+    def load_compiled_calendar(self, compiled: Union[bytes, memoryview, mmap, npt.NDArray[np.uint8]], fingerprint: bytes) -> bool:
+        """
+        コンパイル済みのカレンダーを読み込む．バージョンあるいは指紋が一致しない場合はFalse
+        """
+        is_loaded: bool = super().load_compiled_calendar(compiled, fingerprint)
+        self._scalar_cache.clear()
+        return is_loaded
+
+    def set_holiday_weekdays(self, holiday_weekday_numbers: Set[int]) -> None:
+        """
+        休日曜日の更新
+        """
+        super().set_holiday_weekdays(holiday_weekday_numbers)
+        self._scalar_cache.clear()
+
+    def set_intraday_borders(self, intraday_borders: List[Dict[str, Any]]) -> None:
+        """
+        営業時間境界の更新
+        """
+        super().set_intraday_borders(intraday_borders)
+        self._scalar_cache.clear()
+
+    def set_scalar_cache_config(self, maxsize: int=0) -> None:
+        """
+        py_workdays.set_scalar_cache_config のカレンダー版
+        """
+        self._scalar_cache.maxsize = maxsize
+
+    def get_scalar_cache_info(self) -> Dict[str, int]:
+        """
+        py_workdays.get_scalar_cache_info のカレンダー版
+        """
+        return self._scalar_cache.info()
+
+    def check_workday(self, select_date: date) -> bool:
+        """
+        py_workdays.check_workday のカレンダー版
+        """
+        return workdays._check_workday(self, select_date)
+
+    def get_next_workday(self, select_date: date, days: int=1) -> date:
+        """
+        py_workdays.get_next_workday のカレンダー版
+        """
+        return workdays._get_next_workday(self, select_date, days)
+
+    def get_previous_workday(self, select_date: date, days: int=1) -> date:
+        """
+        py_workdays.get_previous_workday のカレンダー版
+        """
+        return workdays._get_previous_workday(self, select_date, days)
+
+    def get_near_workday(self, select_date: date, is_after: bool=True) -> date:
+        """
+        py_workdays.get_near_workday のカレンダー版
+        """
+        return workdays._get_near_workday(self, select_date, is_after)
+
+    @property
+    def timezone(self) -> Optional[Union[str, tzinfo]]:
+        """
+        営業日・営業時間のローカル時間のタイムゾーン．設定すると抽出関数がUTCやawareなデータをこのタイムゾーンで判定する
+        """
+        return self._timezone
+
+    @timezone.setter
+    def timezone(self, tz: Optional[Union[str, tzinfo]]) -> None:
+        assert(tz is None or isinstance(tz, (str, tzinfo)))
+        transitions, offsets = extract._utc_offset_table(tz)
+        self.set_utc_offset_table(transitions.tolist(), offsets.tolist())
+        self._timezone = tz
+
+    def check_workday_intraday(self, select_datetime: datetime) -> bool:
+        """
+        py_workdays.check_workday_intraday のカレンダー版
+        """
+        return intraday._check_workday_intraday(self, select_datetime)
+
+    def get_next_border_workday_intraday(self, select_datetime: datetime) -> Tuple[datetime, str]:
+        """
+        py_workdays.get_next_border_workday_intraday のカレンダー版
+        """
+        return intraday._get_next_border_workday_intraday(self, select_datetime)
+
+    def get_previous_border_workday_intraday(self, select_datetime: datetime, force_is_end: bool=False) -> Tuple[datetime, str]:
+        """
+        py_workdays.get_previous_border_workday_intraday のカレンダー版
+        """
+        return intraday._get_previous_border_workday_intraday(self, select_datetime, force_is_end)
+
+    def get_near_workday_intraday(self, select_datetime: datetime, is_after: bool=True) -> Tuple[datetime, str]:
+        """
+        py_workdays.get_near_workday_intraday のカレンダー版
+        """
+        return intraday._get_near_workday_intraday(self, select_datetime, is_after)
+
+    def add_workday_intraday_datetime(self, select_datetime: datetime, delta_time: timedelta) -> datetime:
+        """
+        py_workdays.add_workday_intraday_datetime のカレンダー版
+        """
+        return intraday._add_workday_intraday_datetime(self, select_datetime, delta_time)
+
+    def get_timedelta_workdays_intraday(self, start_datetime: datetime, end_datetime: datetime) -> timedelta:
+        """
+        py_workdays.get_timedelta_workdays_intraday のカレンダー版
+        """
+        return intraday._get_timedelta_workdays_intraday(self, start_datetime, end_datetime)
+
+    def extract_workdays_bool(
+        self,
+        dt_index: Any,
+        out: Optional[npt.NDArray[np.bool_]]=None,
+        utc: bool=False,
+        assume_sorted: bool=False
+        ) -> npt.NDArray[np.bool_]:
+        """
+        py_workdays.extract_workdays_bool のカレンダー版
+        """
+        return extract._extract_workdays_bool(self, dt_index, out, utc, assume_sorted)
+
+    def extract_intraday_bool(
+        self,
+        dt_index: Any,
+        out: Optional[npt.NDArray[np.bool_]]=None,
+        utc: bool=False,
+        assume_sorted: bool=False
+        ) -> npt.NDArray[np.bool_]:
+        """
+        py_workdays.extract_intraday_bool のカレンダー版
+        """
+        return extract._extract_intraday_bool(self, dt_index, out, utc, assume_sorted)
+
+    def extract_workdays_intraday_bool(
+        self,
+        dt_index: Any,
+        out: Optional[npt.NDArray[np.bool_]]=None,
+        utc: bool=False,
+        assume_sorted: bool=False
+        ) -> npt.NDArray[np.bool_]:
+        """
+        py_workdays.extract_workdays_intraday_bool のカレンダー版
+        """
+        return extract._extract_workdays_intraday_bool(self, dt_index, out, utc, assume_sorted)
+
+    def count_workdays_array(self, start_dates: Any, end_dates: Any, closed: str="left") -> npt.NDArray[np.int64]:
+        """
+        py_workdays.count_workdays_array のカレンダー版
+        """
+        return vectorized._count_workdays_array(self, start_dates, end_dates, closed)
+
+    def get_workday_ordinal_array(self, dates: Any) -> npt.NDArray[np.int64]:
+        """
+        py_workdays.get_workday_ordinal_array のカレンダー版
+        """
+        return vectorized._get_workday_ordinal_array(self, dates)
+
+    def get_workday_from_ordinal_array(self, ordinals: Any) -> npt.NDArray[np.datetime64]:
+        """
+        py_workdays.get_workday_from_ordinal_array のカレンダー版
+        """
+        return vectorized._get_workday_from_ordinal_array(self, ordinals)
+
+    def get_next_workday_array(self, dates: Any, days: Any=1) -> npt.NDArray[np.datetime64]:
+        """
+        py_workdays.get_next_workday_array のカレンダー版
+        """
+        return vectorized._get_next_workday_array(self, dates, days)
+
+    def get_previous_workday_array(self, dates: Any, days: Any=1) -> npt.NDArray[np.datetime64]:
+        """
+        py_workdays.get_previous_workday_array のカレンダー版
+        """
+        return vectorized._get_previous_workday_array(self, dates, days)
+
+    def get_near_workday_array(self, dates: Any, is_after: bool=True) -> npt.NDArray[np.datetime64]:
+        """
+        py_workdays.get_near_workday_array のカレンダー版
+        """
+        return vectorized._get_near_workday_array(self, dates, is_after)
+
+    def extract_workdays_intraday_ranges(self, dt_index: Any, utc: bool=False) -> npt.NDArray[np.int64]:
+        """
+        py_workdays.extract_workdays_intraday_ranges のカレンダー版
+        """
+        return extract._extract_workdays_intraday_ranges(self, dt_index, utc)
+
+    def get_workday_session_labels(self, dt_index: Any, utc: bool=False) -> vectorized.WorkdaySessionLabels:
+        """
+        py_workdays.get_workday_session_labels のカレンダー版
+        """
+        return vectorized._get_workday_session_labels(self, dt_index, utc)
+
+    def workday_intraday_range(self, start: datetime, end: datetime, freq: Any, closed: str="left", name: Optional[str]=None) -> Any:
+        """
+        py_workdays.workday_intraday_range のカレンダー版
+        """
+        return vectorized._workday_intraday_range(self, start, end, freq, closed, name)
+
+    def iter_workday_intraday_range(
+        self,
+        start: datetime,
+        end: datetime,
+        freq: Any,
+        closed: str="left",
+        chunk_size: int=1000000,
+        name: Optional[str]=None
+        ) -> Iterator[Any]:
+        """
+        py_workdays.iter_workday_intraday_range のカレンダー版
+        """
+        return vectorized._iter_workday_intraday_range(self, start, end, freq, closed, chunk_size, name)
+
+    def get_near_workday_intraday_array(self, dt_index: Any, is_after: bool=True) -> Any:
+        """
+        py_workdays.get_near_workday_intraday_array のカレンダー版
+        """
+        return vectorized._get_near_workday_intraday_array(self, dt_index, is_after)
+
+    def add_workday_intraday_array(self, dt_index: Any, deltas: Any) -> Any:
+        """
+        py_workdays.add_workday_intraday_array のカレンダー版
+        """
+        return vectorized._add_workday_intraday_array(self, dt_index, deltas)
+
+    def get_timedelta_workdays_intraday_array(self, start_index: Any, end_index: Any) -> npt.NDArray[np.timedelta64]:
+        """
+        py_workdays.get_timedelta_workdays_intraday_array のカレンダー版
+        """
+        return vectorized._get_timedelta_workdays_intraday_array(self, start_index, end_index)
+
+    def to_business_time(self, dt_index: Any) -> npt.NDArray[np.timedelta64]:
+        """
+        py_workdays.to_business_time のカレンダー版
+        """
+        return vectorized._to_business_time(self, dt_index)
+
+    def from_business_time(self, business_time: Any) -> npt.NDArray[np.datetime64]:
+        """
+        py_workdays.from_business_time のカレンダー版
+        """
+        return vectorized._from_business_time(self, business_time)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,85 @@
+import hashlib
+import mmap
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, List, Optional
+
+from .py_workdays import PyWorkdaysError
+
+
+def _source_fingerprint(holidays_csv_path_strs: List[str]) -> bytes:
+    """
+    祝日のcsvのパス・更新時刻・サイズから，ソースを識別する指紋を作成
+    """
+    fingerprint = hashlib.sha256()
+    for path_str in holidays_csv_path_strs:
+        stat = os.stat(path_str)
+        fingerprint.update(f"{path_str}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode())
+    return fingerprint.digest()
+
+
+def _load_compiled(engine: Any, compiled_path: Path, fingerprint: bytes) -> bool:
+    """
+    コンパイル済みのカレンダーをメモリマップから読み込む．テーブルは検証してカレンダーにコピーするため，
+    マップは読み込みの間だけ利用し，プロセス間で共有しない．存在しない・古い・壊れている場合はFalse
+    """
+    try:
+        with open(compiled_path, "rb") as compiled_file:
+            with mmap.mmap(compiled_file.fileno(), 0, access=mmap.ACCESS_READ) as compiled_map:
+                is_loaded: bool = engine.load_compiled_calendar(compiled_map, fingerprint)  # bytesを作らずにバッファを渡す
+                return is_loaded
+    except (OSError, ValueError, PyWorkdaysError):
+        return False
+
+
+def _write_compiled(engine: Any, compiled_path: Path, fingerprint: bytes) -> None:
+    """
+    カレンダーをコンパイルして保存する．他のプロセスが読み込み中でも安全なように一時ファイルから置き換える．
+    書き込めない場合は何もしない
+    """
+    compiled_bytes = engine.dump_compiled_calendar(fingerprint)
+    try:
+        file_descriptor, temp_path_str = tempfile.mkstemp(dir=compiled_path.parent, prefix=compiled_path.name)
+    except OSError:
+        return
+    try:
+        with os.fdopen(file_descriptor, "wb") as temp_file:
+            temp_file.write(compiled_bytes)
+        os.replace(temp_path_str, compiled_path)
+    except OSError:
+        Path(temp_path_str).unlink(missing_ok=True)
+
+
+def _set_holidays_compiled(
+    engine: Any,
+    holidays_csv_path_strs: List[str],
+    start_year: int,
+    end_year: int,
+    compiled_path: Optional[Path]
+    ) -> bool:
+    """
+    set_holidays_csvsと同じだが，csvが変更されていなければコンパイル済みのカレンダーを読み込む．
+    変更されていればcsvを読み込んでコンパイルし直す．engineはモジュールあるいはCalendar
+
+    Returns
+    -------
+    コンパイル済みのカレンダーを読み込んだかどうか．読み込んだ場合は休日曜日・営業時間境界も置き換わる
+    """
+    if compiled_path is None:
+        engine.set_holidays_csvs(holidays_csv_path_strs, start_year, end_year)
+        return False
+
+    fingerprint = _source_fingerprint(holidays_csv_path_strs)
+    if _load_compiled(engine, compiled_path, fingerprint):
+        if engine.get_holiday_year_range() != (start_year, end_year):  # 同じ範囲ならテーブルをそのまま利用する
+            engine.set_holiday_year_range(start_year, end_year)
+        return True
+
+    engine.set_holidays_csvs(holidays_csv_path_strs, start_year, end_year)
+    _write_compiled(engine, compiled_path, fingerprint)
+    return False
+
+
+if __name__ == "__main__":
+    pass
@@ -1,123 +1,303 @@
-import datetime
-from pathlib import Path
-from typing import List, Dict
-from datetime import time, date
-
-from py_strict_list import StructureStrictList, strict_list_property
-
-from .py_workdays import set_holidays_csvs, set_intraday_borders, set_holiday_weekdays, make_source_naikaku, add_range_holidays, get_range_holidays
-
-def initialize_source() -> None:
-    """
-    内閣府のサイトから祝日データを取得し"../source/holiday_naikaku.csv"に保存
-    """
-    source_path = Path(__file__).parent / Path("source/holiday_naikaku.csv")
-    if not source_path.exists():
-        make_source_naikaku(str(source_path))
-
-class Config():
-    """
-    動的に変更できる祝日データの設定
-    """
-    def __init__(self) -> None:
-        self.initialize_config()
-
-    def initialize_config(self) -> None:
-        """
-        祝日データの設定の初期化
-        """
-        self._holiday_start_year: int = datetime.datetime.now().year - 5
-        self._holiday_end_year: int = datetime.datetime.now().year + 2
-
-        self._csv_source_paths = StructureStrictList(Path(__file__).parent / Path("source/holiday_naikaku.csv"))
-        self._csv_source_paths.hook_func.add(self._set_holidays)  # 変更にフック
-
-        self._holiday_weekdays = StructureStrictList(5, 6)
-        self._holiday_weekdays.hook_func.add(self._set_holiday_weekdays)  # 変更にフック
-
-        self._intraday_borders = StructureStrictList(
-            {"start": time(9, 0), "end": time(11, 30)},
-            {"start": time(12, 30), "end": time(15, 0)}
-        )
-        self._intraday_borders.hook_func.add(self._set_intraday_borders)  # 変更にフック
-        
-        self._set_holidays()
-        self._set_holiday_weekdays()
-        self._set_intraday_borders()
-
-    csv_source_paths = strict_list_property("_csv_source_paths", include_outer_length=False)
-    holiday_weekdays = strict_list_property("_holiday_weekdays", include_outer_length=False)
-    intraday_borders = strict_list_property("_intraday_borders", include_outer_length=False)
-
-
-
-    def _set_holidays(self) -> None:
-        """
-        csvソースから祝日データを読み込む
-        """
-        holidays_csv_path_strs = [str(one_path.resolve()) for one_path in self._csv_source_paths if one_path.exists()]
-        
-        set_holidays_csvs(
-            holidays_csv_path_strs,
-            self._holiday_start_year,
-            self._holiday_end_year
-        )
-
-    def _set_holiday_weekdays(self) -> None:
-        """
-        休日曜日を設定
-        """
-        holiday_weekdays = set(list(self._holiday_weekdays))
-        set_holiday_weekdays(holiday_weekdays)
-
-
-    def _set_intraday_borders(self) -> None:
-        """
-        営業時間の境界を設定
-        """
-        intraday_borders = list(self._intraday_borders)
-        set_intraday_borders(intraday_borders)
-
-    @property
-    def holiday_start_year(self) -> int:
-        return self._holiday_start_year
-
-    @holiday_start_year.setter
-    def holiday_start_year(self, year: int) -> None:
-        assert(isinstance(year, int))
-        self._holiday_start_year = year
-        self._set_holidays()
-
-    @property
-    def holiday_end_year(self) -> int:
-        return self._holiday_end_year
-
-    @holiday_end_year.setter
-    def holiday_end_year(self, year: int) -> None:
-        assert(isinstance(year, int))
-        self._holiday_end_year = year
-        self._set_holidays()
-
-    def add_range_holidays(self, range_holidays: List[date]) -> None:
-        """
-        祝日を追加
-        """
-        add_range_holidays(
-            range_holidays,
-            self._holiday_start_year,
-            self._holiday_end_year
-        )
-
-    @property
-    def range_holidays(self) -> List[date]:
-        """
-        祝日データを取得
-        """
-        return get_range_holidays()
-
-initialize_source()
-config = Config()
-
-
-if __name__ == "__main__":
+import datetime
+import threading
+import warnings
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, List, Dict, Optional, Union, Iterator, Set
+from datetime import time, date, tzinfo
+
+from py_strict_list import StructureStrictList, strict_list_property
+
+from . import py_workdays as _py_workdays
+from .py_workdays import set_intraday_borders, set_holiday_weekdays, make_source_naikaku, add_range_holidays, get_range_holidays
+from .py_workdays import add_range_holidays_naive
+from .py_workdays import set_utc_offset_table, set_holiday_year_range, set_default_calendar_loader
+from .py_workdays import get_holiday_weekdays, get_intraday_borders
+from .cache import _module_scalar_cache
+from .compiled import _set_holidays_compiled
+
+# 内閣府の祝日データのcsv
+_NAIKAKU_SOURCE_URL = "https://www8.cao.go.jp/chosei/shukujitsu/syukujitsu.csv"
+
+def initialize_source() -> None:
+    """
+    内閣府のサイトから祝日データを取得し"../source/holiday_naikaku.csv"に保存．
+    importでは通信しないため，祝日データが無い場合は明示的に呼ぶ
+    """
+    source_path = Path(__file__).parent / Path("source/holiday_naikaku.csv")
+    if not source_path.exists():
+        make_source_naikaku(str(source_path))
+        config._set_holidays()
+
+class Config():
+    """
+    動的に変更できる祝日データの設定
+    """
+    def __init__(self) -> None:
+        self.initialize_config()
+
+    def initialize_config(self) -> None:
+        """
+        祝日データの設定の初期化
+        """
+        self._batch_depth: int = 0
+        self._pending_updates: Set[str] = set()
+
+        self._holidays_lock = threading.RLock()
+        self._is_holidays_loaded: bool = False
+        self._is_holidays_loading: bool = False
+
+        self._holiday_start_year: int = datetime.datetime.now().year - 5
+        self._holiday_end_year: int = datetime.datetime.now().year + 2
+
+        self._csv_source_paths = StructureStrictList(Path(__file__).parent / Path("source/holiday_naikaku.csv"))
+        self._csv_source_paths.hook_func.add(self._set_holidays)  # 変更にフック
+
+        self._holiday_weekdays = StructureStrictList(5, 6)
+        self._holiday_weekdays.hook_func.add(self._set_holiday_weekdays)  # 変更にフック
+
+        self._intraday_borders = StructureStrictList(
+            {"start": time(9, 0), "end": time(11, 30)},
+            {"start": time(12, 30), "end": time(15, 0)}
+        )
+        self._intraday_borders.hook_func.add(self._set_intraday_borders)  # 変更にフック
+
+        self._timezone: Optional[Union[str, tzinfo]] = None
+        self._compiled_cache_path: Optional[Path] = Path(__file__).parent / Path("source/calendar.compiled")
+        self._holiday_source_url: str = _NAIKAKU_SOURCE_URL
+
+        set_default_calendar_loader(self._load_holidays)  # 祝日は初めて参照するときに読み込む
+        self._set_holiday_weekdays()
+        self._set_intraday_borders()
+        self._set_timezone()
+
+    csv_source_paths = strict_list_property("_csv_source_paths", include_outer_length=False)
+    holiday_weekdays = strict_list_property("_holiday_weekdays", include_outer_length=False)
+    intraday_borders = strict_list_property("_intraday_borders", include_outer_length=False)
+
+
+
+    # batch中に遅延させる更新(適用する順番)
+    _BATCH_UPDATE_ORDER = ("_set_holidays", "_set_holiday_year_range", "_set_holiday_weekdays", "_set_intraday_borders")
+
+    @contextmanager
+    def batch(self) -> Iterator["Config"]:
+        """
+        withブロック中の設定の変更をまとめ，ブロックを抜けるときに一度だけ反映する．入れ子にできる
+
+        Examples
+        --------
+        >>> with config.batch():
+                config.holiday_start_year = 2015
+                config.holiday_end_year = 2025
+                config.csv_source_paths.append(Path("my_holidays.csv"))
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._flush_updates()
+
+    def _defer_update(self, update_name: str) -> bool:
+        """
+        batch中であれば更新を保留してTrueを返す
+        """
+        if self._batch_depth > 0:
+            self._pending_updates.add(update_name)
+            return True
+        return False
+
+    def _flush_updates(self) -> None:
+        """
+        保留した更新を反映する．祝日を読み込み直す場合は年の範囲の変更は不要
+        """
+        pending_updates, self._pending_updates = self._pending_updates, set()
+        if "_set_holidays" in pending_updates:
+            pending_updates.discard("_set_holiday_year_range")
+        for update_name in self._BATCH_UPDATE_ORDER:
+            if update_name in pending_updates:
+                getattr(self, update_name)()
+
+    def _set_holidays(self) -> None:
+        """
+        csvソースから祝日データを読み込む
+        """
+        if self._defer_update("_set_holidays"):
+            return
+        with self._holidays_lock:
+            self._read_holidays()
+
+    def _load_holidays(self) -> None:
+        """
+        祝日データを読み込んでいなければ読み込む．モジュールの関数が初めてカレンダーを参照するときに呼ばれる
+        """
+        with self._holidays_lock:
+            if self._is_holidays_loaded or self._is_holidays_loading:  # 読み込み中の参照ではなにもしない
+                return
+            self._read_holidays()
+
+    def _read_holidays(self) -> None:
+        """
+        csvソースあるいはコンパイル済みのカレンダーから祝日データを読み込み，遅延読み込みを解除する
+        """
+        missing_paths = [str(one_path) for one_path in self._csv_source_paths if not one_path.exists()]
+        if len(missing_paths) > 0:
+            warnings.warn(
+                f"holiday csv not found: {missing_paths}. call py_workdays.initialize_source() to download the default source."
+            )
+        holidays_csv_path_strs = [str(one_path.resolve()) for one_path in self._csv_source_paths if one_path.exists()]
+
+        self._is_holidays_loading = True
+        try:
+            is_loaded = _set_holidays_compiled(
+                _py_workdays,
+                holidays_csv_path_strs,
+                self._holiday_start_year,
+                self._holiday_end_year,
+                self._compiled_cache_path
+            )
+            if is_loaded:  # コンパイル済みのカレンダーの休日曜日・営業時間境界が設定と異なる場合のみ合わせる
+                if get_holiday_weekdays() != set(self._holiday_weekdays):
+                    self._set_holiday_weekdays()
+                if get_intraday_borders() != sorted(self._intraday_borders, key=lambda border: border["start"]):
+                    self._set_intraday_borders()
+            self._is_holidays_loaded = True
+            set_default_calendar_loader(None)
+        finally:
+            self._is_holidays_loading = False
+        _module_scalar_cache.clear()
+
+    def _set_holiday_year_range(self) -> None:
+        """
+        祝日を読み込み直さずに利用する年の範囲を変更
+        """
+        if self._defer_update("_set_holiday_year_range"):
+            return
+        if not self._is_holidays_loaded:  # 読み込み時に反映される
+            return
+        set_holiday_year_range(self._holiday_start_year, self._holiday_end_year)
+        _module_scalar_cache.clear()
+
+    def _set_holiday_weekdays(self) -> None:
+        """
+        休日曜日を設定
+        """
+        if self._defer_update("_set_holiday_weekdays"):
+            return
+        holiday_weekdays = set(list(self._holiday_weekdays))
+        set_holiday_weekdays(holiday_weekdays)
+        _module_scalar_cache.clear()
+
+
+    def _set_intraday_borders(self) -> None:
+        """
+        営業時間の境界を設定
+        """
+        if self._defer_update("_set_intraday_borders"):
+            return
+        intraday_borders = list(self._intraday_borders)
+        set_intraday_borders(intraday_borders)
+        _module_scalar_cache.clear()
+
+    def _set_timezone(self) -> None:
+        """
+        タイムゾーンのオフセットの遷移テーブルを設定
+        """
+        if self._timezone is None:  # numpy・pandasをimportしない
+            set_utc_offset_table([], [])
+            return
+        from .extract import _utc_offset_table
+        transitions, offsets = _utc_offset_table(self._timezone)
+        set_utc_offset_table(transitions.tolist(), offsets.tolist())
+
+    @property
+    def timezone(self) -> Optional[Union[str, tzinfo]]:
+        """
+        営業日・営業時間のローカル時間のタイムゾーン．設定すると抽出関数がUTCやawareなデータをこのタイムゾーンで判定する
+        """
+        return self._timezone
+
+    @timezone.setter
+    def timezone(self, tz: Optional[Union[str, tzinfo]]) -> None:
+        assert(tz is None or isinstance(tz, (str, tzinfo)))
+        self._timezone = tz
+        self._set_timezone()
+
+    @property
+    def compiled_cache_path(self) -> Optional[Path]:
+        """
+        コンパイル済みのカレンダーの保存先．csvが変更されていなければcsvを解析せずにこのファイルから読み込む．
+        テーブルは読み込み時に検証してコピーするため，プロセス間でメモリを共有するものではない．
+        Noneの場合は利用しない
+        """
+        return self._compiled_cache_path
+
+    @compiled_cache_path.setter
+    def compiled_cache_path(self, compiled_path: Optional[Path]) -> None:
+        assert(compiled_path is None or isinstance(compiled_path, Path))
+        self._compiled_cache_path = compiled_path
+
+    @property
+    def holiday_source_url(self) -> str:
+        """
+        refresh_holidaysが祝日データを取得するURL．内閣府のcsvと同じ形式(日付,名称)で配信するものを指定する
+        """
+        return self._holiday_source_url
+
+    @holiday_source_url.setter
+    def holiday_source_url(self, url: str) -> None:
+        assert(isinstance(url, str))
+        self._holiday_source_url = url
+
+    @property
+    def holiday_start_year(self) -> int:
+        return self._holiday_start_year
+
+    @holiday_start_year.setter
+    def holiday_start_year(self, year: int) -> None:
+        assert(isinstance(year, int))
+        self._holiday_start_year = year
+        self._set_holiday_year_range()
+
+    @property
+    def holiday_end_year(self) -> int:
+        return self._holiday_end_year
+
+    @holiday_end_year.setter
+    def holiday_end_year(self, year: int) -> None:
+        assert(isinstance(year, int))
+        self._holiday_end_year = year
+        self._set_holiday_year_range()
+
+    def add_range_holidays(self, range_holidays: Union[List[date], Any]) -> None:
+        """
+        祝日を追加．datetime64のndarray・pd.DatetimeIndex・Arrowの日付の配列はRust側でまとめて変換し，
+        新しく祝日となった日のみ前計算テーブルを更新する
+        """
+        from .extract import _holiday_int64_values  # numpy・pandasは必要な場合のみimportする
+        holiday_values = _holiday_int64_values(range_holidays)
+        if holiday_values is not None:
+            int_64_values, unit = holiday_values
+            add_range_holidays_naive(int_64_values, self._holiday_start_year, self._holiday_end_year, unit=unit)
+        else:
+            add_range_holidays(
+                range_holidays,
+                self._holiday_start_year,
+                self._holiday_end_year
+            )
+        _module_scalar_cache.clear()
+
+    @property
+    def range_holidays(self) -> List[date]:
+        """
+        祝日データを取得
+        """
+        return get_range_holidays()
+
+config = Config()
+
+
+if __name__ == "__main__":
     pass
\ No newline at end of file
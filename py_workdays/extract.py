@@ -1,105 +1,403 @@
-import numpy as np
-import numpy.typing as npt
-import pandas as pd
-from typing import Any
-
-from .py_workdays import extract_workdays_bool_naive, extract_intraday_bool_naive, extract_workdays_intraday_bool_naive
-
-
-def extract_workdays_bool(dt_index: Any) -> npt.NDArray[np.bool_]:
-    """
-    pd.DatetimeIndexから，営業日のデータのものを抽出
-
-    Parameters
-    ----------
-    dt_index: pd.DatetimeIndex
-        入力するDatetimeIndex，すでにdatetimeでソートしていることが前提
-
-    Returns
-    -------
-    営業日を抜き出したブールのndarray
-
-    """        
-    tz_dt = dt_index.tz
-        
-    if tz_dt is not None:
-        naive_dt_index = dt_index.copy()
-        naive_dt_index = naive_dt_index.tz_localize(None)  # 同じdatetimeの値をもつutc(python の localと挙動がことなることに注意)
-    else:
-        naive_dt_index = dt_index
-        
-    dt_value_datetime_64 = (naive_dt_index.values.astype(np.int64)/1.e9).astype(np.int64)
-    extracted_bool = extract_workdays_bool_naive(dt_value_datetime_64)
-    
-    return extracted_bool
-
-
-def extract_intraday_bool(dt_index: Any) -> npt.NDArray[np.bool_]:
-    """
-    pd.DatetimeIndexから，営業時間中のデータのものを抽出
-
-    Parameters
-    ----------
-    dt_index: pd.DatetimeIndex
-        入力するDatetimeIndex
-
-    Returns
-    -------
-    営業時間を抜き出したブールのndarray
-    """
-
-    tz_dt = dt_index.tz
-        
-    if tz_dt is not None:
-        naive_dt_index = dt_index.copy()
-        naive_dt_index = naive_dt_index.tz_localize(None)  # 同じdatetimeの値をもつutc(python の localと挙動がことなることに注意)
-    else:
-        naive_dt_index = dt_index
-        
-    dt_value_datetime_64 = (naive_dt_index.values.astype(np.int64)/1.e9).astype(np.int64)
-    extracted_bool = extract_intraday_bool_naive(dt_value_datetime_64)
-
-    return extracted_bool
-
-
-def extract_workdays_intraday_bool(dt_index: Any) -> npt.NDArray[np.bool_]:
-    """
-    pd.DatetimeIndexから，営業日+日中のデータのものを抽出．
-
-    Parameters
-    ----------
-    dt_index: pd.DatetimeIndex
-        入力するDatetimeIndex
-
-    Returns
-    -------
-    営業日・営業時間を抜き出したブールのndarray
-
-    Examples
-    --------
-    >>> datetime_list = [
-        datetime.datetime(2021,1,1,0,0,0),
-        datetime.datetime(2021,1,1,10,0,0),
-        datetime.datetime(2021,1,4,0,0,0),
-        datetime.datetime(2021,1,4,10,0,0)
-        ]
-    >>> datetime_index = pd.DatetimeIndex(datetime_list)
-    >>> extract_workdays_intraday_bool(datetime_index)
-    array([False, False, False,  True])
-    """ 
-    tz_dt = dt_index.tz
-        
-    if tz_dt is not None:
-        naive_dt_index = dt_index.copy()
-        naive_dt_index = naive_dt_index.tz_localize(None)  # 同じdatetimeの値をもつutc(python の localと挙動がことなることに注意)
-    else:
-        naive_dt_index = dt_index
-        
-    dt_value_datetime_64 = (naive_dt_index.values.astype(np.int64)/1.e9).astype(np.int64)
-    extracted_bool = extract_workdays_intraday_bool_naive(dt_value_datetime_64)
-    
-    return extracted_bool
-
-    
-if __name__ == "__main__":
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from datetime import datetime, tzinfo
+from pytz import timezone, UnknownTimeZoneError, BaseTzInfo, utc as pytz_utc
+from typing import Any, Optional, Tuple, Union
+
+from .py_workdays import extract_workdays_bool_naive, extract_intraday_bool_naive, extract_workdays_intraday_bool_naive
+from . import py_workdays as _py_workdays
+
+
+# Rust側がコピーせずに読める時間単位
+_RUST_TIME_UNITS = ("D", "s", "ms", "us", "ns")
+
+# pytz以外のtzinfoのオフセットの遷移を調べる範囲(UTCの秒数)
+_TRANSITION_SEARCH_RANGE = (0, 4102444800)  # 1970年から2100年まで
+
+
+def _utc_offset_seconds(tz: tzinfo, utc_seconds: int) -> int:
+    """
+    UTCの1970年1月1日からの秒数におけるtzのオフセット(秒)
+    """
+    utcoffset = datetime.fromtimestamp(utc_seconds, tz).utcoffset()
+    assert utcoffset is not None
+    return int(utcoffset.total_seconds())
+
+
+def _utc_offset_table(tz: Union[str, tzinfo, None]) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """
+    タイムゾーンをRust側のオフセットの遷移テーブル(遷移するUTCの秒数, 遷移以降のオフセットの秒数)に変換．
+    pytzのタイムゾーンはその遷移テーブルをそのまま利用する．その他のtzinfo(zoneinfo.ZoneInfoなど)は同じ名前のpytzのタイムゾーンに変換し，
+    変換できない場合のみ日ごとにオフセットを調べて遷移を二分探索する．
+    Noneの場合は空のテーブルを返す
+
+    Parameters
+    ----------
+    tz: str or tzinfo or None
+        タイムゾーン名(pytz.timezoneに与えるもの)あるいはtzinfo
+
+    Returns
+    -------
+    遷移するUTCの1970年1月1日からの秒数とオフセットの秒数のint64のndarray
+    """
+    if tz is None:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+    if isinstance(tz, str):
+        tz = timezone(tz)
+    elif not isinstance(tz, (BaseTzInfo, type(pytz_utc))):
+        try:
+            tz = timezone(str(tz))  # intraday._timezone_from_tzinfoと同様に名前でpytzに変換する
+        except UnknownTimeZoneError:
+            pass
+
+    utc_transition_times = getattr(tz, "_utc_transition_times", None)
+    if utc_transition_times is not None:  # pytzの夏時間のあるタイムゾーン
+        transitions = np.array(utc_transition_times, dtype="datetime64[s]").view(np.int64)
+        offsets = np.array([int(utcoffset.total_seconds()) for utcoffset, _, _ in tz._transition_info], dtype=np.int64)  # type: ignore
+        return transitions, offsets
+
+    fixed_utcoffset = tz.utcoffset(None)
+    if fixed_utcoffset is not None:  # 固定オフセット
+        return np.array([0], dtype=np.int64), np.array([int(fixed_utcoffset.total_seconds())], dtype=np.int64)
+
+    search_start, search_end = _TRANSITION_SEARCH_RANGE
+    transitions_list = [search_start]
+    offsets_list = [_utc_offset_seconds(tz, search_start)]
+    for day_start in range(search_start, search_end, 86400):
+        day_end = day_start + 86400
+        if _utc_offset_seconds(tz, day_end) == offsets_list[-1]:
+            continue
+        # オフセットが変わる最初の秒を二分探索
+        low, high = day_start, day_end
+        while high - low > 1:
+            middle = (low + high) // 2
+            if _utc_offset_seconds(tz, middle) == offsets_list[-1]:
+                low = middle
+            else:
+                high = middle
+        transitions_list.append(high)
+        offsets_list.append(_utc_offset_seconds(tz, high))
+    return np.array(transitions_list, dtype=np.int64), np.array(offsets_list, dtype=np.int64)
+
+
+def _naive_int64_values(dt_index: Any) -> Tuple[npt.NDArray[np.int64], str]:
+    """
+    pd.DatetimeIndexあるいはdatetime64のndarrayを，naiveなdatetime64の値をもつint64のndarrayとその時間単位に変換．
+    naiveな場合はコピーせずにviewを返す
+    """
+    if isinstance(dt_index, np.ndarray):
+        datetime_64_values = dt_index
+    else:
+        if dt_index.tz is not None:
+            dt_index = dt_index.tz_localize(None)  # 同じdatetimeの値をもつutc(python の localと挙動がことなることに注意)
+        datetime_64_values = dt_index.values
+
+    unit, _ = np.datetime_data(datetime_64_values.dtype)
+    if unit not in _RUST_TIME_UNITS:
+        unit = "s"  # Rust側で扱えない単位(分など)は秒に変換する
+        datetime_64_values = datetime_64_values.astype("datetime64[s]")
+    int_64_values: npt.NDArray[np.int64] = np.ascontiguousarray(datetime_64_values).view(np.int64)
+    return int_64_values, unit
+
+
+def _extract_int64_values(engine: Any, dt_index: Any, utc: bool) -> Tuple[npt.NDArray[np.int64], str, bool]:
+    """
+    抽出関数の入力を，int64のndarray，その時間単位，UTCとして判定するかどうかに変換．
+    カレンダーにタイムゾーンが設定されている場合，awareなDatetimeIndexはUTCの値をコピーせずに利用する．
+    設定されていない場合はDatetimeIndexのタイムゾーンのローカル時間で判定する
+    """
+    is_aware = not isinstance(dt_index, np.ndarray) and dt_index.tz is not None
+    if is_aware and engine.has_timezone():
+        int_64_values, unit = _naive_int64_values(dt_index.values)  # awareなDatetimeIndexのvaluesはUTC
+        return int_64_values, unit, True
+
+    int_64_values, unit = _naive_int64_values(dt_index)
+    return int_64_values, unit, utc and not is_aware
+
+
+def _is_arrow_like(dt_index: Any) -> bool:
+    """
+    pyarrowのArray・ChunkedArrayあるいはpolarsのSeriesかどうか．pyarrow・polarsをimportせずに判定する
+    """
+    return type(dt_index).__module__.split(".")[0] in ("pyarrow", "polars")
+
+
+def _extract_arrow_bool_or_none(
+    engine: Any,
+    method_name: str,
+    dt_index: Any,
+    out: Optional[npt.NDArray[np.bool_]],
+    utc: bool,
+    assume_sorted: bool
+    ) -> Any:
+    """
+    入力がArrowの配列の場合はチャンクごとに抽出したArrowのブールの配列を返し，そうでない場合はNoneを返す
+    """
+    if not _is_arrow_like(dt_index):
+        return None
+    if out is not None:
+        raise ValueError("out cannot be used with arrow input")
+    from .arrow import _extract_arrow_bool  # pyarrowは必要な場合のみimportする
+    return _extract_arrow_bool(engine, method_name, dt_index, utc, assume_sorted)
+
+
+def _holiday_int64_values(holidays: Any) -> Optional[Tuple[npt.NDArray[np.int64], str]]:
+    """
+    祝日の入力がdatetime64のndarray・pd.DatetimeIndex・Arrowの日付の配列の場合は，int64のndarrayとその時間単位に変換してRust側でまとめて読めるようにする．
+    dateのリストなどの場合はNoneを返す．awareな日時はそのタイムゾーンのローカルの日付とする
+    """
+    if _is_arrow_like(holidays):
+        from .arrow import _arrow_date_int64_values  # pyarrowは必要な場合のみimportする
+        return _arrow_date_int64_values(holidays)
+    if isinstance(holidays, pd.Series) and pd.api.types.is_datetime64_any_dtype(holidays.dtype):
+        holidays = pd.DatetimeIndex(holidays)
+    if isinstance(holidays, pd.DatetimeIndex) or (isinstance(holidays, np.ndarray) and holidays.dtype.kind == "M"):
+        return _naive_int64_values(holidays)
+    return None
+
+
+def _timedelta_int64_values(deltas: Any) -> Tuple[Union[int, npt.NDArray[np.int64]], str]:
+    """
+    timedelta(datetime.timedelta, np.timedelta64, pd.Timedelta)あるいはtimedelta64のndarray，pd.TimedeltaIndexを，
+    int64の値(スカラーの場合はint)とその時間単位に変換．timedelta64のndarrayの場合はコピーせずにviewを返す
+    """
+    timedelta_64_values = np.asarray(deltas)
+    if timedelta_64_values.dtype.kind != "m":
+        timedelta_64_values = timedelta_64_values.astype("timedelta64[ns]")
+
+    unit, _ = np.datetime_data(timedelta_64_values.dtype)
+    if unit not in _RUST_TIME_UNITS:
+        unit = "s"
+        timedelta_64_values = timedelta_64_values.astype("timedelta64[s]")
+
+    if timedelta_64_values.ndim == 0:
+        return int(timedelta_64_values.view(np.int64)), unit
+    int_64_values: npt.NDArray[np.int64] = np.ascontiguousarray(timedelta_64_values).view(np.int64)
+    return int_64_values, unit
+
+
+def extract_workdays_bool(
+    dt_index: Any,
+    out: Optional[npt.NDArray[np.bool_]]=None,
+    utc: bool=False,
+    assume_sorted: bool=False
+    ) -> npt.NDArray[np.bool_]:
+    """
+    pd.DatetimeIndexから，営業日のデータのものを抽出
+
+    Parameters
+    ----------
+    dt_index: pd.DatetimeIndex
+        入力するDatetimeIndex．datetime64のndarray，pyarrowのtimestampのArray・ChunkedArray，polarsのDatetimeのSeriesも可．
+        Arrowの配列はチャンクごとにコピーせずに読み，同じ形式のブールの配列(nullはnull)を返す
+    out: Optional[np.ndarray]
+        結果を書き込むブールのndarray．Noneの場合は新しく作成する．Arrowの配列の入力では利用できない
+    utc: bool
+        naiveな入力をUTCとみなし，カレンダーのタイムゾーン(config.timezone)のローカル時間で判定するかどうか．
+        awareなDatetimeIndexはタイムゾーンが設定されていればその時刻をローカル時間に変換して判定する
+    assume_sorted: bool
+        入力が昇順にソートされているとみなすかどうか．判定が変わる日・営業時間の境界を探索し，
+        区間ごとにまとめて書き込むため要素ごとの判定を行わない．ソートされていない場合の結果は正しくない
+
+    Returns
+    -------
+    営業日を抜き出したブールのndarray
+
+    """
+    return _extract_workdays_bool(_py_workdays, dt_index, out, utc, assume_sorted)
+
+
+def _extract_workdays_bool(
+    engine: Any,
+    dt_index: Any,
+    out: Optional[npt.NDArray[np.bool_]],
+    utc: bool,
+    assume_sorted: bool
+    ) -> npt.NDArray[np.bool_]:
+    """
+    extract_workdays_bool の実装．engineはモジュールあるいはCalendar
+    """
+    arrow_extracted = _extract_arrow_bool_or_none(engine, "extract_workdays_bool_naive", dt_index, out, utc, assume_sorted)
+    if arrow_extracted is not None:
+        return arrow_extracted
+
+    int_64_values, unit, is_utc = _extract_int64_values(engine, dt_index, utc)
+    extracted_bool: npt.NDArray[np.bool_] = engine.extract_workdays_bool_naive(
+        int_64_values,
+        unit=unit,
+        out=out,
+        utc=is_utc,
+        assume_sorted=assume_sorted
+    )
+
+    return extracted_bool
+
+
+def extract_intraday_bool(
+    dt_index: Any,
+    out: Optional[npt.NDArray[np.bool_]]=None,
+    utc: bool=False,
+    assume_sorted: bool=False
+    ) -> npt.NDArray[np.bool_]:
+    """
+    pd.DatetimeIndexから，営業時間中のデータのものを抽出
+
+    Parameters
+    ----------
+    dt_index: pd.DatetimeIndex
+        入力するDatetimeIndex．datetime64のndarray，pyarrowのtimestampのArray・ChunkedArray，polarsのDatetimeのSeriesも可．
+        Arrowの配列はチャンクごとにコピーせずに読み，同じ形式のブールの配列(nullはnull)を返す
+    out: Optional[np.ndarray]
+        結果を書き込むブールのndarray．Noneの場合は新しく作成する．Arrowの配列の入力では利用できない
+    utc: bool
+        naiveな入力をUTCとみなし，カレンダーのタイムゾーン(config.timezone)のローカル時間で判定するかどうか．
+        awareなDatetimeIndexはタイムゾーンが設定されていればその時刻をローカル時間に変換して判定する
+    assume_sorted: bool
+        入力が昇順にソートされているとみなすかどうか．判定が変わる日・営業時間の境界を探索し，
+        区間ごとにまとめて書き込むため要素ごとの判定を行わない．ソートされていない場合の結果は正しくない
+
+    Returns
+    -------
+    営業時間を抜き出したブールのndarray
+    """
+    return _extract_intraday_bool(_py_workdays, dt_index, out, utc, assume_sorted)
+
+
+def _extract_intraday_bool(
+    engine: Any,
+    dt_index: Any,
+    out: Optional[npt.NDArray[np.bool_]],
+    utc: bool,
+    assume_sorted: bool
+    ) -> npt.NDArray[np.bool_]:
+    """
+    extract_intraday_bool の実装．engineはモジュールあるいはCalendar
+    """
+    arrow_extracted = _extract_arrow_bool_or_none(engine, "extract_intraday_bool_naive", dt_index, out, utc, assume_sorted)
+    if arrow_extracted is not None:
+        return arrow_extracted
+
+    int_64_values, unit, is_utc = _extract_int64_values(engine, dt_index, utc)
+    extracted_bool: npt.NDArray[np.bool_] = engine.extract_intraday_bool_naive(
+        int_64_values,
+        unit=unit,
+        out=out,
+        utc=is_utc,
+        assume_sorted=assume_sorted
+    )
+
+    return extracted_bool
+
+
+def extract_workdays_intraday_bool(
+    dt_index: Any,
+    out: Optional[npt.NDArray[np.bool_]]=None,
+    utc: bool=False,
+    assume_sorted: bool=False
+    ) -> npt.NDArray[np.bool_]:
+    """
+    pd.DatetimeIndexから，営業日+日中のデータのものを抽出．
+
+    Parameters
+    ----------
+    dt_index: pd.DatetimeIndex
+        入力するDatetimeIndex．datetime64のndarray，pyarrowのtimestampのArray・ChunkedArray，polarsのDatetimeのSeriesも可．
+        Arrowの配列はチャンクごとにコピーせずに読み，同じ形式のブールの配列(nullはnull)を返す
+    out: Optional[np.ndarray]
+        結果を書き込むブールのndarray．Noneの場合は新しく作成する．Arrowの配列の入力では利用できない
+    utc: bool
+        naiveな入力をUTCとみなし，カレンダーのタイムゾーン(config.timezone)のローカル時間で判定するかどうか．
+        awareなDatetimeIndexはタイムゾーンが設定されていればその時刻をローカル時間に変換して判定する
+    assume_sorted: bool
+        入力が昇順にソートされているとみなすかどうか．判定が変わる日・営業時間の境界を探索し，
+        区間ごとにまとめて書き込むため要素ごとの判定を行わない．ソートされていない場合の結果は正しくない
+
+    Returns
+    -------
+    営業日・営業時間を抜き出したブールのndarray
+
+    Examples
+    --------
+    >>> datetime_list = [
+        datetime.datetime(2021,1,1,0,0,0),
+        datetime.datetime(2021,1,1,10,0,0),
+        datetime.datetime(2021,1,4,0,0,0),
+        datetime.datetime(2021,1,4,10,0,0)
+        ]
+    >>> datetime_index = pd.DatetimeIndex(datetime_list)
+    >>> extract_workdays_intraday_bool(datetime_index)
+    array([False, False, False,  True])
+    """
+    return _extract_workdays_intraday_bool(_py_workdays, dt_index, out, utc, assume_sorted)
+
+
+def _extract_workdays_intraday_bool(
+    engine: Any,
+    dt_index: Any,
+    out: Optional[npt.NDArray[np.bool_]],
+    utc: bool,
+    assume_sorted: bool
+    ) -> npt.NDArray[np.bool_]:
+    """
+    extract_workdays_intraday_bool の実装．engineはモジュールあるいはCalendar
+    """
+    arrow_extracted = _extract_arrow_bool_or_none(engine, "extract_workdays_intraday_bool_naive", dt_index, out, utc, assume_sorted)
+    if arrow_extracted is not None:
+        return arrow_extracted
+
+    int_64_values, unit, is_utc = _extract_int64_values(engine, dt_index, utc)
+    extracted_bool: npt.NDArray[np.bool_] = engine.extract_workdays_intraday_bool_naive(
+        int_64_values,
+        unit=unit,
+        out=out,
+        utc=is_utc,
+        assume_sorted=assume_sorted
+    )
+
+    return extracted_bool
+
+
+def extract_workdays_intraday_ranges(dt_index: Any, utc: bool=False) -> npt.NDArray[np.int64]:
+    """
+    昇順にソートされたpd.DatetimeIndexから，営業日・営業時間のデータが連続する範囲を(開始, 終了)のインデックスとして取得．
+    ブールのマスクを作成せずにスライスでデータを取り出せる
+
+    Parameters
+    ----------
+    dt_index: pd.DatetimeIndex
+        昇順にソートされたDatetimeIndex．datetime64のndarrayも可
+    utc: bool
+        extract_workdays_intraday_boolと同じ
+
+    Returns
+    -------
+    np.ndarray(dtype=int64, shape=(範囲の数, 2))
+        各行が範囲の開始と終了(含まない)のインデックス．隣接する範囲はまとめる
+
+    Examples
+    --------
+    >>> dt_index = pd.date_range(datetime.datetime(2021,1,4,8,0,0), datetime.datetime(2021,1,5,16,0,0), freq="1h")
+    >>> ranges = extract_workdays_intraday_ranges(dt_index)
+    >>> ranges
+    array([[ 1,  4],
+           [ 5,  7],
+           [25, 28],
+           [29, 31]])
+    >>> df = pd.DataFrame({"value": np.arange(len(dt_index))}, index=dt_index)
+    >>> pd.concat([df.iloc[start:stop] for start, stop in ranges])
+    """
+    return _extract_workdays_intraday_ranges(_py_workdays, dt_index, utc)
+
+
+def _extract_workdays_intraday_ranges(engine: Any, dt_index: Any, utc: bool) -> npt.NDArray[np.int64]:
+    """
+    extract_workdays_intraday_ranges の実装．engineはモジュールあるいはCalendar
+    """
+    int_64_values, unit, is_utc = _extract_int64_values(engine, dt_index, utc)
+    flat_ranges: npt.NDArray[np.int64] = engine.extract_workdays_intraday_ranges_naive(int_64_values, unit=unit, utc=is_utc)
+    return flat_ranges.reshape(-1, 2)
+
+
+if __name__ == "__main__":
     pass
\ No newline at end of file
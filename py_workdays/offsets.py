@@ -0,0 +1,260 @@
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional
+
+from . import py_workdays as _py_workdays
+from .intraday import _add_workday_intraday_datetime, _get_near_workday_intraday, _check_workday_intraday
+from .vectorized import _add_workday_intraday_array, _get_near_workday_intraday_array, _get_timedelta_workdays_intraday_array
+from .extract import _extract_workdays_intraday_bool
+
+
+def _engine_from_calendar(calendar: Optional[Any]) -> Any:
+    """
+    calendarがNoneの場合はモジュール
+    """
+    return _py_workdays if calendar is None else calendar
+
+
+def _map_datetimes(other: Any, scalar_func: Callable[[datetime], datetime], array_func: Callable[[Any], Any]) -> Any:
+    """
+    日時のスカラー・配列にscalar_funcあるいはarray_funcを適用し，入力と同じ形式で返す．日時でない場合はNotImplemented
+    """
+    if other is pd.NaT:
+        return pd.NaT
+    if isinstance(other, datetime):
+        result_datetime = scalar_func(other)
+        return pd.Timestamp(result_datetime) if isinstance(other, pd.Timestamp) else result_datetime
+    if isinstance(other, pd.Series):
+        return pd.Series(array_func(pd.DatetimeIndex(other)), index=other.index, name=other.name)
+    if isinstance(other, pd.DatetimeIndex):
+        return array_func(other).rename(other.name)
+    if isinstance(other, pd.arrays.DatetimeArray):  # Series・Indexの演算ではarrayが渡される
+        return array_func(pd.DatetimeIndex(other)).array
+    if isinstance(other, np.ndarray) and np.issubdtype(other.dtype, np.datetime64):
+        return array_func(other)
+    return NotImplemented
+
+
+class WorkdayIntradayOffset():
+    """
+    営業日・営業時間を考慮して加算するpandas互換のオフセット．DatetimeIndex・Series・Timestamp・datetimeに加算・減算でき，
+    配列はRust側で一括に計算する．加算はadd_workday_intraday_datetimeと同じであり，営業時間外の日時は次の営業時間の開始から数える
+
+    Parameters
+    ----------
+    delta: timedelta or pd.Timedelta or str
+        加算する営業時間(1秒未満は切り捨て)
+    calendar: Calendar or None
+        利用するカレンダー．Noneの場合はモジュールの設定
+
+    Examples
+    --------
+    >>> dt_index = pd.DatetimeIndex([datetime.datetime(2021,1,1,0,0,0), datetime.datetime(2021,1,4,14,0,0)])
+    >>> dt_index + WorkdayIntradayOffset(datetime.timedelta(hours=2))
+    DatetimeIndex(['2021-01-04 11:00:00', '2021-01-05 10:00:00'], dtype='datetime64[ns]', freq=None)
+    """
+    __array_ufunc__ = None  # ndarrayとの演算でこのクラスの__radd__・__rsub__を利用させる
+
+    def __init__(self, delta: Any=timedelta(0), calendar: Optional[Any]=None) -> None:
+        self._delta: timedelta = pd.Timedelta(delta).to_pytimedelta()
+        self._calendar = calendar
+
+    @property
+    def delta(self) -> timedelta:
+        return self._delta
+
+    @property
+    def calendar(self) -> Optional[Any]:
+        return self._calendar
+
+    def __repr__(self) -> str:
+        return f"<WorkdayIntradayOffset: delta={self._delta!r}>"
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, WorkdayIntradayOffset):
+            return NotImplemented
+        return self._delta == other._delta and self._calendar is other._calendar
+
+    def __hash__(self) -> int:
+        return hash((self._delta, id(self._calendar)))
+
+    def __neg__(self) -> "WorkdayIntradayOffset":
+        return WorkdayIntradayOffset(-self._delta, self._calendar)
+
+    def __mul__(self, n: int) -> "WorkdayIntradayOffset":
+        if not isinstance(n, (int, np.integer)):
+            return NotImplemented
+        return WorkdayIntradayOffset(self._delta * int(n), self._calendar)
+
+    __rmul__ = __mul__
+
+    def _add(self, other: Any, delta: timedelta) -> Any:
+        engine = _engine_from_calendar(self._calendar)
+        return _map_datetimes(
+            other,
+            lambda select_datetime: _add_workday_intraday_datetime(engine, select_datetime, delta),
+            lambda dt_index: _add_workday_intraday_array(engine, dt_index, delta)
+        )
+
+    def __add__(self, other: Any) -> Any:
+        return self._add(other, self._delta)
+
+    __radd__ = __add__
+
+    def __rsub__(self, other: Any) -> Any:
+        return self._add(other, -self._delta)
+
+    def _near(self, other: Any, is_after: bool) -> Any:
+        engine = _engine_from_calendar(self._calendar)
+        return _map_datetimes(
+            other,
+            lambda select_datetime: _get_near_workday_intraday(engine, select_datetime, is_after)[0],
+            lambda dt_index: _get_near_workday_intraday_array(engine, dt_index, is_after)
+        )
+
+    def rollforward(self, other: Any) -> Any:
+        """
+        営業時間外の日時を次の営業時間の開始に進める．営業時間内の日時はそのまま
+
+        Parameters
+        ----------
+        other: datetime or pd.Timestamp or pd.DatetimeIndex or pd.Series or np.ndarray
+            日時あるいはその配列
+
+        Returns
+        -------
+        入力と同じ形式の日時
+        """
+        return self._near(other, True)
+
+    def rollback(self, other: Any) -> Any:
+        """
+        営業時間外の日時を前の営業時間の終了に戻す．営業時間内の日時はそのまま
+
+        Parameters
+        ----------
+        other: datetime or pd.Timestamp or pd.DatetimeIndex or pd.Series or np.ndarray
+            日時あるいはその配列
+
+        Returns
+        -------
+        入力と同じ形式の日時
+        """
+        return self._near(other, False)
+
+    def is_on_offset(self, select_datetime: datetime) -> bool:
+        """
+        営業日・営業時間内の日時であるかどうか
+        """
+        return _check_workday_intraday(_engine_from_calendar(self._calendar), select_datetime)
+
+    def date_range(
+        self,
+        start: datetime,
+        end: Optional[datetime]=None,
+        periods: Optional[int]=None,
+        name: Optional[str]=None
+        ) -> pd.DatetimeIndex:
+        """
+        startからこのオフセットの間隔で並ぶ営業日・営業時間内の日時．pd.date_range(start, end, periods, freq)に相当し，
+        k番目の要素はstart + k * offsetとなる
+
+        Parameters
+        ----------
+        start: datetime or pd.Timestamp
+            開始日時．営業時間外の場合は次の営業時間の開始から始まる
+        end: datetime or pd.Timestamp or None
+            終了日時(含む)．periodsとどちらか一方を指定する
+        periods: int or None
+            要素数
+        name: str or None
+            DatetimeIndexの名前
+
+        Returns
+        -------
+        pd.DatetimeIndex
+        """
+        assert (end is None) != (periods is None), "specify exactly one of end and periods"
+        delta_seconds = int(self._delta.total_seconds())
+        assert delta_seconds > 0, "delta must be at least one second"
+
+        engine = _engine_from_calendar(self._calendar)
+        start_index = pd.DatetimeIndex([start])
+        if periods is None:
+            end_index = pd.DatetimeIndex([end])
+            total_seconds = _get_timedelta_workdays_intraday_array(engine, start_index, end_index).astype("timedelta64[s]").astype(np.int64)[0]
+            periods = max(total_seconds // delta_seconds + 1, 0)
+
+        deltas: npt.NDArray[np.timedelta64] = (np.arange(periods, dtype=np.int64) * delta_seconds).view("timedelta64[s]")
+        date_index: pd.DatetimeIndex = _add_workday_intraday_array(engine, start_index.repeat(periods), deltas)
+        if end is not None:
+            # 営業時間の終了ちょうどの要素は次の営業時間の開始となるためendを超えうる
+            date_index = date_index[date_index <= end_index[0]]
+        return date_index.rename(name)
+
+
+@pd.api.extensions.register_series_accessor("workdays")
+@pd.api.extensions.register_index_accessor("workdays")
+class WorkdaysAccessor():
+    """
+    datetime64のSeries・DatetimeIndexの.workdaysアクセサ．py_workdays.offsetsをimportすると利用できる
+
+    Examples
+    --------
+    >>> dt_index.workdays.add(datetime.timedelta(hours=2))
+    >>> df["timestamp"].workdays.rollforward()
+    """
+    def __init__(self, pandas_obj: Any) -> None:
+        if not pd.api.types.is_datetime64_any_dtype(pandas_obj.dtype):
+            raise AttributeError("can only use .workdays accessor with datetime64 values")
+        self._obj = pandas_obj
+
+    def add(self, deltas: Any, calendar: Optional[Any]=None) -> Any:
+        """
+        各要素に営業日・営業時間を考慮してtimedeltaを加算する．add_workday_intraday_arrayと同じ
+
+        Parameters
+        ----------
+        deltas: timedelta or np.ndarray or pd.TimedeltaIndex
+            加算するtimedelta．配列の場合は要素ごとの値
+        calendar: Calendar or None
+            利用するカレンダー．Noneの場合はモジュールの設定
+
+        Returns
+        -------
+        元と同じ形式(SeriesあるいはDatetimeIndex)
+        """
+        engine = _engine_from_calendar(calendar)
+        deltas = deltas.values if isinstance(deltas, pd.Series) else deltas
+        return _map_datetimes(
+            self._obj,
+            lambda select_datetime: _add_workday_intraday_datetime(engine, select_datetime, deltas),
+            lambda dt_index: _add_workday_intraday_array(engine, dt_index, deltas)
+        )
+
+    def rollforward(self, calendar: Optional[Any]=None) -> Any:
+        """
+        営業時間外の要素を次の営業時間の開始に進める
+        """
+        return WorkdayIntradayOffset(calendar=calendar).rollforward(self._obj)
+
+    def rollback(self, calendar: Optional[Any]=None) -> Any:
+        """
+        営業時間外の要素を前の営業時間の終了に戻す
+        """
+        return WorkdayIntradayOffset(calendar=calendar).rollback(self._obj)
+
+    def is_on_offset(self, calendar: Optional[Any]=None) -> Any:
+        """
+        各要素が営業日・営業時間内であるかどうか．Seriesの場合は同じインデックスのboolのSeries，DatetimeIndexの場合はndarray
+        """
+        is_intraday = _extract_workdays_intraday_bool(_engine_from_calendar(calendar), pd.DatetimeIndex(self._obj), None, False, False)
+        if isinstance(self._obj, pd.Series):
+            return pd.Series(is_intraday, index=self._obj.index, name=self._obj.name)
+        return is_intraday
+
+
+if __name__ == "__main__":
+    pass
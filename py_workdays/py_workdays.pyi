@@ -1,383 +1,1651 @@
-from typing import List, Set, Literal, Tuple, TypedDict, Any
-from datetime import date, time, datetime, timedelta
-import numpy as np
-import numpy.typing as npt
-
-Border = TypedDict("Border", {"start":time, "end":time})
-
-def set_holidays_csvs(holidays_csv_paths: List[str], start_year: int, end_year: int) -> None:
-    """
-    csvを読み込んで利用できる祝日の更新をする  
-
-    Parameters
-    ----------
-    - holidays_csv_paths: csvのパス
-    - start_year: 利用する開始年(その年の1月1日から)
-    - end_year: 利用する終了年(その年の12月31日まで)
-    """
-    ...
-
-def set_range_holidays(holidays: List[date], start_year: int, end_year: int) -> None:
-    """
-    祝日のリストから祝日の更新をする
-
-    Parameters
-    ----------
-    - holidays: 祝日のリスト
-    - start_year: 利用する開始年(その年の1月1日から)
-    - end_year: 利用する終了年(その年の12月31日まで)
-    """
-    ...
-
-def add_range_holidays(holidays: List[date], start_year: int, end_year: int) -> None:
-    """
-    祝日のリストから祝日の追加をする
-
-    Parameters
-    ----------
-    - holidays: 休日のリスト
-    - start_year: 利用する開始年(その年の1月1日から)
-    - end_year: 利用する終了年(その年の12月31日まで)
-    """
-    ...
-
-def set_holiday_weekdays(holiday_weekday_numbers: Set[int]) -> None:
-    """
-    休日曜日の更新，曜日は月曜日が0で日曜日が6となる，
-
-    Parameter
-    ---------
-    - new_one_holiday_weekday_set: 休日曜日のセット
-    """
-    ...
-
-def set_intraday_borders(intraday_borders: List[Border]) -> None:
-    """
-    営業時間境界の更新  
-    
-    Parameter
-    ---------
-    - new_intrada_borders: 営業時間境界のリスト
-    """
-    ...
-
-def get_range_holidays() -> List[date]:
-    """
-    祝日データの取得
-
-    Return
-    ------
-    - 祝日のリスト
-    """
-    ...
-
-def get_holiday_weekdays() -> Set[int]:
-    """
-    休日曜日データの取得，曜日は月曜日が0で日曜日が6となる，
-
-    Return
-    ------
-    - 休日曜日のset
-    """
-    ...
-
-def get_intraday_borders() -> List[Border]:
-    """
-    営業時間境界の取得
-
-    Return
-    ------
-    - 営業時間境界のリスト
-        - "start": 開始時間
-        - "end": 終了時間
-    """
-    ...
-
-def make_source_naikaku(source_csv_path: str) -> None:
-    """
-    内閣府のデータを指定したパスにソースとして保存
-
-    Parameters
-    - source_csv_path: 保存するcsvのパス
-    """
-    ...
-
-def request_holidays_naikaku(start_year: int, end_year: int) -> None:
-    """
-    内閣府による祝日データを取得して祝日に設定する(同期)(feature!="wasm")
-
-    Parameters
-    ----------
-    - start_year=2016: 利用範囲の開始年
-    - end_year=2025: 利用範囲の終了年
-    """
-    ...
-
-def get_workdays(
-    start_date: date, 
-    end_date: date, 
-    closed: Literal["left", "right", "both", "not"] = "left"
-    ) -> List[date]:
-    """
-    start_dateからend_dateまでの営業日を取得 
-
-    Parameters
-    ----------
-    - start_date: 開始日
-    - end_date: 終了日
-    - closed="left": 境界を含めるかどうか
-        - "left": 終了境界を含めない
-        - "right": 開始境界を含めない
-        - "not": どちらの境界も含める
-        - "both": どちらの境界も含めない
-
-    Return
-    ------ 
-    - 営業日のリスト
-    """
-    ...
-
-def check_workday(select_date: date) -> bool:
-    """
-    select_dateが営業日であるか判定
-
-    Parameter
-    ---------
-    - select_date: 指定する日
-
-    Return
-    ------
-    - 営業日であるかどうか
-    """
-    ...
-
-def get_next_workday(select_date: date, days: int=1) -> date:
-    """
-    select_dateからdays分の次の営業日を取得  
-
-    Parameters
-    ----------
-    - select_date: 指定する日
-    - days=1: 進める日数 
-
-    Return
-    ------
-    - 次の営業日
-    """
-    ...
-
-def get_previous_workday(select_date: date, days: int=1) -> date:
-    """
-    select_dateからdays分の前の営業日を取得
-
-    Parameters
-    ----------
-    - select_date: 指定する日
-    - days=1: 減らす日数
-
-    Return
-    ------
-    - 前の営業日
-    """
-    ...
-
-def get_near_workday(select_date: date, is_after:bool=True) -> date:
-    """
-    最近の営業日を取得
-
-    Parameters
-    ----------
-    - select_date: 指定する日
-    - is_after: 後の営業日を所得するかどうか
-
-    Return
-    ------
-    - 最近の営業日
-    """
-    ...
-
-def get_workdays_number(select_date: date, days: int) -> List[date]:
-    """
-    start_dateからdays分だけの営業日のリストを取得
-
-    Parameters
-    ----------
-    - start_date: 開始日
-    - days: 日数
-
-    Return
-    ------
-    営業日のリスト
-    """
-    ...
-
-def check_workday_intraday_naive(select_datetime: date) -> bool:
-    """
-    select_datetimeが営業日・営業時間内であるかどうかを判定．naiveを前提とする
-
-    Parameters
-    ----------
-    - select_datetime: 指定する日時
-
-    Return
-    ------
-    - 営業日・営業時間内であるかどうか
-    """
-    ...
-
-def get_next_border_workday_intraday_naive(
-        select_datetime: datetime
-    ) -> Tuple[datetime, str]:
-    """
-    次の営業日・営業時間内のdatetimeをその状態とともに取得．naiveを前提とする
-
-    Parameter
-    ---------
-    - select_datetime: 指定する日時
-
-    Returns
-    -------
-    - 次の営業日・営業時間内のdatetime
-    - 状態を示す文字列
-        - 'border_start': 営業時間の開始
-        - 'border_end': 営業時間の終了
-    """
-    ...
-
-def get_previous_border_workday_intraday_naive(
-        select_datetime: datetime, 
-        force_is_end: bool=False
-    ) -> Tuple[datetime, str]:
-    """
-    前の営業日・営業時間内のdatetimeをその状態とともに取得
-
-    Parameter
-    ---------
-    - select_datetime: 指定する日時
-    - fore_is_end: 終了時間のときに次の終了時間を取得するかどうか
-
-    Returns
-    - 前の営業日・営業時間内のdatetime
-    - 状態を示す文字列
-        - 'border_start': 営業時間の開始
-        - 'border_end': 営業時間の終了
-    """
-    ...
-
-def get_near_workday_intraday_naive(
-        select_datetime: datetime, 
-        is_after:bool=True
-    ) -> Tuple[datetime, str]:
-    """
-    最近の営業日・営業時間内のdatetimeをその状態とともに取得．select_datetimeが営業日・営業時間内の場合そのまま返る．  
-
-    Parameters
-    ----------
-    - select_datetime: 指定する日時
-    - is_after: 後ろを探索するかどうか
-
-    Returns
-    -------
-    - 前の営業日・営業時間内のdatetime
-    - 状態を示す文字列
-        - 'border_intra': 営業時間内
-        - 'border_start': 営業時間の開始
-        - 'border_end': 営業時間の終了
-    """
-    ...
-
-def add_workday_intraday_datetime_naive(
-    select_datetime: datetime, 
-    delta_time: timedelta
-    ) -> datetime:
-    """
-    営業日・営業時間を考慮しDateTimeを加算する．(負の値も可能)
-    1秒より小さい単位は無視される
-
-    Parameters
-    ----------
-    - select_datetime: 指定する日時
-    - dela_time: 加算するtimedelta
-
-    Return
-    ------
-    加算された日時
-    """
-    ...
-
-def get_timedelta_workdays_intraday_naive(
-    start_datetime_vec: datetime, 
-    end_datetime_vec: datetime
-    ) -> timedelta:
-    """
-    start_datetimeからend_datetimeの営業日・営業時間のtimedeltaを取得
-    1秒より小さい単位は無視される
-
-    Parameters
-    ----------
-    - start_datetime: 開始日時
-    - end_datetime: 終了日時
-
-    Return
-    ------
-    営業日・営業時間のtimedelta
-    """
-    ...
-
-def extract_workdays_bool_naive(int_64_numpy: npt.NDArray[np.int64]) -> npt.NDArray[np.bool_]:
-    """
-    np.int64のndarrayから営業日のものをboolとして抽出  
-
-    Parameters
-    ----------
-    - datetime_64_numpy: np.ndarray(dtype=datetime64) 
-        抽出したい日時のndarray
-    
-    Return
-    ------
-    - ブールのndarray: np.ndarray(dtype=bool)
-    """
-    ...
-
-def extract_intraday_bool_naive(int_64_numpy: npt.NDArray[np.int64]) -> npt.NDArray[np.bool_]:
-    """
-    np.int64のndarrayから営業時間のものをboolとして抽出
-    
-    Parameters
-    ----------
-    - datetime_64_numpy: np.ndarray(dtype=datetime64) 
-        抽出したい日時のndarray
-    
-    Return
-    ------
-    - ブールのndarray: np.ndarray(dtype=bool)
-    """
-    ...
-
-def extract_workdays_intraday_bool_naive(int_64_numpy: npt.NDArray[np.int64]) -> npt.NDArray[np.bool_]:
-    """
-    np.int64のndarrayから営業日・営業時間のものをboolとして抽出
-
-    Parameters
-    ----------
-    - datetime_64_numpy: np.ndarray(dtype=datetime64) 
-        抽出したい日時のndarray
-    
-    Return
-    ------
-    - ブールのndarray: np.ndarray(dtype=bool)
-    """
-    ...
-
-class PyWorkdaysError(Exception):
-    """
-    pyworkdaysのrust部分内部で起こるエラー
-    """
-    def __init__(self, *args: List[Any]) -> None:
-        """
-        初期化メソッド
-        """
-        ...
-
-
-
+from typing import Dict, List, Set, Literal, Tuple, TypedDict, Optional, Union, Any, Callable, overload
+from datetime import date, time, datetime, timedelta
+import numpy as np
+import numpy.typing as npt
+from mmap import mmap
+
+Border = TypedDict("Border", {"start":time, "end":time})
+CompiledBuffer = Union[bytes, bytearray, memoryview, mmap, npt.NDArray[np.uint8]]
+SessionLabelArrays = Tuple[
+    npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.int64],
+    npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.int64]
+]
+
+def set_holidays_csvs(holidays_csv_paths: List[str], start_year: int, end_year: int) -> None:
+    """
+    csvを読み込んで利用できる祝日の更新をする  
+
+    Parameters
+    ----------
+    - holidays_csv_paths: csvのパス
+    - start_year: 利用する開始年(その年の1月1日から)
+    - end_year: 利用する終了年(その年の12月31日まで)
+    """
+    ...
+
+def set_range_holidays(holidays: List[date], start_year: int, end_year: int) -> None:
+    """
+    祝日のリストから祝日の更新をする
+
+    Parameters
+    ----------
+    - holidays: 祝日のリスト
+    - start_year: 利用する開始年(その年の1月1日から)
+    - end_year: 利用する終了年(その年の12月31日まで)
+    """
+    ...
+
+def add_range_holidays(holidays: List[date], start_year: int, end_year: int) -> None:
+    """
+    祝日のリストから祝日の追加をする
+
+    Parameters
+    ----------
+    - holidays: 休日のリスト
+    - start_year: 利用する開始年(その年の1月1日から)
+    - end_year: 利用する終了年(その年の12月31日まで)
+    """
+    ...
+
+def set_range_holidays_naive(
+    int_64_numpy: npt.NDArray[np.int64],
+    start_year: int,
+    end_year: int,
+    unit: Literal["D", "s", "ms", "us", "ns"] = "D"
+    ) -> None:
+    """
+    np.int64のndarrayから祝日の更新をする．祝日が変わった日のみ前計算テーブルを更新する
+
+    Parameters
+    ----------
+    - int_64_numpy: np.ndarray(dtype=int64)
+        祝日のndarray(datetime64をint64としてviewしたもの)．NaTは無視する
+    - start_year: 利用する開始年(その年の1月1日から)
+    - end_year: 利用する終了年(その年の12月31日まで)
+    - unit="D": int_64_numpyの時間単位
+    """
+    ...
+
+def add_range_holidays_naive(
+    int_64_numpy: npt.NDArray[np.int64],
+    start_year: int,
+    end_year: int,
+    unit: Literal["D", "s", "ms", "us", "ns"] = "D"
+    ) -> None:
+    """
+    np.int64のndarrayから祝日の追加をする．新しく祝日となった日のみ前計算テーブルを更新する
+
+    Parameters
+    ----------
+    - int_64_numpy: np.ndarray(dtype=int64)
+        祝日のndarray(datetime64をint64としてviewしたもの)．NaTは無視する
+    - start_year: 利用する開始年(その年の1月1日から)
+    - end_year: 利用する終了年(その年の12月31日まで)
+    - unit="D": int_64_numpyの時間単位
+    """
+    ...
+
+def set_holiday_year_range(start_year: int, end_year: int) -> None:
+    """
+    祝日を読み込み直さずに利用する年の範囲を変更する．範囲外にある祝日も保持しているため，
+    範囲を広げると新しい年の祝日が利用される．重なる範囲の前計算テーブルはそのまま利用する
+
+    Parameters
+    ----------
+    - start_year: 利用する開始年(その年の1月1日から)
+    - end_year: 利用する終了年(その年の12月31日まで)
+    """
+    ...
+
+def dump_compiled_calendar(fingerprint: bytes) -> bytes:
+    """
+    カレンダー(範囲外も含む祝日・休日曜日・営業時間境界と前計算テーブル)をコンパイル済みの形式で取得する
+
+    Parameters
+    ----------
+    - fingerprint: 祝日のソースを識別するバイト列．読み込み時に一致を確認する
+
+    Return
+    ------
+    - コンパイル済みのカレンダーのbytes
+    """
+    ...
+
+def load_compiled_calendar(compiled: CompiledBuffer, fingerprint: bytes) -> bool:
+    """
+    コンパイル済みのカレンダーを読み込む．テーブルはそのままコピーし，csvの読み込みや計算をしない
+
+    Parameters
+    ----------
+    - compiled: bytes，mmap，np.ndarray(dtype=uint8)など
+        コンパイル済みのカレンダーのバッファ．bytesを作らずに読み，読み込み後は参照しない
+    - fingerprint: 期待する祝日のソースの指紋
+
+    Return
+    ------
+    - 読み込んだかどうか．バージョンあるいは指紋が一致しない場合はFalse
+    """
+    ...
+
+def set_default_calendar_loader(loader: Optional[Callable[[], None]]) -> None:
+    """
+    モジュールの関数が初めてカレンダーを参照するときに呼ぶ関数を設定する(祝日の遅延読み込み)．
+    読み込みが完了したらloader側でNoneを設定する
+
+    Parameters
+    ----------
+    - loader: 引数をとらない関数．Noneの場合は解除する
+    """
+    ...
+
+def set_holiday_weekdays(holiday_weekday_numbers: Set[int]) -> None:
+    """
+    休日曜日の更新，曜日は月曜日が0で日曜日が6となる，
+
+    Parameter
+    ---------
+    - new_one_holiday_weekday_set: 休日曜日のセット
+    """
+    ...
+
+def set_intraday_borders(intraday_borders: List[Border]) -> None:
+    """
+    営業時間境界の更新  
+    
+    Parameter
+    ---------
+    - new_intrada_borders: 営業時間境界のリスト
+    """
+    ...
+
+@overload
+def get_range_holidays(as_array: Literal[False] = False) -> List[date]: ...
+@overload
+def get_range_holidays(as_array: Literal[True]) -> npt.NDArray[np.datetime64]: ...
+def get_range_holidays(as_array: bool = False) -> Union[List[date], npt.NDArray[np.datetime64]]:
+    """
+    祝日データの取得
+
+    Parameters
+    ----------
+    - as_array=False: datetime64[D]のndarrayとして取得するかどうか
+
+    Return
+    ------
+    - 祝日のリスト(as_arrayの場合はndarray)
+    """
+    ...
+
+def get_holiday_year_range() -> Tuple[int, int]:
+    """
+    利用する年の範囲の取得
+
+    Return
+    ------
+    - (開始年, 終了年)
+    """
+    ...
+
+def get_holiday_weekdays() -> Set[int]:
+    """
+    休日曜日データの取得，曜日は月曜日が0で日曜日が6となる，
+
+    Return
+    ------
+    - 休日曜日のset
+    """
+    ...
+
+def get_intraday_borders() -> List[Border]:
+    """
+    営業時間境界の取得
+
+    Return
+    ------
+    - 営業時間境界のリスト
+        - "start": 開始時間
+        - "end": 終了時間
+    """
+    ...
+
+def set_utc_offset_table(transitions: List[int], offsets: List[int]) -> None:
+    """
+    タイムゾーンの更新．通常はconfig.timezoneから設定する
+
+    Parameters
+    ----------
+    - transitions: オフセットが切り替わるUTCの1970年1月1日からの秒数のリスト(昇順)
+    - offsets: 各遷移以降のUTCからのオフセット(秒)のリスト．空の場合はタイムゾーンを設定しない
+    """
+    ...
+
+def has_timezone() -> bool:
+    """
+    タイムゾーンが設定されているかどうか
+
+    Return
+    ------
+    - UTCの値を抽出関数に与えられるかどうか
+    """
+    ...
+
+def get_calendar_version() -> int:
+    """
+    カレンダーの版の番号の取得
+
+    Return
+    ------
+    - 祝日・休日曜日・営業時間境界・タイムゾーンが変更されるごとに変わる番号
+    """
+    ...
+
+def make_source_naikaku(source_csv_path: str) -> None:
+    """
+    内閣府のデータを指定したパスにソースとして保存
+
+    Parameters
+    - source_csv_path: 保存するcsvのパス
+    """
+    ...
+
+def request_holidays_naikaku(start_year: int, end_year: int) -> None:
+    """
+    内閣府による祝日データを取得して祝日に設定する(同期)(feature!="wasm")
+
+    Parameters
+    ----------
+    - start_year=2016: 利用範囲の開始年
+    - end_year=2025: 利用範囲の終了年
+    """
+    ...
+
+@overload
+def get_workdays(
+    start_date: date,
+    end_date: date,
+    closed: Literal["left", "right", "both", "not"] = "left",
+    as_array: Literal[False] = False
+    ) -> List[date]: ...
+@overload
+def get_workdays(
+    start_date: date,
+    end_date: date,
+    closed: Literal["left", "right", "both", "not"] = "left",
+    *,
+    as_array: Literal[True]
+    ) -> npt.NDArray[np.datetime64]: ...
+def get_workdays(
+    start_date: date, 
+    end_date: date, 
+    closed: Literal["left", "right", "both", "not"] = "left",
+    as_array: bool = False
+    ) -> Union[List[date], npt.NDArray[np.datetime64]]:
+    """
+    start_dateからend_dateまでの営業日を取得 
+
+    Parameters
+    ----------
+    - start_date: 開始日
+    - end_date: 終了日
+    - closed="left": 境界を含めるかどうか
+        - "left": 終了境界を含めない
+        - "right": 開始境界を含めない
+        - "both": どちらの境界も含める
+        - "not": どちらの境界も含めない
+    - as_array=False: datetime64[D]のndarrayとして取得するかどうか．要素ごとのdateを作らない
+
+    Return
+    ------ 
+    - 営業日のリスト(as_arrayの場合はndarray)
+    """
+    ...
+
+def check_workday(select_date: date) -> bool:
+    """
+    select_dateが営業日であるか判定
+
+    Parameter
+    ---------
+    - select_date: 指定する日
+
+    Return
+    ------
+    - 営業日であるかどうか
+    """
+    ...
+
+def get_next_workday(select_date: date, days: int=1) -> date:
+    """
+    select_dateからdays分の次の営業日を取得  
+
+    Parameters
+    ----------
+    - select_date: 指定する日
+    - days=1: 進める日数 
+
+    Return
+    ------
+    - 次の営業日
+    """
+    ...
+
+def get_previous_workday(select_date: date, days: int=1) -> date:
+    """
+    select_dateからdays分の前の営業日を取得
+
+    Parameters
+    ----------
+    - select_date: 指定する日
+    - days=1: 減らす日数
+
+    Return
+    ------
+    - 前の営業日
+    """
+    ...
+
+def get_near_workday(select_date: date, is_after:bool=True) -> date:
+    """
+    最近の営業日を取得
+
+    Parameters
+    ----------
+    - select_date: 指定する日
+    - is_after: 後の営業日を所得するかどうか
+
+    Return
+    ------
+    - 最近の営業日
+    """
+    ...
+
+@overload
+def get_workdays_number(select_date: date, days: int, as_array: Literal[False] = False) -> List[date]: ...
+@overload
+def get_workdays_number(select_date: date, days: int, as_array: Literal[True]) -> npt.NDArray[np.datetime64]: ...
+def get_workdays_number(select_date: date, days: int, as_array: bool = False) -> Union[List[date], npt.NDArray[np.datetime64]]:
+    """
+    start_dateからdays分だけの営業日のリストを取得
+
+    Parameters
+    ----------
+    - start_date: 開始日
+    - days: 日数
+    - as_array=False: datetime64[D]のndarrayとして取得するかどうか
+
+    Return
+    ------
+    営業日のリスト(as_arrayの場合はndarray)
+    """
+    ...
+
+def count_workdays(start_date: date, end_date: date, closed: Literal["left", "right", "both", "not"]="left") -> int:
+    """
+    start_dateからend_dateまでの営業日数を取得．営業日の累積テーブルを利用するため期間の長さによらない
+
+    Parameters
+    ----------
+    - start_date: 開始日
+    - end_date: 終了日
+    - closed: 境界を含めるかどうか
+        - "left": 終了境界を含めない
+        - "right": 開始境界を含めない
+        - "both": どちらの境界も含める
+        - "not": どちらの境界も含めない
+
+    Return
+    ------
+    営業日数(get_workdaysの長さと同じ)
+    """
+    ...
+
+def get_workday_ordinal(select_date: date) -> int:
+    """
+    select_dateの営業日の序数を取得
+
+    Parameters
+    ----------
+    - select_date: 指定する日
+
+    Return
+    ------
+    holiday_start_yearの1月1日から数えた0始まりの序数．営業日でない場合は次の営業日の序数
+    """
+    ...
+
+def get_workday_from_ordinal(ordinal: int) -> date:
+    """
+    営業日の序数から営業日を取得．get_workday_ordinalの逆
+
+    Parameters
+    ----------
+    - ordinal: 序数
+
+    Return
+    ------
+    営業日
+    """
+    ...
+
+def check_workday_intraday_naive(select_datetime: date) -> bool:
+    """
+    select_datetimeが営業日・営業時間内であるかどうかを判定．naiveを前提とする
+
+    Parameters
+    ----------
+    - select_datetime: 指定する日時
+
+    Return
+    ------
+    - 営業日・営業時間内であるかどうか
+    """
+    ...
+
+def get_next_border_workday_intraday_naive(
+        select_datetime: datetime
+    ) -> Tuple[datetime, str]:
+    """
+    次の営業日・営業時間内のdatetimeをその状態とともに取得．naiveを前提とする
+
+    Parameter
+    ---------
+    - select_datetime: 指定する日時
+
+    Returns
+    -------
+    - 次の営業日・営業時間内のdatetime
+    - 状態を示す文字列
+        - 'border_start': 営業時間の開始
+        - 'border_end': 営業時間の終了
+    """
+    ...
+
+def get_previous_border_workday_intraday_naive(
+        select_datetime: datetime, 
+        force_is_end: bool=False
+    ) -> Tuple[datetime, str]:
+    """
+    前の営業日・営業時間内のdatetimeをその状態とともに取得
+
+    Parameter
+    ---------
+    - select_datetime: 指定する日時
+    - fore_is_end: 終了時間のときに次の終了時間を取得するかどうか
+
+    Returns
+    - 前の営業日・営業時間内のdatetime
+    - 状態を示す文字列
+        - 'border_start': 営業時間の開始
+        - 'border_end': 営業時間の終了
+    """
+    ...
+
+def get_near_workday_intraday_naive(
+        select_datetime: datetime, 
+        is_after:bool=True
+    ) -> Tuple[datetime, str]:
+    """
+    最近の営業日・営業時間内のdatetimeをその状態とともに取得．select_datetimeが営業日・営業時間内の場合そのまま返る．  
+
+    Parameters
+    ----------
+    - select_datetime: 指定する日時
+    - is_after: 後ろを探索するかどうか
+
+    Returns
+    -------
+    - 前の営業日・営業時間内のdatetime
+    - 状態を示す文字列
+        - 'border_intra': 営業時間内
+        - 'border_start': 営業時間の開始
+        - 'border_end': 営業時間の終了
+    """
+    ...
+
+def add_workday_intraday_datetime_naive(
+    select_datetime: datetime, 
+    delta_time: timedelta
+    ) -> datetime:
+    """
+    営業日・営業時間を考慮しDateTimeを加算する．(負の値も可能)
+    1秒より小さい単位は無視される
+
+    Parameters
+    ----------
+    - select_datetime: 指定する日時
+    - dela_time: 加算するtimedelta
+
+    Return
+    ------
+    加算された日時
+    """
+    ...
+
+def get_timedelta_workdays_intraday_naive(
+    start_datetime_vec: datetime, 
+    end_datetime_vec: datetime
+    ) -> timedelta:
+    """
+    start_datetimeからend_datetimeの営業日・営業時間のtimedeltaを取得
+    1秒より小さい単位は無視される
+
+    Parameters
+    ----------
+    - start_datetime: 開始日時
+    - end_datetime: 終了日時
+
+    Return
+    ------
+    営業日・営業時間のtimedelta
+    """
+    ...
+
+def extract_workdays_bool_naive(
+    int_64_numpy: npt.NDArray[np.int64],
+    unit: Literal["D", "s", "ms", "us", "ns"] = "s",
+    out: Optional[npt.NDArray[np.bool_]] = None,
+    utc: bool = False,
+    assume_sorted: bool = False
+    ) -> npt.NDArray[np.bool_]:
+    """
+    np.int64のndarrayから営業日のものをboolとして抽出  
+
+    Parameters
+    ----------
+    - int_64_numpy: np.ndarray(dtype=int64)
+        抽出したい日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+    - unit="s": int_64_numpyの時間単位
+    - out=None: np.ndarray(dtype=bool)
+        結果を書き込むndarray．Noneの場合は新しく作成する
+    - utc=False: int_64_numpyをUTCとみなし，タイムゾーンのローカル時間で判定するかどうか．
+        タイムゾーンが設定されていない場合はPyWorkdaysErrorとなる
+    - assume_sorted=False: int_64_numpyが昇順にソートされているとみなし，判定が変わる境界を探索して区間ごとにまとめて書き込むかどうか．
+        ソートされていない場合の結果は正しくない
+    
+    Return
+    ------
+    - ブールのndarray: np.ndarray(dtype=bool)
+    """
+    ...
+
+def extract_intraday_bool_naive(
+    int_64_numpy: npt.NDArray[np.int64],
+    unit: Literal["D", "s", "ms", "us", "ns"] = "s",
+    out: Optional[npt.NDArray[np.bool_]] = None,
+    utc: bool = False,
+    assume_sorted: bool = False
+    ) -> npt.NDArray[np.bool_]:
+    """
+    np.int64のndarrayから営業時間のものをboolとして抽出
+    
+    Parameters
+    ----------
+    - int_64_numpy: np.ndarray(dtype=int64)
+        抽出したい日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+    - unit="s": int_64_numpyの時間単位
+    - out=None: np.ndarray(dtype=bool)
+        結果を書き込むndarray．Noneの場合は新しく作成する
+    - utc=False: int_64_numpyをUTCとみなし，タイムゾーンのローカル時間で判定するかどうか．
+        タイムゾーンが設定されていない場合はPyWorkdaysErrorとなる
+    - assume_sorted=False: int_64_numpyが昇順にソートされているとみなし，判定が変わる境界を探索して区間ごとにまとめて書き込むかどうか．
+        ソートされていない場合の結果は正しくない
+    
+    Return
+    ------
+    - ブールのndarray: np.ndarray(dtype=bool)
+    """
+    ...
+
+def extract_workdays_intraday_bool_naive(
+    int_64_numpy: npt.NDArray[np.int64],
+    unit: Literal["D", "s", "ms", "us", "ns"] = "s",
+    out: Optional[npt.NDArray[np.bool_]] = None,
+    utc: bool = False,
+    assume_sorted: bool = False
+    ) -> npt.NDArray[np.bool_]:
+    """
+    np.int64のndarrayから営業日・営業時間のものをboolとして抽出
+
+    Parameters
+    ----------
+    - int_64_numpy: np.ndarray(dtype=int64)
+        抽出したい日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+    - unit="s": int_64_numpyの時間単位
+    - out=None: np.ndarray(dtype=bool)
+        結果を書き込むndarray．Noneの場合は新しく作成する
+    - utc=False: int_64_numpyをUTCとみなし，タイムゾーンのローカル時間で判定するかどうか．
+        タイムゾーンが設定されていない場合はPyWorkdaysErrorとなる
+    - assume_sorted=False: int_64_numpyが昇順にソートされているとみなし，判定が変わる境界を探索して区間ごとにまとめて書き込むかどうか．
+        ソートされていない場合の結果は正しくない
+    
+    Return
+    ------
+    - ブールのndarray: np.ndarray(dtype=bool)
+    """
+    ...
+
+def extract_workdays_intraday_ranges_naive(
+    int_64_numpy: npt.NDArray[np.int64],
+    unit: Literal["D", "s", "ms", "us", "ns"] = "s",
+    utc: bool = False
+    ) -> npt.NDArray[np.int64]:
+    """
+    昇順にソートされたnp.int64のndarrayから，営業日・営業時間の要素が連続する範囲を取得．
+    判定が変わる境界を探索するため，要素ごとの判定を行わない
+
+    Parameters
+    ----------
+    - int_64_numpy: np.ndarray(dtype=int64)
+        昇順にソートされた日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+    - unit="s": int_64_numpyの時間単位
+    - utc=False: int_64_numpyをUTCとみなし，タイムゾーンのローカル時間で判定するかどうか．
+        タイムゾーンが設定されていない場合はPyWorkdaysErrorとなる
+
+    Return
+    ------
+    - 範囲のndarray: np.ndarray(dtype=int64)
+        開始と終了(含まない)のインデックスを交互に並べたもの．reshape(-1, 2)で(開始, 終了)の組となる
+    """
+    ...
+
+def get_session_numbers_naive(
+    int_64_numpy: npt.NDArray[np.int64],
+    unit: Literal["D", "s", "ms", "us", "ns"] = "s",
+    utc: bool = False
+    ) -> npt.NDArray[np.int64]:
+    """
+    np.int64のndarrayの各要素が含まれる営業時間(セッション)の通し番号を取得
+
+    Parameters
+    ----------
+    - int_64_numpy: np.ndarray(dtype=int64)
+        日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+    - unit="s": int_64_numpyの時間単位
+    - utc=False: int_64_numpyをUTCとみなし，タイムゾーンのローカル時間で判定するかどうか．
+        タイムゾーンが設定されていない場合はPyWorkdaysErrorとなる
+
+    Return
+    ------
+    - 通し番号のndarray: np.ndarray(dtype=int64)
+        営業日の序数 * 1日の営業時間の数 + 営業時間の番号．営業時間外・NaTはint64の最小値
+    """
+    ...
+
+def get_workday_session_labels_naive(
+    int_64_numpy: npt.NDArray[np.int64],
+    unit: Literal["D", "s", "ms", "us", "ns"] = "s",
+    utc: bool = False
+    ) -> SessionLabelArrays:
+    """
+    np.int64のndarrayの各要素の営業時間のラベルを，同じカレンダーのスナップショットから取得
+
+    Parameters
+    ----------
+    - int_64_numpy: np.ndarray(dtype=int64)
+        日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+    - unit="s": int_64_numpyの時間単位
+    - utc=False: int_64_numpyをUTCとみなし，タイムゾーンのローカル時間で判定するかどうか．
+        タイムゾーンが設定されていない場合はPyWorkdaysErrorとなる
+
+    Return
+    ------
+    - (codes, workday_codes, session_indices, session_starts, session_ends, workdays): np.ndarray(dtype=int64)のタプル
+        codes・workday_codesは最初の営業時間・営業日を0とする番号，session_indicesは営業時間の番号で，営業時間外・NaTは-1．
+        session_starts・session_endsはcodeごとの営業時間の開始・終了の1970年1月1日からの秒数，workdaysはworkday_codeごとの営業日の日数
+    """
+    ...
+
+def add_workday_intraday_array_naive(
+    int_64_numpy: npt.NDArray[np.int64],
+    deltas: Union[int, npt.NDArray[np.int64]],
+    unit: Literal["D", "s", "ms", "us", "ns"] = "s",
+    delta_unit: Literal["D", "s", "ms", "us", "ns"] = "s"
+    ) -> npt.NDArray[np.int64]:
+    """
+    np.int64のndarrayの各要素に営業日・営業時間を考慮して時間差を加算する
+
+    Parameters
+    ----------
+    - int_64_numpy: np.ndarray(dtype=int64)
+        日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+    - deltas: int or np.ndarray(dtype=int64)
+        加算する時間差(timedelta64をint64としてviewしたもの)．intの場合はすべての要素で共通
+    - unit="s": int_64_numpyの時間単位
+    - delta_unit="s": deltasの時間単位
+
+    Return
+    ------
+    - 1970年1月1日からの秒数のndarray: np.ndarray(dtype=int64)
+        datetime64[s]としてviewできる．NaTはNaTのまま
+    """
+    ...
+
+def get_timedelta_workdays_intraday_array_naive(
+    start_int_64_numpy: npt.NDArray[np.int64],
+    end_int_64_numpy: npt.NDArray[np.int64],
+    start_unit: Literal["D", "s", "ms", "us", "ns"] = "s",
+    end_unit: Literal["D", "s", "ms", "us", "ns"] = "s"
+    ) -> npt.NDArray[np.int64]:
+    """
+    開始日時と終了日時のnp.int64のndarrayの各組の営業日・営業時間の時間差を取得
+
+    Parameters
+    ----------
+    - start_int_64_numpy: np.ndarray(dtype=int64)
+        開始日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+    - end_int_64_numpy: np.ndarray(dtype=int64)
+        終了日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+    - start_unit="s": start_int_64_numpyの時間単位
+    - end_unit="s": end_int_64_numpyの時間単位
+
+    Return
+    ------
+    - ナノ秒単位の時間差のndarray: np.ndarray(dtype=int64)
+        timedelta64[ns]としてviewできる．どちらかがNaTの場合はNaT
+    """
+    ...
+
+def count_workdays_array_naive(
+    start_int_64_numpy: npt.NDArray[np.int64],
+    end_int_64_numpy: npt.NDArray[np.int64],
+    start_unit: Literal["D", "s", "ms", "us", "ns"] = "s",
+    end_unit: Literal["D", "s", "ms", "us", "ns"] = "s",
+    closed: Literal["left", "right", "both", "not"] = "left"
+    ) -> npt.NDArray[np.int64]:
+    """
+    開始日と終了日のnp.int64のndarrayの各組の営業日数を取得
+
+    Parameters
+    ----------
+    - start_int_64_numpy: np.ndarray(dtype=int64)
+        開始日のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+    - end_int_64_numpy: np.ndarray(dtype=int64)
+        終了日のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+    - start_unit="s": start_int_64_numpyの時間単位
+    - end_unit="s": end_int_64_numpyの時間単位
+    - closed="left": 境界を含めるかどうか
+
+    Return
+    ------
+    - 営業日数のndarray: np.ndarray(dtype=int64)
+        どちらかがNaTの場合はint64の最小値
+    """
+    ...
+
+def get_workday_ordinal_array_naive(
+    int_64_numpy: npt.NDArray[np.int64],
+    unit: Literal["D", "s", "ms", "us", "ns"] = "s"
+    ) -> npt.NDArray[np.int64]:
+    """
+    np.int64のndarrayの各要素の営業日の序数を取得
+
+    Parameters
+    ----------
+    - int_64_numpy: np.ndarray(dtype=int64)
+        日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+    - unit="s": int_64_numpyの時間単位
+
+    Return
+    ------
+    - 序数のndarray: np.ndarray(dtype=int64)
+        NaTの場合はint64の最小値
+    """
+    ...
+
+def get_workday_from_ordinal_array_naive(ordinals: npt.NDArray[np.int64]) -> npt.NDArray[np.int64]:
+    """
+    営業日の序数のndarrayから営業日を取得
+
+    Parameters
+    ----------
+    - ordinals: np.ndarray(dtype=int64)
+        序数のndarray．コピーせずに読む
+
+    Return
+    ------
+    - 1970年1月1日からの日数のndarray: np.ndarray(dtype=int64)
+        datetime64[D]としてviewできる．int64の最小値はNaTとなる
+    """
+    ...
+
+def to_business_time_naive(
+    int_64_numpy: npt.NDArray[np.int64],
+    unit: Literal["s", "ms", "us", "ns"] = "s"
+    ) -> npt.NDArray[np.int64]:
+    """
+    np.int64のndarrayの各要素を営業秒の軸(holiday_start_yearの1月1日0時から数えた営業日・営業時間の時間)に変換
+
+    Parameters
+    ----------
+    - int_64_numpy: np.ndarray(dtype=int64)
+        日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+    - unit="s": int_64_numpyの時間単位
+
+    Return
+    ------
+    - unit単位の営業時間のndarray: np.ndarray(dtype=int64)
+        timedelta64としてviewできる．NaTはNaTのまま
+    """
+    ...
+
+def from_business_time_naive(
+    int_64_numpy: npt.NDArray[np.int64],
+    unit: Literal["s", "ms", "us", "ns"] = "s"
+    ) -> npt.NDArray[np.int64]:
+    """
+    営業秒の軸の値のndarrayを日時に変換．to_business_time_naiveの逆
+
+    Parameters
+    ----------
+    - int_64_numpy: np.ndarray(dtype=int64)
+        営業時間のndarray(timedelta64をint64としてviewしたもの)．コピーせずに読む
+    - unit="s": int_64_numpyの時間単位
+
+    Return
+    ------
+    - unit単位の1970年1月1日からのndarray: np.ndarray(dtype=int64)
+        datetime64としてviewできる．NaTはNaTのまま
+    """
+    ...
+
+def get_next_workday_array_naive(
+    int_64_numpy: npt.NDArray[np.int64],
+    unit: Literal["D", "s", "ms", "us", "ns"] = "s",
+    days: Union[int, npt.NDArray[np.int64], None] = None
+    ) -> npt.NDArray[np.int64]:
+    """
+    np.int64のndarrayの各要素からdays分の次の営業日を取得
+
+    Parameters
+    ----------
+    - int_64_numpy: np.ndarray(dtype=int64)
+        日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+    - unit="s": int_64_numpyの時間単位
+    - days=None: 進める日数．intあるいは要素ごとのint64のndarray．Noneの場合は1
+
+    Return
+    ------
+    - 1970年1月1日からの日数のndarray: np.ndarray(dtype=int64)
+        datetime64[D]としてviewできる．NaTはNaTのまま
+    """
+    ...
+
+def get_previous_workday_array_naive(
+    int_64_numpy: npt.NDArray[np.int64],
+    unit: Literal["D", "s", "ms", "us", "ns"] = "s",
+    days: Union[int, npt.NDArray[np.int64], None] = None
+    ) -> npt.NDArray[np.int64]:
+    """
+    np.int64のndarrayの各要素からdays分の前の営業日を取得
+
+    Parameters
+    ----------
+    - int_64_numpy: np.ndarray(dtype=int64)
+        日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+    - unit="s": int_64_numpyの時間単位
+    - days=None: 戻る日数．intあるいは要素ごとのint64のndarray．Noneの場合は1
+
+    Return
+    ------
+    - 1970年1月1日からの日数のndarray: np.ndarray(dtype=int64)
+        datetime64[D]としてviewできる．NaTはNaTのまま
+    """
+    ...
+
+def get_near_workday_array_naive(
+    int_64_numpy: npt.NDArray[np.int64],
+    unit: Literal["D", "s", "ms", "us", "ns"] = "s",
+    is_after: bool = True
+    ) -> npt.NDArray[np.int64]:
+    """
+    np.int64のndarrayの各要素の最近の営業日を取得
+
+    Parameters
+    ----------
+    - int_64_numpy: np.ndarray(dtype=int64)
+        日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+    - unit="s": int_64_numpyの時間単位
+    - is_after=True: 後ろの営業日を取得するかどうか
+
+    Return
+    ------
+    - 1970年1月1日からの日数のndarray: np.ndarray(dtype=int64)
+        datetime64[D]としてviewできる．NaTはNaTのまま
+    """
+    ...
+
+def get_near_workday_intraday_array_naive(
+    int_64_numpy: npt.NDArray[np.int64],
+    unit: Literal["s", "ms", "us", "ns"] = "s",
+    is_after: bool = True
+    ) -> npt.NDArray[np.int64]:
+    """
+    np.int64のndarrayの各要素の最近の営業日・営業時間内の日時を取得
+
+    Parameters
+    ----------
+    - int_64_numpy: np.ndarray(dtype=int64)
+        日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+    - unit="s": int_64_numpyの時間単位
+    - is_after=True: 後ろの営業時間を取得するかどうか
+
+    Return
+    ------
+    - 1970年1月1日からのunit単位の時間のndarray: np.ndarray(dtype=int64)
+        datetime64としてviewできる．営業時間内の要素はそのまま，NaTはNaTのまま
+    """
+    ...
+
+def workday_intraday_range_naive(
+    start_datetime: datetime,
+    end_datetime: datetime,
+    freq_seconds: int,
+    closed: Literal["left", "right", "both", "not"] = "left",
+    unit: Literal["s", "ms", "us", "ns"] = "ns",
+    offset: int = 0,
+    length: Optional[int] = None
+    ) -> npt.NDArray[np.int64]:
+    """
+    start_datetimeからend_datetime(どちらも含む)までの，営業日の各営業時間の開始からfreq_seconds間隔の日時を取得．
+    結果の長さを先に求め，一度だけ確保したndarrayに書き込む
+
+    Parameters
+    ----------
+    - start_datetime: 開始日時
+    - end_datetime: 終了日時
+    - freq_seconds: 間隔(秒)．正である必要がある
+    - closed="left": 各営業時間の境界を含めるかどうか
+        - "left": 終了境界を含めない
+        - "right": 開始境界を含めない
+        - "both": どちらの境界も含める
+        - "not": どちらの境界も含めない
+    - unit="ns": 出力の時間単位
+    - offset=0: 結果のうちoffset番目以降を取得する
+    - length=None: 取得する最大の要素数．Noneの場合は最後まで
+
+    Return
+    ------
+    - 1970年1月1日からのunit単位の時間のndarray: np.ndarray(dtype=int64)
+        datetime64としてviewできる
+    """
+    ...
+
+def count_workday_intraday_range(
+    start_datetime: datetime,
+    end_datetime: datetime,
+    freq_seconds: int,
+    closed: Literal["left", "right", "both", "not"] = "left"
+    ) -> int:
+    """
+    workday_intraday_range_naiveの結果の要素数を取得
+
+    Parameters
+    ----------
+    - start_datetime: 開始日時
+    - end_datetime: 終了日時
+    - freq_seconds: 間隔(秒)．正である必要がある
+    - closed="left": 各営業時間の境界を含めるかどうか
+
+    Return
+    ------
+    要素数
+    """
+    ...
+
+def set_parallel_config(threads: int=0, min_chunk_length: int=262144) -> None:
+    """
+    抽出関数の並列化の設定を更新．抽出関数はGILを解放し，長い入力を分割して並列に処理する
+
+    Parameters
+    ----------
+    - threads=0: 利用するスレッド数．0の場合は利用可能なコア数，1の場合は並列化しない
+    - min_chunk_length=262144: 1スレッドあたりの最小の要素数．これより短い入力は並列化しない
+    """
+    ...
+
+ParallelConfig = TypedDict("ParallelConfig", {"threads":int, "min_chunk_length":int})
+
+def get_parallel_config() -> ParallelConfig:
+    """
+    抽出関数の並列化の設定を取得
+
+    Return
+    ------
+    - "threads"と"min_chunk_length"をキーにもつ辞書
+    """
+    ...
+
+MetricsEvent = TypedDict("MetricsEvent", {"kind":str, "name":str, "seconds":float})
+
+def set_metrics_config(enabled: bool=False, callback: Optional[Callable[[MetricsEvent], Any]]=None) -> None:
+    """
+    計測の設定を更新．無効の場合は時刻を取得しないため，計測のオーバーヘッドはない
+
+    Parameters
+    ----------
+    - enabled=False: モジュールの関数の呼び出し回数・時間とカレンダーの更新を計測するかどうか
+    - callback=None: カレンダーの更新(祝日の読み込み・営業時間境界の変更など)ごとに，
+      {"kind": "rebuild", "name": 更新の名前, "seconds": 時間}の辞書を引数として呼ぶ関数．Noneの場合は呼ばない
+    """
+    ...
+
+FunctionMetrics = TypedDict("FunctionMetrics", {"calls":int, "conversion_seconds":float, "compute_seconds":float, "elements":int})
+RebuildMetrics = TypedDict("RebuildMetrics", {"count":int, "seconds":float})
+MetricsSnapshot = TypedDict("MetricsSnapshot", {"enabled":bool, "functions":Dict[str, FunctionMetrics], "rebuilds":Dict[str, RebuildMetrics]})
+
+def get_metrics_snapshot() -> MetricsSnapshot:
+    """
+    計測値のスナップショットを取得
+
+    Return
+    ------
+    - "enabled", "functions", "rebuilds"をキーにもつ辞書
+        - "functions": 関数名ごとの"calls"(回数)，"conversion_seconds"(Pythonとの変換の時間)，
+          "compute_seconds"(計算の時間)，"elements"(配列の関数が処理した要素数)の辞書
+        - "rebuilds": 更新の名前ごとの"count"(回数)，"seconds"(時間)の辞書
+    """
+    ...
+
+def reset_metrics() -> None:
+    """
+    計測値を破棄する
+    """
+    ...
+
+class Calendar:
+    """
+    祝日・休日曜日・営業時間境界とその前計算テーブルを個別にもつカレンダー．
+    モジュールの関数と同名のメソッドをもち，複数のカレンダーを同時に利用できる
+    """
+    def __init__(
+        self,
+        holidays_csv_paths: Optional[List[str]] = None,
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+        holiday_weekdays: Optional[Set[int]] = None,
+        intraday_borders: Optional[List[Border]] = None
+        ) -> None:
+        """
+        カレンダーの作成
+
+        Parameters
+        ----------
+        - holidays_csv_paths=None: 祝日のcsvのパス．Noneの場合は祝日なし
+        - start_year=None: 利用する開始年．Noneの場合は現在年の5年前
+        - end_year=None: 利用する終了年．Noneの場合は現在年の2年後
+        - holiday_weekdays=None: 休日曜日のセット．Noneの場合は土日
+        - intraday_borders=None: 営業時間境界のリスト．Noneの場合は東京証券取引所の営業時間
+        """
+        ...
+
+    @property
+    def holiday_start_year(self) -> int:
+        """
+        祝日の開始年
+        """
+        ...
+
+    @property
+    def holiday_end_year(self) -> int:
+        """
+        祝日の終了年
+        """
+        ...
+
+    def set_holidays_csvs(self, holidays_csv_paths: List[str], start_year: int, end_year: int) -> None:
+        """
+        csvを読み込んで利用できる祝日の更新をする
+        """
+        ...
+
+    def set_range_holidays(self, holidays: List[date], start_year: int, end_year: int) -> None:
+        """
+        祝日のリストから祝日の更新をする
+        """
+        ...
+
+    def add_range_holidays(self, holidays: List[date], start_year: int, end_year: int) -> None:
+        """
+        祝日のリストから祝日の追加をする
+        """
+        ...
+
+    def set_range_holidays_naive(
+        self,
+        int_64_numpy: npt.NDArray[np.int64],
+        start_year: int,
+        end_year: int,
+        unit: Literal["D", "s", "ms", "us", "ns"] = "D"
+        ) -> None:
+        """
+        np.datetime64のndarrayから祝日の更新をする
+        """
+        ...
+
+    def add_range_holidays_naive(
+        self,
+        int_64_numpy: npt.NDArray[np.int64],
+        start_year: int,
+        end_year: int,
+        unit: Literal["D", "s", "ms", "us", "ns"] = "D"
+        ) -> None:
+        """
+        np.datetime64のndarrayから祝日の追加をする
+        """
+        ...
+
+    def set_holiday_year_range(self, start_year: int, end_year: int) -> None:
+        """
+        祝日を読み込み直さずに利用する年の範囲を変更する
+        """
+        ...
+
+    def dump_compiled_calendar(self, fingerprint: bytes) -> bytes:
+        """
+        カレンダーをコンパイル済みの形式で取得する
+        """
+        ...
+
+    def load_compiled_calendar(self, compiled: CompiledBuffer, fingerprint: bytes) -> bool:
+        """
+        コンパイル済みのカレンダーを読み込む．バージョンあるいは指紋が一致しない場合はFalse
+        """
+        ...
+
+    def set_holiday_weekdays(self, holiday_weekday_numbers: Set[int]) -> None:
+        """
+        休日曜日の更新，曜日は月曜日が0で日曜日が6となる
+        """
+        ...
+
+    def set_intraday_borders(self, intraday_borders: List[Border]) -> None:
+        """
+        営業時間境界の更新
+        """
+        ...
+
+    @overload
+    def get_range_holidays(self, as_array: Literal[False] = False) -> List[date]: ...
+    @overload
+    def get_range_holidays(self, as_array: Literal[True]) -> npt.NDArray[np.datetime64]: ...
+    def get_range_holidays(self, as_array: bool = False) -> Union[List[date], npt.NDArray[np.datetime64]]:
+        """
+        祝日データの取得
+        """
+        ...
+
+    def get_holiday_year_range(self) -> Tuple[int, int]:
+        """
+        利用する年の範囲の取得
+        """
+        ...
+
+    def get_holiday_weekdays(self) -> Set[int]:
+        """
+        休日曜日データの取得，曜日は月曜日が0で日曜日が6となる
+        """
+        ...
+
+    def get_intraday_borders(self) -> List[Border]:
+        """
+        営業時間境界の取得
+        """
+        ...
+
+    def set_utc_offset_table(self, transitions: List[int], offsets: List[int]) -> None:
+        """
+        タイムゾーンの更新(オフセットの遷移テーブル)．空の場合はタイムゾーンを設定しない
+        """
+        ...
+
+    def has_timezone(self) -> bool:
+        """
+        タイムゾーンが設定されているかどうか
+        """
+        ...
+
+    def get_calendar_version(self) -> int:
+        """
+        カレンダーの版の番号．祝日・休日曜日・営業時間境界・タイムゾーンが変更されるごとに変わる
+        """
+        ...
+
+    @overload
+    def get_workdays(
+        self,
+        start_date: date,
+        end_date: date,
+        closed: Literal["left", "right", "both", "not"] = "left",
+        as_array: Literal[False] = False
+        ) -> List[date]: ...
+    @overload
+    def get_workdays(
+        self,
+        start_date: date,
+        end_date: date,
+        closed: Literal["left", "right", "both", "not"] = "left",
+        *,
+        as_array: Literal[True]
+        ) -> npt.NDArray[np.datetime64]: ...
+    def get_workdays(
+        self,
+        start_date: date,
+        end_date: date,
+        closed: Literal["left", "right", "both", "not"] = "left",
+        as_array: bool = False
+        ) -> Union[List[date], npt.NDArray[np.datetime64]]:
+        """
+        start_dateからend_dateまでの営業日を取得
+        """
+        ...
+
+    def check_workday(self, select_date: date) -> bool:
+        """
+        select_dateが営業日であるか判定
+        """
+        ...
+
+    def get_next_workday(self, select_date: date, days: int=1) -> date:
+        """
+        select_dateからdays分の次の営業日を取得
+        """
+        ...
+
+    def get_previous_workday(self, select_date: date, days: int=1) -> date:
+        """
+        select_dateからdays分の前の営業日を取得
+        """
+        ...
+
+    def get_near_workday(self, select_date: date, is_after: bool=True) -> date:
+        """
+        最近の営業日を取得
+        """
+        ...
+
+    @overload
+    def get_workdays_number(self, start_date: date, days: int, as_array: Literal[False] = False) -> List[date]: ...
+    @overload
+    def get_workdays_number(self, start_date: date, days: int, as_array: Literal[True]) -> npt.NDArray[np.datetime64]: ...
+    def get_workdays_number(self, start_date: date, days: int, as_array: bool = False) -> Union[List[date], npt.NDArray[np.datetime64]]:
+        """
+        start_dateからdays分だけの営業日のリストを取得
+        """
+        ...
+
+    def count_workdays(self, start_date: date, end_date: date, closed: Literal["left", "right", "both", "not"]="left") -> int:
+        """
+        start_dateからend_dateまでの営業日数を取得
+        """
+        ...
+
+    def get_workday_ordinal(self, select_date: date) -> int:
+        """
+        select_dateの営業日の序数を取得
+        """
+        ...
+
+    def get_workday_from_ordinal(self, ordinal: int) -> date:
+        """
+        営業日の序数から営業日を取得
+        """
+        ...
+
+    def check_workday_intraday_naive(self, select_datetime: datetime) -> bool:
+        """
+        select_datetimeが営業日・営業時間内であるかどうかを判定．naiveを前提とする
+        """
+        ...
+
+    def get_next_border_workday_intraday_naive(self, select_datetime: datetime) -> Tuple[datetime, str]:
+        """
+        次の営業日・営業時間内のdatetimeをその状態とともに取得．naiveを前提とする
+        """
+        ...
+
+    def get_previous_border_workday_intraday_naive(self, select_datetime: datetime, force_is_end: bool=False) -> Tuple[datetime, str]:
+        """
+        前の営業日・営業時間内のdatetimeをその状態とともに取得．naiveを前提とする
+        """
+        ...
+
+    def get_near_workday_intraday_naive(self, select_datetime: datetime, is_after: bool=True) -> Tuple[datetime, str]:
+        """
+        最近の営業日・営業時間内のdatetimeをその状態とともに取得．naiveを前提とする
+        """
+        ...
+
+    def add_workday_intraday_datetime_naive(self, select_datetime: datetime, delta_time: timedelta) -> datetime:
+        """
+        営業日・営業時間を考慮しDateTimeを加算する．naiveを前提とする
+        """
+        ...
+
+    def get_timedelta_workdays_intraday_naive(self, start_datetime: datetime, end_datetime: datetime) -> timedelta:
+        """
+        start_datetimeからend_datetimeの営業日・営業時間のtimedeltaを取得．naiveを前提とする
+        """
+        ...
+
+    def extract_workdays_bool_naive(
+        self,
+        int_64_numpy: npt.NDArray[np.int64],
+        unit: Literal["D", "s", "ms", "us", "ns"] = "s",
+        out: Optional[npt.NDArray[np.bool_]] = None,
+        utc: bool = False,
+        assume_sorted: bool = False
+        ) -> npt.NDArray[np.bool_]:
+        """
+        np.int64のndarrayから営業日のものをboolとして抽出
+        """
+        ...
+
+    def extract_intraday_bool_naive(
+        self,
+        int_64_numpy: npt.NDArray[np.int64],
+        unit: Literal["D", "s", "ms", "us", "ns"] = "s",
+        out: Optional[npt.NDArray[np.bool_]] = None,
+        utc: bool = False,
+        assume_sorted: bool = False
+        ) -> npt.NDArray[np.bool_]:
+        """
+        np.int64のndarrayから営業時間のものをboolとして抽出
+        """
+        ...
+
+    def extract_workdays_intraday_bool_naive(
+        self,
+        int_64_numpy: npt.NDArray[np.int64],
+        unit: Literal["D", "s", "ms", "us", "ns"] = "s",
+        out: Optional[npt.NDArray[np.bool_]] = None,
+        utc: bool = False,
+        assume_sorted: bool = False
+        ) -> npt.NDArray[np.bool_]:
+        """
+        np.int64のndarrayから営業日・営業時間のものをboolとして抽出
+        """
+        ...
+
+    def extract_workdays_intraday_ranges_naive(
+        self,
+        int_64_numpy: npt.NDArray[np.int64],
+        unit: Literal["D", "s", "ms", "us", "ns"] = "s",
+        utc: bool = False
+        ) -> npt.NDArray[np.int64]:
+        """
+        昇順にソートされたnp.int64のndarrayから，営業日・営業時間の要素が連続する範囲を取得
+        """
+        ...
+
+    def get_session_numbers_naive(
+        self,
+        int_64_numpy: npt.NDArray[np.int64],
+        unit: Literal["D", "s", "ms", "us", "ns"] = "s",
+        utc: bool = False
+        ) -> npt.NDArray[np.int64]:
+        """
+        np.int64のndarrayの各要素が含まれる営業時間(セッション)の通し番号を取得
+        """
+        ...
+
+    def get_workday_session_labels_naive(
+        self,
+        int_64_numpy: npt.NDArray[np.int64],
+        unit: Literal["D", "s", "ms", "us", "ns"] = "s",
+        utc: bool = False
+        ) -> SessionLabelArrays:
+        """
+        np.int64のndarrayの各要素の営業時間のラベルを，同じカレンダーのスナップショットから取得
+        """
+        ...
+
+    def add_workday_intraday_array_naive(
+        self,
+        int_64_numpy: npt.NDArray[np.int64],
+        deltas: Union[int, npt.NDArray[np.int64]],
+        unit: Literal["D", "s", "ms", "us", "ns"] = "s",
+        delta_unit: Literal["D", "s", "ms", "us", "ns"] = "s"
+        ) -> npt.NDArray[np.int64]:
+        """
+        np.int64のndarrayの各要素に営業日・営業時間を考慮して時間差を加算する
+        """
+        ...
+
+    def get_timedelta_workdays_intraday_array_naive(
+        self,
+        start_int_64_numpy: npt.NDArray[np.int64],
+        end_int_64_numpy: npt.NDArray[np.int64],
+        start_unit: Literal["D", "s", "ms", "us", "ns"] = "s",
+        end_unit: Literal["D", "s", "ms", "us", "ns"] = "s"
+        ) -> npt.NDArray[np.int64]:
+        """
+        開始日時と終了日時のnp.int64のndarrayの各組の営業日・営業時間の時間差を取得
+        """
+        ...
+
+    def count_workdays_array_naive(
+        self,
+        start_int_64_numpy: npt.NDArray[np.int64],
+        end_int_64_numpy: npt.NDArray[np.int64],
+        start_unit: Literal["D", "s", "ms", "us", "ns"] = "s",
+        end_unit: Literal["D", "s", "ms", "us", "ns"] = "s",
+        closed: Literal["left", "right", "both", "not"] = "left"
+        ) -> npt.NDArray[np.int64]:
+        """
+        開始日と終了日のnp.int64のndarrayの各組の営業日数を取得
+        """
+        ...
+
+    def get_workday_ordinal_array_naive(
+        self,
+        int_64_numpy: npt.NDArray[np.int64],
+        unit: Literal["D", "s", "ms", "us", "ns"] = "s"
+        ) -> npt.NDArray[np.int64]:
+        """
+        np.int64のndarrayの各要素の営業日の序数を取得
+        """
+        ...
+
+    def get_workday_from_ordinal_array_naive(self, ordinals: npt.NDArray[np.int64]) -> npt.NDArray[np.int64]:
+        """
+        営業日の序数のndarrayから営業日を取得
+        """
+        ...
+
+    def to_business_time_naive(
+        self,
+        int_64_numpy: npt.NDArray[np.int64],
+        unit: Literal["s", "ms", "us", "ns"] = "s"
+        ) -> npt.NDArray[np.int64]:
+        """
+        np.int64のndarrayの各要素を営業秒の軸に変換
+        """
+        ...
+
+    def from_business_time_naive(
+        self,
+        int_64_numpy: npt.NDArray[np.int64],
+        unit: Literal["s", "ms", "us", "ns"] = "s"
+        ) -> npt.NDArray[np.int64]:
+        """
+        営業秒の軸の値のndarrayを日時に変換
+        """
+        ...
+
+    def get_next_workday_array_naive(
+        self,
+        int_64_numpy: npt.NDArray[np.int64],
+        unit: Literal["D", "s", "ms", "us", "ns"] = "s",
+        days: Union[int, npt.NDArray[np.int64], None] = None
+        ) -> npt.NDArray[np.int64]:
+        """
+        np.int64のndarrayの各要素からdays分の次の営業日を取得
+        """
+        ...
+
+    def get_previous_workday_array_naive(
+        self,
+        int_64_numpy: npt.NDArray[np.int64],
+        unit: Literal["D", "s", "ms", "us", "ns"] = "s",
+        days: Union[int, npt.NDArray[np.int64], None] = None
+        ) -> npt.NDArray[np.int64]:
+        """
+        np.int64のndarrayの各要素からdays分の前の営業日を取得
+        """
+        ...
+
+    def get_near_workday_array_naive(
+        self,
+        int_64_numpy: npt.NDArray[np.int64],
+        unit: Literal["D", "s", "ms", "us", "ns"] = "s",
+        is_after: bool = True
+        ) -> npt.NDArray[np.int64]:
+        """
+        np.int64のndarrayの各要素の最近の営業日を取得
+        """
+        ...
+
+    def get_near_workday_intraday_array_naive(
+        self,
+        int_64_numpy: npt.NDArray[np.int64],
+        unit: Literal["s", "ms", "us", "ns"] = "s",
+        is_after: bool = True
+        ) -> npt.NDArray[np.int64]:
+        """
+        np.int64のndarrayの各要素の最近の営業日・営業時間内の日時を取得
+        """
+        ...
+
+    def workday_intraday_range_naive(
+        self,
+        start_datetime: datetime,
+        end_datetime: datetime,
+        freq_seconds: int,
+        closed: Literal["left", "right", "both", "not"] = "left",
+        unit: Literal["s", "ms", "us", "ns"] = "ns",
+        offset: int = 0,
+        length: Optional[int] = None
+        ) -> npt.NDArray[np.int64]:
+        """
+        営業日の各営業時間の開始からfreq_seconds間隔の日時を取得
+        """
+        ...
+
+    def count_workday_intraday_range(
+        self,
+        start_datetime: datetime,
+        end_datetime: datetime,
+        freq_seconds: int,
+        closed: Literal["left", "right", "both", "not"] = "left"
+        ) -> int:
+        """
+        workday_intraday_range_naiveの結果の要素数を取得
+        """
+        ...
+
+class SessionCursor:
+    """
+    単調増加する日時(ライブのティックなど)について，営業日・営業時間内かどうかと次の営業時間境界を判定するカーソル．
+    次の営業時間境界までの状態を保持し，境界を越えたときとカレンダーが変更されたときのみ再計算する
+    """
+    def __init__(self, calendar: Optional[Calendar] = None) -> None:
+        """
+        カーソルの作成
+
+        Parameters
+        ----------
+        - calendar=None: 利用するカレンダー．Noneの場合はモジュールの設定
+        """
+        ...
+
+    def update(self, select_datetime: datetime) -> bool:
+        """
+        日時に進め，営業日・営業時間内であるかどうかを返す(1秒未満は切り捨て)
+
+        Parameters
+        ----------
+        - select_datetime: 日時．awareの場合はそのタイムゾーンのローカル時間として扱う
+
+        Return
+        ------
+        営業日・営業時間内であるかどうか
+        """
+        ...
+
+    def update_timestamp(self, value: int, unit: Literal["s", "ms", "us", "ns"] = "s") -> bool:
+        """
+        1970年1月1日からのunit単位の整数(datetime64をint64としたもの)に進め，営業日・営業時間内であるかどうかを返す．
+        datetimeを作成しない分updateより速い
+
+        Parameters
+        ----------
+        - value: 1970年1月1日からのunit単位の整数
+        - unit="s": valueの時間単位
+
+        Return
+        ------
+        営業日・営業時間内であるかどうか
+        """
+        ...
+
+    def update_array(
+        self,
+        int_64_numpy: npt.NDArray[np.int64],
+        unit: Literal["s", "ms", "us", "ns"] = "s"
+        ) -> npt.NDArray[np.bool_]:
+        """
+        np.int64のndarray(マイクロバッチ)の各要素に順に進め，営業日・営業時間内であるかどうかを一括で取得．
+        カーソルは最後の要素(NaTを除く)に進む
+
+        Parameters
+        ----------
+        - int_64_numpy: np.ndarray(dtype=int64)
+            日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+        - unit="s": int_64_numpyの時間単位
+
+        Return
+        ------
+        - ブールのndarray: np.ndarray(dtype=bool)
+            NaTはFalse
+        """
+        ...
+
+    @property
+    def is_intraday(self) -> bool:
+        """
+        最後に進めた日時が営業日・営業時間内であるかどうか
+        """
+        ...
+
+    @property
+    def seconds_to_next_border(self) -> int:
+        """
+        最後に進めた日時から次の営業時間境界までの秒数
+        """
+        ...
+
+    @property
+    def next_border(self) -> Tuple[datetime, str]:
+        """
+        最後に進めた日時より後の最初の営業時間境界とその状態("border_start"あるいは"border_end")
+        """
+        ...
+
+    def reset(self) -> None:
+        """
+        保持している状態を破棄する
+        """
+        ...
+
+class PyWorkdaysError(Exception):
+    """
+    pyworkdaysのrust部分内部で起こるエラー
+    """
+    def __init__(self, *args: List[Any]) -> None:
+        """
+        初期化メソッド
+        """
+        ...
+
+
+
@@ -0,0 +1,159 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import urllib.error
+import urllib.request
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .config import config
+
+# 祝日データのソースのデフォルトの保存先
+_DEFAULT_SOURCE_PATH = Path(__file__).parent / Path("source/holiday_naikaku.csv")
+
+# 前回取得したETag．(URL, 保存先)ごとに保持する
+_source_etags: Dict[Tuple[str, str], str] = {}
+
+
+def _fetch_source(url: str, etag: Optional[str], timeout: float) -> Tuple[Optional[bytes], Optional[str]]:
+    """
+    URLから祝日データを取得する．etagを与えると条件付きで取得する
+
+    Returns
+    -------
+    取得したバイト列(変更されていない場合はNone)とETag
+    """
+    request = urllib.request.Request(url)
+    if etag is not None:
+        request.add_header("If-None-Match", etag)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.read(), response.headers.get("ETag")
+    except urllib.error.HTTPError as err:
+        if err.code == 304:  # Not Modified
+            return None, etag
+        raise
+
+
+def _parse_holiday_rows(content: bytes) -> List[Tuple[date, str]]:
+    """
+    内閣府の形式(1行目はヘッダー，"1955/1/1,元日"の行)のcsvを祝日と名称のリストに変換して検証する．
+    UTF-8でなければShift_JIS(cp932)として読む
+    """
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        text = content.decode("cp932")
+
+    holiday_rows: List[Tuple[date, str]] = []
+    for line_index, line in enumerate(text.splitlines()):
+        if line.strip() == "":
+            continue
+        fields = line.split(",")
+        try:
+            year, month, day = (int(value) for value in fields[0].strip().replace("-", "/").split("/"))
+            holiday = date(year, month, day)
+        except ValueError:
+            if line_index == 0:  # ヘッダー
+                continue
+            raise ValueError(f"invalid holiday row at line {line_index + 1}: {line!r}")
+        holiday_name = fields[1].strip() if len(fields) > 1 else ""
+        holiday_rows.append((holiday, holiday_name))
+
+    if len(holiday_rows) == 0:
+        raise ValueError("holiday source has no holiday rows")
+    return holiday_rows
+
+
+def _to_source_bytes(content: bytes) -> bytes:
+    """
+    取得したcsvを検証し，ソースのcsvの形式("1955-01-01,元日"の行，UTF-8)のバイト列に変換する
+    """
+    holiday_rows = _parse_holiday_rows(content)
+    return "".join(f"{holiday.isoformat()},{holiday_name}\n" for holiday, holiday_name in holiday_rows).encode("utf-8")
+
+
+def _changed_source_bytes(source_path: Path, content: bytes) -> Optional[bytes]:
+    """
+    取得したcsvをソースの形式に変換し，現在のソースと内容のハッシュが異なる場合のみそのバイト列を返す
+    """
+    source_bytes = _to_source_bytes(content)
+    previous_digest = hashlib.sha256(source_path.read_bytes()).digest() if source_path.exists() else None
+    if hashlib.sha256(source_bytes).digest() == previous_digest:
+        return None
+    return source_bytes
+
+
+def _replace_source(source_path: Path, source_bytes: bytes) -> None:
+    """
+    読み込み中でも安全なように一時ファイルに書き込んでからソースを置き換える
+    """
+    source_path.parent.mkdir(parents=True, exist_ok=True)
+    file_descriptor, temp_path_str = tempfile.mkstemp(dir=source_path.parent, prefix=source_path.name)
+    try:
+        with os.fdopen(file_descriptor, "wb") as temp_file:
+            temp_file.write(source_bytes)
+        os.replace(temp_path_str, source_path)
+    except OSError:
+        Path(temp_path_str).unlink(missing_ok=True)
+        raise
+
+
+def _is_config_source(source_path: Path) -> bool:
+    """
+    source_pathが設定で読み込むcsvかどうか
+    """
+    resolved_path = source_path.resolve()
+    return any(one_path.resolve() == resolved_path for one_path in config.csv_source_paths)
+
+
+async def refresh_holidays(source_path: Optional[Path]=None, timeout: float=30.0) -> bool:
+    """
+    config.holiday_source_urlから祝日データを取得し，変更されていればソースのcsvを置き換えてカレンダーを更新する．
+    取得・検証・ソースとの比較・csvの読み込みは別のスレッドで行うため，イベントループをブロックしない．
+    前回のETagで条件付きで取得し，内容のハッシュが同じ場合も置き換えない．
+    更新が完了するまで他の呼び出しは以前のカレンダーを利用する
+
+    Parameters
+    ----------
+    source_path: Optional[Path]
+        置き換えるソースのcsvのパス．Noneの場合はデフォルトのソース(initialize_sourceの保存先)．
+        config.csv_source_pathsに含まれる場合はカレンダーを読み込み直す
+    timeout: float
+        取得のタイムアウト(秒)
+
+    Returns
+    -------
+    ソースを置き換えたかどうか
+
+    Examples
+    --------
+    >>> asyncio.run(refresh_holidays())
+    False
+    """
+    if source_path is None:
+        source_path = _DEFAULT_SOURCE_PATH
+    url = config.holiday_source_url
+    etag_key = (url, str(source_path.resolve()))
+    previous_etag = _source_etags.get(etag_key) if source_path.exists() else None
+
+    content, etag = await asyncio.to_thread(_fetch_source, url, previous_etag, timeout)
+    if content is None:
+        return False
+
+    source_bytes = await asyncio.to_thread(_changed_source_bytes, source_path, content)
+    is_changed = source_bytes is not None
+    if source_bytes is not None:
+        await asyncio.to_thread(_replace_source, source_path, source_bytes)
+        if _is_config_source(source_path):
+            await asyncio.to_thread(config._set_holidays)  # 新しいカレンダーを作成してから差し替える
+
+    if etag is not None:
+        _source_etags[etag_key] = etag
+    return is_changed
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,627 @@
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from datetime import datetime
+from typing import Any, Iterator, NamedTuple, Optional, Tuple, Union
+
+from . import py_workdays as _py_workdays
+from .extract import _naive_int64_values, _extract_int64_values, _timedelta_int64_values
+from .intraday import get_timezone_from_datetime
+
+
+def _days_argument(days: Any) -> Union[int, npt.NDArray[np.int64]]:
+    """
+    スカラーあるいは要素ごとの日数を，Rustに渡せるintあるいは連続なint64のndarrayに変換
+    """
+    if np.ndim(days) == 0:
+        return int(days)
+    return np.ascontiguousarray(days, dtype=np.int64)
+
+
+def count_workdays_array(start_dates: Any, end_dates: Any, closed: str="left") -> npt.NDArray[np.int64]:
+    """
+    開始日と終了日の各組について営業日数を取得．count_workdaysを一括で行う
+
+    Parameters
+    ----------
+    start_dates: np.ndarray or pd.DatetimeIndex
+        開始日のdatetime64のndarrayあるいはDatetimeIndex
+    end_dates: np.ndarray or pd.DatetimeIndex
+        終了日のdatetime64のndarrayあるいはDatetimeIndex．start_datesと同じ長さ
+    closed: {"left", "right", "both", "not"}
+        境界を含めるかどうか
+
+    Returns
+    -------
+    営業日数のint64のndarray．どちらかがNaTの場合はint64の最小値
+    """
+    return _count_workdays_array(_py_workdays, start_dates, end_dates, closed)
+
+
+def _count_workdays_array(engine: Any, start_dates: Any, end_dates: Any, closed: str) -> npt.NDArray[np.int64]:
+    """
+    count_workdays_array の実装．engineはモジュールあるいはCalendar
+    """
+    start_int_64_values, start_unit = _naive_int64_values(start_dates)
+    end_int_64_values, end_unit = _naive_int64_values(end_dates)
+    counts: npt.NDArray[np.int64] = engine.count_workdays_array_naive(
+        start_int_64_values,
+        end_int_64_values,
+        start_unit=start_unit,
+        end_unit=end_unit,
+        closed=closed
+    )
+    return counts
+
+
+def get_workday_ordinal_array(dates: Any) -> npt.NDArray[np.int64]:
+    """
+    datetime64のndarrayあるいはpd.DatetimeIndexの各要素の営業日の序数を取得．get_workday_ordinalを一括で行う
+
+    Parameters
+    ----------
+    dates: np.ndarray or pd.DatetimeIndex
+        datetime64のndarrayあるいはDatetimeIndex
+
+    Returns
+    -------
+    序数のint64のndarray．NaTの場合はint64の最小値
+
+    Examples
+    --------
+    >>> ordinals = get_workday_ordinal_array(np.array(["2021-01-04", "2021-01-05"], dtype="datetime64[D]"))
+    >>> get_workday_from_ordinal_array(ordinals + 10)
+    array(['2021-01-19', '2021-01-20'], dtype='datetime64[D]')
+    """
+    return _get_workday_ordinal_array(_py_workdays, dates)
+
+
+def _get_workday_ordinal_array(engine: Any, dates: Any) -> npt.NDArray[np.int64]:
+    """
+    get_workday_ordinal_array の実装．engineはモジュールあるいはCalendar
+    """
+    int_64_values, unit = _naive_int64_values(dates)
+    ordinals: npt.NDArray[np.int64] = engine.get_workday_ordinal_array_naive(int_64_values, unit=unit)
+    return ordinals
+
+
+def get_workday_from_ordinal_array(ordinals: Any) -> npt.NDArray[np.datetime64]:
+    """
+    営業日の序数の配列から営業日を取得．get_workday_from_ordinalを一括で行う
+
+    Parameters
+    ----------
+    ordinals: np.ndarray
+        序数の整数のndarray
+
+    Returns
+    -------
+    datetime64[D]のndarray
+    """
+    return _get_workday_from_ordinal_array(_py_workdays, ordinals)
+
+
+def _get_workday_from_ordinal_array(engine: Any, ordinals: Any) -> npt.NDArray[np.datetime64]:
+    """
+    get_workday_from_ordinal_array の実装．engineはモジュールあるいはCalendar
+    """
+    out_days: npt.NDArray[np.int64] = engine.get_workday_from_ordinal_array_naive(np.ascontiguousarray(ordinals, dtype=np.int64))
+    return out_days.view("datetime64[D]")
+
+
+def get_next_workday_array(dates: Any, days: Any=1) -> npt.NDArray[np.datetime64]:
+    """
+    datetime64のndarrayあるいはpd.DatetimeIndexの各要素から，days分の次の営業日を取得
+
+    Parameters
+    ----------
+    dates: np.ndarray or pd.DatetimeIndex
+        datetime64のndarrayあるいはDatetimeIndex．awareな場合はその地域の日付を利用する
+    days: int or np.ndarray
+        進める日数．intの場合はすべての要素で共通，ndarrayの場合は要素ごとの日数
+
+    Returns
+    -------
+    datetime64[D]のndarray．NaTはNaTのまま
+
+    Examples
+    --------
+    >>> dates = np.array(["2021-01-01", "2021-01-04"], dtype="datetime64[D]")
+    >>> get_next_workday_array(dates, days=np.array([1, 2]))
+    array(['2021-01-04', '2021-01-06'], dtype='datetime64[D]')
+    """
+    return _get_next_workday_array(_py_workdays, dates, days)
+
+
+def _get_next_workday_array(engine: Any, dates: Any, days: Any) -> npt.NDArray[np.datetime64]:
+    """
+    get_next_workday_array の実装．engineはモジュールあるいはCalendar
+    """
+    int_64_values, unit = _naive_int64_values(dates)
+    out_days: npt.NDArray[np.int64] = engine.get_next_workday_array_naive(int_64_values, unit=unit, days=_days_argument(days))
+    return out_days.view("datetime64[D]")
+
+
+def get_previous_workday_array(dates: Any, days: Any=1) -> npt.NDArray[np.datetime64]:
+    """
+    datetime64のndarrayあるいはpd.DatetimeIndexの各要素から，days分の前の営業日を取得
+
+    Parameters
+    ----------
+    dates: np.ndarray or pd.DatetimeIndex
+        datetime64のndarrayあるいはDatetimeIndex．awareな場合はその地域の日付を利用する
+    days: int or np.ndarray
+        戻る日数．intの場合はすべての要素で共通，ndarrayの場合は要素ごとの日数
+
+    Returns
+    -------
+    datetime64[D]のndarray．NaTはNaTのまま
+    """
+    return _get_previous_workday_array(_py_workdays, dates, days)
+
+
+def _get_previous_workday_array(engine: Any, dates: Any, days: Any) -> npt.NDArray[np.datetime64]:
+    """
+    get_previous_workday_array の実装．engineはモジュールあるいはCalendar
+    """
+    int_64_values, unit = _naive_int64_values(dates)
+    out_days: npt.NDArray[np.int64] = engine.get_previous_workday_array_naive(int_64_values, unit=unit, days=_days_argument(days))
+    return out_days.view("datetime64[D]")
+
+
+def get_near_workday_array(dates: Any, is_after: bool=True) -> npt.NDArray[np.datetime64]:
+    """
+    datetime64のndarrayあるいはpd.DatetimeIndexの各要素の最近の営業日を取得．営業日の要素はその日付のまま
+
+    Parameters
+    ----------
+    dates: np.ndarray or pd.DatetimeIndex
+        datetime64のndarrayあるいはDatetimeIndex．awareな場合はその地域の日付を利用する
+    is_after: bool
+        後ろの営業日を取得するかどうか
+
+    Returns
+    -------
+    datetime64[D]のndarray．NaTはNaTのまま
+    """
+    return _get_near_workday_array(_py_workdays, dates, is_after)
+
+
+def _get_near_workday_array(engine: Any, dates: Any, is_after: bool) -> npt.NDArray[np.datetime64]:
+    """
+    get_near_workday_array の実装．engineはモジュールあるいはCalendar
+    """
+    int_64_values, unit = _naive_int64_values(dates)
+    out_days: npt.NDArray[np.int64] = engine.get_near_workday_array_naive(int_64_values, unit=unit, is_after=is_after)
+    return out_days.view("datetime64[D]")
+
+
+def add_workday_intraday_array(dt_index: Any, deltas: Any) -> Any:
+    """
+    datetime64のndarrayあるいはpd.DatetimeIndexの各要素に，営業日・営業時間を考慮してtimedeltaを加算する．
+    add_workday_intraday_datetimeを一括で行う
+
+    Parameters
+    ----------
+    dt_index: np.ndarray or pd.DatetimeIndex
+        datetime64のndarrayあるいはDatetimeIndex
+    deltas: timedelta or np.ndarray or pd.TimedeltaIndex
+        加算するtimedelta(1秒未満は切り捨て)．スカラーの場合はすべての要素で共通，timedelta64のndarrayの場合は要素ごとの値
+
+    Returns
+    -------
+    加算された日時．ndarrayの場合はdatetime64[s]のndarray，DatetimeIndexの場合は同じタイムゾーンのDatetimeIndex．
+    NaTはNaTのまま
+
+    Examples
+    --------
+    >>> dt_index = pd.DatetimeIndex([datetime.datetime(2021,1,1,0,0,0), datetime.datetime(2021,1,4,14,0,0)])
+    >>> add_workday_intraday_array(dt_index, datetime.timedelta(hours=2))
+    DatetimeIndex(['2021-01-04 11:00:00', '2021-01-05 10:00:00'], dtype='datetime64[ns]', freq=None)
+    """
+    return _add_workday_intraday_array(_py_workdays, dt_index, deltas)
+
+
+def _add_workday_intraday_array(engine: Any, dt_index: Any, deltas: Any) -> Any:
+    """
+    add_workday_intraday_array の実装．engineはモジュールあるいはCalendar
+    """
+    int_64_values, unit = _naive_int64_values(dt_index)
+    delta_values, delta_unit = _timedelta_int64_values(deltas)
+    added_seconds: npt.NDArray[np.int64] = engine.add_workday_intraday_array_naive(
+        int_64_values,
+        delta_values,
+        unit=unit,
+        delta_unit=delta_unit
+    )
+    return _datetimes_like(dt_index, added_seconds.view("datetime64[s]"))
+
+
+def _sub_day_naive_int64_values(dt_index: Any) -> Tuple[npt.NDArray[np.int64], str]:
+    """
+    _naive_int64_valuesと同じだが，日単位の場合は秒単位に変換する(NaTはNaTのまま)
+    """
+    int_64_values, unit = _naive_int64_values(dt_index)
+    if unit == "D":
+        int_64_values, unit = int_64_values.view("datetime64[D]").astype("datetime64[s]").view(np.int64), "s"
+    return int_64_values, unit
+
+
+def _datetimes_like(dt_index: Any, naive_datetimes: npt.NDArray[np.datetime64]) -> Any:
+    """
+    naiveなdatetime64のndarrayを入力と同じ形式にする．DatetimeIndexの場合は同じタイムゾーンのDatetimeIndex
+    """
+    if not isinstance(dt_index, pd.DatetimeIndex):
+        return naive_datetimes
+
+    return _localize_datetime_index(pd.DatetimeIndex(naive_datetimes), dt_index.tz)
+
+
+def _localize_datetime_index(datetime_index: pd.DatetimeIndex, select_timezone: Any) -> pd.DatetimeIndex:
+    """
+    naiveなDatetimeIndexをselect_timezoneでlocalizeする．Noneの場合はそのまま
+    """
+    if select_timezone is None:
+        return datetime_index
+    # localizeと同様に，重複する時刻は標準時とする
+    return datetime_index.tz_localize(
+        select_timezone,
+        ambiguous=np.zeros(len(datetime_index), dtype=bool),
+        nonexistent="shift_forward"
+    )
+
+
+def get_near_workday_intraday_array(dt_index: Any, is_after: bool=True) -> Any:
+    """
+    datetime64のndarrayあるいはpd.DatetimeIndexの各要素について，最近の営業日・営業時間内の日時を取得．
+    get_near_workday_intradayを一括で行い，営業時間内の要素はそのまま返る
+
+    Parameters
+    ----------
+    dt_index: np.ndarray or pd.DatetimeIndex
+        datetime64のndarrayあるいはDatetimeIndex
+    is_after: bool
+        後の営業時間を取得するかどうか
+
+    Returns
+    -------
+    ndarrayの場合は入力と同じ単位(日単位の場合は秒)のdatetime64のndarray，DatetimeIndexの場合は同じタイムゾーンのDatetimeIndex．
+    NaTはNaTのまま
+
+    Examples
+    --------
+    >>> dt_index = pd.DatetimeIndex([datetime.datetime(2021,1,1,0,0,0), datetime.datetime(2021,1,4,10,0,0)])
+    >>> get_near_workday_intraday_array(dt_index, is_after=False)
+    DatetimeIndex(['2020-12-31 15:00:00', '2021-01-04 10:00:00'], dtype='datetime64[ns]', freq=None)
+    """
+    return _get_near_workday_intraday_array(_py_workdays, dt_index, is_after)
+
+
+def _get_near_workday_intraday_array(engine: Any, dt_index: Any, is_after: bool) -> Any:
+    """
+    get_near_workday_intraday_array の実装．engineはモジュールあるいはCalendar
+    """
+    int_64_values, unit = _sub_day_naive_int64_values(dt_index)
+    near_values: npt.NDArray[np.int64] = engine.get_near_workday_intraday_array_naive(
+        int_64_values,
+        unit=unit,
+        is_after=is_after
+    )
+    return _datetimes_like(dt_index, near_values.view(f"datetime64[{unit}]"))
+
+
+def get_timedelta_workdays_intraday_array(start_index: Any, end_index: Any) -> npt.NDArray[np.timedelta64]:
+    """
+    開始日時と終了日時の各組について，期間中の営業日・営業時間をtimedelta64[ns](1秒未満は切り捨て)として出力．
+    get_timedelta_workdays_intradayを一括で行い，期間の長さによらず一組あたり定数時間で計算する
+
+    Parameters
+    ----------
+    start_index: np.ndarray or pd.DatetimeIndex
+        開始日時のdatetime64のndarrayあるいはDatetimeIndex
+    end_index: np.ndarray or pd.DatetimeIndex
+        終了日時のdatetime64のndarrayあるいはDatetimeIndex．start_indexと同じ長さ
+
+    Returns
+    -------
+    timedelta64[ns]のndarray．どちらかがNaTの場合はNaT
+
+    Examples
+    --------
+    >>> start_index = pd.DatetimeIndex([datetime.datetime(2021,1,1,0,0,0), datetime.datetime(2021,1,4,10,0,0)])
+    >>> end_index = pd.DatetimeIndex([datetime.datetime(2021,1,4,15,0,0), datetime.datetime(2021,1,4,13,0,0)])
+    >>> get_timedelta_workdays_intraday_array(start_index, end_index)
+    array([18000000000000,  7200000000000], dtype='timedelta64[ns]')
+    """
+    return _get_timedelta_workdays_intraday_array(_py_workdays, start_index, end_index)
+
+
+def _get_timedelta_workdays_intraday_array(engine: Any, start_index: Any, end_index: Any) -> npt.NDArray[np.timedelta64]:
+    """
+    get_timedelta_workdays_intraday_array の実装．engineはモジュールあるいはCalendar
+    """
+    start_int_64_values, start_unit = _naive_int64_values(start_index)
+    end_int_64_values, end_unit = _naive_int64_values(end_index)
+    delta_nanoseconds: npt.NDArray[np.int64] = engine.get_timedelta_workdays_intraday_array_naive(
+        start_int_64_values,
+        end_int_64_values,
+        start_unit=start_unit,
+        end_unit=end_unit
+    )
+    return delta_nanoseconds.view("timedelta64[ns]")
+
+
+def to_business_time(dt_index: Any) -> npt.NDArray[np.timedelta64]:
+    """
+    datetime64のndarrayあるいはpd.DatetimeIndexを，営業日・営業時間のみを数える連続な時間軸(営業秒)に変換．
+    holiday_start_yearの1月1日0時からの営業時間をtimedelta64として返し，営業時間外は直前の営業時間の終了と同じ値となる．
+    差を取ると営業時間の長さとなり，from_business_timeで日時に戻せる
+
+    Parameters
+    ----------
+    dt_index: np.ndarray or pd.DatetimeIndex
+        datetime64のndarrayあるいはDatetimeIndex
+
+    Returns
+    -------
+    入力と同じ単位(日単位の場合は秒)のtimedelta64のndarray．NaTはNaTのまま
+
+    Examples
+    --------
+    >>> dt_index = pd.DatetimeIndex([datetime.datetime(2021,1,4,11,0,0), datetime.datetime(2021,1,4,13,0,0)])
+    >>> np.diff(to_business_time(dt_index))
+    array([3600000000000], dtype='timedelta64[ns]')
+    """
+    return _to_business_time(_py_workdays, dt_index)
+
+
+def _to_business_time(engine: Any, dt_index: Any) -> npt.NDArray[np.timedelta64]:
+    """
+    to_business_time の実装．engineはモジュールあるいはCalendar
+    """
+    int_64_values, unit = _sub_day_naive_int64_values(dt_index)
+    business_values: npt.NDArray[np.int64] = engine.to_business_time_naive(int_64_values, unit=unit)
+    return business_values.view(f"timedelta64[{unit}]")
+
+
+def from_business_time(business_time: Any) -> npt.NDArray[np.datetime64]:
+    """
+    営業秒(to_business_timeの値)を日時に変換．営業時間の境界の値は営業時間の開始となる
+
+    Parameters
+    ----------
+    business_time: np.ndarray or pd.TimedeltaIndex
+        timedelta64のndarrayあるいはTimedeltaIndex
+
+    Returns
+    -------
+    入力と同じ単位(日単位の場合は秒)のdatetime64のndarray．NaTはNaTのまま
+    """
+    return _from_business_time(_py_workdays, business_time)
+
+
+def _from_business_time(engine: Any, business_time: Any) -> npt.NDArray[np.datetime64]:
+    """
+    from_business_time の実装．engineはモジュールあるいはCalendar
+    """
+    int_64_values, unit = _timedelta_int64_values(np.atleast_1d(np.asarray(business_time)))
+    if unit == "D":  # NaTを保つためastypeで秒に変換
+        int_64_values, unit = int_64_values.view("timedelta64[D]").astype("timedelta64[s]").view(np.int64), "s"
+    datetime_values: npt.NDArray[np.int64] = engine.from_business_time_naive(int_64_values, unit=unit)
+    return datetime_values.view(f"datetime64[{unit}]")
+
+
+
+def _freq_seconds(freq: Any) -> int:
+    """
+    timedelta・pd.Timedelta・"5min"のような文字列・pandasの固定長のオフセットを秒数に変換する
+    """
+    freq_timedelta = pd.Timedelta(freq)
+    if freq_timedelta <= pd.Timedelta(0) or freq_timedelta % pd.Timedelta(seconds=1) != pd.Timedelta(0):
+        raise ValueError(f"freq must be a positive whole number of seconds: {freq!r}")
+    return int(freq_timedelta.total_seconds())
+
+
+def _naive_range_bounds(start: datetime, end: datetime) -> Tuple[datetime, datetime, Any]:
+    """
+    開始・終了日時をnaiveにし，タイムゾーン(naiveの場合はNone)とともに返す
+    """
+    assert isinstance(start, datetime)
+    assert isinstance(end, datetime)
+    select_timezone = get_timezone_from_datetime(start, end)
+    if select_timezone is not None:
+        start = start.replace(tzinfo=None)
+        end = end.replace(tzinfo=None)
+    return start, end, select_timezone
+
+
+def workday_intraday_range(
+    start: datetime,
+    end: datetime,
+    freq: Any,
+    closed: str="left",
+    name: Optional[str]=None
+    ) -> pd.DatetimeIndex:
+    """
+    startからendまで(どちらも含む)の営業日について，各営業時間の開始からfreq間隔の日時(バーの時刻)を一括で取得．
+    結果はRust側で一度だけ確保した配列に書き込まれる
+
+    Parameters
+    ----------
+    start: datetime.datetime
+        開始日時(1秒未満は切り捨て)
+    end: datetime.datetime
+        終了日時(1秒未満は切り捨て)．awareの場合はstartと同じタイムゾーンである必要がある
+    freq: timedelta or pd.Timedelta or str
+        間隔．1秒単位である必要がある
+    closed: {"left", "right", "both", "not"}
+        各営業時間の境界を含めるかどうか．"left"はバーの開始時刻，"right"はバーの終了時刻となる
+    name: str or None
+        DatetimeIndexの名前
+
+    Returns
+    -------
+    pd.DatetimeIndex
+        datetime64[ns]のDatetimeIndex．awareの場合は同じタイムゾーン
+
+    Examples
+    --------
+    >>> workday_intraday_range(datetime.datetime(2021,1,1,0,0,0), datetime.datetime(2021,1,4,23,0,0), "1h")
+    DatetimeIndex(['2021-01-04 09:00:00', '2021-01-04 10:00:00', '2021-01-04 11:00:00',
+                   '2021-01-04 12:30:00', '2021-01-04 13:30:00', '2021-01-04 14:30:00'],
+                  dtype='datetime64[ns]', freq=None)
+    """
+    return _workday_intraday_range(_py_workdays, start, end, freq, closed, name)
+
+
+def _workday_intraday_range(engine: Any, start: datetime, end: datetime, freq: Any, closed: str, name: Optional[str]) -> pd.DatetimeIndex:
+    """
+    workday_intraday_range の実装．engineはモジュールあるいはCalendar
+    """
+    naive_start, naive_end, select_timezone = _naive_range_bounds(start, end)
+    range_values: npt.NDArray[np.int64] = engine.workday_intraday_range_naive(
+        naive_start,
+        naive_end,
+        _freq_seconds(freq),
+        closed=closed,
+        unit="ns"
+    )
+    return _localize_datetime_index(pd.DatetimeIndex(range_values.view("datetime64[ns]"), name=name), select_timezone)
+
+
+def iter_workday_intraday_range(
+    start: datetime,
+    end: datetime,
+    freq: Any,
+    closed: str="left",
+    chunk_size: int=1000000,
+    name: Optional[str]=None
+    ) -> Iterator[pd.DatetimeIndex]:
+    """
+    workday_intraday_rangeと同じ日時をchunk_sizeずつのDatetimeIndexとして順に取得する．
+    長い期間でも全体を一度に確保しない
+
+    Parameters
+    ----------
+    start: datetime.datetime
+        開始日時
+    end: datetime.datetime
+        終了日時
+    freq: timedelta or pd.Timedelta or str
+        間隔
+    closed: {"left", "right", "both", "not"}
+        各営業時間の境界を含めるかどうか
+    chunk_size: int
+        一度に取得する最大の要素数
+    name: str or None
+        DatetimeIndexの名前
+
+    Returns
+    -------
+    Iterator[pd.DatetimeIndex]
+        連結するとworkday_intraday_rangeの結果と一致する
+    """
+    return _iter_workday_intraday_range(_py_workdays, start, end, freq, closed, chunk_size, name)
+
+
+def _iter_workday_intraday_range(
+    engine: Any,
+    start: datetime,
+    end: datetime,
+    freq: Any,
+    closed: str,
+    chunk_size: int,
+    name: Optional[str]
+    ) -> Iterator[pd.DatetimeIndex]:
+    """
+    iter_workday_intraday_range の実装．engineはモジュールあるいはCalendar
+    """
+    assert chunk_size > 0, "chunk_size must be positive"
+    naive_start, naive_end, select_timezone = _naive_range_bounds(start, end)
+    freq_seconds = _freq_seconds(freq)
+    total_length: int = engine.count_workday_intraday_range(naive_start, naive_end, freq_seconds, closed=closed)
+    for offset in range(0, total_length, chunk_size):
+        range_values: npt.NDArray[np.int64] = engine.workday_intraday_range_naive(
+            naive_start,
+            naive_end,
+            freq_seconds,
+            closed=closed,
+            unit="ns",
+            offset=offset,
+            length=chunk_size
+        )
+        yield _localize_datetime_index(pd.DatetimeIndex(range_values.view("datetime64[ns]"), name=name), select_timezone)
+
+
+class WorkdaySessionLabels(NamedTuple):
+    """
+    get_workday_session_labelsの結果．codes・workday_codesはgroupbyやnp.bincountにそのまま与えられる
+
+    Attributes
+    ----------
+    codes: np.ndarray(dtype=int64)
+        営業時間(セッション)のコード．データの最初のセッションを0とする通し番号で，営業時間外・NaTは-1
+    workday_codes: np.ndarray(dtype=int64)
+        営業日のコード．データの最初の営業日を0とする通し番号で，営業時間外・NaTは-1
+    session_indices: np.ndarray(dtype=int64)
+        intraday_bordersにおける営業時間の番号．営業時間外・NaTは-1
+    session_starts: np.ndarray(dtype=datetime64[s])
+        codeごとのセッションの開始日時(ローカル時間)．データを含まないセッションも含む
+    session_ends: np.ndarray(dtype=datetime64[s])
+        codeごとのセッションの終了日時(ローカル時間)
+    workdays: np.ndarray(dtype=datetime64[D])
+        workday_codeごとの営業日
+    """
+    codes: npt.NDArray[np.int64]
+    workday_codes: npt.NDArray[np.int64]
+    session_indices: npt.NDArray[np.int64]
+    session_starts: npt.NDArray[np.datetime64]
+    session_ends: npt.NDArray[np.datetime64]
+    workdays: npt.NDArray[np.datetime64]
+
+
+def get_workday_session_labels(dt_index: Any, utc: bool=False) -> WorkdaySessionLabels:
+    """
+    datetime64のndarrayあるいはpd.DatetimeIndexの各要素が含まれる営業日・営業時間(セッション)を整数のコードとして一括で取得．
+    セッションはintraday_bordersの各営業時間であり，コードと対応するセッションの開始・終了日時のテーブルを返す
+
+    Parameters
+    ----------
+    dt_index: np.ndarray or pd.DatetimeIndex
+        datetime64のndarrayあるいはDatetimeIndex
+    utc: bool
+        extract_workdays_intraday_boolと同じ
+
+    Returns
+    -------
+    WorkdaySessionLabels
+
+    Examples
+    --------
+    >>> dt_index = pd.DatetimeIndex([datetime.datetime(2021,1,4,10,0,0), datetime.datetime(2021,1,4,13,0,0), datetime.datetime(2021,1,4,16,0,0)])
+    >>> labels = get_workday_session_labels(dt_index)
+    >>> labels.codes
+    array([ 0,  1, -1])
+    >>> labels.session_starts
+    array(['2021-01-04T09:00:00', '2021-01-04T12:30:00'], dtype='datetime64[s]')
+    """
+    return _get_workday_session_labels(_py_workdays, dt_index, utc)
+
+
+def _get_workday_session_labels(engine: Any, dt_index: Any, utc: bool) -> WorkdaySessionLabels:
+    """
+    get_workday_session_labels の実装．engineはモジュールあるいはCalendar
+    """
+    int_64_values, unit, is_utc = _extract_int64_values(engine, dt_index, utc)
+    # コードと表は同じスナップショットから1回の呼び出しで求める(途中で営業時間境界が変わっても食い違わない)
+    codes, workday_codes, session_indices, session_starts, session_ends, workdays = engine.get_workday_session_labels_naive(
+        int_64_values, unit=unit, utc=is_utc
+    )
+    return WorkdaySessionLabels(
+        codes, workday_codes, session_indices,
+        session_starts.view("datetime64[s]"), session_ends.view("datetime64[s]"), workdays.view("datetime64[D]")
+    )
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,131 @@
+from datetime import date
+from typing import Any
+
+from . import py_workdays as _py_workdays
+from .cache import _cached_call, _rust_function
+
+
+def check_workday(select_date: date) -> bool:
+    """
+    select_dateが営業日であるか判定
+
+    Parameters
+    ----------
+    select_date: datetime.date
+        指定する日
+
+    Returns
+    -------
+    bool
+        営業日であるかどうか
+
+    Examples
+    --------
+    >>> check_workday(datetime.date(2021,1,4))
+    True
+    """
+    return _check_workday(_py_workdays, select_date)
+
+
+def _check_workday(engine: Any, select_date: date) -> bool:
+    """
+    check_workday の実装．engineはモジュールあるいはCalendar
+    """
+    is_workday: bool = _cached_call(engine, ("check_workday", select_date), _rust_function(engine, "check_workday"), select_date)
+    return is_workday
+
+
+def get_next_workday(select_date: date, days: int=1) -> date:
+    """
+    select_dateからdays分の次の営業日を取得
+
+    Parameters
+    ----------
+    select_date: datetime.date
+        指定する日
+    days: int
+        進める日数
+
+    Returns
+    -------
+    datetime.date
+        次の営業日
+
+    Examples
+    --------
+    >>> get_next_workday(datetime.date(2021,1,1))
+    datetime.date(2021, 1, 4)
+    """
+    return _get_next_workday(_py_workdays, select_date, days)
+
+
+def _get_next_workday(engine: Any, select_date: date, days: int) -> date:
+    """
+    get_next_workday の実装．engineはモジュールあるいはCalendar
+    """
+    next_workday: date = _cached_call(
+        engine, ("get_next_workday", select_date, days), _rust_function(engine, "get_next_workday"), select_date, days
+    )
+    return next_workday
+
+
+def get_previous_workday(select_date: date, days: int=1) -> date:
+    """
+    select_dateからdays分の前の営業日を取得
+
+    Parameters
+    ----------
+    select_date: datetime.date
+        指定する日
+    days: int
+        減らす日数
+
+    Returns
+    -------
+    datetime.date
+        前の営業日
+    """
+    return _get_previous_workday(_py_workdays, select_date, days)
+
+
+def _get_previous_workday(engine: Any, select_date: date, days: int) -> date:
+    """
+    get_previous_workday の実装．engineはモジュールあるいはCalendar
+    """
+    previous_workday: date = _cached_call(
+        engine, ("get_previous_workday", select_date, days), _rust_function(engine, "get_previous_workday"), select_date, days
+    )
+    return previous_workday
+
+
+def get_near_workday(select_date: date, is_after: bool=True) -> date:
+    """
+    select_dateが営業日の場合はそのまま，そうでない場合は最も近い営業日を取得
+
+    Parameters
+    ----------
+    select_date: datetime.date
+        指定する日
+    is_after: bool
+        後の営業日を取得するかどうか
+
+    Returns
+    -------
+    datetime.date
+        最近の営業日
+    """
+    return _get_near_workday(_py_workdays, select_date, is_after)
+
+
+def _get_near_workday(engine: Any, select_date: date, is_after: bool) -> date:
+    """
+    get_near_workday の実装．engineはモジュールあるいはCalendar
+    """
+    near_workday: date = _cached_call(
+        engine, ("get_near_workday", select_date, is_after), _rust_function(engine, "get_near_workday"), select_date, is_after
+    )
+    return near_workday
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,784 @@
+use std::collections::{HashSet, HashMap};
+
+use pyo3::prelude::*;
+use pyo3::buffer::PyBuffer;
+use pyo3::types::{PyBytes, PyDate, PyDateTime, PyTime, PyDelta};
+use numpy::{PyArray, PyReadonlyArray, Ix1};
+
+use chrono::NaiveDate;
+
+use crate::calendar::{datetime_to_timestamp, CalendarCore, Closed, ExtractKind, TimeUnit, UtcOffsetTable};
+use crate::convert::*;
+use crate::error::Error;
+use crate::extract::{check_freq_seconds, check_sub_day_unit, check_utc_timezone, end_slice, extract_bool_into, extract_broadcast, fill_i64_into, holidays_from_int64, map_i64_into, map_i64_into_three, slice_index_range, sorted_ranges_to_py};
+use crate::metrics::{record_rebuild, CallTimer};
+use crate::snapshot::CalendarSnapshot;
+
+// モジュールの関数(デフォルトのカレンダー)とCalendarのメソッドの共通の実装．
+// 更新はカレンダーのスナップショット，参照はそのスナップショットから取得したカレンダーと計測の名前を受け取る
+
+/// get_workday_session_labelsの結果(codes, workday_codes, session_indices, session_starts, session_ends, workdays)
+pub type SessionLabelArrays<'p> = (
+    &'p PyArray<i64,Ix1>, &'p PyArray<i64,Ix1>, &'p PyArray<i64,Ix1>,
+    &'p PyArray<i64,Ix1>, &'p PyArray<i64,Ix1>, &'p PyArray<i64,Ix1>
+);
+
+// 更新
+
+/// csvを読み込んで利用できる祝日の更新をする
+pub fn set_holidays_csvs(
+    py: Python,
+    snapshot: &CalendarSnapshot,
+    name: &'static str,
+    holidays_csv_paths: &[String],
+    start_year: i32,
+    end_year: i32
+) -> Result<(), Error> {
+    record_rebuild(name, ||{
+        snapshot.update(py, |calendar|{calendar.set_holidays_csvs(holidays_csv_paths, start_year, end_year)})
+    })
+}
+
+/// 祝日のリストから祝日の更新をする
+pub fn set_range_holidays(
+    py: Python,
+    snapshot: &CalendarSnapshot,
+    name: &'static str,
+    holidays: &[NaiveDate],
+    start_year: i32,
+    end_year: i32
+) -> Result<(), Error> {
+    record_rebuild(name, ||{
+        snapshot.update(py, |calendar|{Ok(calendar.set_range_holidays(holidays, start_year, end_year))})
+    })
+}
+
+/// 祝日のリストから祝日の追加をする
+pub fn add_range_holidays(
+    py: Python,
+    snapshot: &CalendarSnapshot,
+    name: &'static str,
+    holidays: &[NaiveDate],
+    start_year: i32,
+    end_year: i32
+) -> Result<(), Error> {
+    record_rebuild(name, ||{
+        snapshot.update(py, |calendar|{Ok(calendar.add_range_holidays(holidays, start_year, end_year))})
+    })
+}
+
+/// 祝日のPyDateのリストをNaiveDateに変換する
+pub fn holidays_py_to_chrono(holidays: &[&PyDate]) -> Vec<NaiveDate> {
+    holidays.iter().map(|py_date|{date_py_to_chrono(*py_date)}).collect()
+}
+
+/// np.datetime64のndarrayから祝日の更新をする
+pub fn set_range_holidays_naive(
+    py: Python,
+    snapshot: &CalendarSnapshot,
+    name: &'static str,
+    int_64_numpy: &PyReadonlyArray<i64,Ix1>,
+    start_year: i32,
+    end_year: i32,
+    unit: &str
+) -> Result<(), Error> {
+    let holidays = holidays_from_int64(int_64_numpy, unit)?;
+    set_range_holidays(py, snapshot, name, &holidays, start_year, end_year)
+}
+
+/// np.datetime64のndarrayから祝日の追加をする
+pub fn add_range_holidays_naive(
+    py: Python,
+    snapshot: &CalendarSnapshot,
+    name: &'static str,
+    int_64_numpy: &PyReadonlyArray<i64,Ix1>,
+    start_year: i32,
+    end_year: i32,
+    unit: &str
+) -> Result<(), Error> {
+    let holidays = holidays_from_int64(int_64_numpy, unit)?;
+    add_range_holidays(py, snapshot, name, &holidays, start_year, end_year)
+}
+
+/// 祝日を読み込み直さずに利用する年の範囲を変更する
+pub fn set_holiday_year_range(py: Python, snapshot: &CalendarSnapshot, name: &'static str, start_year: i32, end_year: i32) -> Result<(), Error> {
+    record_rebuild(name, ||{
+        snapshot.update(py, |calendar|{Ok(calendar.set_year_range(start_year, end_year))})
+    })
+}
+
+/// コンパイル済みのカレンダーを読み込む．タイムゾーンは現在のものを引き継ぐ．バージョンあるいは指紋が一致しない場合はfalse
+pub fn load_compiled_calendar(
+    py: Python,
+    snapshot: &CalendarSnapshot,
+    name: &'static str,
+    compiled: &PyAny,
+    fingerprint: &[u8]
+) -> PyResult<bool> {
+    let compiled_buffer = PyBuffer::<u8>::get(compiled)?;
+    match CalendarCore::from_compiled_bytes(buffer_as_bytes(&compiled_buffer, "compiled")?, fingerprint)? {
+        Some(calendar) => {
+            record_rebuild(name, ||{
+                snapshot.replace(py, |current|{Ok(calendar.with_timezone_of(current))})
+            })?;
+            Ok(true)
+        },
+        None => Ok(false)
+    }
+}
+
+/// 休日曜日の更新
+pub fn set_holiday_weekdays(
+    py: Python,
+    snapshot: &CalendarSnapshot,
+    name: &'static str,
+    holiday_weekday_numbers: &HashSet<usize>
+) -> Result<(), Error> {
+    let holiday_weekday_set = weekdays_py_to_chrono(holiday_weekday_numbers)?;
+    record_rebuild(name, ||{
+        snapshot.update(py, |calendar|{calendar.set_holiday_weekdays(&holiday_weekday_set)})
+    })
+}
+
+/// 営業時間境界の更新
+pub fn set_intraday_borders(
+    py: Python,
+    snapshot: &CalendarSnapshot,
+    name: &'static str,
+    intraday_borders: &[HashMap<&str, &PyTime>]
+) -> Result<(), Error> {
+    let time_borders = borders_py_to_chrono(intraday_borders)?;
+    record_rebuild(name, ||{
+        snapshot.update(py, |calendar|{calendar.set_intraday_borders(&time_borders)})
+    })
+}
+
+/// タイムゾーンの更新(オフセットの遷移テーブル)
+pub fn set_utc_offset_table(
+    py: Python,
+    snapshot: &CalendarSnapshot,
+    name: &'static str,
+    transitions: Vec<i64>,
+    offsets: Vec<i64>
+) -> Result<(), Error> {
+    let utc_offsets = UtcOffsetTable::new(transitions, offsets)?;
+    record_rebuild(name, ||{
+        snapshot.update(py, |calendar|{Ok(calendar.set_utc_offset_table(utc_offsets))})
+    })
+}
+
+// 設定の取得
+
+/// カレンダーをコンパイル済みの形式で取得する
+pub fn dump_compiled_calendar<'p>(py: Python<'p>, core: &CalendarCore, fingerprint: &[u8]) -> &'p PyBytes {
+    PyBytes::new(py, &core.to_compiled_bytes(fingerprint))
+}
+
+/// 休日曜日の番号のset
+pub fn holiday_weekday_numbers(core: &CalendarCore) -> HashSet<u32> {
+    core.holiday_weekdays().iter().map(|weekday|{
+        weekday.num_days_from_monday()
+    }).collect::<HashSet<u32>>()
+}
+
+// 営業日
+
+/// start_dateからend_dateまでの営業日を取得
+pub fn get_workdays(
+    py: Python,
+    core: &CalendarCore,
+    name: &'static str,
+    start_date: &PyDate,
+    end_date: &PyDate,
+    closed: &str,
+    as_array: bool
+) -> PyResult<PyObject> {
+    let mut timer = CallTimer::start(name);
+    let (start_date, end_date, closed) = (date_py_to_chrono(start_date), date_py_to_chrono(end_date), Closed::from_str(closed));
+    timer.conversion();
+    let workdays = py.allow_threads(move ||{core.get_workdays_days(start_date, end_date, closed)});
+    timer.compute();
+    let workdays = days_to_py_output(py, workdays, as_array)?;
+    timer.finish(0);
+    Ok(workdays)
+}
+
+/// select_dateが営業日であるか判定
+pub fn check_workday(py: Python, core: &CalendarCore, name: &'static str, select_date: &PyDate) -> Result<bool, Error> {
+    let mut timer = CallTimer::start(name);
+    let select_date = date_py_to_chrono(select_date);
+    timer.conversion();
+    let is_workday = py.allow_threads(move ||{core.check_workday(select_date)});
+    timer.compute();
+    timer.finish(0);
+    Ok(is_workday)
+}
+
+/// select_dateからdays分の次の営業日を取得
+pub fn get_next_workday<'p>(
+    py: Python<'p>,
+    core: &CalendarCore,
+    name: &'static str,
+    select_date: &PyDate,
+    days: i32
+) -> Result<&'p PyDate, Error> {
+    let mut timer = CallTimer::start(name);
+    let select_date = date_py_to_chrono(select_date);
+    timer.conversion();
+    let next_workday = py.allow_threads(move ||{core.get_next_workday(select_date, days)});
+    timer.compute();
+    let next_workday = date_chrono_to_py(py, next_workday);
+    timer.finish(0);
+    Ok(next_workday)
+}
+
+/// select_dateからdays分の前の営業日を取得
+pub fn get_previous_workday<'p>(
+    py: Python<'p>,
+    core: &CalendarCore,
+    name: &'static str,
+    select_date: &PyDate,
+    days: i32
+) -> Result<&'p PyDate, Error> {
+    let mut timer = CallTimer::start(name);
+    let select_date = date_py_to_chrono(select_date);
+    timer.conversion();
+    let previous_workday = py.allow_threads(move ||{core.get_previous_workday(select_date, days)});
+    timer.compute();
+    let previous_workday = date_chrono_to_py(py, previous_workday);
+    timer.finish(0);
+    Ok(previous_workday)
+}
+
+/// 最近の営業日を取得
+pub fn get_near_workday<'p>(
+    py: Python<'p>,
+    core: &CalendarCore,
+    name: &'static str,
+    select_date: &PyDate,
+    is_after: bool
+) -> Result<&'p PyDate, Error> {
+    let mut timer = CallTimer::start(name);
+    let select_date = date_py_to_chrono(select_date);
+    timer.conversion();
+    let near_workday = py.allow_threads(move ||{core.get_near_workday(select_date, is_after)});
+    timer.compute();
+    let near_workday = date_chrono_to_py(py, near_workday);
+    timer.finish(0);
+    Ok(near_workday)
+}
+
+/// start_dateからdays分だけの営業日を取得
+pub fn get_workdays_number(
+    py: Python,
+    core: &CalendarCore,
+    name: &'static str,
+    start_date: &PyDate,
+    days: i32,
+    as_array: bool
+) -> PyResult<PyObject> {
+    let mut timer = CallTimer::start(name);
+    let start_date = date_py_to_chrono(start_date);
+    timer.conversion();
+    let workdays = py.allow_threads(move ||{core.get_workdays_number_days(start_date, days)});
+    timer.compute();
+    let workdays = days_to_py_output(py, workdays, as_array)?;
+    timer.finish(0);
+    Ok(workdays)
+}
+
+/// start_dateからend_dateまでの営業日数を取得
+pub fn count_workdays(
+    py: Python,
+    core: &CalendarCore,
+    name: &'static str,
+    start_date: &PyDate,
+    end_date: &PyDate,
+    closed: &str
+) -> Result<i64, Error> {
+    let mut timer = CallTimer::start(name);
+    let (start_date, end_date, closed) = (date_py_to_chrono(start_date), date_py_to_chrono(end_date), Closed::from_str(closed));
+    timer.conversion();
+    let workdays_count = py.allow_threads(move ||{core.count_workdays(start_date, end_date, closed)});
+    timer.compute();
+    timer.finish(0);
+    Ok(workdays_count)
+}
+
+/// select_dateの営業日の序数を取得
+pub fn get_workday_ordinal(py: Python, core: &CalendarCore, name: &'static str, select_date: &PyDate) -> Result<i64, Error> {
+    let mut timer = CallTimer::start(name);
+    let select_date = date_py_to_chrono(select_date);
+    timer.conversion();
+    let ordinal = py.allow_threads(move ||{core.get_workday_ordinal(select_date)});
+    timer.compute();
+    timer.finish(0);
+    Ok(ordinal)
+}
+
+/// 営業日の序数から営業日を取得
+pub fn get_workday_from_ordinal<'p>(py: Python<'p>, core: &CalendarCore, name: &'static str, ordinal: i64) -> Result<&'p PyDate, Error> {
+    let mut timer = CallTimer::start(name);
+    let workday = py.allow_threads(move ||{core.get_workday_from_ordinal(ordinal)});
+    timer.compute();
+    let workday = date_chrono_to_py(py, workday);
+    timer.finish(0);
+    Ok(workday)
+}
+
+// 営業時間
+
+/// select_datetimeが営業日・営業時間内であるかどうかを判定
+pub fn check_workday_intraday(py: Python, core: &CalendarCore, name: &'static str, select_datetime: &PyDateTime) -> Result<bool, Error> {
+    let mut timer = CallTimer::start(name);
+    let select_datetime = datetime_py_to_chrono(select_datetime);
+    timer.conversion();
+    let is_intraday = py.allow_threads(move ||{core.check_workday_intraday(select_datetime)});
+    timer.compute();
+    timer.finish(0);
+    Ok(is_intraday)
+}
+
+/// 次の営業日・営業時間内のdatetimeをその状態とともに取得
+pub fn get_next_border_workday_intraday<'p>(
+    py: Python<'p>,
+    core: &CalendarCore,
+    name: &'static str,
+    select_datetime: &PyDateTime
+) -> Result<(&'p PyDateTime, String), Error> {
+    let mut timer = CallTimer::start(name);
+    let select_datetime = datetime_py_to_chrono(select_datetime);
+    timer.conversion();
+    let (border_datetime, border_symbol) = py.allow_threads(move ||{core.get_next_border_workday_intraday(select_datetime)});
+    timer.compute();
+    let border = (datetime_chrono_to_py(py, border_datetime), border_symbol.to_string());
+    timer.finish(0);
+    Ok(border)
+}
+
+/// 前の営業日・営業時間内のdatetimeをその状態とともに取得
+pub fn get_previous_border_workday_intraday<'p>(
+    py: Python<'p>,
+    core: &CalendarCore,
+    name: &'static str,
+    select_datetime: &PyDateTime,
+    force_is_end: bool
+) -> Result<(&'p PyDateTime, String), Error> {
+    let mut timer = CallTimer::start(name);
+    let select_datetime = datetime_py_to_chrono(select_datetime);
+    timer.conversion();
+    let (border_datetime, border_symbol) = py.allow_threads(move ||{
+        core.get_previous_border_workday_intraday(select_datetime, force_is_end)
+    });
+    timer.compute();
+    let border = (datetime_chrono_to_py(py, border_datetime), border_symbol.to_string());
+    timer.finish(0);
+    Ok(border)
+}
+
+/// 最近の営業日・営業時間内のdatetimeをその状態とともに取得
+pub fn get_near_workday_intraday<'p>(
+    py: Python<'p>,
+    core: &CalendarCore,
+    name: &'static str,
+    select_datetime: &PyDateTime,
+    is_after: bool
+) -> Result<(&'p PyDateTime, String), Error> {
+    let mut timer = CallTimer::start(name);
+    let select_datetime = datetime_py_to_chrono(select_datetime);
+    timer.conversion();
+    let (border_datetime, border_symbol) = py.allow_threads(move ||{
+        core.get_near_workday_intraday(select_datetime, is_after)
+    });
+    timer.compute();
+    let border = (datetime_chrono_to_py(py, border_datetime), border_symbol.to_string());
+    timer.finish(0);
+    Ok(border)
+}
+
+/// 営業日・営業時間を考慮しDateTimeを加算する
+pub fn add_workday_intraday_datetime<'p>(
+    py: Python<'p>,
+    core: &CalendarCore,
+    name: &'static str,
+    select_datetime: &PyDateTime,
+    delta_time: &PyDelta
+) -> Result<&'p PyDateTime, Error> {
+    let mut timer = CallTimer::start(name);
+    let (select_datetime, delta_time) = (datetime_py_to_chrono(select_datetime), duration_py_to_chrono(delta_time));
+    timer.conversion();
+    let added_datetime = py.allow_threads(move ||{core.add_workday_intraday_datetime(select_datetime, delta_time)});
+    timer.compute();
+    let added_datetime = datetime_chrono_to_py(py, added_datetime);
+    timer.finish(0);
+    Ok(added_datetime)
+}
+
+/// start_datetimeからend_datetimeの営業日・営業時間を取得
+pub fn get_timedelta_workdays_intraday<'p>(
+    py: Python<'p>,
+    core: &CalendarCore,
+    name: &'static str,
+    start_datetime: &PyDateTime,
+    end_datetime: &PyDateTime
+) -> Result<&'p PyDelta, Error> {
+    let mut timer = CallTimer::start(name);
+    let (start_datetime, end_datetime) = (datetime_py_to_chrono(start_datetime), datetime_py_to_chrono(end_datetime));
+    timer.conversion();
+    let duration = py.allow_threads(move ||{core.get_timedelta_workdays_intraday(start_datetime, end_datetime)});
+    timer.compute();
+    let duration = duration_chrono_to_py(py, duration);
+    timer.finish(0);
+    Ok(duration)
+}
+
+// 配列
+
+/// np.datetime64のndarrayからkindのものをboolとして抽出
+pub fn extract_bool<'p>(
+    py: Python<'p>,
+    core: &CalendarCore,
+    name: &'static str,
+    kind: ExtractKind,
+    int_64_numpy: &PyReadonlyArray<i64,Ix1>,
+    unit: &str,
+    out: Option<&'p PyArray<bool,Ix1>>,
+    utc: bool,
+    assume_sorted: bool
+) -> Result<&'p PyArray<bool,Ix1>, Error> {
+    check_utc_timezone(core, utc)?;
+    let mut timer = CallTimer::start(name);
+    let extracted = extract_bool_into(py, int_64_numpy, unit, out, move |values, unit, out_slice|{
+        core.extract_kind_bool_into(values, unit, utc, kind, assume_sorted, out_slice)
+    })?;
+    timer.compute();
+    timer.finish(int_64_numpy.len());
+    Ok(extracted)
+}
+
+/// 昇順にソートされたnp.datetime64のndarrayから，営業日・営業時間の要素が連続する範囲を取得
+pub fn extract_workdays_intraday_ranges<'p>(
+    py: Python<'p>,
+    core: &CalendarCore,
+    name: &'static str,
+    int_64_numpy: &PyReadonlyArray<i64,Ix1>,
+    unit: &str,
+    utc: bool
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    check_utc_timezone(core, utc)?;
+    let mut timer = CallTimer::start(name);
+    let ranges = sorted_ranges_to_py(py, int_64_numpy, unit, move |values, unit|{
+        core.extract_sorted_ranges(values, unit, utc, ExtractKind::WorkdaysIntraday)
+    })?;
+    timer.compute();
+    timer.finish(int_64_numpy.len());
+    Ok(ranges)
+}
+
+/// np.datetime64のndarrayの各要素が含まれる営業時間(セッション)の通し番号を取得
+pub fn get_session_numbers<'p>(
+    py: Python<'p>,
+    core: &CalendarCore,
+    name: &'static str,
+    int_64_numpy: &PyReadonlyArray<i64,Ix1>,
+    unit: &str,
+    utc: bool
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    check_utc_timezone(core, utc)?;
+    let mut timer = CallTimer::start(name);
+    let out_array = map_i64_into(py, int_64_numpy, unit, move |_, values, unit, out_slice|{
+        core.session_numbers_into(values, unit, utc, out_slice)
+    })?;
+    timer.compute();
+    timer.finish(int_64_numpy.len());
+    Ok(out_array)
+}
+
+/// np.datetime64のndarrayの各要素の営業時間のコード・営業日のコード・営業時間の番号と，
+/// コードごとの営業時間の開始・終了(秒)と営業日(日)のndarrayを同じカレンダーから取得
+pub fn get_workday_session_labels<'p>(
+    py: Python<'p>,
+    core: &CalendarCore,
+    name: &'static str,
+    int_64_numpy: &PyReadonlyArray<i64,Ix1>,
+    unit: &str,
+    utc: bool
+) -> Result<SessionLabelArrays<'p>, Error> {
+    check_utc_timezone(core, utc)?;
+    let mut timer = CallTimer::start(name);
+    let ([codes, workday_codes, session_indices], (session_starts, session_ends, workdays)) = map_i64_into_three(
+        py, int_64_numpy, unit, move |values, unit, codes, workday_codes, session_indices|{
+            core.session_labels_into(values, unit, utc, codes, workday_codes, session_indices)
+        }
+    )?;
+    timer.compute();
+    let labels = (
+        codes, workday_codes, session_indices,
+        PyArray::from_vec(py, session_starts), PyArray::from_vec(py, session_ends), PyArray::from_vec(py, workdays)
+    );
+    timer.finish(int_64_numpy.len());
+    Ok(labels)
+}
+
+/// np.datetime64のndarrayの各要素に営業日・営業時間を考慮してnp.timedelta64を加算する
+pub fn add_workday_intraday_array<'p>(
+    py: Python<'p>,
+    core: &CalendarCore,
+    name: &'static str,
+    int_64_numpy: &PyReadonlyArray<i64,Ix1>,
+    deltas: &PyAny,
+    unit: &str,
+    delta_unit: &str
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    let deltas_arg = extract_broadcast(Some(deltas), "deltas", 0, int_64_numpy.len())?;
+    let deltas = deltas_arg.as_broadcast()?;
+    let delta_unit = TimeUnit::from_str(delta_unit)?;
+    let mut timer = CallTimer::start(name);
+    let out_array = map_i64_into(py, int_64_numpy, unit, move |offset, values, unit, out_slice|{
+        core.add_workday_intraday_into(values, unit, deltas.slice(offset, values.len()), delta_unit, out_slice)
+    })?;
+    timer.compute();
+    timer.finish(int_64_numpy.len());
+    Ok(out_array)
+}
+
+/// 開始日時と終了日時のnp.datetime64のndarrayの各組の営業日・営業時間の時間差を取得
+pub fn get_timedelta_workdays_intraday_array<'p>(
+    py: Python<'p>,
+    core: &CalendarCore,
+    name: &'static str,
+    start_int_64_numpy: &PyReadonlyArray<i64,Ix1>,
+    end_int_64_numpy: &PyReadonlyArray<i64,Ix1>,
+    start_unit: &str,
+    end_unit: &str
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    let ends = end_slice(end_int_64_numpy, start_int_64_numpy.len())?;
+    let end_unit = TimeUnit::from_str(end_unit)?;
+    let mut timer = CallTimer::start(name);
+    let out_array = map_i64_into(py, start_int_64_numpy, start_unit, move |offset, starts, start_unit, out_slice|{
+        core.timedelta_workdays_intraday_into(starts, start_unit, &ends[offset..offset+starts.len()], end_unit, out_slice)
+    })?;
+    timer.compute();
+    timer.finish(start_int_64_numpy.len());
+    Ok(out_array)
+}
+
+/// 開始日と終了日のnp.datetime64のndarrayの各組の営業日数を取得
+pub fn count_workdays_array<'p>(
+    py: Python<'p>,
+    core: &CalendarCore,
+    name: &'static str,
+    start_int_64_numpy: &PyReadonlyArray<i64,Ix1>,
+    end_int_64_numpy: &PyReadonlyArray<i64,Ix1>,
+    start_unit: &str,
+    end_unit: &str,
+    closed: &str
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    let ends = end_slice(end_int_64_numpy, start_int_64_numpy.len())?;
+    let end_unit = TimeUnit::from_str(end_unit)?;
+    let closed = Closed::from_str(closed);
+    let mut timer = CallTimer::start(name);
+    let out_array = map_i64_into(py, start_int_64_numpy, start_unit, move |offset, starts, start_unit, out_slice|{
+        core.count_workdays_into(starts, start_unit, &ends[offset..offset+starts.len()], end_unit, closed, out_slice)
+    })?;
+    timer.compute();
+    timer.finish(start_int_64_numpy.len());
+    Ok(out_array)
+}
+
+/// np.datetime64のndarrayの各要素の営業日の序数を取得
+pub fn get_workday_ordinal_array<'p>(
+    py: Python<'p>,
+    core: &CalendarCore,
+    name: &'static str,
+    int_64_numpy: &PyReadonlyArray<i64,Ix1>,
+    unit: &str
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    let mut timer = CallTimer::start(name);
+    let out_array = map_i64_into(py, int_64_numpy, unit, move |_, values, unit, out_slice|{
+        core.workday_ordinals_into(values, unit, out_slice)
+    })?;
+    timer.compute();
+    timer.finish(int_64_numpy.len());
+    Ok(out_array)
+}
+
+/// 営業日の序数のndarrayから営業日を取得
+pub fn get_workday_from_ordinal_array<'p>(
+    py: Python<'p>,
+    core: &CalendarCore,
+    name: &'static str,
+    ordinals: &PyReadonlyArray<i64,Ix1>
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    // 序数は時間単位をもたないので，unitは利用しない
+    let mut timer = CallTimer::start(name);
+    let out_array = map_i64_into(py, ordinals, "D", move |_, ordinal_chunk, _, out_slice|{
+        core.workdays_from_ordinals_into(ordinal_chunk, out_slice)
+    })?;
+    timer.compute();
+    timer.finish(ordinals.len());
+    Ok(out_array)
+}
+
+/// np.datetime64のndarrayの各要素を営業秒の軸に変換
+pub fn to_business_time<'p>(
+    py: Python<'p>,
+    core: &CalendarCore,
+    name: &'static str,
+    int_64_numpy: &PyReadonlyArray<i64,Ix1>,
+    unit: &str
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    check_sub_day_unit(unit)?;
+    let mut timer = CallTimer::start(name);
+    let out_array = map_i64_into(py, int_64_numpy, unit, move |_, values, unit, out_slice|{
+        core.business_time_into(values, unit, out_slice)
+    })?;
+    timer.compute();
+    timer.finish(int_64_numpy.len());
+    Ok(out_array)
+}
+
+/// 営業秒の軸の値のndarrayを日時に変換
+pub fn from_business_time<'p>(
+    py: Python<'p>,
+    core: &CalendarCore,
+    name: &'static str,
+    int_64_numpy: &PyReadonlyArray<i64,Ix1>,
+    unit: &str
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    check_sub_day_unit(unit)?;
+    let mut timer = CallTimer::start(name);
+    let out_array = map_i64_into(py, int_64_numpy, unit, move |_, values, unit, out_slice|{
+        core.from_business_time_into(values, unit, out_slice)
+    })?;
+    timer.compute();
+    timer.finish(int_64_numpy.len());
+    Ok(out_array)
+}
+
+/// np.datetime64のndarrayの各要素からdays分の次の営業日を取得
+pub fn get_next_workday_array<'p>(
+    py: Python<'p>,
+    core: &CalendarCore,
+    name: &'static str,
+    int_64_numpy: &PyReadonlyArray<i64,Ix1>,
+    unit: &str,
+    days: Option<&PyAny>
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    let days_arg = extract_broadcast(days, "days", 1, int_64_numpy.len())?;
+    let days = days_arg.as_broadcast()?;
+    let mut timer = CallTimer::start(name);
+    let out_array = map_i64_into(py, int_64_numpy, unit, move |offset, values, unit, out_slice|{
+        core.next_workdays_into(values, unit, days.slice(offset, values.len()), out_slice)
+    })?;
+    timer.compute();
+    timer.finish(int_64_numpy.len());
+    Ok(out_array)
+}
+
+/// np.datetime64のndarrayの各要素からdays分の前の営業日を取得
+pub fn get_previous_workday_array<'p>(
+    py: Python<'p>,
+    core: &CalendarCore,
+    name: &'static str,
+    int_64_numpy: &PyReadonlyArray<i64,Ix1>,
+    unit: &str,
+    days: Option<&PyAny>
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    let days_arg = extract_broadcast(days, "days", 1, int_64_numpy.len())?;
+    let days = days_arg.as_broadcast()?;
+    let mut timer = CallTimer::start(name);
+    let out_array = map_i64_into(py, int_64_numpy, unit, move |offset, values, unit, out_slice|{
+        core.previous_workdays_into(values, unit, days.slice(offset, values.len()), out_slice)
+    })?;
+    timer.compute();
+    timer.finish(int_64_numpy.len());
+    Ok(out_array)
+}
+
+/// np.datetime64のndarrayの各要素の最近の営業日を取得
+pub fn get_near_workday_array<'p>(
+    py: Python<'p>,
+    core: &CalendarCore,
+    name: &'static str,
+    int_64_numpy: &PyReadonlyArray<i64,Ix1>,
+    unit: &str,
+    is_after: bool
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    let mut timer = CallTimer::start(name);
+    let out_array = map_i64_into(py, int_64_numpy, unit, move |_, values, unit, out_slice|{
+        core.near_workdays_into(values, unit, is_after, out_slice)
+    })?;
+    timer.compute();
+    timer.finish(int_64_numpy.len());
+    Ok(out_array)
+}
+
+/// np.datetime64のndarrayの各要素の最近の営業日・営業時間内の日時を取得
+pub fn get_near_workday_intraday_array<'p>(
+    py: Python<'p>,
+    core: &CalendarCore,
+    name: &'static str,
+    int_64_numpy: &PyReadonlyArray<i64,Ix1>,
+    unit: &str,
+    is_after: bool
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    check_sub_day_unit(unit)?;
+    let mut timer = CallTimer::start(name);
+    let out_array = map_i64_into(py, int_64_numpy, unit, move |_, values, unit, out_slice|{
+        core.near_workday_intraday_into(values, unit, is_after, out_slice)
+    })?;
+    timer.compute();
+    timer.finish(int_64_numpy.len());
+    Ok(out_array)
+}
+
+/// 営業日の各営業時間の開始からfreq_seconds間隔の日時を取得
+pub fn workday_intraday_range<'p>(
+    py: Python<'p>,
+    core: &CalendarCore,
+    name: &'static str,
+    start_datetime: &PyDateTime,
+    end_datetime: &PyDateTime,
+    freq_seconds: i64,
+    closed: &str,
+    unit: &str,
+    offset: usize,
+    length: Option<usize>
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    check_sub_day_unit(unit)?;
+    check_freq_seconds(freq_seconds)?;
+    let unit = TimeUnit::from_str(unit)?;
+    let grid = core.intraday_grid_seconds(freq_seconds, Closed::from_str(closed));
+    let (first, last) = core.intraday_grid_index_range(
+        &grid,
+        datetime_to_timestamp(datetime_py_to_chrono(start_datetime)),
+        datetime_to_timestamp(datetime_py_to_chrono(end_datetime))
+    );
+    let (first_index, range_length) = slice_index_range(first, last, offset, length);
+    let mut timer = CallTimer::start(name);
+    let out_array = fill_i64_into(py, range_length, move |out_slice|{
+        core.intraday_grid_into(&grid, first_index, unit, out_slice)
+    })?;
+    timer.compute();
+    timer.finish(range_length);
+    Ok(out_array)
+}
+
+/// workday_intraday_rangeの結果の要素数を取得
+pub fn count_workday_intraday_range(
+    core: &CalendarCore,
+    start_datetime: &PyDateTime,
+    end_datetime: &PyDateTime,
+    freq_seconds: i64,
+    closed: &str
+) -> Result<i64, Error> {
+    check_freq_seconds(freq_seconds)?;
+    let grid = core.intraday_grid_seconds(freq_seconds, Closed::from_str(closed));
+    let (first, last) = core.intraday_grid_index_range(
+        &grid,
+        datetime_to_timestamp(datetime_py_to_chrono(start_datetime)),
+        datetime_to_timestamp(datetime_py_to_chrono(end_datetime))
+    );
+    Ok(last - first)
+}
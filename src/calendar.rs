@@ -0,0 +1,1591 @@
+use std::collections::{BTreeSet, HashSet};
+use std::convert::{TryFrom, TryInto};
+use std::fs;
+use std::sync::atomic::{AtomicU64, Ordering};
+
+use chrono::{Datelike, Duration, Local, NaiveDate, NaiveDateTime, NaiveTime, Timelike, Weekday};
+use num_traits::cast::FromPrimitive;
+
+use crate::error::Error;
+
+pub const SECONDS_PER_DAY: i64 = 86400;
+
+/// 0001年1月1日から1970年1月1日までの日数
+const UNIX_EPOCH_DAYS_FROM_CE: i64 = 719163;
+
+/// 営業時間境界
+#[derive(Clone, Copy, Debug, PartialEq)]
+pub struct TimeBorder {
+    pub start: NaiveTime,
+    pub end: NaiveTime
+}
+
+/// 営業時間境界の状態
+#[derive(Clone, Copy, Debug, PartialEq)]
+pub enum BorderSymbol {
+    Start,
+    End,
+    Intra
+}
+
+impl std::fmt::Display for BorderSymbol {
+    fn fmt(&self, f: &mut std::fmt::Formatter) -> std::fmt::Result {
+        let symbol = match self {
+            BorderSymbol::Start => "border_start",
+            BorderSymbol::End => "border_end",
+            BorderSymbol::Intra => "border_intra"
+        };
+        write!(f, "{}", symbol)
+    }
+}
+
+/// numpy.datetime64のNaTに対応する整数
+pub const NAT: i64 = i64::MIN;
+
+/// numpy.datetime64の時間単位
+#[derive(Clone, Copy, Debug, PartialEq)]
+pub enum TimeUnit {
+    Day,
+    Second,
+    Milli,
+    Micro,
+    Nano
+}
+
+impl TimeUnit {
+    /// 文字列("D", "s", "ms", "us", "ns")から変換する
+    pub fn from_str(unit: &str) -> Result<TimeUnit, Error> {
+        match unit {
+            "D" => Ok(TimeUnit::Day),
+            "s" => Ok(TimeUnit::Second),
+            "ms" => Ok(TimeUnit::Milli),
+            "us" => Ok(TimeUnit::Micro),
+            "ns" => Ok(TimeUnit::Nano),
+            _ => Err(Error::ArgTimeUnitError{unit: unit.to_string()})
+        }
+    }
+
+    /// 1日あたりの単位数
+    #[inline]
+    pub fn per_day(&self) -> i64 {
+        match self {
+            TimeUnit::Day => 1,
+            TimeUnit::Second => SECONDS_PER_DAY,
+            TimeUnit::Milli => SECONDS_PER_DAY * 1_000,
+            TimeUnit::Micro => SECONDS_PER_DAY * 1_000_000,
+            TimeUnit::Nano => SECONDS_PER_DAY * 1_000_000_000
+        }
+    }
+
+    /// 1秒あたりの単位数．日単位の場合は1秒未満となるため利用できない
+    #[inline]
+    pub fn per_second(&self) -> i64 {
+        match self {
+            TimeUnit::Day => panic!("per_second is not defined for day unit"),
+            _ => self.per_day() / SECONDS_PER_DAY
+        }
+    }
+
+    /// 1970年1月1日からの日数に変換
+    #[inline]
+    pub fn to_day(&self, value: i64) -> i64 {
+        value.div_euclid(self.per_day())
+    }
+
+    /// to_secondsが1970年1月1日からの秒数seconds以上となる最小の値
+    #[inline]
+    pub fn ceil_from_seconds(&self, seconds: i64) -> i64 {
+        match self {
+            TimeUnit::Day => -(-seconds).div_euclid(SECONDS_PER_DAY),
+            _ => seconds.saturating_mul(self.per_second())
+        }
+    }
+
+    /// 1970年1月1日からの秒数に変換(1秒未満は切り捨て)
+    #[inline]
+    pub fn to_seconds(&self, value: i64) -> i64 {
+        match self {
+            TimeUnit::Day => value * SECONDS_PER_DAY,
+            TimeUnit::Second => value,
+            TimeUnit::Milli => value.div_euclid(1_000),
+            TimeUnit::Micro => value.div_euclid(1_000_000),
+            TimeUnit::Nano => value.div_euclid(1_000_000_000)
+        }
+    }
+}
+
+/// 期間の境界を含めるかどうか
+#[derive(Clone, Copy, Debug, PartialEq)]
+pub enum Closed {
+    Left,
+    Right,
+    Both,
+    Not
+}
+
+impl Closed {
+    /// 文字列から変換する．不明な文字列の場合はLeftとなる
+    pub fn from_str(closed: &str) -> Closed {
+        match closed {
+            "left" => Closed::Left,
+            "right" => Closed::Right,
+            "both" => Closed::Both,
+            "not" => Closed::Not,
+            _ => Closed::Left
+        }
+    }
+}
+
+/// 抽出関数の判定の種類
+#[derive(Clone, Copy, Debug, PartialEq)]
+pub enum ExtractKind {
+    Workdays,
+    Intraday,
+    WorkdaysIntraday
+}
+
+/// UTCからカレンダーのタイムゾーンのローカル時間へのオフセットの遷移テーブル．
+/// transitions[i](1970年1月1日からのUTCの秒数)以降はoffsets[i]秒を加える．最初の遷移より前はoffsets[0]
+#[derive(Clone, Debug, Default, PartialEq)]
+pub struct UtcOffsetTable {
+    transitions: Vec<i64>,
+    offsets: Vec<i64>
+}
+
+impl UtcOffsetTable {
+    /// 遷移テーブルを作成．transitionsは狭義単調増加である必要がある
+    pub fn new(transitions: Vec<i64>, offsets: Vec<i64>) -> Result<Self, Error> {
+        if transitions.len() != offsets.len() {
+            return Err(Error::ArgLengthError{arg_name: "offsets".to_string(), expected: transitions.len(), actual: offsets.len()});
+        }
+        if transitions.windows(2).any(|pair|{pair[0] >= pair[1]}) {
+            return Err(Error::InvalidUtcOffsetTable("transitions must be strictly increasing".to_string()));
+        }
+        if offsets.iter().any(|offset|{offset.abs() >= SECONDS_PER_DAY}) {
+            return Err(Error::InvalidUtcOffsetTable("offsets must be shorter than a day".to_string()));
+        }
+        Ok(UtcOffsetTable {transitions, offsets})
+    }
+
+    /// テーブルが空(タイムゾーンが設定されていない)かどうか
+    pub fn is_empty(&self) -> bool {
+        self.offsets.is_empty()
+    }
+
+    /// UTCの秒数におけるオフセット(秒)
+    #[inline]
+    pub fn offset_seconds(&self, utc_seconds: i64) -> i64 {
+        match self.offsets.len() {
+            0 => 0,
+            1 => self.offsets[0],
+            _ => {
+                let index = self.transitions.partition_point(|transition|{*transition <= utc_seconds});
+                self.offsets[index.saturating_sub(1)]
+            }
+        }
+    }
+
+    /// UTCの秒数におけるオフセット(秒)と，次の遷移のUTCの秒数(ない場合はi64::MAX)
+    #[inline]
+    pub fn offset_span(&self, utc_seconds: i64) -> (i64, i64) {
+        if self.offsets.is_empty() {
+            return (0, i64::MAX);
+        }
+        let index = self.transitions.partition_point(|transition|{*transition <= utc_seconds});
+        (self.offsets[index.saturating_sub(1)], self.transitions.get(index).copied().unwrap_or(i64::MAX))
+    }
+}
+
+/// predicateを満たす先頭の要素数．predicateは先頭から連続して満たし，以降は満たさない必要がある．
+/// 先頭から倍々に範囲を広げてから二分探索するため，短い範囲ほど速い
+fn gallop_partition_point<F>(values: &[i64], predicate: F) -> usize
+where F: Fn(&i64) -> bool {
+    let mut bound = 1;
+    while bound <= values.len() && predicate(&values[bound - 1]) {
+        bound *= 2;
+    }
+    let low = bound / 2;
+    low + values[low..bound.min(values.len())].partition_point(predicate)
+}
+
+/// 配列の各要素に適用する整数の引数．スカラーの場合はすべての要素で共通
+#[derive(Clone, Copy, Debug)]
+pub enum Broadcast<'a> {
+    Scalar(i64),
+    PerElement(&'a [i64])
+}
+
+impl<'a> Broadcast<'a> {
+    /// index番目の要素に適用する値
+    #[inline]
+    pub fn get(&self, index: usize) -> i64 {
+        match self {
+            Broadcast::Scalar(value) => *value,
+            Broadcast::PerElement(values) => values[index]
+        }
+    }
+
+    /// offsetからlength分の範囲に対応する値
+    pub fn slice(&self, offset: usize, length: usize) -> Broadcast<'a> {
+        match self {
+            Broadcast::Scalar(value) => Broadcast::Scalar(*value),
+            Broadcast::PerElement(values) => Broadcast::PerElement(&values[offset..offset+length])
+        }
+    }
+}
+
+/// 1970年1月1日からの日数に変換
+pub fn date_to_day(date: NaiveDate) -> i64 {
+    date.num_days_from_ce() as i64 - UNIX_EPOCH_DAYS_FROM_CE
+}
+
+/// 1970年1月1日からの日数から変換
+pub fn day_to_date(day: i64) -> NaiveDate {
+    NaiveDate::from_num_days_from_ce_opt((day + UNIX_EPOCH_DAYS_FROM_CE) as i32).unwrap()
+}
+
+/// 1970年1月1日からの日数から変換．範囲外の場合はNone
+pub fn day_to_date_opt(day: i64) -> Option<NaiveDate> {
+    let days_from_ce = day.checked_add(UNIX_EPOCH_DAYS_FROM_CE)?;
+    if days_from_ce < i32::MIN as i64 || days_from_ce > i32::MAX as i64 {
+        return None;
+    }
+    NaiveDate::from_num_days_from_ce_opt(days_from_ce as i32)
+}
+
+/// 1970年1月1日からの日数の曜日(月曜日が0)
+pub fn day_to_weekday_number(day: i64) -> usize {
+    (day + 3).rem_euclid(7) as usize
+}
+
+/// naiveなdatetimeを1970年1月1日からの秒数に変換
+pub fn datetime_to_timestamp(datetime: NaiveDateTime) -> i64 {
+    date_to_day(datetime.date()) * SECONDS_PER_DAY + datetime.num_seconds_from_midnight() as i64
+}
+
+/// 1970年1月1日からの秒数をnaiveなdatetimeに変換
+pub fn timestamp_to_datetime(timestamp: i64) -> NaiveDateTime {
+    let day = timestamp.div_euclid(SECONDS_PER_DAY);
+    let seconds = timestamp.rem_euclid(SECONDS_PER_DAY);
+    NaiveDateTime::new(
+        day_to_date(day),
+        NaiveTime::from_num_seconds_from_midnight_opt(seconds as u32, 0).unwrap()
+    )
+}
+
+/// 祝日のcsvを読み込む．一列目が"%Y-%m-%d"あるいは"%Y/%m/%d"として読めない行は無視する
+pub fn read_holidays_csv(holidays_csv_path: &str) -> Result<Vec<NaiveDate>, Error> {
+    let bytes = fs::read(holidays_csv_path)?;
+    let mut holidays: Vec<NaiveDate> = Vec::new();
+    for line in bytes.split(|byte|{*byte == b'\n'}) {
+        let first_field = line.split(|byte|{*byte == b','}).next().unwrap_or(&[]);
+        let text = match std::str::from_utf8(first_field) {
+            Ok(text) => {text.trim().trim_start_matches('\u{feff}')},
+            Err(_) => {continue;}
+        };
+        let parsed = NaiveDate::parse_from_str(text, "%Y-%m-%d")
+            .or_else(|_|{NaiveDate::parse_from_str(text, "%Y/%m/%d")});
+        if let Ok(holiday) = parsed {
+            holidays.push(holiday);
+        }
+    }
+    Ok(holidays)
+}
+
+/// 休日曜日のマスクを確認する．すべての曜日が休日の場合は次の営業日が存在しないためエラー
+fn check_holiday_weekdays(holiday_weekday_mask: &[bool; 7]) -> Result<(), Error> {
+    if holiday_weekday_mask.iter().all(|is_holiday|{*is_holiday}) {
+        return Err(Error::InvalidHolidayWeekdays("all weekdays are holidays".to_string()));
+    }
+    Ok(())
+}
+
+/// 営業時間境界を確認し，開始時間でソートしたものを返す．
+/// 空の場合・開始が終了より前でない場合・重なる場合はエラー
+fn sorted_intraday_borders(intraday_borders: &[TimeBorder]) -> Result<Vec<TimeBorder>, Error> {
+    if intraday_borders.is_empty() {
+        return Err(Error::InvalidIntradayBorders("intraday_borders is empty".to_string()));
+    }
+    let mut sorted_borders = intraday_borders.to_vec();
+    sorted_borders.sort_by_key(|border|{border.start});
+    for (i, border) in sorted_borders.iter().enumerate() {
+        if border.start >= border.end {
+            return Err(Error::InvalidIntradayBorders(format!("start must be before end: {:?}", border)));
+        }
+        if i > 0 && sorted_borders[i-1].end > border.start {
+            return Err(Error::InvalidIntradayBorders(format!("borders overlap: {:?}", border)));
+        }
+    }
+    Ok(sorted_borders)
+}
+
+/// コンパイル済みカレンダーのマジックナンバー
+const COMPILED_MAGIC: &[u8; 8] = b"PYWDCAL\0";
+
+/// コンパイル済みカレンダーの形式のバージョン．形式を変更した場合は上げる
+pub const COMPILED_VERSION: u32 = 1;
+
+/// コンパイル済みカレンダーを先頭から読むためのリーダー(リトルエンディアン)
+struct CompiledReader<'a> {
+    bytes: &'a [u8],
+    position: usize
+}
+
+impl<'a> CompiledReader<'a> {
+    fn take(&mut self, length: usize) -> Result<&'a [u8], Error> {
+        let end = self.position.checked_add(length)
+            .filter(|end|{*end <= self.bytes.len()})
+            .ok_or_else(||{Error::InvalidCompiledCalendar("unexpected end of data".to_string())})?;
+        let taken = &self.bytes[self.position..end];
+        self.position = end;
+        Ok(taken)
+    }
+
+    fn read_u32(&mut self) -> Result<u32, Error> {
+        Ok(u32::from_le_bytes(self.take(4)?.try_into().unwrap()))
+    }
+
+    fn read_i64(&mut self) -> Result<i64, Error> {
+        Ok(i64::from_le_bytes(self.take(8)?.try_into().unwrap()))
+    }
+
+    fn read_length(&mut self) -> Result<usize, Error> {
+        let length = self.read_i64()?;
+        if length < 0 || length as usize > self.bytes.len() {
+            return Err(Error::InvalidCompiledCalendar(format!("invalid length: {}", length)));
+        }
+        Ok(length as usize)
+    }
+
+    fn read_i64_vec(&mut self, length: usize) -> Result<Vec<i64>, Error> {
+        let bytes = self.take(length.checked_mul(8).ok_or_else(||{Error::InvalidCompiledCalendar("too long".to_string())})?)?;
+        Ok(bytes.chunks_exact(8).map(|chunk|{i64::from_le_bytes(chunk.try_into().unwrap())}).collect())
+    }
+}
+
+/// タイムスタンプの営業時間の状態．valid_from(含む)からnext_border(含まない)までは変わらないため，
+/// 単調増加するタイムスタンプは境界を越えたときのみ再計算すればよい
+#[derive(Clone, Copy, Debug, PartialEq)]
+pub struct SessionState {
+    pub valid_from: i64,
+    pub is_intraday: bool,
+    pub next_border: i64,
+    pub next_symbol: BorderSymbol,
+    pub version: u64
+}
+
+impl SessionState {
+    /// 版versionのカレンダーでtimestampにこの状態が利用できるかどうか
+    #[inline]
+    pub fn contains(&self, timestamp: i64, version: u64) -> bool {
+        self.version == version && self.valid_from <= timestamp && timestamp < self.next_border
+    }
+}
+
+/// カレンダーの版の番号．すべてのカレンダーで重複しないように割り当てる
+static NEXT_CALENDAR_VERSION: AtomicU64 = AtomicU64::new(1);
+
+/// 祝日・休日曜日・営業時間境界とその前計算テーブルをもつカレンダー
+#[derive(Clone, Debug)]
+pub struct CalendarCore {
+    start_year: i32,
+    end_year: i32,
+    holidays: BTreeSet<NaiveDate>,
+    source_holidays: BTreeSet<NaiveDate>,
+    holiday_weekdays: [bool; 7],
+    intraday_borders: Vec<TimeBorder>,
+    utc_offsets: UtcOffsetTable,
+
+    // 前計算テーブル
+    border_seconds: Vec<(i64, i64)>,
+    session_offsets: Vec<i64>,
+    intraday_seconds_per_day: i64,
+    table_start_day: i64,
+    workday_table: Vec<bool>,
+    workday_cumsum: Vec<i64>,
+
+    // 前計算テーブルを更新するごとに変わる版の番号(SessionStateの無効化に利用)
+    version: u64,
+}
+
+impl Default for CalendarCore {
+    /// 現在年の5年前から2年後まで，土日休み，東京証券取引所の営業時間のカレンダー(祝日なし)
+    fn default() -> Self {
+        let this_year = Local::now().year();
+        CalendarCore::new(this_year - 5, this_year + 2)
+    }
+}
+
+impl CalendarCore {
+    /// 土日休み，東京証券取引所の営業時間のカレンダー(祝日なし)を作成
+    pub fn new(start_year: i32, end_year: i32) -> Self {
+        let mut calendar = CalendarCore {
+            start_year,
+            end_year,
+            holidays: BTreeSet::new(),
+            source_holidays: BTreeSet::new(),
+            holiday_weekdays: [false, false, false, false, false, true, true],
+            intraday_borders: vec![
+                TimeBorder {start: NaiveTime::from_hms(9, 0, 0), end: NaiveTime::from_hms(11, 30, 0)},
+                TimeBorder {start: NaiveTime::from_hms(12, 30, 0), end: NaiveTime::from_hms(15, 0, 0)},
+            ],
+            utc_offsets: UtcOffsetTable::default(),
+            border_seconds: Vec::new(),
+            session_offsets: Vec::new(),
+            intraday_seconds_per_day: 0,
+            table_start_day: 0,
+            workday_table: Vec::new(),
+            workday_cumsum: Vec::new(),
+            version: 0,
+        };
+        calendar.rebuild_border_seconds();
+        calendar.rebuild_workday_table();
+        calendar
+    }
+
+    // -------------------------------------------------------------------------
+    // 設定
+
+    /// csvを読み込んで祝日を更新
+    pub fn set_holidays_csvs(&mut self, holidays_csv_paths: &[String], start_year: i32, end_year: i32) -> Result<(), Error> {
+        let mut holidays: Vec<NaiveDate> = Vec::new();
+        for holidays_csv_path in holidays_csv_paths.iter() {
+            holidays.extend(read_holidays_csv(holidays_csv_path)?);
+        }
+        self.set_range_holidays(&holidays, start_year, end_year);
+        Ok(())
+    }
+
+    /// 祝日のリストから祝日を更新．範囲外の祝日も保持し，set_year_rangeで範囲を広げた場合に利用する．
+    /// 営業日テーブルは祝日が変わった日のみ更新する
+    pub fn set_range_holidays(&mut self, holidays: &[NaiveDate], start_year: i32, end_year: i32) {
+        self.set_year_range(start_year, end_year);
+        let old_holidays = std::mem::take(&mut self.holidays);
+        self.source_holidays = holidays.iter().cloned().collect();
+        self.filter_holidays();
+
+        // 祝日でなくなった日と新しく祝日となった日(昇順)
+        let changed_days: Vec<i64> = old_holidays.symmetric_difference(&self.holidays)
+            .map(|holiday|{date_to_day(*holiday)})
+            .collect();
+        self.update_workday_table_days(&changed_days);
+    }
+
+    /// 祝日のリストから祝日を追加．営業日テーブルは新しく祝日となった日のみ更新する
+    pub fn add_range_holidays(&mut self, holidays: &[NaiveDate], start_year: i32, end_year: i32) {
+        self.set_year_range(start_year, end_year);
+        let (start_year, end_year) = (self.start_year, self.end_year);
+        let mut added_days: Vec<i64> = Vec::new();
+        for holiday in holidays.iter() {
+            self.source_holidays.insert(*holiday);
+            if start_year <= holiday.year() && holiday.year() <= end_year && self.holidays.insert(*holiday) {
+                added_days.push(date_to_day(*holiday));
+            }
+        }
+        added_days.sort_unstable();
+        self.update_workday_table_days(&added_days);
+    }
+
+    /// 祝日を読み込み直さずに利用する年の範囲を変更．
+    /// 前の範囲と重なる部分の営業日テーブルはそのまま利用し，新しい年の分のみ計算する
+    pub fn set_year_range(&mut self, start_year: i32, end_year: i32) {
+        if (start_year, end_year) == (self.start_year, self.end_year) {
+            return;  // 変更がない場合は前計算テーブルを作り直さない
+        }
+        let old_start_day = self.table_start_day;
+        let old_end_day = old_start_day + self.workday_table.len() as i64;
+        self.start_year = start_year;
+        self.end_year = end_year;
+        self.filter_holidays();
+
+        let (new_start_day, new_end_day) = self.table_day_range();
+        let keep_start_day = new_start_day.max(old_start_day);
+        let keep_end_day = new_end_day.min(old_end_day);
+        if keep_start_day >= keep_end_day {
+            self.rebuild_workday_table();
+            return;
+        }
+        let mut workday_table = self.workday_flags(new_start_day, keep_start_day);
+        workday_table.extend_from_slice(
+            &self.workday_table[(keep_start_day - old_start_day) as usize..(keep_end_day - old_start_day) as usize]
+        );
+        workday_table.extend(self.workday_flags(keep_end_day, new_end_day));
+        self.table_start_day = new_start_day;
+        self.workday_table = workday_table;
+        self.rebuild_workday_cumsum();
+    }
+
+    /// source_holidaysのうち利用する年の範囲の祝日をholidaysとする
+    fn filter_holidays(&mut self) {
+        let (start_year, end_year) = (self.start_year, self.end_year);
+        self.holidays = self.source_holidays.iter()
+            .filter(|holiday|{start_year <= holiday.year() && holiday.year() <= end_year})
+            .cloned().collect();
+    }
+
+    /// 休日曜日を更新
+    pub fn set_holiday_weekdays(&mut self, holiday_weekdays: &HashSet<Weekday>) -> Result<(), Error> {
+        let mut holiday_weekday_mask = [false; 7];
+        for weekday in holiday_weekdays.iter() {
+            holiday_weekday_mask[weekday.num_days_from_monday() as usize] = true;
+        }
+        check_holiday_weekdays(&holiday_weekday_mask)?;
+        if self.holiday_weekdays == holiday_weekday_mask {
+            return Ok(());  // 変更がない場合は前計算テーブルを作り直さない
+        }
+        self.holiday_weekdays = holiday_weekday_mask;
+        self.rebuild_workday_table();
+        Ok(())
+    }
+
+    /// 営業時間境界を更新．開始時間でソートされる
+    pub fn set_intraday_borders(&mut self, intraday_borders: &[TimeBorder]) -> Result<(), Error> {
+        let sorted_borders = sorted_intraday_borders(intraday_borders)?;
+        if self.intraday_borders == sorted_borders {
+            return Ok(());  // 変更がない場合は前計算テーブルを作り直さない
+        }
+        self.intraday_borders = sorted_borders;
+        self.rebuild_border_seconds();
+        Ok(())
+    }
+
+    /// タイムゾーンのオフセットの遷移テーブルを更新．空のテーブルの場合はタイムゾーンを設定しない
+    pub fn set_utc_offset_table(&mut self, utc_offsets: UtcOffsetTable) {
+        if self.utc_offsets == utc_offsets {
+            return;
+        }
+        self.utc_offsets = utc_offsets;
+        self.update_version();
+    }
+
+    /// 新しい版の番号を割り当てる
+    fn update_version(&mut self) {
+        self.version = NEXT_CALENDAR_VERSION.fetch_add(1, Ordering::Relaxed);
+    }
+
+    fn rebuild_border_seconds(&mut self) {
+        self.border_seconds = self.intraday_borders.iter()
+            .map(|border|{
+                (border.start.num_seconds_from_midnight() as i64, border.end.num_seconds_from_midnight() as i64)
+            }).collect();
+        // session_offsets[k]は1日のうちk番目の営業時間より前の営業時間の秒数
+        self.session_offsets = self.border_seconds.iter()
+            .scan(0, |offset, (start, end)|{
+                let session_offset = *offset;
+                *offset += end - start;
+                Some(session_offset)
+            }).collect();
+        self.intraday_seconds_per_day = self.border_seconds.iter().map(|(start, end)|{end - start}).sum();
+        self.update_version();
+    }
+
+    /// 祝日範囲の営業日テーブルを作り直す
+    fn rebuild_workday_table(&mut self) {
+        let (table_start_day, table_end_day) = self.table_day_range();
+        self.table_start_day = table_start_day;
+        self.workday_table = self.workday_flags(table_start_day, table_end_day);
+        self.rebuild_workday_cumsum();
+    }
+
+    /// 祝日範囲の営業日テーブルの範囲(開始日, 終了日(含まない))
+    fn table_day_range(&self) -> (i64, i64) {
+        let table_start_day = date_to_day(NaiveDate::from_ymd(self.start_year, 1, 1));
+        let table_end_day = date_to_day(NaiveDate::from_ymd(self.end_year + 1, 1, 1));
+        (table_start_day, table_end_day.max(table_start_day))
+    }
+
+    /// start_dayからend_day(含まない)までの各日が営業日であるかどうか
+    fn workday_flags(&self, start_day: i64, end_day: i64) -> Vec<bool> {
+        let holiday_weekdays = self.holiday_weekdays;
+        let mut workday_flags: Vec<bool> = (start_day..end_day)
+            .map(|day|{!holiday_weekdays[day_to_weekday_number(day)]})
+            .collect();
+        if start_day < end_day {
+            for holiday in self.holidays.range(day_to_date(start_day)..day_to_date(end_day)) {
+                workday_flags[(date_to_day(*holiday) - start_day) as usize] = false;
+            }
+        }
+        workday_flags
+    }
+
+    /// 営業日テーブルから累積の営業日数を作り直す
+    /// 祝日が変わった日(昇順)の営業日テーブルを更新し，累積テーブルは最初に変わった日以降のみ計算し直す
+    fn update_workday_table_days(&mut self, changed_days: &[i64]) {
+        let mut first_index: Option<usize> = None;
+        for day in changed_days.iter() {
+            let index = day - self.table_start_day;
+            if index < 0 || index >= self.workday_table.len() as i64 {
+                continue;
+            }
+            let is_workday = !self.holiday_weekdays[day_to_weekday_number(*day)] && !self.holidays.contains(&day_to_date(*day));
+            self.workday_table[index as usize] = is_workday;
+            first_index = first_index.or(Some(index as usize));
+        }
+        if let Some(first_index) = first_index {
+            for i in first_index..self.workday_table.len() {
+                self.workday_cumsum[i + 1] = self.workday_cumsum[i] + self.workday_table[i] as i64;
+            }
+            self.update_version();
+        }
+    }
+
+    fn rebuild_workday_cumsum(&mut self) {
+        // workday_cumsum[i]はテーブルの先頭からi日分の営業日数
+        let mut workday_cumsum: Vec<i64> = Vec::with_capacity(self.workday_table.len() + 1);
+        workday_cumsum.push(0);
+        for is_workday in self.workday_table.iter() {
+            workday_cumsum.push(workday_cumsum.last().unwrap() + *is_workday as i64);
+        }
+        self.workday_cumsum = workday_cumsum;
+        self.update_version();
+    }
+
+    // -------------------------------------------------------------------------
+    // 取得
+
+    pub fn start_year(&self) -> i32 {
+        self.start_year
+    }
+
+    pub fn end_year(&self) -> i32 {
+        self.end_year
+    }
+
+    /// 祝日を1970年1月1日からの日数として昇順で取得
+    pub fn range_holidays_days(&self) -> Vec<i64> {
+        self.holidays.iter().map(|holiday|{date_to_day(*holiday)}).collect()
+    }
+
+    /// 休日曜日のベクター
+    pub fn holiday_weekdays(&self) -> Vec<Weekday> {
+        (0..7_u32).filter(|i|{self.holiday_weekdays[*i as usize]})
+            .map(|i|{Weekday::from_u32(i).unwrap()})
+            .collect()
+    }
+
+    /// 営業時間境界のスライス(開始時間の昇順)
+    pub fn intraday_borders(&self) -> &[TimeBorder] {
+        &self.intraday_borders
+    }
+
+    /// タイムゾーンが設定されているかどうか
+    pub fn has_timezone(&self) -> bool {
+        !self.utc_offsets.is_empty()
+    }
+
+    /// 版の番号．設定を変更するごとに変わる
+    #[inline]
+    pub fn version(&self) -> u64 {
+        self.version
+    }
+
+    // -------------------------------------------------------------------------
+    // 営業日
+
+    /// 1970年1月1日からの日数が営業日であるかどうか
+    #[inline]
+    pub fn is_workday_day(&self, day: i64) -> bool {
+        let index = day - self.table_start_day;
+        if 0 <= index && (index as usize) < self.workday_table.len() {
+            self.workday_table[index as usize]
+        } else {
+            !self.holiday_weekdays[day_to_weekday_number(day)]
+        }
+    }
+
+    /// start_day(含む)からend_day(含まない)までの休日曜日でない日数(祝日は考慮しない)
+    fn weekday_workdays_between(&self, start_day: i64, end_day: i64) -> i64 {
+        if end_day <= start_day {
+            return 0;
+        }
+        let workdays_per_week = self.holiday_weekdays.iter().filter(|is_holiday|{!**is_holiday}).count() as i64;
+        let length = end_day - start_day;
+        let full_weeks = length / 7;
+        let remainder = (start_day + full_weeks * 7..end_day)
+            .filter(|day|{!self.holiday_weekdays[day_to_weekday_number(*day)]})
+            .count() as i64;
+        full_weeks * workdays_per_week + remainder
+    }
+
+    /// テーブルの先頭の日からdayまで(dayは含まない)の営業日数．dayが先頭より前の場合は負の値となる．
+    /// 二つの日の差がその間の営業日数となる
+    #[inline]
+    pub fn workdays_before_day(&self, day: i64) -> i64 {
+        let table_length = self.workday_table.len() as i64;
+        let index = day - self.table_start_day;
+        if index < 0 {
+            -self.weekday_workdays_between(day, self.table_start_day)
+        } else if index <= table_length {
+            self.workday_cumsum[index as usize]
+        } else {
+            self.workday_cumsum[table_length as usize] + self.weekday_workdays_between(self.table_start_day + table_length, day)
+        }
+    }
+
+    /// select_dateが営業日であるかどうか
+    pub fn check_workday(&self, select_date: NaiveDate) -> bool {
+        self.is_workday_day(date_to_day(select_date))
+    }
+
+    /// start_dateからend_dateまでの営業日を1970年1月1日からの日数として取得
+    pub fn get_workdays_days(&self, start_date: NaiveDate, end_date: NaiveDate, closed: Closed) -> Vec<i64> {
+        let start_day = date_to_day(start_date);
+        let end_day = date_to_day(end_date);
+        let (first_day, last_day) = match closed {
+            Closed::Left => (start_day, end_day - 1),
+            Closed::Right => (start_day + 1, end_day),
+            Closed::Both => (start_day, end_day),
+            Closed::Not => (start_day + 1, end_day - 1)
+        };
+        let mut workdays: Vec<i64> = Vec::with_capacity(self.count_workdays_day(start_day, end_day, closed) as usize);
+        workdays.extend((first_day..=last_day).filter(|day|{self.is_workday_day(*day)}));
+        workdays
+    }
+
+    /// 営業日の序数(テーブルの先頭の日から数えて0始まり)から1970年1月1日からの日数を取得．
+    /// workdays_before_dayの逆写像であり，テーブル内は二分探索，テーブル外は曜日から計算する
+    pub fn workday_from_ordinal(&self, ordinal: i64) -> i64 {
+        let table_length = self.workday_table.len();
+        let total_workdays = self.workday_cumsum[table_length];
+        if 0 <= ordinal && ordinal < total_workdays {
+            // workday_cumsum[index + 1] > ordinalとなる最初のindex
+            let index = self.workday_cumsum.partition_point(|count|{*count <= ordinal}) - 1;
+            return self.table_start_day + index as i64;
+        }
+
+        let workdays_per_week = self.holiday_weekdays.iter().filter(|is_holiday|{!**is_holiday}).count() as i64;
+        let (mut day, mut remaining, step) = if ordinal >= total_workdays {
+            (self.table_start_day + table_length as i64, ordinal - total_workdays + 1, 1)
+        } else {
+            (self.table_start_day - 1, -ordinal, -1)
+        };
+        // 1週間単位で進めてから残りを1日ずつ進める(最後の週は残す)
+        let full_weeks = (remaining - 1) / workdays_per_week;
+        day += step * full_weeks * 7;
+        remaining -= full_weeks * workdays_per_week;
+        loop {
+            if !self.holiday_weekdays[day_to_weekday_number(day)] {
+                remaining -= 1;
+                if remaining == 0 {
+                    return day;
+                }
+            }
+            day += step;
+        }
+    }
+
+    /// 1970年1月1日からの日数dayからdays分の次の営業日(dayは含めない)．daysが負の場合は前の営業日
+    pub fn next_workday_day(&self, day: i64, days: i64) -> i64 {
+        if days > 0 {
+            self.workday_from_ordinal(self.workdays_before_day(day + 1) + days - 1)
+        } else if days < 0 {
+            self.workday_from_ordinal(self.workdays_before_day(day) + days)
+        } else {
+            day
+        }
+    }
+
+    /// start_dayからend_dayまでの営業日数
+    pub fn count_workdays_day(&self, start_day: i64, end_day: i64, closed: Closed) -> i64 {
+        let (first_day, last_day) = match closed {
+            Closed::Left => (start_day, end_day - 1),
+            Closed::Right => (start_day + 1, end_day),
+            Closed::Both => (start_day, end_day),
+            Closed::Not => (start_day + 1, end_day - 1)
+        };
+        (self.workdays_before_day(last_day + 1) - self.workdays_before_day(first_day)).max(0)
+    }
+
+    /// start_dateからend_dateまでの営業日数．get_workdaysの長さと一致する
+    pub fn count_workdays(&self, start_date: NaiveDate, end_date: NaiveDate, closed: Closed) -> i64 {
+        self.count_workdays_day(date_to_day(start_date), date_to_day(end_date), closed)
+    }
+
+    /// select_dateの営業日の序数．holiday_start_yearの1月1日から数えて0始まりで，
+    /// 営業日でない場合は次の営業日の序数となる
+    pub fn get_workday_ordinal(&self, select_date: NaiveDate) -> i64 {
+        self.workdays_before_day(date_to_day(select_date))
+    }
+
+    /// 営業日の序数から営業日を取得．get_workday_ordinalの逆
+    pub fn get_workday_from_ordinal(&self, ordinal: i64) -> NaiveDate {
+        day_to_date(self.workday_from_ordinal(ordinal))
+    }
+
+    /// 1970年1月1日からの日数dayの最近の営業日．dayが営業日の場合はそのまま返る
+    pub fn near_workday_day(&self, day: i64, is_after: bool) -> i64 {
+        if self.is_workday_day(day) {
+            day
+        } else if is_after {
+            self.next_workday_day(day, 1)
+        } else {
+            self.next_workday_day(day, -1)
+        }
+    }
+
+    /// select_dateからdays分の次の営業日を取得(select_dateは含めない)
+    pub fn get_next_workday(&self, select_date: NaiveDate, days: i32) -> NaiveDate {
+        day_to_date(self.next_workday_day(date_to_day(select_date), days as i64))
+    }
+
+    /// select_dateからdays分の前の営業日を取得(select_dateは含めない)
+    pub fn get_previous_workday(&self, select_date: NaiveDate, days: i32) -> NaiveDate {
+        day_to_date(self.next_workday_day(date_to_day(select_date), -(days as i64)))
+    }
+
+    /// 最近の営業日を取得．select_dateが営業日の場合はそのまま返る
+    pub fn get_near_workday(&self, select_date: NaiveDate, is_after: bool) -> NaiveDate {
+        day_to_date(self.near_workday_day(date_to_day(select_date), is_after))
+    }
+
+    /// start_date(含む)からdays分の営業日を1970年1月1日からの日数として昇順で取得．daysが負の場合はstart_dateから遡る
+    pub fn get_workdays_number_days(&self, start_date: NaiveDate, days: i32) -> Vec<i64> {
+        let step: i64 = if days < 0 {-1} else {1};
+        let number = days.unsigned_abs() as usize;
+        let mut workdays: Vec<i64> = Vec::with_capacity(number);
+        let mut day = date_to_day(start_date);
+        while workdays.len() < number {
+            if self.is_workday_day(day) {
+                workdays.push(day);
+            }
+            day += step;
+        }
+        if step < 0 {
+            workdays.reverse();
+        }
+        workdays
+    }
+
+    // -------------------------------------------------------------------------
+    // 営業時間(1970年1月1日からの秒数)
+
+    /// 0時からの秒数が営業時間内であるかどうか
+    #[inline]
+    pub fn is_intraday_seconds(&self, seconds_of_day: i64) -> bool {
+        self.border_seconds.iter().any(|(start, end)|{*start <= seconds_of_day && seconds_of_day < *end})
+    }
+
+    /// 0時からの秒数が含まれる営業時間の番号．営業時間外の場合はNone
+    #[inline]
+    pub fn session_index_of_seconds(&self, seconds_of_day: i64) -> Option<usize> {
+        let session_count = self.border_seconds.partition_point(|(start, _)|{*start <= seconds_of_day});
+        if session_count > 0 && seconds_of_day < self.border_seconds[session_count - 1].1 {
+            Some(session_count - 1)
+        } else {
+            None
+        }
+    }
+
+    /// タイムスタンプが営業日・営業時間内であるかどうか
+    #[inline]
+    pub fn is_workday_intraday_timestamp(&self, timestamp: i64) -> bool {
+        self.is_workday_day(timestamp.div_euclid(SECONDS_PER_DAY))
+            && self.is_intraday_seconds(timestamp.rem_euclid(SECONDS_PER_DAY))
+    }
+
+    /// timestampより後(含まない)の最初の営業時間境界
+    fn next_border_timestamp(&self, timestamp: i64) -> (i64, BorderSymbol) {
+        let mut day = timestamp.div_euclid(SECONDS_PER_DAY);
+        loop {
+            if self.is_workday_day(day) {
+                let base = day * SECONDS_PER_DAY;
+                for (start, end) in self.border_seconds.iter() {
+                    if base + start > timestamp {
+                        return (base + start, BorderSymbol::Start);
+                    }
+                    if base + end > timestamp {
+                        return (base + end, BorderSymbol::End);
+                    }
+                }
+            }
+            day += 1;
+        }
+    }
+
+    /// timestampより前の最後の営業時間境界．終了境界はtimestampと一致するものも含む(force_is_endの場合は含まない)
+    fn previous_border_timestamp(&self, timestamp: i64, force_is_end: bool) -> (i64, BorderSymbol) {
+        let mut day = timestamp.div_euclid(SECONDS_PER_DAY);
+        loop {
+            if self.is_workday_day(day) {
+                let base = day * SECONDS_PER_DAY;
+                for (start, end) in self.border_seconds.iter().rev() {
+                    if base + end < timestamp || (base + end == timestamp && !force_is_end) {
+                        return (base + end, BorderSymbol::End);
+                    }
+                    if base + start < timestamp {
+                        return (base + start, BorderSymbol::Start);
+                    }
+                }
+            }
+            day -= 1;
+        }
+    }
+
+    /// 営業日・営業時間を考慮しタイムスタンプに秒数を加算する．営業時間の終了ちょうどになる場合は次の営業時間の開始となる．
+    /// 営業秒の軸上の加算であり，期間の長さによらない
+    pub fn add_workday_intraday_timestamp(&self, timestamp: i64, delta_seconds: i64) -> i64 {
+        self.timestamp_from_business_seconds(self.business_seconds_from_timestamp(timestamp) + delta_seconds)
+    }
+
+    /// 0時からseconds_of_dayまでの営業時間の秒数
+    #[inline]
+    fn intraday_seconds_before(&self, seconds_of_day: i64) -> i64 {
+        // 開始がseconds_of_day以前である営業時間の数
+        let session_count = self.border_seconds.partition_point(|(start, _)|{*start <= seconds_of_day});
+        if session_count == 0 {
+            return 0;
+        }
+        let (start, end) = self.border_seconds[session_count - 1];
+        self.session_offsets[session_count - 1] + (seconds_of_day.min(end) - start)
+    }
+
+    /// タイムスタンプを営業秒(テーブルの先頭の日の0時から数えた営業日・営業時間の秒数)に変換．
+    /// 営業時間外は直前の営業時間の終了(次の営業時間の開始)と同じ値となる．
+    /// 二つのタイムスタンプの営業秒の差がその間の営業日・営業時間の秒数となる
+    #[inline]
+    pub fn business_seconds_from_timestamp(&self, timestamp: i64) -> i64 {
+        let day = timestamp.div_euclid(SECONDS_PER_DAY);
+        let mut seconds = self.workdays_before_day(day) * self.intraday_seconds_per_day;
+        if self.is_workday_day(day) {
+            seconds += self.intraday_seconds_before(timestamp.rem_euclid(SECONDS_PER_DAY));
+        }
+        seconds
+    }
+
+    /// 営業秒をタイムスタンプに変換．business_seconds_from_timestampの逆であり，
+    /// 営業時間の境界では営業時間の開始を返す
+    #[inline]
+    pub fn timestamp_from_business_seconds(&self, business_seconds: i64) -> i64 {
+        let ordinal = business_seconds.div_euclid(self.intraday_seconds_per_day);
+        let seconds_in_day = business_seconds.rem_euclid(self.intraday_seconds_per_day);
+        let day = self.workday_from_ordinal(ordinal);
+        // session_offsets[k] <= seconds_in_dayとなる最後の営業時間k
+        let session_index = self.session_offsets.partition_point(|offset|{*offset <= seconds_in_day}) - 1;
+        let (start, _) = self.border_seconds[session_index];
+        day * SECONDS_PER_DAY + start + (seconds_in_day - self.session_offsets[session_index])
+    }
+
+    /// start_timestampからend_timestampまでの営業日・営業時間の秒数．期間の長さによらず定数時間
+    pub fn get_timedelta_workdays_intraday_seconds(&self, start_timestamp: i64, end_timestamp: i64) -> i64 {
+        self.business_seconds_from_timestamp(end_timestamp) - self.business_seconds_from_timestamp(start_timestamp)
+    }
+
+    // -------------------------------------------------------------------------
+    // 営業時間(NaiveDateTime)
+
+    /// select_datetimeが営業日・営業時間内であるかどうか
+    pub fn check_workday_intraday(&self, select_datetime: NaiveDateTime) -> bool {
+        self.is_workday_intraday_timestamp(datetime_to_timestamp(select_datetime))
+    }
+
+    /// 次の営業時間境界をその状態とともに取得
+    pub fn get_next_border_workday_intraday(&self, select_datetime: NaiveDateTime) -> (NaiveDateTime, BorderSymbol) {
+        let (border, symbol) = self.next_border_timestamp(datetime_to_timestamp(select_datetime));
+        (timestamp_to_datetime(border), symbol)
+    }
+
+    /// 前の営業時間境界をその状態とともに取得
+    pub fn get_previous_border_workday_intraday(&self, select_datetime: NaiveDateTime, force_is_end: bool) -> (NaiveDateTime, BorderSymbol) {
+        let (border, symbol) = self.previous_border_timestamp(datetime_to_timestamp(select_datetime), force_is_end);
+        (timestamp_to_datetime(border), symbol)
+    }
+
+    /// 最近の営業日・営業時間内の日時をその状態とともに取得．営業時間内の場合はそのまま返る
+    pub fn get_near_workday_intraday(&self, select_datetime: NaiveDateTime, is_after: bool) -> (NaiveDateTime, BorderSymbol) {
+        let timestamp = datetime_to_timestamp(select_datetime);
+        if self.is_workday_intraday_timestamp(timestamp) {
+            return (select_datetime, BorderSymbol::Intra);
+        }
+        let (border, symbol) = if is_after {
+            self.next_border_timestamp(timestamp)
+        } else {
+            self.previous_border_timestamp(timestamp, false)
+        };
+        (timestamp_to_datetime(border), symbol)
+    }
+
+    /// 最近の営業日・営業時間内のタイムスタンプ．営業時間内の場合はそのまま返る
+    #[inline]
+    pub fn near_workday_intraday_timestamp(&self, timestamp: i64, is_after: bool) -> i64 {
+        if self.is_workday_intraday_timestamp(timestamp) {
+            timestamp
+        } else if is_after {
+            self.next_border_timestamp(timestamp).0
+        } else {
+            self.previous_border_timestamp(timestamp, false).0
+        }
+    }
+
+    /// timestampから次の営業時間境界までの状態
+    pub fn session_state(&self, timestamp: i64) -> SessionState {
+        let (next_border, next_symbol) = self.next_border_timestamp(timestamp);
+        SessionState {
+            valid_from: timestamp,
+            is_intraday: self.is_workday_intraday_timestamp(timestamp),
+            next_border,
+            next_symbol,
+            version: self.version
+        }
+    }
+
+    // -------------------------------------------------------------------------
+    // 営業時間の格子(各営業時間の開始からfreq_seconds間隔の時刻)．
+    // 格子点には営業日の序数 * 1日の格子点の数 + 1日のうちの番号で通し番号を付ける
+
+    /// 1日の格子点の0時からの秒数(昇順)．closedは各営業時間の開始・終了を含めるかどうか
+    pub fn intraday_grid_seconds(&self, freq_seconds: i64, closed: Closed) -> Vec<i64> {
+        let mut grid: Vec<i64> = Vec::new();
+        for (start, end) in self.border_seconds.iter() {
+            let mut seconds = *start;
+            while seconds <= *end {
+                let is_included = match closed {
+                    Closed::Left => seconds < *end,
+                    Closed::Right => seconds > *start,
+                    Closed::Both => true,
+                    Closed::Not => *start < seconds && seconds < *end
+                };
+                if is_included {
+                    grid.push(seconds);
+                }
+                seconds += freq_seconds;
+            }
+        }
+        grid.dedup();  // 隣接する営業時間の終了と開始が一致する場合
+        grid
+    }
+
+    /// start_timestampからend_timestamp(どちらも含む)までの格子点の通し番号の範囲[first, last)
+    pub fn intraday_grid_index_range(&self, grid: &[i64], start_timestamp: i64, end_timestamp: i64) -> (i64, i64) {
+        let grid_length = grid.len() as i64;
+        let grid_index = |timestamp: i64, is_end: bool| -> i64 {
+            let day = timestamp.div_euclid(SECONDS_PER_DAY);
+            let seconds_of_day = timestamp.rem_euclid(SECONDS_PER_DAY);
+            let index_of_day = if self.is_workday_day(day) {
+                grid.partition_point(|seconds|{if is_end {*seconds <= seconds_of_day} else {*seconds < seconds_of_day}})
+            } else {
+                0
+            };
+            self.workdays_before_day(day) * grid_length + index_of_day as i64
+        };
+        let first = grid_index(start_timestamp, false);
+        (first, grid_index(end_timestamp, true).max(first))
+    }
+
+    /// 通し番号first_indexから順に格子点のタイムスタンプ(unit単位)をoutに書き込む
+    pub fn intraday_grid_into(&self, grid: &[i64], first_index: i64, unit: TimeUnit, out: &mut [i64]) {
+        if grid.is_empty() {
+            return;
+        }
+        let grid_length = grid.len() as i64;
+        let mut ordinal = first_index.div_euclid(grid_length);
+        let mut index_of_day = first_index.rem_euclid(grid_length) as usize;
+        let mut base = self.workday_from_ordinal(ordinal) * SECONDS_PER_DAY;
+        let per_second = unit.per_second();
+        for out_timestamp in out.iter_mut() {
+            *out_timestamp = (base + grid[index_of_day]) * per_second;
+            index_of_day += 1;
+            if index_of_day == grid.len() {
+                index_of_day = 0;
+                ordinal += 1;
+                base = self.workday_from_ordinal(ordinal) * SECONDS_PER_DAY;
+            }
+        }
+    }
+
+    /// 営業日・営業時間を考慮しDateTimeを加算する(1秒未満は切り捨て)
+    pub fn add_workday_intraday_datetime(&self, select_datetime: NaiveDateTime, delta_time: Duration) -> NaiveDateTime {
+        timestamp_to_datetime(
+            self.add_workday_intraday_timestamp(datetime_to_timestamp(select_datetime), delta_time.num_seconds())
+        )
+    }
+
+    /// start_datetimeからend_datetimeまでの営業日・営業時間のDuration
+    pub fn get_timedelta_workdays_intraday(&self, start_datetime: NaiveDateTime, end_datetime: NaiveDateTime) -> Duration {
+        Duration::seconds(self.get_timedelta_workdays_intraday_seconds(
+            datetime_to_timestamp(start_datetime),
+            datetime_to_timestamp(end_datetime)
+        ))
+    }
+
+    // -------------------------------------------------------------------------
+    // 抽出(1970年1月1日からのunit単位の整数．NaTはfalse)．
+    // utcの場合は値をUTCとみなし，タイムゾーンのオフセットを加えたローカル時間で判定する
+
+    /// UTCの値をローカル時間の1970年1月1日からの秒数に変換
+    #[inline]
+    fn local_seconds_from_utc(&self, value: i64, unit: TimeUnit) -> i64 {
+        let utc_seconds = unit.to_seconds(value);
+        utc_seconds + self.utc_offsets.offset_seconds(utc_seconds)
+    }
+
+    /// 営業日であるかどうかをoutに書き込む
+    pub fn extract_workdays_bool_into(&self, values: &[i64], unit: TimeUnit, utc: bool, out: &mut [bool]) {
+        for (value, flag) in values.iter().zip(out.iter_mut()) {
+            *flag = *value != NAT && if utc {
+                self.is_workday_day(self.local_seconds_from_utc(*value, unit).div_euclid(SECONDS_PER_DAY))
+            } else {
+                self.is_workday_day(unit.to_day(*value))
+            };
+        }
+    }
+
+    /// 営業時間内であるかどうかをoutに書き込む
+    pub fn extract_intraday_bool_into(&self, values: &[i64], unit: TimeUnit, utc: bool, out: &mut [bool]) {
+        for (value, flag) in values.iter().zip(out.iter_mut()) {
+            *flag = *value != NAT && {
+                let seconds = if utc {self.local_seconds_from_utc(*value, unit)} else {unit.to_seconds(*value)};
+                self.is_intraday_seconds(seconds.rem_euclid(SECONDS_PER_DAY))
+            };
+        }
+    }
+
+    /// 営業日・営業時間内であるかどうかをoutに書き込む
+    pub fn extract_workdays_intraday_bool_into(&self, values: &[i64], unit: TimeUnit, utc: bool, out: &mut [bool]) {
+        for (value, flag) in values.iter().zip(out.iter_mut()) {
+            *flag = *value != NAT && {
+                let seconds = if utc {self.local_seconds_from_utc(*value, unit)} else {unit.to_seconds(*value)};
+                self.is_workday_intraday_timestamp(seconds)
+            };
+        }
+    }
+
+    /// ローカル時間の秒数localの判定と，判定が変わりうる次のローカル時間の秒数
+    fn extract_segment(&self, local: i64, kind: ExtractKind) -> (bool, i64) {
+        let day = local.div_euclid(SECONDS_PER_DAY);
+        match kind {
+            ExtractKind::Workdays => (self.is_workday_day(day), (day + 1) * SECONDS_PER_DAY),
+            ExtractKind::Intraday => {
+                let seconds_of_day = local.rem_euclid(SECONDS_PER_DAY);
+                let mut next_border = SECONDS_PER_DAY;
+                for (start, end) in self.border_seconds.iter() {
+                    if *start > seconds_of_day {
+                        next_border = *start;
+                        break;
+                    }
+                    if *end > seconds_of_day {
+                        next_border = *end;
+                        break;
+                    }
+                }
+                (self.is_intraday_seconds(seconds_of_day), day * SECONDS_PER_DAY + next_border)
+            },
+            ExtractKind::WorkdaysIntraday => {
+                let state = self.session_state(local);
+                (state.is_intraday, state.next_border)
+            }
+        }
+    }
+
+    /// 昇順にソートされた入力を判定が変わらない区間(run)に分け，区間ごとにf(開始, 終了(含まない), 判定)を呼ぶ．
+    /// 区間の終わりは倍々探索と二分探索で求めるため，要素ごとの判定を行わない．NaTは判定がfalseの区間となる
+    pub fn for_each_sorted_run<F>(&self, values: &[i64], unit: TimeUnit, utc: bool, kind: ExtractKind, mut f: F)
+    where F: FnMut(usize, usize, bool) {
+        let mut index = 0;
+        while index < values.len() {
+            let rest = &values[index + 1..];
+            if values[index] == NAT {
+                let stop = index + 1 + gallop_partition_point(rest, |value|{*value == NAT});
+                f(index, stop, false);
+                index = stop;
+                continue;
+            }
+
+            let seconds = unit.to_seconds(values[index]);
+            // 判定が変わらない秒数の上限(含まない)．UTCの場合はオフセットが一定の範囲に限る
+            let (flag, limit_seconds) = if utc {
+                let (offset, next_transition) = self.utc_offsets.offset_span(seconds);
+                let (flag, next_local) = self.extract_segment(seconds + offset, kind);
+                (flag, (next_local - offset).min(next_transition))
+            } else {
+                self.extract_segment(seconds, kind)
+            };
+            let limit = unit.ceil_from_seconds(limit_seconds);
+            let stop = index + 1 + gallop_partition_point(rest, |value|{*value < limit && *value != NAT});
+            f(index, stop, flag);
+            index = stop;
+        }
+    }
+
+    /// 昇順にソートされた入力について，判定をoutに区間ごとにまとめて書き込む
+    pub fn extract_sorted_bool_into(&self, values: &[i64], unit: TimeUnit, utc: bool, kind: ExtractKind, out: &mut [bool]) {
+        self.for_each_sorted_run(values, unit, utc, kind, |start, stop, flag|{out[start..stop].fill(flag)});
+    }
+
+    /// kindの判定をoutに書き込む．assume_sortedの場合は入力が昇順にソートされているとして区間ごとにまとめて書き込む
+    pub fn extract_kind_bool_into(&self, values: &[i64], unit: TimeUnit, utc: bool, kind: ExtractKind, assume_sorted: bool, out: &mut [bool]) {
+        if assume_sorted {
+            return self.extract_sorted_bool_into(values, unit, utc, kind, out);
+        }
+        match kind {
+            ExtractKind::Workdays => self.extract_workdays_bool_into(values, unit, utc, out),
+            ExtractKind::Intraday => self.extract_intraday_bool_into(values, unit, utc, out),
+            ExtractKind::WorkdaysIntraday => self.extract_workdays_intraday_bool_into(values, unit, utc, out)
+        }
+    }
+
+    /// 昇順にソートされた入力について，判定がtrueとなる連続した範囲[start, stop)を取得
+    pub fn extract_sorted_ranges(&self, values: &[i64], unit: TimeUnit, utc: bool, kind: ExtractKind) -> Vec<(usize, usize)> {
+        let mut ranges: Vec<(usize, usize)> = Vec::new();
+        self.for_each_sorted_run(values, unit, utc, kind, |start, stop, flag|{
+            if !flag {
+                return;
+            }
+            match ranges.last_mut() {
+                Some(last) if last.1 == start => last.1 = stop,  // 隣接する区間はまとめる
+                _ => ranges.push((start, stop))
+            }
+        });
+        ranges
+    }
+
+    /// 各要素が含まれる営業時間の通し番号(営業日の序数 * 1日の営業時間の数 + 営業時間の番号)をoutに書き込む．
+    /// 営業時間外・NaTはNaT
+    pub fn session_numbers_into(&self, values: &[i64], unit: TimeUnit, utc: bool, out: &mut [i64]) {
+        let session_count = self.border_seconds.len() as i64;
+        for (value, out_number) in values.iter().zip(out.iter_mut()) {
+            *out_number = if *value == NAT {
+                NAT
+            } else {
+                let seconds = if utc {self.local_seconds_from_utc(*value, unit)} else {unit.to_seconds(*value)};
+                let day = seconds.div_euclid(SECONDS_PER_DAY);
+                match self.session_index_of_seconds(seconds.rem_euclid(SECONDS_PER_DAY)) {
+                    Some(session_index) if self.is_workday_day(day) => {
+                        self.workdays_before_day(day) * session_count + session_index as i64
+                    },
+                    _ => NAT
+                }
+            };
+        }
+    }
+
+    /// 各要素が含まれる営業時間について，含まれる最初の営業時間からの番号をcodesに，最初の営業日からの番号をworkday_codesに，
+    /// 営業時間境界における番号をsession_indicesに書き込む．営業時間外・NaTは-1．
+    /// 最初から最後の営業時間までの各営業時間の開始・終了(1970年1月1日からの秒数)と，各営業日(1970年1月1日からの日数)を返す
+    pub fn session_labels_into(
+        &self,
+        values: &[i64],
+        unit: TimeUnit,
+        utc: bool,
+        codes: &mut [i64],
+        workday_codes: &mut [i64],
+        session_indices: &mut [i64]
+    ) -> (Vec<i64>, Vec<i64>, Vec<i64>) {
+        self.session_numbers_into(values, unit, utc, codes);
+        let (first_number, last_number) = codes.iter().filter(|number|{**number != NAT})
+            .fold((i64::MAX, i64::MIN), |(first, last), number|{(first.min(*number), last.max(*number))});
+        if first_number > last_number {  // 営業時間内の要素がない
+            codes.fill(-1);
+            workday_codes.fill(-1);
+            session_indices.fill(-1);
+            return (Vec::new(), Vec::new(), Vec::new());
+        }
+
+        let session_count = self.border_seconds.len() as i64;
+        let first_ordinal = first_number.div_euclid(session_count);
+        for ((code, workday_code), session_index) in codes.iter_mut().zip(workday_codes.iter_mut()).zip(session_indices.iter_mut()) {
+            if *code == NAT {
+                *code = -1;
+                *workday_code = -1;
+                *session_index = -1;
+            } else {
+                *workday_code = code.div_euclid(session_count) - first_ordinal;
+                *session_index = code.rem_euclid(session_count);
+                *code -= first_number;
+            }
+        }
+
+        let workdays: Vec<i64> = (first_ordinal..=last_number.div_euclid(session_count))
+            .map(|ordinal|{self.workday_from_ordinal(ordinal)}).collect();
+        let (session_starts, session_ends): (Vec<i64>, Vec<i64>) = (first_number..=last_number).map(|number|{
+            let day_seconds = workdays[(number.div_euclid(session_count) - first_ordinal) as usize] * SECONDS_PER_DAY;
+            let (start_seconds, end_seconds) = self.border_seconds[number.rem_euclid(session_count) as usize];
+            (day_seconds + start_seconds, day_seconds + end_seconds)
+        }).unzip();
+        (session_starts, session_ends, workdays)
+    }
+
+    /// 各要素に営業日・営業時間を考慮してdeltas(delta_unit単位，1秒未満は切り捨て)を加算し，
+    /// 1970年1月1日からの秒数をoutに書き込む．要素あるいは加算する値がNaTの場合はNaT
+    pub fn add_workday_intraday_into(&self, values: &[i64], unit: TimeUnit, deltas: Broadcast, delta_unit: TimeUnit, out: &mut [i64]) {
+        for (i, (value, out_timestamp)) in values.iter().zip(out.iter_mut()).enumerate() {
+            let delta = deltas.get(i);
+            *out_timestamp = if *value == NAT || delta == NAT {
+                NAT
+            } else {
+                self.add_workday_intraday_timestamp(unit.to_seconds(*value), delta_unit.to_seconds(delta))
+            };
+        }
+    }
+
+    /// 各要素の最近の営業日・営業時間内の日時をunit単位でoutに書き込む．
+    /// 営業時間内の要素はそのまま(1秒未満も保持)，営業時間外の要素は境界となる．NaTはNaTのまま
+    pub fn near_workday_intraday_into(&self, values: &[i64], unit: TimeUnit, is_after: bool, out: &mut [i64]) {
+        let per_second = unit.per_second();
+        for (value, out_value) in values.iter().zip(out.iter_mut()) {
+            *out_value = if *value == NAT {
+                NAT
+            } else {
+                // 境界は秒単位なので，営業時間内かどうかと最近の境界は切り捨てた秒で決まる
+                let timestamp = value.div_euclid(per_second);
+                if self.is_workday_intraday_timestamp(timestamp) {
+                    *value
+                } else {
+                    self.near_workday_intraday_timestamp(timestamp, is_after) * per_second
+                }
+            };
+        }
+    }
+
+    /// starts，endsの各組の営業日・営業時間の時間差をoutにナノ秒単位で書き込む．どちらかがNaTの場合はNaT
+    pub fn timedelta_workdays_intraday_into(&self, starts: &[i64], start_unit: TimeUnit, ends: &[i64], end_unit: TimeUnit, out: &mut [i64]) {
+        for ((start, end), out_delta) in starts.iter().zip(ends.iter()).zip(out.iter_mut()) {
+            *out_delta = if *start == NAT || *end == NAT {
+                NAT
+            } else {
+                self.get_timedelta_workdays_intraday_seconds(start_unit.to_seconds(*start), end_unit.to_seconds(*end)) * 1_000_000_000
+            };
+        }
+    }
+
+    /// 各要素の営業秒をunit単位でoutに書き込む(1秒未満は営業時間内の場合のみ加える)．NaTはNaTのまま
+    pub fn business_time_into(&self, values: &[i64], unit: TimeUnit, out: &mut [i64]) {
+        let per_second = unit.per_second();
+        for (value, out_value) in values.iter().zip(out.iter_mut()) {
+            *out_value = if *value == NAT {
+                NAT
+            } else {
+                let timestamp = value.div_euclid(per_second);
+                let sub_second = if self.is_workday_intraday_timestamp(timestamp) {value.rem_euclid(per_second)} else {0};
+                self.business_seconds_from_timestamp(timestamp) * per_second + sub_second
+            };
+        }
+    }
+
+    /// unit単位の営業秒の各要素をunit単位の1970年1月1日からの時間としてoutに書き込む．NaTはNaTのまま
+    pub fn from_business_time_into(&self, values: &[i64], unit: TimeUnit, out: &mut [i64]) {
+        let per_second = unit.per_second();
+        for (value, out_value) in values.iter().zip(out.iter_mut()) {
+            *out_value = if *value == NAT {
+                NAT
+            } else {
+                self.timestamp_from_business_seconds(value.div_euclid(per_second)) * per_second + value.rem_euclid(per_second)
+            };
+        }
+    }
+
+    // -------------------------------------------------------------------------
+    // 営業日の配列演算(入力は1970年1月1日からのunit単位の整数，出力は日数．NaTはNaTのまま)
+
+    /// 各要素からdays分の次の営業日をoutに書き込む．daysが負の要素は前の営業日
+    pub fn next_workdays_into(&self, values: &[i64], unit: TimeUnit, days: Broadcast, out: &mut [i64]) {
+        for (i, (value, out_day)) in values.iter().zip(out.iter_mut()).enumerate() {
+            *out_day = if *value == NAT {NAT} else {self.next_workday_day(unit.to_day(*value), days.get(i))};
+        }
+    }
+
+    /// 各要素からdays分の前の営業日をoutに書き込む．daysが負の要素は次の営業日
+    pub fn previous_workdays_into(&self, values: &[i64], unit: TimeUnit, days: Broadcast, out: &mut [i64]) {
+        for (i, (value, out_day)) in values.iter().zip(out.iter_mut()).enumerate() {
+            *out_day = if *value == NAT {NAT} else {self.next_workday_day(unit.to_day(*value), -days.get(i))};
+        }
+    }
+
+    /// starts，endsの各組の営業日数をoutに書き込む．どちらかがNaTの場合はNAT
+    pub fn count_workdays_into(&self, starts: &[i64], start_unit: TimeUnit, ends: &[i64], end_unit: TimeUnit, closed: Closed, out: &mut [i64]) {
+        for ((start, end), out_count) in starts.iter().zip(ends.iter()).zip(out.iter_mut()) {
+            *out_count = if *start == NAT || *end == NAT {
+                NAT
+            } else {
+                self.count_workdays_day(start_unit.to_day(*start), end_unit.to_day(*end), closed)
+            };
+        }
+    }
+
+    /// 各要素の営業日の序数をoutに書き込む．NaTの場合はNAT
+    pub fn workday_ordinals_into(&self, values: &[i64], unit: TimeUnit, out: &mut [i64]) {
+        for (value, out_ordinal) in values.iter().zip(out.iter_mut()) {
+            *out_ordinal = if *value == NAT {NAT} else {self.workdays_before_day(unit.to_day(*value))};
+        }
+    }
+
+    /// 各序数の営業日(1970年1月1日からの日数)をoutに書き込む．NATの場合はNaT
+    pub fn workdays_from_ordinals_into(&self, ordinals: &[i64], out: &mut [i64]) {
+        for (ordinal, out_day) in ordinals.iter().zip(out.iter_mut()) {
+            *out_day = if *ordinal == NAT {NAT} else {self.workday_from_ordinal(*ordinal)};
+        }
+    }
+
+    /// 各要素の最近の営業日をoutに書き込む
+    pub fn near_workdays_into(&self, values: &[i64], unit: TimeUnit, is_after: bool, out: &mut [i64]) {
+        for (value, out_day) in values.iter().zip(out.iter_mut()) {
+            *out_day = if *value == NAT {NAT} else {self.near_workday_day(unit.to_day(*value), is_after)};
+        }
+    }
+
+    // -------------------------------------------------------------------------
+    // コンパイル済みカレンダー
+    //
+    // 形式(リトルエンディアン):
+    // マジックナンバー(8) | バージョン(u32) | 長さ(i64) + ソースの指紋 | 開始年(i64) | 終了年(i64) |
+    // 休日曜日のマスク(i64) | 境界の数(i64) + (開始秒, 終了秒)(i64, i64)... | 祝日の数(i64) + 祝日(i64)... |
+    // テーブルの開始日(i64) | テーブルの長さ(i64) + 営業日テーブル(u8)... + 累積の営業日数(i64)...
+
+    /// 祝日(範囲外のものも含む)・休日曜日・営業時間境界と前計算テーブルをバイト列に変換する．
+    /// タイムゾーンは含まない
+    /// Argments
+    /// - fingerprint: 祝日のソースを識別するバイト列．読み込み時に一致を確認する
+    pub fn to_compiled_bytes(&self, fingerprint: &[u8]) -> Vec<u8> {
+        let mut bytes: Vec<u8> = Vec::with_capacity(
+            64 + fingerprint.len() + 8 * (self.source_holidays.len() + self.workday_cumsum.len()) + self.workday_table.len()
+        );
+        let push_i64 = |bytes: &mut Vec<u8>, value: i64|{bytes.extend_from_slice(&value.to_le_bytes())};
+        bytes.extend_from_slice(COMPILED_MAGIC);
+        bytes.extend_from_slice(&COMPILED_VERSION.to_le_bytes());
+        push_i64(&mut bytes, fingerprint.len() as i64);
+        bytes.extend_from_slice(fingerprint);
+        push_i64(&mut bytes, self.start_year as i64);
+        push_i64(&mut bytes, self.end_year as i64);
+        let weekday_mask = self.holiday_weekdays.iter().enumerate()
+            .fold(0_i64, |mask, (i, is_holiday)|{mask | ((*is_holiday as i64) << i)});
+        push_i64(&mut bytes, weekday_mask);
+        push_i64(&mut bytes, self.border_seconds.len() as i64);
+        for (start, end) in self.border_seconds.iter() {
+            push_i64(&mut bytes, *start);
+            push_i64(&mut bytes, *end);
+        }
+        push_i64(&mut bytes, self.source_holidays.len() as i64);
+        for holiday in self.source_holidays.iter() {
+            push_i64(&mut bytes, date_to_day(*holiday));
+        }
+        push_i64(&mut bytes, self.table_start_day);
+        push_i64(&mut bytes, self.workday_table.len() as i64);
+        bytes.extend(self.workday_table.iter().map(|is_workday|{*is_workday as u8}));
+        for cumsum in self.workday_cumsum.iter() {
+            push_i64(&mut bytes, *cumsum);
+        }
+        bytes
+    }
+
+    /// to_compiled_bytesで変換したバイト列から作成する．テーブルは検証してコピーし，計算し直さない．
+    /// バージョンあるいはソースの指紋が一致しない場合はNoneを返し，値やテーブルが矛盾する場合はエラーとする
+    /// Argments
+    /// - bytes: コンパイル済みカレンダーのバイト列(メモリマップしたものなど)．作成後は参照しない
+    /// - fingerprint: 期待するソースの指紋
+    pub fn from_compiled_bytes(bytes: &[u8], fingerprint: &[u8]) -> Result<Option<Self>, Error> {
+        let mut reader = CompiledReader {bytes, position: 0};
+        if reader.take(COMPILED_MAGIC.len())? != COMPILED_MAGIC {
+            return Err(Error::InvalidCompiledCalendar("magic number mismatch".to_string()));
+        }
+        if reader.read_u32()? != COMPILED_VERSION {
+            return Ok(None);
+        }
+        let fingerprint_length = reader.read_length()?;
+        if reader.take(fingerprint_length)? != fingerprint {
+            return Ok(None);
+        }
+
+        let invalid = |message: String|{Error::InvalidCompiledCalendar(message)};
+        let read_year = |reader: &mut CompiledReader| -> Result<i32, Error> {
+            let year = reader.read_i64()?;
+            // 翌年の1月1日まで日付として扱える年のみ
+            i32::try_from(year).ok()
+                .filter(|year|{NaiveDate::from_ymd_opt(*year, 1, 1).is_some() && NaiveDate::from_ymd_opt(*year + 1, 1, 1).is_some()})
+                .ok_or_else(||{Error::InvalidCompiledCalendar(format!("invalid year: {}", year))})
+        };
+        let start_year = read_year(&mut reader)?;
+        let end_year = read_year(&mut reader)?;
+        let weekday_mask = reader.read_i64()?;
+        if weekday_mask & !0b111_1111 != 0 {
+            return Err(invalid(format!("invalid holiday weekday mask: {}", weekday_mask)));
+        }
+        let mut holiday_weekdays = [false; 7];
+        for (i, is_holiday) in holiday_weekdays.iter_mut().enumerate() {
+            *is_holiday = (weekday_mask >> i) & 1 == 1;
+        }
+        // 設定する場合と同じ確認を行う(全曜日が休日のカレンダーでは次の営業日の探索が終わらない)
+        check_holiday_weekdays(&holiday_weekdays).map_err(|error|{invalid(error.to_string())})?;
+
+        let border_length = reader.read_length()?;
+        let border_values = reader.read_i64_vec(border_length * 2)?;
+        let mut intraday_borders: Vec<TimeBorder> = Vec::with_capacity(border_length);
+        for pair in border_values.chunks_exact(2) {
+            let to_time = |seconds: i64|{
+                u32::try_from(seconds).ok()
+                    .and_then(|seconds|{NaiveTime::from_num_seconds_from_midnight_opt(seconds, 0)})
+                    .ok_or_else(||{invalid(format!("invalid border seconds: {}", seconds))})
+            };
+            intraday_borders.push(TimeBorder {start: to_time(pair[0])?, end: to_time(pair[1])?});
+        }
+        // 空の境界は1日の営業時間が0となり，営業時間の秒数からの変換で0除算となる
+        let intraday_borders = sorted_intraday_borders(&intraday_borders).map_err(|error|{invalid(error.to_string())})?;
+
+        let holiday_length = reader.read_length()?;
+        let source_holidays: BTreeSet<NaiveDate> = reader.read_i64_vec(holiday_length)?
+            .into_iter()
+            .map(|day|{day_to_date_opt(day).ok_or_else(||{invalid(format!("invalid holiday: {}", day))})})
+            .collect::<Result<BTreeSet<NaiveDate>, Error>>()?;
+
+        let table_start_day = reader.read_i64()?;
+        let table_length = reader.read_length()?;
+        let workday_table: Vec<bool> = reader.take(table_length)?.iter().map(|byte|{*byte != 0}).collect();
+        let workday_cumsum = reader.read_i64_vec(table_length + 1)?;
+
+        // テーブルは計算し直さずにそのまま利用する
+        let mut calendar = CalendarCore {
+            start_year,
+            end_year,
+            holidays: BTreeSet::new(),
+            source_holidays,
+            holiday_weekdays,
+            intraday_borders,
+            utc_offsets: UtcOffsetTable::default(),
+            border_seconds: Vec::new(),
+            session_offsets: Vec::new(),
+            intraday_seconds_per_day: 0,
+            table_start_day,
+            workday_table,
+            workday_cumsum,
+            version: 0,
+        };
+        calendar.filter_holidays();
+        calendar.rebuild_border_seconds();
+        calendar.check_compiled_tables()?;
+        calendar.update_version();
+        Ok(Some(calendar))
+    }
+
+    /// 読み込んだ前計算テーブルが年の範囲・祝日・休日曜日と一致することを確認する．
+    /// 各日が営業日であるのは休日曜日でも祝日でもない場合に限り，累積の営業日数はテーブルと一致する必要がある
+    fn check_compiled_tables(&self) -> Result<(), Error> {
+        let invalid = |message: &str|{Err(Error::InvalidCompiledCalendar(message.to_string()))};
+        let (table_start_day, table_end_day) = self.table_day_range();
+        if self.table_start_day != table_start_day || self.workday_table.len() as i64 != table_end_day - table_start_day {
+            return invalid("table range does not match the year range");
+        }
+        if self.workday_cumsum.first() != Some(&0) {
+            return invalid("workday cumsum must start with 0");
+        }
+        let is_consistent = self.workday_table.iter().zip(self.workday_cumsum.windows(2))
+            .all(|(is_workday, cumsum_pair)|{cumsum_pair[1] - cumsum_pair[0] == *is_workday as i64});
+        if !is_consistent {
+            return invalid("workday cumsum does not match the workday table");
+        }
+        if self.workday_flags(table_start_day, table_end_day) != self.workday_table {
+            return invalid("workday table does not match the holidays and holiday weekdays");
+        }
+        Ok(())
+    }
+
+    /// タイムゾーンのみを残して，他のカレンダーの祝日・休日曜日・営業時間境界と前計算テーブルに置き換える
+    pub fn replace_keeping_timezone(&mut self, calendar: CalendarCore) {
+        let utc_offsets = std::mem::take(&mut self.utc_offsets);
+        *self = calendar;
+        self.utc_offsets = utc_offsets;
+    }
+
+    /// calendarのタイムゾーンを引き継いだカレンダー(replace_keeping_timezoneの新しいカレンダーを作成する版)
+    pub fn with_timezone_of(mut self, calendar: &CalendarCore) -> CalendarCore {
+        self.utc_offsets = calendar.utc_offsets.clone();
+        self
+    }
+}
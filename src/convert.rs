@@ -1,86 +1,151 @@
-use chrono::{NaiveDate, Datelike, NaiveTime, NaiveDateTime, Timelike, Duration};
-use pyo3::prelude::*;
-use pyo3::types::{PyDate, PyDateAccess, PyDateTime, PyTime, PyTimeAccess, PyDelta, PyDeltaAccess};
-
-pub fn date_py_to_chrono(py_date: &PyDate) -> NaiveDate {
-    NaiveDate::from_ymd(
-        py_date.get_year(),
-        py_date.get_month() as u32,
-        py_date.get_day() as u32
-    )
-}
-
-pub fn date_chrono_to_py<'p>(py:Python<'p>, chrono_date: NaiveDate) -> &'p PyDate {
-    PyDate::new(
-        py,
-        chrono_date.year(), 
-        chrono_date.month() as u8, 
-        chrono_date.day() as u8
-    ).unwrap()
-}
-
-pub fn time_py_to_chrono(py_time: &PyTime) -> NaiveTime {
-    NaiveTime::from_hms(
-        py_time.get_hour() as u32,
-        py_time.get_minute() as u32,
-        py_time.get_second() as u32
-    )
-}
-
-pub fn time_chrono_to_py<'p>(py: Python<'p>, chrono_time: NaiveTime) -> &'p PyTime {
-    PyTime::new(
-        py,
-        chrono_time.hour() as u8, 
-        chrono_time.minute() as u8, 
-        chrono_time.second() as u8,
-        0_u32,
-        None
-    ).unwrap()
-}
-
-
-pub fn datetime_py_to_chrono(py_datetime: &PyDateTime) -> NaiveDateTime {
-    NaiveDateTime::new(
-        NaiveDate::from_ymd(
-            py_datetime.get_year(),
-            py_datetime.get_month() as u32,
-            py_datetime.get_day() as u32
-        ),
-        NaiveTime::from_hms(
-            py_datetime.get_hour() as u32,
-            py_datetime.get_minute() as u32,
-            py_datetime.get_second() as u32
-        )
-    )
-}
-
-pub fn datetime_chrono_to_py<'p>(py: Python<'p>, chrono_datetime: NaiveDateTime) -> &'p PyDateTime {
-    PyDateTime::new(
-        py,
-        chrono_datetime.year(),
-        chrono_datetime.month() as u8,
-        chrono_datetime.day() as u8,
-        chrono_datetime.hour() as u8,
-        chrono_datetime.minute() as u8,
-        chrono_datetime.second() as u8,
-        0_u32,
-        None
-    ).unwrap()
-}
-
-pub fn duration_py_to_chrono(py_delta: &PyDelta) -> Duration {
-    Duration::days(py_delta.get_days() as i64) +
-    Duration::seconds(py_delta.get_seconds() as i64)
-}
-
-pub fn duration_chrono_to_py<'p>(py: Python<'p>, duration: Duration) -> &PyDelta {
-    let days = duration.num_days();
-    let seconds = duration.num_seconds() - days * 24_i64 * 3600_i64;
-    PyDelta::new(
-        py,
-        days as i32,
-        seconds as i32,
-        0_i32,
-        true
-    ).unwrap()
-}
\ No newline at end of file
+use std::collections::{HashSet, HashMap};
+use chrono::{NaiveDate, Datelike, NaiveTime, NaiveDateTime, Timelike, Duration, Weekday};
+use pyo3::prelude::*;
+use pyo3::buffer::PyBuffer;
+use pyo3::types::{PyDate, PyDateAccess, PyDateTime, PyTime, PyTimeAccess, PyDelta, PyDeltaAccess};
+use numpy::PyArray;
+use num_traits::cast::FromPrimitive;
+
+use crate::calendar::{TimeBorder, day_to_date};
+use crate::error::Error;
+
+pub fn date_py_to_chrono(py_date: &PyDate) -> NaiveDate {
+    NaiveDate::from_ymd(
+        py_date.get_year(),
+        py_date.get_month() as u32,
+        py_date.get_day() as u32
+    )
+}
+
+pub fn date_chrono_to_py<'p>(py:Python<'p>, chrono_date: NaiveDate) -> &'p PyDate {
+    PyDate::new(
+        py,
+        chrono_date.year(), 
+        chrono_date.month() as u8, 
+        chrono_date.day() as u8
+    ).unwrap()
+}
+
+pub fn time_py_to_chrono(py_time: &PyTime) -> NaiveTime {
+    NaiveTime::from_hms(
+        py_time.get_hour() as u32,
+        py_time.get_minute() as u32,
+        py_time.get_second() as u32
+    )
+}
+
+pub fn time_chrono_to_py<'p>(py: Python<'p>, chrono_time: NaiveTime) -> &'p PyTime {
+    PyTime::new(
+        py,
+        chrono_time.hour() as u8, 
+        chrono_time.minute() as u8, 
+        chrono_time.second() as u8,
+        0_u32,
+        None
+    ).unwrap()
+}
+
+
+pub fn datetime_py_to_chrono(py_datetime: &PyDateTime) -> NaiveDateTime {
+    NaiveDateTime::new(
+        NaiveDate::from_ymd(
+            py_datetime.get_year(),
+            py_datetime.get_month() as u32,
+            py_datetime.get_day() as u32
+        ),
+        NaiveTime::from_hms(
+            py_datetime.get_hour() as u32,
+            py_datetime.get_minute() as u32,
+            py_datetime.get_second() as u32
+        )
+    )
+}
+
+pub fn datetime_chrono_to_py<'p>(py: Python<'p>, chrono_datetime: NaiveDateTime) -> &'p PyDateTime {
+    PyDateTime::new(
+        py,
+        chrono_datetime.year(),
+        chrono_datetime.month() as u8,
+        chrono_datetime.day() as u8,
+        chrono_datetime.hour() as u8,
+        chrono_datetime.minute() as u8,
+        chrono_datetime.second() as u8,
+        0_u32,
+        None
+    ).unwrap()
+}
+
+pub fn duration_py_to_chrono(py_delta: &PyDelta) -> Duration {
+    Duration::days(py_delta.get_days() as i64) +
+    Duration::seconds(py_delta.get_seconds() as i64)
+}
+
+pub fn duration_chrono_to_py<'p>(py: Python<'p>, duration: Duration) -> &PyDelta {
+    let days = duration.num_days();
+    let seconds = duration.num_seconds() - days * 24_i64 * 3600_i64;
+    PyDelta::new(
+        py,
+        days as i32,
+        seconds as i32,
+        0_i32,
+        true
+    ).unwrap()
+}
+
+pub fn weekdays_py_to_chrono(holiday_weekday_numbers: &HashSet<usize>) -> Result<HashSet<Weekday>, Error> {
+    holiday_weekday_numbers.iter()
+        .map(|day_number|{
+            Weekday::from_usize(*day_number)
+                .ok_or(Error::InvalidHolidayWeekdays(format!("{} is not weekday number", day_number)))
+        }).collect::<Result<HashSet<Weekday>, Error>>()
+}
+
+pub fn borders_py_to_chrono(intraday_borders: &[HashMap<&str, &PyTime>]) -> Result<Vec<TimeBorder>, Error> {
+    intraday_borders.iter()
+        .map(|dict|{
+            let start_time = dict.get(&"start")
+                .ok_or(Error::ArgKeyError{arg_name: "intraday_borders".to_string(), key_name: "start".to_string()})?;
+            let end_time = dict.get(&"end")
+                .ok_or(Error::ArgKeyError{arg_name: "intraday_borders".to_string(), key_name: "end".to_string()})?;
+            Ok(
+                TimeBorder {
+                    start: time_py_to_chrono(*start_time),
+                    end: time_py_to_chrono(*end_time)
+                }
+            )
+        }).collect::<Result<Vec<TimeBorder>, Error>>()
+}
+
+pub fn borders_chrono_to_py<'p>(py: Python<'p>, intraday_borders: &[TimeBorder]) -> Vec<HashMap<String, &'p PyTime>> {
+    intraday_borders.iter()
+        .map(|border|{
+            let mut border_map: HashMap<String, &PyTime> = HashMap::new();
+            border_map.insert("start".to_string(), time_chrono_to_py(py, border.start));
+            border_map.insert("end".to_string(), time_chrono_to_py(py, border.end));
+            border_map
+        }).collect::<Vec<_>>()
+}
+
+/// 1970年1月1日からの日数のベクターを，datetime.dateのリストあるいはdatetime64[D]のndarrayに変換する．
+/// ndarrayの場合はベクターをそのまま利用し，要素ごとのPythonオブジェクトを作らない
+pub fn days_to_py_output(py: Python, days: Vec<i64>, as_array: bool) -> PyResult<PyObject> {
+    if as_array {
+        let days_numpy = PyArray::from_vec(py, days);
+        Ok(days_numpy.call_method1("view", ("datetime64[D]",))?.into())
+    } else {
+        let dates = days.into_iter().map(|day|{date_chrono_to_py(py, day_to_date(day))}).collect::<Vec<&PyDate>>();
+        Ok(dates.into_py(py))
+    }
+}
+
+/// バイト列のバッファ(bytes，mmapなど)をコピーせずにスライスとして参照する
+pub fn buffer_as_bytes<'a>(buffer: &'a PyBuffer<u8>, arg_name: &str) -> Result<&'a [u8], Error> {
+    if !buffer.is_c_contiguous() {
+        return Err(Error::ArgNotContiguousError{arg_name: arg_name.to_string()});
+    }
+    if buffer.len_bytes() == 0 {
+        return Ok(&[]);
+    }
+    // 連続したバッファであり，bufferを保持している間は解放されない
+    Ok(unsafe { std::slice::from_raw_parts(buffer.buf_ptr() as *const u8, buffer.len_bytes()) })
+}
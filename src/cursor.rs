@@ -0,0 +1,165 @@
+use pyo3::prelude::*;
+use pyo3::types::PyDateTime;
+use numpy::{PyArray, PyReadonlyArray, Ix1};
+
+use crate::calendar::{datetime_to_timestamp, timestamp_to_datetime, CalendarCore, SessionState, TimeUnit, NAT};
+use crate::convert::*;
+use crate::error::Error;
+use crate::extract::{check_sub_day_unit, prepare_output};
+use crate::py_calendar::PyCalendar;
+use crate::{default_calendar, load_default_calendar};
+
+/// 単調増加する日時(ライブのティックなど)について，営業日・営業時間内かどうかと次の営業時間境界を判定するカーソル．
+/// 次の営業時間境界までの状態を保持し，境界を越えたときとカレンダーが変更されたときのみ再計算する
+#[pyclass(name = "SessionCursor")]
+pub struct PySessionCursor {
+    calendar: Option<Py<PyCalendar>>,
+    state: Option<SessionState>,
+    timestamp: i64
+}
+
+impl PySessionCursor {
+    /// 利用するカレンダーでfを呼ぶ．calendarがNoneの場合はデフォルトのカレンダー
+    fn with_core<T, F>(&self, py: Python, f: F) -> Result<T, Error>
+    where F: FnOnce(&CalendarCore) -> T {
+        match &self.calendar {
+            Some(calendar) => Ok(f(&calendar.borrow(py).core.load())),
+            None => {
+                load_default_calendar()?;
+                Ok(f(&default_calendar()))
+            }
+        }
+    }
+
+    /// タイムスタンプ(1970年1月1日からの秒数)に進める
+    fn advance(&mut self, py: Python, timestamp: i64) -> Result<SessionState, Error> {
+        let state = self.state;
+        let state = self.with_core(py, |core|{
+            match state {
+                Some(state) if state.contains(timestamp, core.version()) => state,
+                _ => core.session_state(timestamp)
+            }
+        })?;
+        self.state = Some(state);
+        self.timestamp = timestamp;
+        Ok(state)
+    }
+
+    /// 現在の状態．一度も進めていない場合はエラー
+    fn current_state(&self) -> Result<SessionState, Error> {
+        self.state.ok_or(Error::CursorNotStartedError)
+    }
+}
+
+#[pymethods]
+impl PySessionCursor {
+    /// カーソルの作成
+    /// Argments
+    /// - calendar: 利用するカレンダー．Noneの場合はモジュールの設定
+    #[new]
+    #[args(calendar="None")]
+    fn new(calendar: Option<Py<PyCalendar>>) -> Self {
+        PySessionCursor {calendar, state: None, timestamp: NAT}
+    }
+
+    /// 日時に進め，営業日・営業時間内であるかどうかを返す(1秒未満は切り捨て)
+    /// Argments
+    /// - select_datetime: 日時．awareの場合はそのタイムゾーンのローカル時間として扱う
+    ///
+    /// Return
+    /// 営業日・営業時間内であるかどうか
+    fn update(&mut self, py: Python, select_datetime: &PyDateTime) -> Result<bool, Error> {
+        let timestamp = datetime_to_timestamp(datetime_py_to_chrono(select_datetime));
+        Ok(self.advance(py, timestamp)?.is_intraday)
+    }
+
+    /// 1970年1月1日からのunit単位の整数(datetime64をint64としたもの)に進め，営業日・営業時間内であるかどうかを返す．
+    /// datetimeを作成しない分updateより速い
+    /// Argments
+    /// - value: 1970年1月1日からのunit単位の整数
+    /// - unit: valueの時間単位("s", "ms", "us", "ns")
+    ///
+    /// Return
+    /// 営業日・営業時間内であるかどうか
+    #[args(unit="\"s\"")]
+    fn update_timestamp(&mut self, py: Python, value: i64, unit: &str) -> Result<bool, Error> {
+        check_sub_day_unit(unit)?;
+        let timestamp = TimeUnit::from_str(unit)?.to_seconds(value);
+        Ok(self.advance(py, timestamp)?.is_intraday)
+    }
+
+    /// np.datetime64のndarray(マイクロバッチ)の各要素に順に進め，営業日・営業時間内であるかどうかを一括で取得．
+    /// カーソルは最後の要素(NaTを除く)に進む
+    /// Argments
+    /// - int_64_numpy: 日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+    /// - unit: int_64_numpyの時間単位("s", "ms", "us", "ns")
+    ///
+    /// Return
+    /// ブールのndarray．NaTはFalse
+    #[args(unit="\"s\"")]
+    fn update_array<'p>(
+        &mut self,
+        py: Python<'p>,
+        int_64_numpy: PyReadonlyArray<i64,Ix1>,
+        unit: &str
+    ) -> Result<&'p PyArray<bool,Ix1>, Error> {
+        check_sub_day_unit(unit)?;
+        let unit = TimeUnit::from_str(unit)?;
+        let values = int_64_numpy.as_slice()
+            .map_err(|_|{Error::ArgNotContiguousError{arg_name: "int_64_numpy".to_string()}})?;
+        let out = prepare_output::<bool>(py, values.len(), None)?;
+        let out_slice = unsafe {out.as_slice_mut()}
+            .map_err(|_|{Error::ArgNotContiguousError{arg_name: "out".to_string()}})?;
+
+        let (mut state, mut timestamp) = (self.state, self.timestamp);
+        self.with_core(py, |core|{
+            let version = core.version();
+            for (value, flag) in values.iter().zip(out_slice.iter_mut()) {
+                if *value == NAT {
+                    *flag = false;
+                    continue;
+                }
+                timestamp = unit.to_seconds(*value);
+                let current = match state {
+                    Some(current) if current.contains(timestamp, version) => current,
+                    _ => core.session_state(timestamp)
+                };
+                *flag = current.is_intraday;
+                state = Some(current);
+            }
+        })?;
+        self.state = state;
+        self.timestamp = timestamp;
+        Ok(out)
+    }
+
+    /// 最後に進めた日時が営業日・営業時間内であるかどうか
+    #[getter]
+    fn is_intraday(&self) -> Result<bool, Error> {
+        Ok(self.current_state()?.is_intraday)
+    }
+
+    /// 最後に進めた日時から次の営業時間境界までの秒数
+    #[getter]
+    fn seconds_to_next_border(&self) -> Result<i64, Error> {
+        Ok(self.current_state()?.next_border - self.timestamp)
+    }
+
+    /// 最後に進めた日時より後の最初の営業時間境界
+    /// Returns
+    /// - 境界のdatetime
+    /// - 状態を示す文字列
+    ///     - 'border_start': 営業時間の開始
+    ///     - 'border_end': 営業時間の終了
+    #[getter]
+    fn next_border<'p>(&self, py: Python<'p>) -> Result<(&'p PyDateTime, String), Error> {
+        let state = self.current_state()?;
+        Ok((datetime_chrono_to_py(py, timestamp_to_datetime(state.next_border)), state.next_symbol.to_string()))
+    }
+
+    /// 保持している状態を破棄する
+    fn reset(&mut self) {
+        self.state = None;
+        self.timestamp = NAT;
+    }
+}
@@ -1,8 +1,47 @@
-#[derive(thiserror::Error, Debug)]
-pub enum Error {
-    #[error(transparent)]
-    RsWorkdaysError(#[from] rs_workdays::Error),
-
-    #[error("key error for argment: {arg_name:?}, key:{key_name:?}")]
-    ArgKeyError{arg_name: String, key_name: String},
-}
\ No newline at end of file
+#[derive(thiserror::Error, Debug)]
+pub enum Error {
+    #[error(transparent)]
+    RsWorkdaysError(#[from] rs_workdays::Error),
+
+    #[error(transparent)]
+    IoError(#[from] std::io::Error),
+
+    #[error("key error for argment: {arg_name:?}, key:{key_name:?}")]
+    ArgKeyError{arg_name: String, key_name: String},
+
+    #[error("array must be contiguous: {arg_name:?}")]
+    ArgNotContiguousError{arg_name: String},
+
+    #[error("length mismatch for argment: {arg_name:?}, expected:{expected}, actual:{actual}")]
+    ArgLengthError{arg_name: String, expected: usize, actual: usize},
+
+    #[error("invalid type for argment: {arg_name:?}, expected:{expected}")]
+    ArgTypeError{arg_name: String, expected: String},
+
+    #[error("invalid value for argment: {arg_name:?}, {message}")]
+    ArgValueError{arg_name: String, message: String},
+
+    #[error("unknown time unit: {unit:?}")]
+    ArgTimeUnitError{unit: String},
+
+    #[error("invalid holiday weekdays: {0}")]
+    InvalidHolidayWeekdays(String),
+
+    #[error("invalid intraday borders: {0}")]
+    InvalidIntradayBorders(String),
+
+    #[error("invalid utc offset table: {0}")]
+    InvalidUtcOffsetTable(String),
+
+    #[error("invalid compiled calendar: {0}")]
+    InvalidCompiledCalendar(String),
+
+    #[error("failed to load the default calendar: {0}")]
+    DefaultCalendarLoadError(String),
+
+    #[error("timezone of the calendar is not set")]
+    TimezoneNotSetError,
+
+    #[error("cursor has not been updated yet")]
+    CursorNotStartedError,
+}
@@ -0,0 +1,269 @@
+use pyo3::prelude::*;
+use chrono::NaiveDate;
+use numpy::{Element, PyArray, PyReadonlyArray, Ix1};
+
+use crate::calendar::{day_to_date_opt, Broadcast, CalendarCore, TimeUnit, NAT};
+use crate::error::Error;
+use crate::parallel::{fill_chunks, fill_chunks_with_offset};
+
+/// 出力するndarrayを用意する．outが与えられた場合は長さを確認してそのまま利用する
+pub fn prepare_output<'p, T: Element>(
+    py: Python<'p>,
+    length: usize,
+    out: Option<&'p PyArray<T, Ix1>>
+) -> Result<&'p PyArray<T, Ix1>, Error> {
+    match out {
+        Some(out) => {
+            if out.len() != length {
+                return Err(Error::ArgLengthError{arg_name: "out".to_string(), expected: length, actual: out.len()});
+            }
+            Ok(out)
+        },
+        None => {
+            // 未初期化の領域をスライスとして扱うとboolでは未定義動作になるため，0で確保する(callocなのでほぼ無償)
+            Ok(PyArray::<T, Ix1>::zeros(py, length, false))
+        }
+    }
+}
+
+/// int64のndarrayをコピーせずに読み，結果をブールのndarrayに直接書き込む．
+/// GILを解放し，長い入力は分割して並列に処理する
+/// Argments
+/// - int_64_numpy: 1970年1月1日からのunit単位の整数のndarray(datetime64をviewしたもの)
+/// - unit: 時間単位
+/// - out: 書き込み先のndarray．Noneの場合は新しく作成する
+/// - kernel: 書き込みを行う関数(要素ごとに独立であること)
+pub fn extract_bool_into<'p, F>(
+    py: Python<'p>,
+    int_64_numpy: &PyReadonlyArray<i64, Ix1>,
+    unit: &str,
+    out: Option<&'p PyArray<bool, Ix1>>,
+    kernel: F
+) -> Result<&'p PyArray<bool, Ix1>, Error>
+where F: Fn(&[i64], TimeUnit, &mut [bool]) + Send + Sync {
+    let unit = TimeUnit::from_str(unit)?;
+    let values = int_64_numpy.as_slice()
+        .map_err(|_|{Error::ArgNotContiguousError{arg_name: "int_64_numpy".to_string()}})?;
+    let out = prepare_output(py, values.len(), out)?;
+    let out_slice = unsafe {out.as_slice_mut()}
+        .map_err(|_|{Error::ArgNotContiguousError{arg_name: "out".to_string()}})?;
+    py.allow_threads(move ||{
+        fill_chunks(values, out_slice, |value_chunk, out_chunk|{kernel(value_chunk, unit, out_chunk)})
+    });
+    Ok(out)
+}
+
+/// int64のndarrayをコピーせずに読み，結果を新しいint64のndarrayに書き込む．
+/// GILを解放し，長い入力は分割して並列に処理する
+/// Argments
+/// - int_64_numpy: 1970年1月1日からのunit単位の整数のndarray(datetime64をviewしたもの)
+/// - unit: 時間単位
+/// - kernel: 書き込みを行う関数(要素ごとに独立であること)．分割した範囲の先頭のインデックスも受け取る
+pub fn map_i64_into<'p, F>(
+    py: Python<'p>,
+    int_64_numpy: &PyReadonlyArray<i64, Ix1>,
+    unit: &str,
+    kernel: F
+) -> Result<&'p PyArray<i64, Ix1>, Error>
+where F: Fn(usize, &[i64], TimeUnit, &mut [i64]) + Send + Sync {
+    let unit = TimeUnit::from_str(unit)?;
+    let values = int_64_numpy.as_slice()
+        .map_err(|_|{Error::ArgNotContiguousError{arg_name: "int_64_numpy".to_string()}})?;
+    let out = prepare_output::<i64>(py, values.len(), None)?;
+    let out_slice = unsafe {out.as_slice_mut()}
+        .map_err(|_|{Error::ArgNotContiguousError{arg_name: "out".to_string()}})?;
+    py.allow_threads(move ||{
+        fill_chunks_with_offset(values, out_slice, |offset, value_chunk, out_chunk|{kernel(offset, value_chunk, unit, out_chunk)})
+    });
+    Ok(out)
+}
+
+/// ソートされたint64のndarrayをコピーせずに読み，GILを解放してkernelで求めた範囲[start, stop)を
+/// 開始・終了を交互に並べたint64のndarrayとして返す
+/// Argments
+/// - int_64_numpy: 1970年1月1日からのunit単位の整数のndarray(datetime64をviewしたもの)
+/// - unit: 時間単位
+/// - kernel: 範囲を求める関数
+pub fn sorted_ranges_to_py<'p, F>(
+    py: Python<'p>,
+    int_64_numpy: &PyReadonlyArray<i64, Ix1>,
+    unit: &str,
+    kernel: F
+) -> Result<&'p PyArray<i64, Ix1>, Error>
+where F: FnOnce(&[i64], TimeUnit) -> Vec<(usize, usize)> + Send {
+    let unit = TimeUnit::from_str(unit)?;
+    let values = int_64_numpy.as_slice()
+        .map_err(|_|{Error::ArgNotContiguousError{arg_name: "int_64_numpy".to_string()}})?;
+    let flat_ranges: Vec<i64> = py.allow_threads(move ||{
+        let ranges = kernel(values, unit);
+        let mut flat_ranges: Vec<i64> = Vec::with_capacity(ranges.len() * 2);
+        for (start, stop) in ranges.into_iter() {
+            flat_ranges.push(start as i64);
+            flat_ranges.push(stop as i64);
+        }
+        flat_ranges
+    });
+    Ok(PyArray::from_vec(py, flat_ranges))
+}
+
+/// int64のndarrayをコピーせずに読み，GILを解放してkernelで同じ長さの3つの新しいint64のndarrayに書き込む．
+/// 要素ごとに独立でない処理のため分割しない
+/// Argments
+/// - int_64_numpy: 1970年1月1日からのunit単位の整数のndarray(datetime64をviewしたもの)
+/// - unit: 時間単位
+/// - kernel: 書き込みを行う関数．戻り値はそのまま返す
+pub fn map_i64_into_three<'p, F, R>(
+    py: Python<'p>,
+    int_64_numpy: &PyReadonlyArray<i64, Ix1>,
+    unit: &str,
+    kernel: F
+) -> Result<([&'p PyArray<i64, Ix1>; 3], R), Error>
+where F: FnOnce(&[i64], TimeUnit, &mut [i64], &mut [i64], &mut [i64]) -> R + Send, R: Send {
+    let unit = TimeUnit::from_str(unit)?;
+    let values = int_64_numpy.as_slice()
+        .map_err(|_|{Error::ArgNotContiguousError{arg_name: "int_64_numpy".to_string()}})?;
+    let outs = [
+        prepare_output::<i64>(py, values.len(), None)?,
+        prepare_output::<i64>(py, values.len(), None)?,
+        prepare_output::<i64>(py, values.len(), None)?
+    ];
+    let out_slices = unsafe {(outs[0].as_slice_mut(), outs[1].as_slice_mut(), outs[2].as_slice_mut())};
+    let (first_slice, second_slice, third_slice) = match out_slices {
+        (Ok(first_slice), Ok(second_slice), Ok(third_slice)) => (first_slice, second_slice, third_slice),
+        _ => return Err(Error::ArgNotContiguousError{arg_name: "out".to_string()})
+    };
+    let returned = py.allow_threads(move ||{kernel(values, unit, first_slice, second_slice, third_slice)});
+    Ok((outs, returned))
+}
+
+/// 長さlengthの新しいint64のndarrayを作成し，GILを解放してkernelで書き込む
+/// Argments
+/// - length: 作成するndarrayの長さ
+/// - kernel: すべての要素を書き込む関数
+pub fn fill_i64_into<'p, F>(
+    py: Python<'p>,
+    length: usize,
+    kernel: F
+) -> Result<&'p PyArray<i64, Ix1>, Error>
+where F: FnOnce(&mut [i64]) + Send {
+    let out = prepare_output::<i64>(py, length, None)?;
+    let out_slice = unsafe {out.as_slice_mut()}
+        .map_err(|_|{Error::ArgNotContiguousError{arg_name: "out".to_string()}})?;
+    py.allow_threads(move ||{kernel(out_slice)});
+    Ok(out)
+}
+
+/// 格子の間隔(秒)が正であることを確認する
+pub fn check_freq_seconds(freq_seconds: i64) -> Result<(), Error> {
+    if freq_seconds <= 0 {
+        return Err(Error::ArgValueError{arg_name: "freq_seconds".to_string(), message: "must be positive".to_string()});
+    }
+    Ok(())
+}
+
+/// 通し番号の範囲[first, last)のoffset番目からlength個(Noneの場合は最後まで)を切り出す
+/// Return
+/// - (先頭の通し番号, 要素数)
+pub fn slice_index_range(first: i64, last: i64, offset: usize, length: Option<usize>) -> (i64, usize) {
+    let range_length = (last - first) as usize;
+    let offset = offset.min(range_length);
+    let length = length.unwrap_or(range_length).min(range_length - offset);
+    (first + offset as i64, length)
+}
+
+/// datetime64のndarrayをコピーせずに読み，祝日のリストに変換する．NaTは無視し，日単位より細かい値は日付に切り捨てる
+/// Argments
+/// - int_64_numpy: 祝日のndarray(datetime64をint64としてviewしたもの)
+/// - unit: int_64_numpyの時間単位("D", "s", "ms", "us", "ns")
+pub fn holidays_from_int64(int_64_numpy: &PyReadonlyArray<i64, Ix1>, unit: &str) -> Result<Vec<NaiveDate>, Error> {
+    let unit = TimeUnit::from_str(unit)?;
+    let values = int_64_numpy.as_slice()
+        .map_err(|_|{Error::ArgNotContiguousError{arg_name: "int_64_numpy".to_string()}})?;
+    values.iter()
+        .filter(|value|{**value != NAT})
+        .map(|value|{
+            day_to_date_opt(unit.to_day(*value)).ok_or_else(||{
+                Error::ArgValueError{arg_name: "int_64_numpy".to_string(), message: format!("date out of range: {}", value)}
+            })
+        })
+        .collect()
+}
+
+/// 1秒単位以下の時間単位("s", "ms", "us", "ns")であることを確認する
+pub fn check_sub_day_unit(unit: &str) -> Result<(), Error> {
+    match TimeUnit::from_str(unit)? {
+        TimeUnit::Day => Err(Error::ArgTimeUnitError{unit: unit.to_string()}),
+        _ => Ok(())
+    }
+}
+
+/// 値をUTCとして扱う場合に，カレンダーのタイムゾーンが設定されていることを確認する
+pub fn check_utc_timezone(core: &CalendarCore, utc: bool) -> Result<(), Error> {
+    if utc && !core.has_timezone() {
+        return Err(Error::TimezoneNotSetError);
+    }
+    Ok(())
+}
+
+/// 入力と対になるint64のndarrayをコピーせずにスライスとして読む
+/// Argments
+/// - end_int_64_numpy: 入力と対になるndarray
+/// - length: 入力の長さ．一致する必要がある
+pub fn end_slice<'a>(end_int_64_numpy: &'a PyReadonlyArray<i64, Ix1>, length: usize) -> Result<&'a [i64], Error> {
+    let ends = end_int_64_numpy.as_slice()
+        .map_err(|_|{Error::ArgNotContiguousError{arg_name: "end_int_64_numpy".to_string()}})?;
+    if ends.len() != length {
+        return Err(Error::ArgLengthError{arg_name: "end_int_64_numpy".to_string(), expected: length, actual: ends.len()});
+    }
+    Ok(ends)
+}
+
+/// extract_broadcastの結果．ndarrayの借用を保持する
+pub enum BroadcastArg<'a> {
+    Scalar(i64),
+    PerElement(PyReadonlyArray<'a, i64, Ix1>)
+}
+
+impl<'a> BroadcastArg<'a> {
+    /// calendar::Broadcastとして参照する(連続であることはextract_broadcastで確認済み)
+    pub fn as_broadcast(&self) -> Result<Broadcast, Error> {
+        match self {
+            BroadcastArg::Scalar(value) => Ok(Broadcast::Scalar(*value)),
+            BroadcastArg::PerElement(values_numpy) => {
+                let values = values_numpy.as_slice()
+                    .map_err(|_|{Error::ArgNotContiguousError{arg_name: "broadcast".to_string()}})?;
+                Ok(Broadcast::PerElement(values))
+            }
+        }
+    }
+}
+
+/// スカラーあるいは要素ごとのint64のndarrayとして与えられた引数を読む
+/// Argments
+/// - arg: intあるいはint64のndarray
+/// - arg_name: エラーに表示する引数名
+/// - default: argがNoneの場合の値
+/// - length: 入力の長さ．ndarrayの場合は長さが一致する必要がある
+pub fn extract_broadcast<'a>(
+    arg: Option<&'a PyAny>,
+    arg_name: &str,
+    default: i64,
+    length: usize
+) -> Result<BroadcastArg<'a>, Error> {
+    let arg = match arg {
+        Some(arg) => arg,
+        None => return Ok(BroadcastArg::Scalar(default))
+    };
+    if let Ok(value) = arg.extract::<i64>() {
+        return Ok(BroadcastArg::Scalar(value));
+    }
+    let values_numpy: PyReadonlyArray<i64, Ix1> = arg.extract()
+        .map_err(|_|{Error::ArgTypeError{arg_name: arg_name.to_string(), expected: "int or int64 ndarray".to_string()}})?;
+    if values_numpy.len() != length {
+        return Err(Error::ArgLengthError{arg_name: arg_name.to_string(), expected: length, actual: values_numpy.len()});
+    }
+    if !values_numpy.is_contiguous() {
+        return Err(Error::ArgNotContiguousError{arg_name: arg_name.to_string()});
+    }
+    Ok(BroadcastArg::PerElement(values_numpy))
+}
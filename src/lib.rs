@@ -1,522 +1,1093 @@
-use std::collections::{HashSet, HashMap};
-use chrono::Weekday;
-
-use pyo3::prelude::*;
-use pyo3::wrap_pyfunction;
-use pyo3::types::{PyDate, PyDateTime, PyTime, PyDelta};
-use pyo3::create_exception;
-use numpy::{IntoPyArray, PyArray, PyReadonlyArray, Ix1};
-use numpy::ndarray::{Array};
-
-use chrono::{NaiveDate, NaiveDateTime};
-use num_traits::cast::FromPrimitive;
-
-mod convert;
-mod error;
-
-use crate::convert::*;
-use crate::error::Error;
-
-// PyErrとしてPyWorkdaysErrorを定義
-create_exception!(module, PyWorkdaysError, pyo3::exceptions::PyException);
-
-// crate::error::ErrorをPyErrに変換できるようにする(pyfunctionが認識できる)
-impl std::convert::From<Error> for PyErr {
-    fn from(err: Error) -> PyErr {
-        PyWorkdaysError::new_err(err.to_string())
-    }
-}
-
-/// csvを読み込んで利用できる祝日の更新をする  
-/// Argments
-/// - holidays_csv_paths: csvのパス
-/// - start_year: 利用する開始年(その年の1月1日から)
-/// - end_year: 利用する終了年(その年の12月31日まで)
-#[pyfunction]
-fn set_holidays_csvs(
-    holidays_csv_paths: Vec<String>, 
-    start_year: i32, 
-    end_year: i32
-) -> Result<(), Error> {
-    rs_workdays::set_holidays_csvs(&holidays_csv_paths, start_year, end_year)?;
-    Ok(())
-}
-
-/// 祝日のリストから祝日の更新をする  
-/// Argments
-/// - holidays: 祝日のリスト
-/// - start_year: 利用する開始年(その年の1月1日から)
-/// - end_year: 利用する終了年(その年の12月31日まで)
-#[pyfunction]
-fn set_range_holidays(
-    holidays: Vec<&PyDate>, 
-    start_year: i32, 
-    end_year: i32
-) -> Result<(), Error> {
-    let holidays: Vec<NaiveDate> = holidays.iter()
-        .map(|py_date|{date_py_to_chrono(*py_date)}).collect();
-    rs_workdays::set_range_holidays(&holidays, start_year, end_year);
-    Ok(())
-}
-
-/// 祝日のリストから祝日の追加をする  
-/// Argments
-/// - holidays: 休日のリスト
-/// - start_year: 利用する開始年(その年の1月1日から)
-/// - end_year: 利用する終了年(その年の12月31日まで)
-#[pyfunction]
-fn add_range_holidays(
-    holidays: Vec<&PyDate>,
-    start_year: i32,
-    end_year: i32
-) -> Result<(), Error> {
-    let holidays: Vec<NaiveDate> = holidays.iter()
-        .map(|py_date| {date_py_to_chrono(*py_date)}).collect();
-    rs_workdays::add_range_holidays(&holidays, start_year, end_year);
-    Ok(())
-}
-
-/// 休日曜日の更新  
-/// Argment
-/// - new_one_holiday_weekday_set: 休日曜日のセット
-#[pyfunction]
-fn set_holiday_weekdays(holiday_weekday_numbers: HashSet<usize>) -> Result<(), Error> {
-    let holiday_weekday_set: HashSet<Weekday> = holiday_weekday_numbers.iter()
-        .map(|day_number|{
-            Weekday::from_usize(*day_number).unwrap()
-        }).collect();
-    rs_workdays::set_holiday_weekdays(&holiday_weekday_set);
-    Ok(())
-}
-
-/// 営業時間境界の更新  
-/// Argment
-/// - new_intrada_borders: 営業時間境界のベクター
-#[pyfunction]
-fn set_intraday_borders(intraday_borders: Vec<HashMap<&str, &PyTime>>) -> Result<(), Error> {
-    let time_borders: Vec<rs_workdays::global::TimeBorder> = intraday_borders.iter()
-        .map(|dict|{
-            let start_time = dict.get(&"start")
-                .ok_or(Error::ArgKeyError{arg_name: "intraday_borders".to_string(), key_name: "start".to_string()})?;
-            let end_time = dict.get(&"end")
-                .ok_or(Error::ArgKeyError{arg_name: "intraday_borders".to_string(), key_name: "end".to_string()})?;
-            Ok(
-                rs_workdays::global::TimeBorder {
-                    start: time_py_to_chrono(*start_time),
-                    end: time_py_to_chrono(*end_time)
-                }
-            )
-        }).collect::<Result<Vec<rs_workdays::global::TimeBorder>, Error>>()?;
-    rs_workdays::set_intraday_borders(&time_borders);
-    Ok(())
-}
-
-/// 祝日データの取得  
-/// Return
-/// - 祝日のリスト
-#[pyfunction]
-fn get_range_holidays<'p>(py: Python<'p>) -> Result<Vec<&'p PyDate>, Error> {
-    let range_holidays = rs_workdays::get_range_holidays();
-    Ok(
-        range_holidays.iter().map(|holiday|{date_chrono_to_py(py, *holiday)}).collect::<Vec<&PyDate>>()
-    )
-}
-
-/// 休日曜日データの取得  
-/// Return
-/// - 休日曜日のset
-#[pyfunction]
-fn get_holiday_weekdays() -> Result<HashSet<u32>, Error>{
-    let weekdays = rs_workdays::get_holiday_weekdays();
-    Ok(
-        weekdays.iter().map(|weekday|{
-            weekday.num_days_from_monday()
-        }).collect::<HashSet<u32>>()
-    )
-}
-
-/// 営業時間境界の取得  
-/// Return
-/// - 営業時間境界のリスト
-#[pyfunction]
-fn get_intraday_borders<'p>(py: Python<'p>) -> Result<Vec<HashMap<String, &'p PyTime>>, Error>{
-    let borders = rs_workdays::get_intraday_borders();
-    Ok(
-        borders.iter().map(|border|{
-            let mut border_map: HashMap<String, &PyTime> = HashMap::new();
-            border_map.insert("start".to_string(), time_chrono_to_py(py,border.start));
-            border_map.insert("end".to_string(), time_chrono_to_py(py, border.end));
-            border_map
-        }).collect::<Vec<_>>()
-    )
-}
-
-/// 内閣府のデータを指定したパスにソースとして保存
-/// Argment
-/// - source_path: 保存するcsvのパス
-#[pyfunction]
-fn make_source_naikaku(source_csv_path: String) -> Result<(), Error> {
-    rs_workdays::make_source_naikaku(&source_csv_path)?;
-    Ok(())
-}
-
-/// 内閣府による祝日データを取得して祝日に設定する(同期)(feature!="wasm")  
-/// Argments  
-/// - start_year=2016: 利用範囲の開始年
-/// - end_year=2025: 利用範囲の終了年
-#[pyfunction(start_year="2016", end_year="2025")]
-fn request_holidays_naikaku(start_year: i32, end_year: i32) -> Result<(), Error> {
-    rs_workdays::request_holidays_naikaku(start_year, end_year)?;
-    Ok(())
-}
-
-/// start_dateからend_dateまでの営業日を取得  
-/// Argments
-/// - start_date: 開始日
-/// - end_date: 終了日
-/// - closed: 境界を含めるかどうか
-///     - "left": 終了境界を含めない
-///     - "right": 開始境界を含めない
-///     - "not": どちらの境界も含める
-///     - "both": どちらの境界も含めない
-/// 
-/// Return  
-/// 営業日のリスト
-#[pyfunction(closed="\"left\"")]
-fn get_workdays<'p>(
-    py: Python<'p>,
-    start_date: &PyDate, 
-    end_date: &PyDate, 
-    closed: &str
-) -> Result<Vec<&'p PyDate>, Error> {
-    let start_date = date_py_to_chrono(start_date);
-    let end_date = date_py_to_chrono(end_date);
-    let closed = match closed {
-        "left" => {rs_workdays::Closed::Left},
-        "right" => {rs_workdays::Closed::Right},
-        "both" => {rs_workdays::Closed::Both},
-        "not" => {rs_workdays::Closed::Not},
-        _ => {rs_workdays::Closed::Left}
-    };
-
-    let workdays = rs_workdays::get_workdays(start_date, end_date, closed);
-    Ok(
-        workdays.iter().map(|workday|{date_chrono_to_py(py, *workday)}).collect::<Vec<&PyDate>>()
-    )
-}
-
-/// select_dateが営業日であるか判定  
-/// Argment
-/// - select_date: 指定する日
-/// 
-/// Return
-/// 営業日であるかどうか
-#[pyfunction]
-fn check_workday(select_date: &PyDate) -> Result<bool, Error> {
-    let select_date = date_py_to_chrono(select_date);
-    Ok(rs_workdays::check_workday(select_date))
-}
-
-/// select_dateからdays分の次の営業日を取得  
-/// Argments
-/// - select_date: 指定する日
-/// - days: 進める日数
-/// 
-/// Return  
-/// one_day: 次の営業日
-#[pyfunction(days="1")]
-fn get_next_workday<'p>(
-    py: Python<'p>,
-    select_date: &PyDate, 
-    days:i32
-) -> Result<&'p PyDate, Error> {
-    let select_date = date_py_to_chrono(select_date);
-    let next_workday = rs_workdays::get_next_workday(select_date, days);
-    Ok(date_chrono_to_py(py, next_workday))
-}
-
-/// select_dateからdays分の前の営業日を取得  
-/// Argment
-/// - select_date: 指定する日
-/// - days: 減らす日数
-/// 
-/// Return  
-/// one_day: 前の営業日
-#[pyfunction(days="1")]
-fn get_previous_workday<'p>(
-    py: Python<'p>,
-    select_date: &PyDate, 
-    days: i32
-) -> Result<&'p PyDate, Error> {
-    let select_date = date_py_to_chrono(select_date);
-    let previous_workday = rs_workdays::get_previous_workday(select_date, days);
-    Ok(date_chrono_to_py(py, previous_workday))
-}
-
-/// 最近の営業日を取得  
-/// Argments
-/// - select_date: 指定する日
-/// - is_after: 後の営業日を所得するかどうか
-/// 
-/// Return  
-/// 最近の営業日
-#[pyfunction(is_after="true")]
-fn get_near_workday<'p>(
-    py:Python<'p>,
-    select_date: &PyDate, 
-    is_after: bool
-) -> Result<&'p PyDate, Error> {
-    let select_date = date_py_to_chrono(select_date);
-    let near_workday = rs_workdays::get_near_workday(select_date, is_after);
-    Ok(date_chrono_to_py(py, near_workday))
-}
-
-/// start_dateからdays分だけの営業日のベクターを取得  
-/// Argments
-/// - start_date: 開始日
-/// - days: 日数
-/// 
-/// Return  
-/// workdays_vec: 営業日のベクター
-#[pyfunction]
-fn get_workdays_number<'p>(
-    py: Python<'p>,
-    start_date: &PyDate, 
-    days: i32
-) -> Result<Vec<&'p PyDate>, Error> {
-    let start_date = date_py_to_chrono(start_date);
-    let workdays = rs_workdays::get_workdays_number(start_date, days);
-    Ok(
-        workdays.iter().map(|workday|{date_chrono_to_py(py, *workday)}).collect::<Vec<&PyDate>>()
-    )
-}
-
-/// select_datetimeが営業日・営業時間内であるかどうかを判定    
-/// Argment
-/// - select_datetime: 指定する日時
-/// 
-/// Return  
-/// 営業日・営業時間内であるかどうか
-#[pyfunction]
-fn check_workday_intraday_naive(select_datetime: &PyDateTime) -> Result<bool, Error> {
-    let select_date = datetime_py_to_chrono(select_datetime);
-    Ok(rs_workdays::check_workday_intraday(select_date))
-}
-
-/// 次の営業日・営業時間内のdatetimeをその状態とともに取得  
-/// Argment
-/// - select_datetime: 指定する日時
-/// 
-/// Returns
-/// - out_datetime: 次の営業日・営業時間内のdatetime
-/// - 状態を示す文字列
-///     - 'border_start': 営業時間の開始
-///     - 'border_end': 営業時間の終了
-#[pyfunction]
-fn get_next_border_workday_intraday_naive<'p>(
-    py: Python<'p>,
-    select_datetime: &PyDateTime 
-) -> Result<(&'p PyDateTime, String), Error> {
-    let select_datetime = datetime_py_to_chrono(select_datetime);
-    let (border_datetime, border_symbol) = rs_workdays::get_next_border_workday_intraday(select_datetime);
-    Ok(
-        (datetime_chrono_to_py(py, border_datetime), border_symbol.to_string())
-    )
-}
-
-/// 前の営業日・営業時間内のdatetimeをその状態とともに取得  
-/// Argment
-/// - select_datetime: 指定する日時
-/// - fore_is_end: 終了時間のときに次の終了時間を取得するかどうか
-/// 
-/// Returns
-/// - out_datetime: 前の営業日・営業時間内のdatetime
-/// - 状態を示す文字列
-///     - 'border_start': 営業時間の開始
-///     - 'border_end': 営業時間の終了
-#[pyfunction(force_is_end="false")]
-fn get_previous_border_workday_intraday_naive<'p>(
-    py: Python<'p>,
-    select_datetime: &PyDateTime,
-    force_is_end: bool
-) -> Result<(&'p PyDateTime, String), Error> {
-    let select_datetime = datetime_py_to_chrono(select_datetime);
-    let (border_datetime, border_symbol) = rs_workdays::get_previous_border_workday_intraday(
-        select_datetime, 
-        force_is_end
-    );
-    Ok(
-        (datetime_chrono_to_py(py, border_datetime), border_symbol.to_string())
-    )
-}
-
-/// 最近の営業日・営業時間内のdatetimeをその状態とともに取得．select_datetimeが営業日・営業時間内の場合そのまま返る．  
-/// Argments
-/// - select_datetime: 指定する日時
-/// - is_after: 後ろを探索するかどうか
-/// 
-/// Returns
-/// - out_datetime: 前の営業日・営業時間内のdatetime
-/// - 状態を示す文字列
-///     - 'border_intra': 営業時間内
-///     - 'border_start': 営業時間の開始
-///     - 'border_end': 営業時間の終了
-#[pyfunction(is_after="true")]
-fn get_near_workday_intraday_naive<'p>(
-    py: Python<'p>,
-    select_datetime: &PyDateTime,
-    is_after: bool
-) -> Result<(&'p PyDateTime, String), Error> {
-    let select_datetime = datetime_py_to_chrono(select_datetime);
-    let (border_datetime, border_symbol) = rs_workdays::get_near_workday_intraday(
-        select_datetime, 
-        is_after
-    );
-    Ok(
-        (datetime_chrono_to_py(py, border_datetime), border_symbol.to_string())
-    )
-}
-
-/// 営業日・営業時間を考慮しDateTimeを加算する．  
-/// Argments
-/// - select_datetime: 指定する日時
-/// - dela_time: 加算するDuration
-/// 
-/// Return  
-/// 加算された日時
-#[pyfunction]
-fn add_workday_intraday_datetime_naive<'p>(
-    py: Python<'p>,
-    select_datetime: &PyDateTime, 
-    delta_time: &PyDelta
-) -> Result<&'p PyDateTime, Error> {
-    let select_datetime = datetime_py_to_chrono(select_datetime);
-    let added_datetime = rs_workdays::add_workday_intraday_datetime(
-        select_datetime, 
-        duration_py_to_chrono(delta_time)
-    );
-    Ok(datetime_chrono_to_py(py, added_datetime))
-}
-
-/// start_datetimeからend_datetimeの営業日・営業時間を取得
-/// Argments
-/// - start_datetime: 開始日時
-/// - end_datetime: 終了日時
-/// 
-/// Return
-/// 営業日・営業時間のDuration
-#[pyfunction]
-fn get_timedelta_workdays_intraday_naive<'p>(
-    py: Python<'p>,
-    start_datetime: &PyDateTime,
-    end_datetime: &PyDateTime
-) -> Result<&'p PyDelta, Error> {
-    let start_datetime = datetime_py_to_chrono( start_datetime);
-    let end_datetime = datetime_py_to_chrono(end_datetime);
-    let duration = rs_workdays::get_timedelta_workdays_intraday(start_datetime, end_datetime);
-    Ok(duration_chrono_to_py(py, duration))
-}
-
-
-/// 営業日の取得，営業時間の演算，営業時間内データの抽出ができるライブラリ
-#[pymodule]
-fn py_workdays(py: Python, m: &PyModule) -> PyResult<()> {
-    m.add("PyWorkdaysError", py.get_type::<PyWorkdaysError>())?;
-
-    m.add_function(wrap_pyfunction!(set_holidays_csvs, m)?)?;
-    m.add_function(wrap_pyfunction!(set_range_holidays, m)?)?;
-    m.add_function(wrap_pyfunction!(add_range_holidays, m)?)?;
-    m.add_function(wrap_pyfunction!(set_holiday_weekdays, m)?)?;
-    m.add_function(wrap_pyfunction!(set_intraday_borders, m)?)?;
-    m.add_function(wrap_pyfunction!(get_range_holidays, m)?)?;
-    m.add_function(wrap_pyfunction!(get_holiday_weekdays, m)?)?;
-    m.add_function(wrap_pyfunction!(get_intraday_borders, m)?)?;
-    m.add_function(wrap_pyfunction!(make_source_naikaku, m)?)?;
-    m.add_function(wrap_pyfunction!(request_holidays_naikaku, m)?)?;
-
-
-    // workdays
-    m.add_function(wrap_pyfunction!(get_workdays, m)?)?;
-    m.add_function(wrap_pyfunction!(check_workday, m)?)?;
-    m.add_function(wrap_pyfunction!(get_next_workday, m)?)?;
-    m.add_function(wrap_pyfunction!(get_previous_workday, m)?)?;
-    m.add_function(wrap_pyfunction!(get_near_workday, m)?)?;
-    m.add_function(wrap_pyfunction!(get_workdays_number, m)?)?;
-
-    // intraday
-    m.add_function(wrap_pyfunction!(check_workday_intraday_naive, m)?)?;
-    m.add_function(wrap_pyfunction!(get_next_border_workday_intraday_naive, m)?)?;
-    m.add_function(wrap_pyfunction!(get_previous_border_workday_intraday_naive, m)?)?;
-    m.add_function(wrap_pyfunction!(get_near_workday_intraday_naive, m)?)?;
-    m.add_function(wrap_pyfunction!(add_workday_intraday_datetime_naive, m)?)?;
-    m.add_function(wrap_pyfunction!(get_timedelta_workdays_intraday_naive, m)?)?;
-
-    // extract
-    /// np.datetime64のndarrayから営業日のものをboolとして抽出  
-    /// Argment
-    /// - datetime_64_numpy: 抽出したい日時のndarray
-    /// 
-    /// Return  
-    /// ブールのndarray
-    #[pyfn(m)]
-    fn extract_workdays_bool_naive<'p>(
-        py: Python<'p>, 
-        int_64_numpy: PyReadonlyArray<i64,Ix1>
-    ) -> PyResult<&'p PyArray<bool,Ix1>> {
-        let int_64_numpy = int_64_numpy.as_array();
-        let datetime_vec: Vec<NaiveDateTime> = int_64_numpy.iter().map(|x|{
-            NaiveDateTime::from_timestamp(*x, 0)
-        }).collect();
-        let bool_vec = rs_workdays::extract_workdays_bool(&datetime_vec);
-        let bool_array = Array::from_shape_vec(bool_vec.len(), bool_vec).unwrap();
-        Ok(
-            bool_array.into_pyarray(py)
-        )
-    } 
-
-    /// np.datetime64のndarrayから営業時間のものをboolとして抽出
-    /// Argment
-    /// - datetime_vec: 抽出したい日時のndarray
-    /// 
-    /// Return  
-    /// ブールのndarray
-    #[pyfn(m)]
-    fn extract_intraday_bool_naive<'p>(
-        py: Python<'p>, 
-        int_64_numpy:PyReadonlyArray<i64,Ix1>
-    ) -> PyResult<&'p PyArray<bool,Ix1>> {
-        let int_64_numpy = int_64_numpy.as_array();
-        let datetime_vec: Vec<NaiveDateTime> = int_64_numpy.iter().map(|x|{
-            NaiveDateTime::from_timestamp(*x, 0)
-        }).collect();
-        let bool_vec = rs_workdays::extract_intraday_bool(&datetime_vec);
-        let bool_array = Array::from_shape_vec(bool_vec.len(), bool_vec).unwrap();
-        Ok(
-            bool_array.into_pyarray(py)
-        )
-    }
-
-    /// np.datetime64のndarrayから営業日・営業時間のものをboolとして抽出
-    /// Argment
-    /// - datetime_vec: 抽出したい日時のndarray
-    /// 
-    /// Return
-    /// ブールのndarray
-    #[pyfn(m)]
-    fn extract_workdays_intraday_bool_naive<'py>(
-        py: Python<'py>, 
-        int_64_numpy: PyReadonlyArray<i64,Ix1>
-    ) -> PyResult<&'py PyArray<bool,Ix1>> {
-        let int_64_numpy = int_64_numpy.as_array();
-        let datetime_vec: Vec<NaiveDateTime> = int_64_numpy.iter().map(|x|{
-            NaiveDateTime::from_timestamp(*x, 0)
-        }).collect();
-        let bool_vec = rs_workdays::extract_workdays_intraday_bool(&datetime_vec);
-        let bool_array = Array::from_shape_vec(bool_vec.len(), bool_vec).unwrap();
-        Ok(
-            bool_array.into_pyarray(py)
-        )
-    }
-
-    Ok(())
+use std::collections::{HashSet, HashMap};
+use std::sync::{Arc, Mutex};
+use std::sync::atomic::{AtomicBool, Ordering};
+
+use pyo3::prelude::*;
+use pyo3::wrap_pyfunction;
+use pyo3::types::{PyBytes, PyDate, PyDateTime, PyDict, PyTime, PyDelta};
+use pyo3::create_exception;
+use numpy::{PyArray, PyReadonlyArray, Ix1};
+
+use once_cell::sync::Lazy;
+
+mod bindings;
+mod calendar;
+mod convert;
+mod cursor;
+mod error;
+mod extract;
+mod metrics;
+mod parallel;
+mod py_calendar;
+mod snapshot;
+
+use crate::calendar::{CalendarCore, ExtractKind};
+use crate::convert::*;
+use crate::error::Error;
+use crate::cursor::PySessionCursor;
+use crate::py_calendar::PyCalendar;
+use crate::snapshot::CalendarSnapshot;
+
+// PyErrとしてPyWorkdaysErrorを定義
+create_exception!(module, PyWorkdaysError, pyo3::exceptions::PyException);
+
+// crate::error::ErrorをPyErrに変換できるようにする(pyfunctionが認識できる)
+impl std::convert::From<Error> for PyErr {
+    fn from(err: Error) -> PyErr {
+        PyWorkdaysError::new_err(err.to_string())
+    }
+}
+
+/// モジュールの関数が利用するデフォルトのカレンダー．変更しないスナップショットをアトミックに差し替える
+static DEFAULT_CALENDAR: Lazy<CalendarSnapshot> = Lazy::new(||{CalendarSnapshot::new(CalendarCore::default())});
+
+/// 現在のデフォルトのカレンダーのスナップショット．ロックせずに取得でき，保持している間は更新の影響を受けない
+fn default_calendar() -> Arc<CalendarCore> {
+    DEFAULT_CALENDAR.load()
+}
+
+/// デフォルトのカレンダーを初めて参照するときに呼ぶPythonの関数(祝日の遅延読み込み)
+static DEFAULT_CALENDAR_LOADER: Lazy<Mutex<Option<PyObject>>> = Lazy::new(||{Mutex::new(None)});
+
+/// DEFAULT_CALENDAR_LOADERが設定されているかどうか(参照ごとにロックしないため)
+static HAS_DEFAULT_CALENDAR_LOADER: AtomicBool = AtomicBool::new(false);
+
+/// デフォルトのカレンダーの読み込みが遅延されていれば読み込む．
+/// 祝日を置き換える関数は，後から遅延読み込みで上書きされないように先に呼ぶ．
+/// 読み込みの排他制御と完了後の解除はloader側で行う
+fn load_default_calendar() -> Result<(), Error> {
+    if !HAS_DEFAULT_CALENDAR_LOADER.load(Ordering::Acquire) {
+        return Ok(());
+    }
+    Python::with_gil(|py|{
+        let loader = DEFAULT_CALENDAR_LOADER.lock().unwrap().as_ref().map(|loader|{loader.clone_ref(py)});
+        match loader {
+            Some(loader) => {
+                loader.call0(py).map_err(|err|{Error::DefaultCalendarLoadError(err.to_string())})?;
+                Ok(())
+            },
+            None => Ok(())
+        }
+    })
+}
+
+/// デフォルトのカレンダーを初めて参照するときに呼ぶ関数を設定する．読み込みが完了したらloader側でNoneを設定する  
+/// Argments
+/// - loader: 引数をとらない関数．Noneの場合は解除する
+#[pyfunction]
+fn set_default_calendar_loader(loader: Option<PyObject>) -> Result<(), Error> {
+    let has_loader = loader.is_some();
+    *DEFAULT_CALENDAR_LOADER.lock().unwrap() = loader;
+    HAS_DEFAULT_CALENDAR_LOADER.store(has_loader, Ordering::Release);
+    Ok(())
+}
+
+/// csvを読み込んで利用できる祝日の更新をする  
+/// Argments
+/// - holidays_csv_paths: csvのパス
+/// - start_year: 利用する開始年(その年の1月1日から)
+/// - end_year: 利用する終了年(その年の12月31日まで)
+#[pyfunction]
+fn set_holidays_csvs(
+    py: Python,
+    holidays_csv_paths: Vec<String>, 
+    start_year: i32, 
+    end_year: i32
+) -> Result<(), Error> {
+    load_default_calendar()?;
+    bindings::set_holidays_csvs(py, &DEFAULT_CALENDAR, "set_holidays_csvs", &holidays_csv_paths, start_year, end_year)
+}
+
+/// 祝日のリストから祝日の更新をする  
+/// Argments
+/// - holidays: 祝日のリスト
+/// - start_year: 利用する開始年(その年の1月1日から)
+/// - end_year: 利用する終了年(その年の12月31日まで)
+#[pyfunction]
+fn set_range_holidays(
+    py: Python,
+    holidays: Vec<&PyDate>, 
+    start_year: i32, 
+    end_year: i32
+) -> Result<(), Error> {
+    load_default_calendar()?;
+    let holidays = bindings::holidays_py_to_chrono(&holidays);
+    bindings::set_range_holidays(py, &DEFAULT_CALENDAR, "set_range_holidays", &holidays, start_year, end_year)
+}
+
+/// 祝日のリストから祝日の追加をする  
+/// Argments
+/// - holidays: 休日のリスト
+/// - start_year: 利用する開始年(その年の1月1日から)
+/// - end_year: 利用する終了年(その年の12月31日まで)
+#[pyfunction]
+fn add_range_holidays(
+    py: Python,
+    holidays: Vec<&PyDate>,
+    start_year: i32,
+    end_year: i32
+) -> Result<(), Error> {
+    load_default_calendar()?;
+    let holidays = bindings::holidays_py_to_chrono(&holidays);
+    bindings::add_range_holidays(py, &DEFAULT_CALENDAR, "add_range_holidays", &holidays, start_year, end_year)
+}
+
+/// np.datetime64のndarrayから祝日の更新をする．祝日が変わった日のみ前計算テーブルを更新する  
+/// Argments
+/// - int_64_numpy: 祝日のndarray(datetime64をint64としてviewしたもの)．NaTは無視する
+/// - start_year: 利用する開始年(その年の1月1日から)
+/// - end_year: 利用する終了年(その年の12月31日まで)
+/// - unit: int_64_numpyの時間単位("D", "s", "ms", "us", "ns")
+#[pyfunction(unit="\"D\"")]
+fn set_range_holidays_naive(
+    py: Python,
+    int_64_numpy: PyReadonlyArray<i64,Ix1>,
+    start_year: i32,
+    end_year: i32,
+    unit: &str
+) -> Result<(), Error> {
+    load_default_calendar()?;
+    bindings::set_range_holidays_naive(py, &DEFAULT_CALENDAR, "set_range_holidays", &int_64_numpy, start_year, end_year, unit)
+}
+
+/// np.datetime64のndarrayから祝日の追加をする．新しく祝日となった日のみ前計算テーブルを更新する  
+/// Argments
+/// - int_64_numpy: 祝日のndarray(datetime64をint64としてviewしたもの)．NaTは無視する
+/// - start_year: 利用する開始年(その年の1月1日から)
+/// - end_year: 利用する終了年(その年の12月31日まで)
+/// - unit: int_64_numpyの時間単位("D", "s", "ms", "us", "ns")
+#[pyfunction(unit="\"D\"")]
+fn add_range_holidays_naive(
+    py: Python,
+    int_64_numpy: PyReadonlyArray<i64,Ix1>,
+    start_year: i32,
+    end_year: i32,
+    unit: &str
+) -> Result<(), Error> {
+    load_default_calendar()?;
+    bindings::add_range_holidays_naive(py, &DEFAULT_CALENDAR, "add_range_holidays", &int_64_numpy, start_year, end_year, unit)
+}
+
+/// 祝日を読み込み直さずに利用する年の範囲を変更する．重なる範囲の前計算テーブルはそのまま利用する  
+/// Argments
+/// - start_year: 利用する開始年(その年の1月1日から)
+/// - end_year: 利用する終了年(その年の12月31日まで)
+#[pyfunction]
+fn set_holiday_year_range(py: Python, start_year: i32, end_year: i32) -> Result<(), Error> {
+    load_default_calendar()?;
+    bindings::set_holiday_year_range(py, &DEFAULT_CALENDAR, "set_holiday_year_range", start_year, end_year)
+}
+
+/// カレンダー(範囲外も含む祝日・休日曜日・営業時間境界と前計算テーブル)をコンパイル済みの形式で取得する  
+/// Argments
+/// - fingerprint: 祝日のソースを識別するバイト列．読み込み時に一致を確認する
+/// 
+/// Return
+/// - コンパイル済みのカレンダーのbytes
+#[pyfunction]
+fn dump_compiled_calendar<'p>(py: Python<'p>, fingerprint: &[u8]) -> Result<&'p PyBytes, Error> {
+    load_default_calendar()?;
+    Ok(bindings::dump_compiled_calendar(py, &default_calendar(), fingerprint))
+}
+
+/// コンパイル済みのカレンダーを読み込む．テーブルはそのままコピーし，csvの読み込みや計算をしない  
+/// Argments
+/// - compiled: コンパイル済みのカレンダーのバッファ(bytes，mmap，uint8のndarrayなど)．bytesを作らずに読み，読み込み後は参照しない
+/// - fingerprint: 期待する祝日のソースの指紋
+/// 
+/// Return
+/// - 読み込んだかどうか．バージョンあるいは指紋が一致しない場合はFalse
+#[pyfunction]
+fn load_compiled_calendar(py: Python, compiled: &PyAny, fingerprint: &[u8]) -> PyResult<bool> {
+    load_default_calendar()?;
+    bindings::load_compiled_calendar(py, &DEFAULT_CALENDAR, "load_compiled_calendar", compiled, fingerprint)
+}
+
+/// 休日曜日の更新  
+/// Argment
+/// - new_one_holiday_weekday_set: 休日曜日のセット
+#[pyfunction]
+fn set_holiday_weekdays(py: Python, holiday_weekday_numbers: HashSet<usize>) -> Result<(), Error> {
+    bindings::set_holiday_weekdays(py, &DEFAULT_CALENDAR, "set_holiday_weekdays", &holiday_weekday_numbers)
+}
+
+/// 営業時間境界の更新  
+/// Argment
+/// - new_intrada_borders: 営業時間境界のベクター
+#[pyfunction]
+fn set_intraday_borders(py: Python, intraday_borders: Vec<HashMap<&str, &PyTime>>) -> Result<(), Error> {
+    bindings::set_intraday_borders(py, &DEFAULT_CALENDAR, "set_intraday_borders", &intraday_borders)
+}
+
+/// タイムゾーンの更新  
+/// Argments
+/// - transitions: オフセットが切り替わるUTCの1970年1月1日からの秒数のリスト(昇順)
+/// - offsets: 各遷移以降のUTCからのオフセット(秒)のリスト．空の場合はタイムゾーンを設定しない
+#[pyfunction]
+fn set_utc_offset_table(py: Python, transitions: Vec<i64>, offsets: Vec<i64>) -> Result<(), Error> {
+    bindings::set_utc_offset_table(py, &DEFAULT_CALENDAR, "set_utc_offset_table", transitions, offsets)
+}
+
+/// タイムゾーンが設定されているかどうか  
+/// Return
+/// - UTCの値を抽出関数に与えられるかどうか
+#[pyfunction]
+fn has_timezone() -> Result<bool, Error> {
+    Ok(default_calendar().has_timezone())
+}
+
+/// カレンダーの版の番号の取得  
+/// Return
+/// - 祝日・休日曜日・営業時間境界・タイムゾーンが変更されるごとに変わる番号
+#[pyfunction]
+fn get_calendar_version() -> Result<u64, Error> {
+    Ok(default_calendar().version())
+}
+
+/// 祝日データの取得  
+/// Argments
+/// - as_array: datetime64[D]のndarrayとして取得するかどうか
+/// 
+/// Return
+/// - 祝日のリスト(as_arrayの場合はndarray)
+#[pyfunction(as_array="false")]
+fn get_range_holidays(py: Python, as_array: bool) -> PyResult<PyObject> {
+    load_default_calendar()?;
+    let range_holidays = default_calendar().range_holidays_days();
+    days_to_py_output(py, range_holidays, as_array)
+}
+
+/// 利用する年の範囲の取得  
+/// Return
+/// - (開始年, 終了年)
+#[pyfunction]
+fn get_holiday_year_range() -> Result<(i32, i32), Error> {
+    let core = default_calendar();
+    Ok((core.start_year(), core.end_year()))
+}
+
+/// 休日曜日データの取得  
+/// Return
+/// - 休日曜日のset
+#[pyfunction]
+fn get_holiday_weekdays() -> Result<HashSet<u32>, Error>{
+    Ok(bindings::holiday_weekday_numbers(&default_calendar()))
+}
+
+/// 営業時間境界の取得  
+/// Return
+/// - 営業時間境界のリスト
+#[pyfunction]
+fn get_intraday_borders<'p>(py: Python<'p>) -> Result<Vec<HashMap<String, &'p PyTime>>, Error>{
+    Ok(
+        borders_chrono_to_py(py, default_calendar().intraday_borders())
+    )
+}
+
+/// 内閣府のデータを指定したパスにソースとして保存
+/// Argment
+/// - source_path: 保存するcsvのパス
+#[pyfunction]
+fn make_source_naikaku(source_csv_path: String) -> Result<(), Error> {
+    rs_workdays::make_source_naikaku(&source_csv_path)?;
+    Ok(())
+}
+
+/// 内閣府による祝日データを取得して祝日に設定する(同期)(feature!="wasm")  
+/// Argments  
+/// - start_year=2016: 利用範囲の開始年
+/// - end_year=2025: 利用範囲の終了年
+#[pyfunction(start_year="2016", end_year="2025")]
+fn request_holidays_naikaku(py: Python, start_year: i32, end_year: i32) -> Result<(), Error> {
+    load_default_calendar()?;
+    rs_workdays::request_holidays_naikaku(start_year, end_year)?;
+    let holidays = rs_workdays::get_range_holidays();
+    bindings::set_range_holidays(py, &DEFAULT_CALENDAR, "request_holidays_naikaku", &holidays, start_year, end_year)
+}
+
+/// start_dateからend_dateまでの営業日を取得  
+/// Argments
+/// - start_date: 開始日
+/// - end_date: 終了日
+/// - closed: 境界を含めるかどうか
+///     - "left": 終了境界を含めない
+///     - "right": 開始境界を含めない
+///     - "both": どちらの境界も含める
+///     - "not": どちらの境界も含めない
+/// - as_array: datetime64[D]のndarrayとして取得するかどうか
+/// 
+/// Return  
+/// 営業日のリスト(as_arrayの場合はndarray)
+#[pyfunction(closed="\"left\"", as_array="false")]
+fn get_workdays(
+    py: Python,
+    start_date: &PyDate,
+    end_date: &PyDate,
+    closed: &str,
+    as_array: bool
+) -> PyResult<PyObject> {
+    load_default_calendar()?;
+    bindings::get_workdays(py, &default_calendar(), "get_workdays", start_date, end_date, closed, as_array)
+}
+
+/// select_dateが営業日であるか判定  
+/// Argment
+/// - select_date: 指定する日
+/// 
+/// Return
+/// 営業日であるかどうか
+#[pyfunction]
+fn check_workday(
+    py: Python,
+    select_date: &PyDate
+) -> Result<bool, Error> {
+    load_default_calendar()?;
+    bindings::check_workday(py, &default_calendar(), "check_workday", select_date)
+}
+
+/// select_dateからdays分の次の営業日を取得  
+/// Argments
+/// - select_date: 指定する日
+/// - days: 進める日数
+/// 
+/// Return  
+/// one_day: 次の営業日
+#[pyfunction(days="1")]
+fn get_next_workday<'p>(
+    py: Python<'p>,
+    select_date: &PyDate,
+    days: i32
+) -> Result<&'p PyDate, Error> {
+    load_default_calendar()?;
+    bindings::get_next_workday(py, &default_calendar(), "get_next_workday", select_date, days)
+}
+
+/// select_dateからdays分の前の営業日を取得  
+/// Argment
+/// - select_date: 指定する日
+/// - days: 減らす日数
+/// 
+/// Return  
+/// one_day: 前の営業日
+#[pyfunction(days="1")]
+fn get_previous_workday<'p>(
+    py: Python<'p>,
+    select_date: &PyDate,
+    days: i32
+) -> Result<&'p PyDate, Error> {
+    load_default_calendar()?;
+    bindings::get_previous_workday(py, &default_calendar(), "get_previous_workday", select_date, days)
+}
+
+/// 最近の営業日を取得  
+/// Argments
+/// - select_date: 指定する日
+/// - is_after: 後の営業日を所得するかどうか
+/// 
+/// Return  
+/// 最近の営業日
+#[pyfunction(is_after="true")]
+fn get_near_workday<'p>(
+    py: Python<'p>,
+    select_date: &PyDate,
+    is_after: bool
+) -> Result<&'p PyDate, Error> {
+    load_default_calendar()?;
+    bindings::get_near_workday(py, &default_calendar(), "get_near_workday", select_date, is_after)
+}
+
+/// start_dateからdays分だけの営業日のベクターを取得  
+/// Argments
+/// - start_date: 開始日
+/// - days: 日数
+/// - as_array: datetime64[D]のndarrayとして取得するかどうか
+/// 
+/// Return  
+/// workdays_vec: 営業日のベクター(as_arrayの場合はndarray)
+#[pyfunction(as_array="false")]
+fn get_workdays_number(
+    py: Python,
+    start_date: &PyDate,
+    days: i32,
+    as_array: bool
+) -> PyResult<PyObject> {
+    load_default_calendar()?;
+    bindings::get_workdays_number(py, &default_calendar(), "get_workdays_number", start_date, days, as_array)
+}
+
+/// start_dateからend_dateまでの営業日数を取得．営業日の累積テーブルを利用するため期間の長さによらない  
+/// Argments
+/// - start_date: 開始日
+/// - end_date: 終了日
+/// - closed: 境界を含めるかどうか("left", "right", "both", "not")
+/// 
+/// Return  
+/// 営業日数(get_workdaysの長さと同じ)
+#[pyfunction(closed="\"left\"")]
+fn count_workdays(
+    py: Python,
+    start_date: &PyDate,
+    end_date: &PyDate,
+    closed: &str
+) -> Result<i64, Error> {
+    load_default_calendar()?;
+    bindings::count_workdays(py, &default_calendar(), "count_workdays", start_date, end_date, closed)
+}
+
+/// select_dateの営業日の序数を取得  
+/// Argments
+/// - select_date: 指定する日
+/// 
+/// Return  
+/// holiday_start_yearの1月1日から数えた0始まりの序数．営業日でない場合は次の営業日の序数
+#[pyfunction]
+fn get_workday_ordinal(
+    py: Python,
+    select_date: &PyDate
+) -> Result<i64, Error> {
+    load_default_calendar()?;
+    bindings::get_workday_ordinal(py, &default_calendar(), "get_workday_ordinal", select_date)
+}
+
+/// 営業日の序数から営業日を取得  
+/// Argments
+/// - ordinal: get_workday_ordinalで得られる序数
+/// 
+/// Return  
+/// 営業日
+#[pyfunction]
+fn get_workday_from_ordinal<'p>(
+    py: Python<'p>,
+    ordinal: i64
+) -> Result<&'p PyDate, Error> {
+    load_default_calendar()?;
+    bindings::get_workday_from_ordinal(py, &default_calendar(), "get_workday_from_ordinal", ordinal)
+}
+
+/// select_datetimeが営業日・営業時間内であるかどうかを判定    
+/// Argment
+/// - select_datetime: 指定する日時
+/// 
+/// Return  
+/// 営業日・営業時間内であるかどうか
+#[pyfunction]
+fn check_workday_intraday_naive(
+    py: Python,
+    select_datetime: &PyDateTime
+) -> Result<bool, Error> {
+    load_default_calendar()?;
+    bindings::check_workday_intraday(py, &default_calendar(), "check_workday_intraday", select_datetime)
+}
+
+/// 次の営業日・営業時間内のdatetimeをその状態とともに取得  
+/// Argment
+/// - select_datetime: 指定する日時
+/// 
+/// Returns
+/// - out_datetime: 次の営業日・営業時間内のdatetime
+/// - 状態を示す文字列
+///     - 'border_start': 営業時間の開始
+///     - 'border_end': 営業時間の終了
+#[pyfunction]
+fn get_next_border_workday_intraday_naive<'p>(
+    py: Python<'p>,
+    select_datetime: &PyDateTime
+) -> Result<(&'p PyDateTime, String), Error> {
+    load_default_calendar()?;
+    bindings::get_next_border_workday_intraday(py, &default_calendar(), "get_next_border_workday_intraday", select_datetime)
+}
+
+/// 前の営業日・営業時間内のdatetimeをその状態とともに取得  
+/// Argment
+/// - select_datetime: 指定する日時
+/// - fore_is_end: 終了時間のときに次の終了時間を取得するかどうか
+/// 
+/// Returns
+/// - out_datetime: 前の営業日・営業時間内のdatetime
+/// - 状態を示す文字列
+///     - 'border_start': 営業時間の開始
+///     - 'border_end': 営業時間の終了
+#[pyfunction(force_is_end="false")]
+fn get_previous_border_workday_intraday_naive<'p>(
+    py: Python<'p>,
+    select_datetime: &PyDateTime,
+    force_is_end: bool
+) -> Result<(&'p PyDateTime, String), Error> {
+    load_default_calendar()?;
+    bindings::get_previous_border_workday_intraday(py, &default_calendar(), "get_previous_border_workday_intraday", select_datetime, force_is_end)
+}
+
+/// 最近の営業日・営業時間内のdatetimeをその状態とともに取得．select_datetimeが営業日・営業時間内の場合そのまま返る．  
+/// Argments
+/// - select_datetime: 指定する日時
+/// - is_after: 後ろを探索するかどうか
+/// 
+/// Returns
+/// - out_datetime: 前の営業日・営業時間内のdatetime
+/// - 状態を示す文字列
+///     - 'border_intra': 営業時間内
+///     - 'border_start': 営業時間の開始
+///     - 'border_end': 営業時間の終了
+#[pyfunction(is_after="true")]
+fn get_near_workday_intraday_naive<'p>(
+    py: Python<'p>,
+    select_datetime: &PyDateTime,
+    is_after: bool
+) -> Result<(&'p PyDateTime, String), Error> {
+    load_default_calendar()?;
+    bindings::get_near_workday_intraday(py, &default_calendar(), "get_near_workday_intraday", select_datetime, is_after)
+}
+
+/// 営業日・営業時間を考慮しDateTimeを加算する．  
+/// Argments
+/// - select_datetime: 指定する日時
+/// - dela_time: 加算するDuration
+/// 
+/// Return  
+/// 加算された日時
+#[pyfunction]
+fn add_workday_intraday_datetime_naive<'p>(
+    py: Python<'p>,
+    select_datetime: &PyDateTime,
+    delta_time: &PyDelta
+) -> Result<&'p PyDateTime, Error> {
+    load_default_calendar()?;
+    bindings::add_workday_intraday_datetime(py, &default_calendar(), "add_workday_intraday_datetime", select_datetime, delta_time)
+}
+
+/// start_datetimeからend_datetimeの営業日・営業時間を取得
+/// Argments
+/// - start_datetime: 開始日時
+/// - end_datetime: 終了日時
+/// 
+/// Return
+/// 営業日・営業時間のDuration
+#[pyfunction]
+fn get_timedelta_workdays_intraday_naive<'p>(
+    py: Python<'p>,
+    start_datetime: &PyDateTime,
+    end_datetime: &PyDateTime
+) -> Result<&'p PyDelta, Error> {
+    load_default_calendar()?;
+    bindings::get_timedelta_workdays_intraday(py, &default_calendar(), "get_timedelta_workdays_intraday", start_datetime, end_datetime)
+}
+
+
+/// np.datetime64のndarrayから営業日のものをboolとして抽出  
+/// Argments
+/// - int_64_numpy: 抽出したい日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+/// - unit: int_64_numpyの時間単位("D", "s", "ms", "us", "ns")
+/// - out: 結果を書き込むブールのndarray．Noneの場合は新しく作成する
+/// - utc: int_64_numpyをUTCとみなし，カレンダーのタイムゾーンのローカル時間で判定するかどうか
+/// - assume_sorted: int_64_numpyが昇順にソートされているとみなし，判定が変わる境界を探索して区間ごとにまとめて書き込むかどうか．
+///   ソートされていない場合の結果は正しくない
+/// 
+/// Return  
+/// ブールのndarray
+#[pyfunction(unit="\"s\"", out="None", utc="false", assume_sorted="false")]
+fn extract_workdays_bool_naive<'p>(
+    py: Python<'p>, 
+    int_64_numpy: PyReadonlyArray<i64,Ix1>,
+    unit: &str,
+    out: Option<&'p PyArray<bool,Ix1>>,
+    utc: bool,
+    assume_sorted: bool
+) -> Result<&'p PyArray<bool,Ix1>, Error> {
+    load_default_calendar()?;
+    bindings::extract_bool(py, &default_calendar(), "extract_workdays_bool", ExtractKind::Workdays, &int_64_numpy, unit, out, utc, assume_sorted)
+}
+
+/// np.datetime64のndarrayから営業時間のものをboolとして抽出
+/// Argment
+/// - int_64_numpy: 抽出したい日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+/// - unit: int_64_numpyの時間単位("D", "s", "ms", "us", "ns")
+/// - out: 結果を書き込むブールのndarray．Noneの場合は新しく作成する
+/// - utc: int_64_numpyをUTCとみなし，カレンダーのタイムゾーンのローカル時間で判定するかどうか
+/// - assume_sorted: int_64_numpyが昇順にソートされているとみなし，判定が変わる境界を探索して区間ごとにまとめて書き込むかどうか．
+///   ソートされていない場合の結果は正しくない
+/// 
+/// Return  
+/// ブールのndarray
+#[pyfunction(unit="\"s\"", out="None", utc="false", assume_sorted="false")]
+fn extract_intraday_bool_naive<'p>(
+    py: Python<'p>, 
+    int_64_numpy: PyReadonlyArray<i64,Ix1>,
+    unit: &str,
+    out: Option<&'p PyArray<bool,Ix1>>,
+    utc: bool,
+    assume_sorted: bool
+) -> Result<&'p PyArray<bool,Ix1>, Error> {
+    load_default_calendar()?;
+    bindings::extract_bool(py, &default_calendar(), "extract_intraday_bool", ExtractKind::Intraday, &int_64_numpy, unit, out, utc, assume_sorted)
+}
+
+/// np.datetime64のndarrayから営業日・営業時間のものをboolとして抽出
+/// Argment
+/// - int_64_numpy: 抽出したい日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+/// - unit: int_64_numpyの時間単位("D", "s", "ms", "us", "ns")
+/// - out: 結果を書き込むブールのndarray．Noneの場合は新しく作成する
+/// - utc: int_64_numpyをUTCとみなし，カレンダーのタイムゾーンのローカル時間で判定するかどうか
+/// - assume_sorted: int_64_numpyが昇順にソートされているとみなし，判定が変わる境界を探索して区間ごとにまとめて書き込むかどうか．
+///   ソートされていない場合の結果は正しくない
+/// 
+/// Return
+/// ブールのndarray
+#[pyfunction(unit="\"s\"", out="None", utc="false", assume_sorted="false")]
+fn extract_workdays_intraday_bool_naive<'p>(
+    py: Python<'p>, 
+    int_64_numpy: PyReadonlyArray<i64,Ix1>,
+    unit: &str,
+    out: Option<&'p PyArray<bool,Ix1>>,
+    utc: bool,
+    assume_sorted: bool
+) -> Result<&'p PyArray<bool,Ix1>, Error> {
+    load_default_calendar()?;
+    bindings::extract_bool(py, &default_calendar(), "extract_workdays_intraday_bool", ExtractKind::WorkdaysIntraday, &int_64_numpy, unit, out, utc, assume_sorted)
+}
+
+/// 昇順にソートされたnp.datetime64のndarrayから，営業日・営業時間の要素が連続する範囲を取得．
+/// 判定が変わる境界を探索するため，要素ごとの判定を行わない  
+/// Argment
+/// - int_64_numpy: 昇順にソートされた日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+/// - unit: int_64_numpyの時間単位("D", "s", "ms", "us", "ns")
+/// - utc: int_64_numpyをUTCとみなし，カレンダーのタイムゾーンのローカル時間で判定するかどうか
+/// 
+/// Return
+/// 範囲の開始と終了(含まない)のインデックスを交互に並べたint64のndarray(reshape(-1, 2)で(開始, 終了)の組となる)
+#[pyfunction(unit="\"s\"", utc="false")]
+fn extract_workdays_intraday_ranges_naive<'p>(
+    py: Python<'p>,
+    int_64_numpy: PyReadonlyArray<i64,Ix1>,
+    unit: &str,
+    utc: bool
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    load_default_calendar()?;
+    bindings::extract_workdays_intraday_ranges(py, &default_calendar(), "extract_workdays_intraday_ranges", &int_64_numpy, unit, utc)
+}
+
+/// np.datetime64のndarrayの各要素が含まれる営業時間(セッション)の通し番号を取得  
+/// Argment
+/// - int_64_numpy: 日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+/// - unit: int_64_numpyの時間単位("D", "s", "ms", "us", "ns")
+/// - utc: int_64_numpyをUTCとみなし，カレンダーのタイムゾーンのローカル時間で判定するかどうか
+/// 
+/// Return  
+/// 営業日の序数 * 1日の営業時間の数 + 営業時間の番号のint64のndarray．営業時間外・NaTはint64の最小値
+#[pyfunction(unit="\"s\"", utc="false")]
+fn get_session_numbers_naive<'p>(
+    py: Python<'p>,
+    int_64_numpy: PyReadonlyArray<i64,Ix1>,
+    unit: &str,
+    utc: bool
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    load_default_calendar()?;
+    bindings::get_session_numbers(py, &default_calendar(), "get_session_numbers", &int_64_numpy, unit, utc)
+}
+
+/// np.datetime64のndarrayの各要素の営業時間のラベルを同じスナップショットから取得する  
+/// Argment
+/// - int_64_numpy: 日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+/// - unit: int_64_numpyの時間単位("D", "s", "ms", "us", "ns")
+/// - utc: int_64_numpyをUTCとみなし，カレンダーのタイムゾーンのローカル時間で判定するかどうか
+/// 
+/// Return  
+/// (codes, workday_codes, session_indices, session_starts, session_ends, workdays)のint64のndarrayのタプル．
+/// コードは最初の営業時間・営業日を0とする番号で，営業時間外・NaTは-1．
+/// session_starts・session_endsはコードごとの営業時間の開始・終了の1970年1月1日からの秒数，workdaysは営業日の日数
+#[pyfunction(unit="\"s\"", utc="false")]
+fn get_workday_session_labels_naive<'p>(
+    py: Python<'p>,
+    int_64_numpy: PyReadonlyArray<i64,Ix1>,
+    unit: &str,
+    utc: bool
+) -> Result<bindings::SessionLabelArrays<'p>, Error> {
+    load_default_calendar()?;
+    bindings::get_workday_session_labels(py, &default_calendar(), "get_workday_session_labels", &int_64_numpy, unit, utc)
+}
+
+/// np.datetime64のndarrayの各要素に営業日・営業時間を考慮してnp.timedelta64を加算する  
+/// Argments
+/// - int_64_numpy: 日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+/// - deltas: 加算する時間差(timedelta64をint64としてviewしたもの)．intあるいは要素ごとのint64のndarray
+/// - unit: int_64_numpyの時間単位("D", "s", "ms", "us", "ns")
+/// - delta_unit: deltasの時間単位("D", "s", "ms", "us", "ns")
+/// 
+/// Return
+/// 1970年1月1日からの秒数のint64のndarray(datetime64[s]としてviewできる)．NaTはNaTのまま
+#[pyfunction(unit="\"s\"", delta_unit="\"s\"")]
+fn add_workday_intraday_array_naive<'p>(
+    py: Python<'p>,
+    int_64_numpy: PyReadonlyArray<i64,Ix1>,
+    deltas: &PyAny,
+    unit: &str,
+    delta_unit: &str
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    load_default_calendar()?;
+    bindings::add_workday_intraday_array(py, &default_calendar(), "add_workday_intraday_array", &int_64_numpy, deltas, unit, delta_unit)
+}
+
+/// 開始日時と終了日時のnp.datetime64のndarrayの各組の営業日・営業時間の時間差を取得  
+/// Argments
+/// - start_int_64_numpy: 開始日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+/// - end_int_64_numpy: 終了日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+/// - start_unit: start_int_64_numpyの時間単位("D", "s", "ms", "us", "ns")
+/// - end_unit: end_int_64_numpyの時間単位("D", "s", "ms", "us", "ns")
+/// 
+/// Return
+/// ナノ秒単位のint64のndarray(timedelta64[ns]としてviewできる)．どちらかがNaTの場合はNaT
+#[pyfunction(start_unit="\"s\"", end_unit="\"s\"")]
+fn get_timedelta_workdays_intraday_array_naive<'p>(
+    py: Python<'p>,
+    start_int_64_numpy: PyReadonlyArray<i64,Ix1>,
+    end_int_64_numpy: PyReadonlyArray<i64,Ix1>,
+    start_unit: &str,
+    end_unit: &str
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    load_default_calendar()?;
+    bindings::get_timedelta_workdays_intraday_array(py, &default_calendar(), "get_timedelta_workdays_intraday_array", &start_int_64_numpy, &end_int_64_numpy, start_unit, end_unit)
+}
+
+/// 開始日と終了日のnp.datetime64のndarrayの各組の営業日数を取得  
+/// Argments
+/// - start_int_64_numpy: 開始日のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+/// - end_int_64_numpy: 終了日のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+/// - start_unit: start_int_64_numpyの時間単位("D", "s", "ms", "us", "ns")
+/// - end_unit: end_int_64_numpyの時間単位("D", "s", "ms", "us", "ns")
+/// - closed: 境界を含めるかどうか("left", "right", "both", "not")
+/// 
+/// Return
+/// 営業日数のint64のndarray．どちらかがNaTの場合はint64の最小値
+#[pyfunction(start_unit="\"s\"", end_unit="\"s\"", closed="\"left\"")]
+fn count_workdays_array_naive<'p>(
+    py: Python<'p>,
+    start_int_64_numpy: PyReadonlyArray<i64,Ix1>,
+    end_int_64_numpy: PyReadonlyArray<i64,Ix1>,
+    start_unit: &str,
+    end_unit: &str,
+    closed: &str
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    load_default_calendar()?;
+    bindings::count_workdays_array(py, &default_calendar(), "count_workdays_array", &start_int_64_numpy, &end_int_64_numpy, start_unit, end_unit, closed)
+}
+
+/// np.datetime64のndarrayの各要素の営業日の序数を取得  
+/// Argments
+/// - int_64_numpy: 日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+/// - unit: int_64_numpyの時間単位("D", "s", "ms", "us", "ns")
+/// 
+/// Return
+/// 序数のint64のndarray．NaTの場合はint64の最小値
+#[pyfunction(unit="\"s\"")]
+fn get_workday_ordinal_array_naive<'p>(
+    py: Python<'p>,
+    int_64_numpy: PyReadonlyArray<i64,Ix1>,
+    unit: &str
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    load_default_calendar()?;
+    bindings::get_workday_ordinal_array(py, &default_calendar(), "get_workday_ordinal_array", &int_64_numpy, unit)
+}
+
+/// 営業日の序数のndarrayから営業日を取得  
+/// Argments
+/// - ordinals: 序数のint64のndarray．コピーせずに読む
+/// 
+/// Return
+/// 1970年1月1日からの日数のint64のndarray(datetime64[D]としてviewできる)．int64の最小値はNaTとなる
+#[pyfunction]
+fn get_workday_from_ordinal_array_naive<'p>(
+    py: Python<'p>,
+    ordinals: PyReadonlyArray<i64,Ix1>
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    load_default_calendar()?;
+    bindings::get_workday_from_ordinal_array(py, &default_calendar(), "get_workday_from_ordinal_array", &ordinals)
+}
+
+/// np.datetime64のndarrayの各要素を営業秒の軸(holiday_start_yearの1月1日0時から数えた営業日・営業時間の時間)に変換  
+/// Argments
+/// - int_64_numpy: 日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+/// - unit: int_64_numpyの時間単位("s", "ms", "us", "ns")
+/// 
+/// Return
+/// unit単位の営業時間のint64のndarray(timedelta64としてviewできる)．NaTはNaTのまま
+#[pyfunction(unit="\"s\"")]
+fn to_business_time_naive<'p>(
+    py: Python<'p>,
+    int_64_numpy: PyReadonlyArray<i64,Ix1>,
+    unit: &str
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    load_default_calendar()?;
+    bindings::to_business_time(py, &default_calendar(), "to_business_time", &int_64_numpy, unit)
+}
+
+/// 営業秒の軸の値のndarrayを日時に変換．to_business_time_naiveの逆  
+/// Argments
+/// - int_64_numpy: 営業時間のndarray(timedelta64をint64としてviewしたもの)．コピーせずに読む
+/// - unit: int_64_numpyの時間単位("s", "ms", "us", "ns")
+/// 
+/// Return
+/// unit単位の1970年1月1日からのint64のndarray(datetime64としてviewできる)．NaTはNaTのまま
+#[pyfunction(unit="\"s\"")]
+fn from_business_time_naive<'p>(
+    py: Python<'p>,
+    int_64_numpy: PyReadonlyArray<i64,Ix1>,
+    unit: &str
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    load_default_calendar()?;
+    bindings::from_business_time(py, &default_calendar(), "from_business_time", &int_64_numpy, unit)
+}
+
+/// np.datetime64のndarrayの各要素からdays分の次の営業日を取得  
+/// Argments
+/// - int_64_numpy: 日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+/// - unit: int_64_numpyの時間単位("D", "s", "ms", "us", "ns")
+/// - days: 進める日数．intあるいは要素ごとのint64のndarray
+/// 
+/// Return
+/// 1970年1月1日からの日数のint64のndarray(datetime64[D]としてviewできる)．NaTはNaTのまま
+#[pyfunction(unit="\"s\"", days="None")]
+fn get_next_workday_array_naive<'p>(
+    py: Python<'p>,
+    int_64_numpy: PyReadonlyArray<i64,Ix1>,
+    unit: &str,
+    days: Option<&PyAny>
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    load_default_calendar()?;
+    bindings::get_next_workday_array(py, &default_calendar(), "get_next_workday_array", &int_64_numpy, unit, days)
+}
+
+/// np.datetime64のndarrayの各要素からdays分の前の営業日を取得  
+/// Argments
+/// - int_64_numpy: 日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+/// - unit: int_64_numpyの時間単位("D", "s", "ms", "us", "ns")
+/// - days: 戻る日数．intあるいは要素ごとのint64のndarray
+/// 
+/// Return
+/// 1970年1月1日からの日数のint64のndarray(datetime64[D]としてviewできる)．NaTはNaTのまま
+#[pyfunction(unit="\"s\"", days="None")]
+fn get_previous_workday_array_naive<'p>(
+    py: Python<'p>,
+    int_64_numpy: PyReadonlyArray<i64,Ix1>,
+    unit: &str,
+    days: Option<&PyAny>
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    load_default_calendar()?;
+    bindings::get_previous_workday_array(py, &default_calendar(), "get_previous_workday_array", &int_64_numpy, unit, days)
+}
+
+/// np.datetime64のndarrayの各要素の最近の営業日を取得  
+/// Argments
+/// - int_64_numpy: 日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+/// - unit: int_64_numpyの時間単位("D", "s", "ms", "us", "ns")
+/// - is_after: 後の営業日を取得するかどうか
+/// 
+/// Return
+/// 1970年1月1日からの日数のint64のndarray(datetime64[D]としてviewできる)．NaTはNaTのまま
+#[pyfunction(unit="\"s\"", is_after="true")]
+fn get_near_workday_array_naive<'p>(
+    py: Python<'p>,
+    int_64_numpy: PyReadonlyArray<i64,Ix1>,
+    unit: &str,
+    is_after: bool
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    load_default_calendar()?;
+    bindings::get_near_workday_array(py, &default_calendar(), "get_near_workday_array", &int_64_numpy, unit, is_after)
+}
+
+/// np.datetime64のndarrayの各要素の最近の営業日・営業時間内の日時を取得．get_near_workday_intradayを一括で行う  
+/// Argments
+/// - int_64_numpy: 日時のndarray(datetime64をint64としてviewしたもの)．コピーせずに読む
+/// - unit: int_64_numpyの時間単位("s", "ms", "us", "ns")
+/// - is_after: 後の営業時間を取得するかどうか
+/// 
+/// Return
+/// unit単位の1970年1月1日からの時間のint64のndarray(datetime64としてviewできる)．営業時間内の要素はそのまま，NaTはNaTのまま
+#[pyfunction(unit="\"s\"", is_after="true")]
+fn get_near_workday_intraday_array_naive<'p>(
+    py: Python<'p>,
+    int_64_numpy: PyReadonlyArray<i64,Ix1>,
+    unit: &str,
+    is_after: bool
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    load_default_calendar()?;
+    bindings::get_near_workday_intraday_array(py, &default_calendar(), "get_near_workday_intraday_array", &int_64_numpy, unit, is_after)
+}
+
+/// start_datetimeからend_datetime(どちらも含む)までの，営業日の各営業時間の開始からfreq_seconds間隔の日時を取得．
+/// 結果の長さを先に求め，一度だけ確保したndarrayにGILを解放して書き込む  
+/// Argments
+/// - start_datetime: 開始日時
+/// - end_datetime: 終了日時
+/// - freq_seconds: 間隔(秒)
+/// - closed: 各営業時間の境界を含めるかどうか
+///     - "left": 終了境界を含めない
+///     - "right": 開始境界を含めない
+///     - "both": どちらの境界も含める
+///     - "not": どちらの境界も含めない
+/// - unit: 出力の時間単位("s", "ms", "us", "ns")
+/// - offset: 結果のうちoffset番目以降を取得する(分割して取得する場合)
+/// - length: 取得する最大の要素数．Noneの場合は最後まで
+/// 
+/// Return
+/// 1970年1月1日からのunit単位のint64のndarray(datetime64としてviewできる)
+#[pyfunction(closed="\"left\"", unit="\"ns\"", offset="0", length="None")]
+fn workday_intraday_range_naive<'p>(
+    py: Python<'p>,
+    start_datetime: &PyDateTime,
+    end_datetime: &PyDateTime,
+    freq_seconds: i64,
+    closed: &str,
+    unit: &str,
+    offset: usize,
+    length: Option<usize>
+) -> Result<&'p PyArray<i64,Ix1>, Error> {
+    load_default_calendar()?;
+    bindings::workday_intraday_range(py, &default_calendar(), "workday_intraday_range", start_datetime, end_datetime, freq_seconds, closed, unit, offset, length)
+}
+
+/// workday_intraday_range_naiveの結果の要素数を取得  
+/// Argments
+/// - start_datetime: 開始日時
+/// - end_datetime: 終了日時
+/// - freq_seconds: 間隔(秒)
+/// - closed: 各営業時間の境界を含めるかどうか("left", "right", "both", "not")
+/// 
+/// Return
+/// 要素数
+#[pyfunction(closed="\"left\"")]
+fn count_workday_intraday_range(
+    start_datetime: &PyDateTime,
+    end_datetime: &PyDateTime,
+    freq_seconds: i64,
+    closed: &str
+) -> Result<i64, Error> {
+    load_default_calendar()?;
+    bindings::count_workday_intraday_range(&default_calendar(), start_datetime, end_datetime, freq_seconds, closed)
+}
+
+/// 抽出関数の並列化の設定を更新  
+/// Argments
+/// - threads: 利用するスレッド数．0の場合は利用可能なコア数，1の場合は並列化しない
+/// - min_chunk_length: 1スレッドあたりの最小の要素数．これより短い入力は並列化しない
+#[pyfunction(threads="0", min_chunk_length="parallel::DEFAULT_MIN_CHUNK_LENGTH")]
+fn set_parallel_config(threads: usize, min_chunk_length: usize) -> Result<(), Error> {
+    parallel::set_parallel_config(threads, min_chunk_length);
+    Ok(())
+}
+
+/// 抽出関数の並列化の設定を取得  
+/// Return
+/// - "threads"と"min_chunk_length"をキーにもつ辞書
+#[pyfunction]
+fn get_parallel_config() -> Result<HashMap<String, usize>, Error> {
+    let (threads, min_chunk_length) = parallel::get_parallel_config();
+    let mut config_map: HashMap<String, usize> = HashMap::new();
+    config_map.insert("threads".to_string(), threads);
+    config_map.insert("min_chunk_length".to_string(), min_chunk_length);
+    Ok(config_map)
+}
+
+/// 計測の設定を更新．無効の場合は時刻を取得しないため，計測のオーバーヘッドはない  
+/// Argments
+/// - enabled: モジュールの関数の呼び出し回数・時間とカレンダーの更新を計測するかどうか
+/// - callback: カレンダーの更新(祝日の読み込み・営業時間境界の変更など)ごとに，
+///   {"kind": "rebuild", "name": 更新の名前, "seconds": 時間}の辞書を引数として呼ぶ関数．Noneの場合は呼ばない
+#[pyfunction(enabled="false", callback="None")]
+fn set_metrics_config(enabled: bool, callback: Option<PyObject>) -> Result<(), Error> {
+    metrics::set_metrics_config(enabled, callback);
+    Ok(())
+}
+
+/// 計測値のスナップショットを取得  
+/// Return
+/// - "enabled", "functions", "rebuilds"をキーにもつ辞書
+///     - "functions": 関数名ごとの"calls"(回数)，"conversion_seconds"(Pythonとの変換の時間)，
+///       "compute_seconds"(計算の時間)，"elements"(配列の関数が処理した要素数)の辞書
+///     - "rebuilds": 更新の名前ごとの"count"(回数)，"seconds"(時間)の辞書
+#[pyfunction]
+fn get_metrics_snapshot(py: Python) -> PyResult<&PyDict> {
+    metrics::metrics_snapshot(py)
+}
+
+/// 計測値を破棄する
+#[pyfunction]
+fn reset_metrics() -> Result<(), Error> {
+    metrics::reset_metrics();
+    Ok(())
+}
+
+/// 営業日の取得，営業時間の演算，営業時間内データの抽出ができるライブラリ
+#[pymodule]
+fn py_workdays(py: Python, m: &PyModule) -> PyResult<()> {
+    m.add("PyWorkdaysError", py.get_type::<PyWorkdaysError>())?;
+    m.add_class::<PyCalendar>()?;
+    m.add_class::<PySessionCursor>()?;
+
+    m.add_function(wrap_pyfunction!(set_holidays_csvs, m)?)?;
+    m.add_function(wrap_pyfunction!(set_range_holidays, m)?)?;
+    m.add_function(wrap_pyfunction!(add_range_holidays, m)?)?;
+    m.add_function(wrap_pyfunction!(set_range_holidays_naive, m)?)?;
+    m.add_function(wrap_pyfunction!(add_range_holidays_naive, m)?)?;
+    m.add_function(wrap_pyfunction!(set_holiday_year_range, m)?)?;
+    m.add_function(wrap_pyfunction!(dump_compiled_calendar, m)?)?;
+    m.add_function(wrap_pyfunction!(load_compiled_calendar, m)?)?;
+    m.add_function(wrap_pyfunction!(set_default_calendar_loader, m)?)?;
+    m.add_function(wrap_pyfunction!(set_holiday_weekdays, m)?)?;
+    m.add_function(wrap_pyfunction!(set_intraday_borders, m)?)?;
+    m.add_function(wrap_pyfunction!(get_range_holidays, m)?)?;
+    m.add_function(wrap_pyfunction!(get_holiday_year_range, m)?)?;
+    m.add_function(wrap_pyfunction!(get_holiday_weekdays, m)?)?;
+    m.add_function(wrap_pyfunction!(get_intraday_borders, m)?)?;
+    m.add_function(wrap_pyfunction!(set_utc_offset_table, m)?)?;
+    m.add_function(wrap_pyfunction!(has_timezone, m)?)?;
+    m.add_function(wrap_pyfunction!(get_calendar_version, m)?)?;
+    m.add_function(wrap_pyfunction!(make_source_naikaku, m)?)?;
+    m.add_function(wrap_pyfunction!(request_holidays_naikaku, m)?)?;
+
+
+    // workdays
+    m.add_function(wrap_pyfunction!(get_workdays, m)?)?;
+    m.add_function(wrap_pyfunction!(check_workday, m)?)?;
+    m.add_function(wrap_pyfunction!(get_next_workday, m)?)?;
+    m.add_function(wrap_pyfunction!(get_previous_workday, m)?)?;
+    m.add_function(wrap_pyfunction!(get_near_workday, m)?)?;
+    m.add_function(wrap_pyfunction!(get_workdays_number, m)?)?;
+    m.add_function(wrap_pyfunction!(count_workdays, m)?)?;
+    m.add_function(wrap_pyfunction!(get_workday_ordinal, m)?)?;
+    m.add_function(wrap_pyfunction!(get_workday_from_ordinal, m)?)?;
+
+    // intraday
+    m.add_function(wrap_pyfunction!(check_workday_intraday_naive, m)?)?;
+    m.add_function(wrap_pyfunction!(get_next_border_workday_intraday_naive, m)?)?;
+    m.add_function(wrap_pyfunction!(get_previous_border_workday_intraday_naive, m)?)?;
+    m.add_function(wrap_pyfunction!(get_near_workday_intraday_naive, m)?)?;
+    m.add_function(wrap_pyfunction!(add_workday_intraday_datetime_naive, m)?)?;
+    m.add_function(wrap_pyfunction!(get_timedelta_workdays_intraday_naive, m)?)?;
+
+    // extract
+    m.add_function(wrap_pyfunction!(extract_workdays_bool_naive, m)?)?;
+    m.add_function(wrap_pyfunction!(extract_intraday_bool_naive, m)?)?;
+    m.add_function(wrap_pyfunction!(extract_workdays_intraday_bool_naive, m)?)?;
+    m.add_function(wrap_pyfunction!(extract_workdays_intraday_ranges_naive, m)?)?;
+    m.add_function(wrap_pyfunction!(get_session_numbers_naive, m)?)?;
+    m.add_function(wrap_pyfunction!(get_workday_session_labels_naive, m)?)?;
+    m.add_function(wrap_pyfunction!(add_workday_intraday_array_naive, m)?)?;
+    m.add_function(wrap_pyfunction!(get_timedelta_workdays_intraday_array_naive, m)?)?;
+    m.add_function(wrap_pyfunction!(count_workdays_array_naive, m)?)?;
+    m.add_function(wrap_pyfunction!(get_workday_ordinal_array_naive, m)?)?;
+    m.add_function(wrap_pyfunction!(get_workday_from_ordinal_array_naive, m)?)?;
+    m.add_function(wrap_pyfunction!(to_business_time_naive, m)?)?;
+    m.add_function(wrap_pyfunction!(from_business_time_naive, m)?)?;
+    m.add_function(wrap_pyfunction!(get_next_workday_array_naive, m)?)?;
+    m.add_function(wrap_pyfunction!(get_previous_workday_array_naive, m)?)?;
+    m.add_function(wrap_pyfunction!(get_near_workday_array_naive, m)?)?;
+    m.add_function(wrap_pyfunction!(get_near_workday_intraday_array_naive, m)?)?;
+    m.add_function(wrap_pyfunction!(workday_intraday_range_naive, m)?)?;
+    m.add_function(wrap_pyfunction!(count_workday_intraday_range, m)?)?;
+    m.add_function(wrap_pyfunction!(set_parallel_config, m)?)?;
+    m.add_function(wrap_pyfunction!(get_parallel_config, m)?)?;
+    m.add_function(wrap_pyfunction!(set_metrics_config, m)?)?;
+    m.add_function(wrap_pyfunction!(get_metrics_snapshot, m)?)?;
+    m.add_function(wrap_pyfunction!(reset_metrics, m)?)?;
+
+    Ok(())
 }
\ No newline at end of file
@@ -0,0 +1,189 @@
+use std::collections::HashMap;
+use std::sync::Mutex;
+use std::sync::atomic::{AtomicBool, Ordering};
+use std::time::{Duration, Instant};
+
+use once_cell::sync::Lazy;
+use pyo3::prelude::*;
+use pyo3::types::PyDict;
+
+use crate::error::Error;
+
+/// 計測するかどうか(無効の場合は時刻を取得しない)
+static METRICS_ENABLED: AtomicBool = AtomicBool::new(false);
+
+/// 関数ごとの計測値
+#[derive(Clone, Copy, Debug, Default)]
+struct CallMetrics {
+    calls: u64,
+    conversion: Duration,
+    compute: Duration,
+    elements: u64
+}
+
+/// カレンダーの更新(前計算テーブルの再構築)ごとの計測値
+#[derive(Clone, Copy, Debug, Default)]
+struct RebuildMetrics {
+    count: u64,
+    total: Duration
+}
+
+#[derive(Debug, Default)]
+struct Metrics {
+    calls: HashMap<&'static str, CallMetrics>,
+    rebuilds: HashMap<&'static str, RebuildMetrics>
+}
+
+static METRICS: Lazy<Mutex<Metrics>> = Lazy::new(||{Mutex::new(Metrics::default())});
+
+/// カレンダーの更新ごとに呼ぶPythonの関数
+static METRICS_CALLBACK: Lazy<Mutex<Option<PyObject>>> = Lazy::new(||{Mutex::new(None)});
+
+pub fn is_enabled() -> bool {
+    METRICS_ENABLED.load(Ordering::Relaxed)
+}
+
+/// 計測の設定を更新する．無効にしても計測値は保持する
+/// Argments
+/// - enabled: 計測するかどうか
+/// - callback: カレンダーの更新ごとに呼ぶ関数．Noneの場合は解除する
+pub fn set_metrics_config(enabled: bool, callback: Option<PyObject>) {
+    *METRICS_CALLBACK.lock().unwrap() = callback;
+    METRICS_ENABLED.store(enabled, Ordering::Relaxed);
+}
+
+/// 計測値を破棄する
+pub fn reset_metrics() {
+    let mut metrics = METRICS.lock().unwrap();
+    metrics.calls.clear();
+    metrics.rebuilds.clear();
+}
+
+/// 関数の1回の呼び出しについて，Pythonとの変換と計算の時間を区間ごとに積算するストップウォッチ．
+/// 計測が無効の場合はなにもしない
+pub struct CallTimer {
+    name: &'static str,
+    last: Option<Instant>,
+    conversion: Duration,
+    compute: Duration
+}
+
+impl CallTimer {
+    pub fn start(name: &'static str) -> Self {
+        let last = if is_enabled() {Some(Instant::now())} else {None};
+        CallTimer {name, last, conversion: Duration::ZERO, compute: Duration::ZERO}
+    }
+
+    /// 前の区切りからの時間
+    fn lap(&mut self) -> Duration {
+        match self.last {
+            Some(last) => {
+                let now = Instant::now();
+                self.last = Some(now);
+                now - last
+            },
+            None => Duration::ZERO
+        }
+    }
+
+    /// 前の区切りからの時間を変換の時間とする
+    pub fn conversion(&mut self) {
+        let elapsed = self.lap();
+        self.conversion += elapsed;
+    }
+
+    /// 前の区切りからの時間を計算の時間とする
+    pub fn compute(&mut self) {
+        let elapsed = self.lap();
+        self.compute += elapsed;
+    }
+
+    /// 前の区切りからの時間を変換の時間として記録を終える
+    /// Argments
+    /// - elements: 処理した要素数(抽出関数などの配列の長さ)．スカラーの場合は0
+    pub fn finish(mut self, elements: usize) {
+        if self.last.is_none() {
+            return;
+        }
+        self.conversion();
+        let mut metrics = METRICS.lock().unwrap();
+        let call_metrics = metrics.calls.entry(self.name).or_default();
+        call_metrics.calls += 1;
+        call_metrics.conversion += self.conversion;
+        call_metrics.compute += self.compute;
+        call_metrics.elements += elements as u64;
+    }
+}
+
+/// カレンダーの更新fにかかる時間を記録し，コールバックを呼ぶ．
+/// fの中でカレンダーのロックを取得・解放し，コールバックはロックを解放してから呼ぶ．
+/// 前計算テーブルが変わらなかった場合(fがfalseを返す場合)は記録しない
+/// Argments
+/// - name: 更新の名前
+/// - f: 更新を行い，前計算テーブルが変わったかどうかを返す関数
+pub fn record_rebuild<F>(name: &'static str, f: F) -> Result<(), Error>
+where F: FnOnce() -> Result<bool, Error> {
+    if !is_enabled() {
+        return f().map(|_|{()});
+    }
+    let start = Instant::now();
+    let is_rebuilt = f()?;
+    let elapsed = start.elapsed();
+    if !is_rebuilt {
+        return Ok(());
+    }
+    {
+        let mut metrics = METRICS.lock().unwrap();
+        let rebuild_metrics = metrics.rebuilds.entry(name).or_default();
+        rebuild_metrics.count += 1;
+        rebuild_metrics.total += elapsed;
+    }
+    notify_rebuild(name, elapsed);
+    Ok(())
+}
+
+/// コールバックに更新のイベントの辞書を渡す．コールバックの例外は表示して無視する
+fn notify_rebuild(name: &str, elapsed: Duration) {
+    Python::with_gil(|py|{
+        let callback = METRICS_CALLBACK.lock().unwrap().as_ref().map(|callback|{callback.clone_ref(py)});
+        if let Some(callback) = callback {
+            let event = PyDict::new(py);
+            let called = event.set_item("kind", "rebuild")
+                .and_then(|_|{event.set_item("name", name)})
+                .and_then(|_|{event.set_item("seconds", elapsed.as_secs_f64())})
+                .and_then(|_|{callback.call1(py, (event,))});
+            if let Err(err) = called {
+                err.print(py);
+            }
+        }
+    })
+}
+
+/// 計測値のスナップショットを辞書として取得する
+pub fn metrics_snapshot(py: Python) -> PyResult<&PyDict> {
+    let metrics = METRICS.lock().unwrap();
+
+    let functions = PyDict::new(py);
+    for (name, call_metrics) in metrics.calls.iter() {
+        let function = PyDict::new(py);
+        function.set_item("calls", call_metrics.calls)?;
+        function.set_item("conversion_seconds", call_metrics.conversion.as_secs_f64())?;
+        function.set_item("compute_seconds", call_metrics.compute.as_secs_f64())?;
+        function.set_item("elements", call_metrics.elements)?;
+        functions.set_item(*name, function)?;
+    }
+
+    let rebuilds = PyDict::new(py);
+    for (name, rebuild_metrics) in metrics.rebuilds.iter() {
+        let rebuild = PyDict::new(py);
+        rebuild.set_item("count", rebuild_metrics.count)?;
+        rebuild.set_item("seconds", rebuild_metrics.total.as_secs_f64())?;
+        rebuilds.set_item(*name, rebuild)?;
+    }
+
+    let snapshot = PyDict::new(py);
+    snapshot.set_item("enabled", is_enabled())?;
+    snapshot.set_item("functions", functions)?;
+    snapshot.set_item("rebuilds", rebuilds)?;
+    Ok(snapshot)
+}
@@ -0,0 +1,69 @@
+use std::sync::atomic::{AtomicUsize, Ordering};
+use std::thread;
+
+/// 並列化する場合の1スレッドあたりの最小の要素数のデフォルト
+pub const DEFAULT_MIN_CHUNK_LENGTH: usize = 1 << 18;
+
+/// 利用するスレッド数(0の場合は利用可能なコア数)
+static PARALLEL_THREADS: AtomicUsize = AtomicUsize::new(0);
+
+/// 1スレッドあたりの最小の要素数
+static PARALLEL_MIN_CHUNK_LENGTH: AtomicUsize = AtomicUsize::new(DEFAULT_MIN_CHUNK_LENGTH);
+
+/// 並列化の設定を更新
+/// Argments
+/// - threads: 利用するスレッド数．0の場合は利用可能なコア数，1の場合は並列化しない
+/// - min_chunk_length: 1スレッドあたりの最小の要素数．これより短い入力は並列化しない
+pub fn set_parallel_config(threads: usize, min_chunk_length: usize) {
+    PARALLEL_THREADS.store(threads, Ordering::Relaxed);
+    PARALLEL_MIN_CHUNK_LENGTH.store(min_chunk_length.max(1), Ordering::Relaxed);
+}
+
+/// 並列化の設定(スレッド数, 1スレッドあたりの最小の要素数)を取得
+pub fn get_parallel_config() -> (usize, usize) {
+    (PARALLEL_THREADS.load(Ordering::Relaxed), PARALLEL_MIN_CHUNK_LENGTH.load(Ordering::Relaxed))
+}
+
+/// 実際に利用するスレッド数
+fn resolve_threads() -> usize {
+    match PARALLEL_THREADS.load(Ordering::Relaxed) {
+        0 => thread::available_parallelism().map(|n|{n.get()}).unwrap_or(1),
+        threads => threads
+    }
+}
+
+/// inputを分割してkernelを並列に適用し，対応するoutの範囲に書き込む．
+/// kernelは要素ごとに独立である必要があり，結果は直列に処理した場合と一致する
+pub fn fill_chunks<T, U, F>(input: &[T], out: &mut [U], kernel: F)
+where
+    T: Sync,
+    U: Send,
+    F: Fn(&[T], &mut [U]) + Sync
+{
+    fill_chunks_with_offset(input, out, |_, input_chunk, out_chunk|{kernel(input_chunk, out_chunk)});
+}
+
+/// fill_chunksと同じだが，kernelは分割した範囲の先頭のインデックスも受け取る．
+/// 要素ごとの引数の配列を同じ範囲で分割するのに利用する
+pub fn fill_chunks_with_offset<T, U, F>(input: &[T], out: &mut [U], kernel: F)
+where
+    T: Sync,
+    U: Send,
+    F: Fn(usize, &[T], &mut [U]) + Sync
+{
+    let min_chunk_length = PARALLEL_MIN_CHUNK_LENGTH.load(Ordering::Relaxed);
+    let n_chunks = resolve_threads().min(input.len() / min_chunk_length).max(1);
+    if n_chunks == 1 {
+        kernel(0, input, out);
+        return;
+    }
+
+    let chunk_length = (input.len() + n_chunks - 1) / n_chunks;
+    let kernel = &kernel;
+    thread::scope(|scope|{
+        let chunks = input.chunks(chunk_length).zip(out.chunks_mut(chunk_length)).enumerate();
+        for (i, (input_chunk, out_chunk)) in chunks {
+            scope.spawn(move ||{kernel(i * chunk_length, input_chunk, out_chunk)});
+        }
+    });
+}
@@ -0,0 +1,504 @@
+use std::collections::{HashSet, HashMap};
+
+use pyo3::prelude::*;
+use pyo3::types::{PyBytes, PyDate, PyDateTime, PyTime, PyDelta};
+use numpy::{PyArray, PyReadonlyArray, Ix1};
+
+use crate::bindings;
+use crate::calendar::{CalendarCore, ExtractKind};
+use crate::convert::*;
+use crate::error::Error;
+use crate::snapshot::CalendarSnapshot;
+
+/// 祝日・休日曜日・営業時間境界とその前計算テーブルを個別にもつカレンダー．
+/// モジュールの関数と同名のメソッドをもち，複数のカレンダーを同時に利用できる．
+/// デフォルトのカレンダーと同様に，更新は変更しないスナップショットを差し替える
+#[pyclass(name = "Calendar", subclass)]
+pub struct PyCalendar {
+    pub core: CalendarSnapshot
+}
+
+#[pymethods]
+impl PyCalendar {
+    /// カレンダーの作成
+    /// Argments
+    /// - holidays_csv_paths: 祝日のcsvのパス．Noneの場合は祝日なし
+    /// - start_year: 利用する開始年．Noneの場合は現在年の5年前
+    /// - end_year: 利用する終了年．Noneの場合は現在年の2年後
+    /// - holiday_weekdays: 休日曜日のセット．Noneの場合は土日
+    /// - intraday_borders: 営業時間境界のリスト．Noneの場合は東京証券取引所の営業時間
+    #[new]
+    #[args(holidays_csv_paths="None", start_year="None", end_year="None", holiday_weekdays="None", intraday_borders="None")]
+    fn new(
+        holidays_csv_paths: Option<Vec<String>>,
+        start_year: Option<i32>,
+        end_year: Option<i32>,
+        holiday_weekdays: Option<HashSet<usize>>,
+        intraday_borders: Option<Vec<HashMap<&str, &PyTime>>>
+    ) -> PyResult<Self> {
+        let mut core = CalendarCore::default();
+        let start_year = start_year.unwrap_or(core.start_year());
+        let end_year = end_year.unwrap_or(core.end_year());
+        core.set_holidays_csvs(&holidays_csv_paths.unwrap_or_default(), start_year, end_year)?;
+        if let Some(holiday_weekdays) = holiday_weekdays {
+            core.set_holiday_weekdays(&weekdays_py_to_chrono(&holiday_weekdays)?)?;
+        }
+        if let Some(intraday_borders) = intraday_borders {
+            core.set_intraday_borders(&borders_py_to_chrono(&intraday_borders)?)?;
+        }
+        Ok(PyCalendar {core: CalendarSnapshot::new(core)})
+    }
+
+    /// 祝日の開始年
+    #[getter]
+    fn holiday_start_year(&self) -> i32 {
+        self.core.load().start_year()
+    }
+
+    /// 祝日の終了年
+    #[getter]
+    fn holiday_end_year(&self) -> i32 {
+        self.core.load().end_year()
+    }
+
+    /// csvを読み込んで利用できる祝日の更新をする
+    fn set_holidays_csvs(&self, py: Python, holidays_csv_paths: Vec<String>, start_year: i32, end_year: i32) -> Result<(), Error> {
+        bindings::set_holidays_csvs(py, &self.core, "Calendar.set_holidays_csvs", &holidays_csv_paths, start_year, end_year)
+    }
+
+    /// 祝日のリストから祝日の更新をする
+    fn set_range_holidays(&self, py: Python, holidays: Vec<&PyDate>, start_year: i32, end_year: i32) -> Result<(), Error> {
+        let holidays = bindings::holidays_py_to_chrono(&holidays);
+        bindings::set_range_holidays(py, &self.core, "Calendar.set_range_holidays", &holidays, start_year, end_year)
+    }
+
+    /// 祝日のリストから祝日の追加をする
+    fn add_range_holidays(&self, py: Python, holidays: Vec<&PyDate>, start_year: i32, end_year: i32) -> Result<(), Error> {
+        let holidays = bindings::holidays_py_to_chrono(&holidays);
+        bindings::add_range_holidays(py, &self.core, "Calendar.add_range_holidays", &holidays, start_year, end_year)
+    }
+
+    /// np.datetime64のndarrayから祝日の更新をする
+    #[args(unit="\"D\"")]
+    fn set_range_holidays_naive(&self, py: Python, int_64_numpy: PyReadonlyArray<i64,Ix1>, start_year: i32, end_year: i32, unit: &str) -> Result<(), Error> {
+        bindings::set_range_holidays_naive(py, &self.core, "Calendar.set_range_holidays", &int_64_numpy, start_year, end_year, unit)
+    }
+
+    /// np.datetime64のndarrayから祝日の追加をする
+    #[args(unit="\"D\"")]
+    fn add_range_holidays_naive(&self, py: Python, int_64_numpy: PyReadonlyArray<i64,Ix1>, start_year: i32, end_year: i32, unit: &str) -> Result<(), Error> {
+        bindings::add_range_holidays_naive(py, &self.core, "Calendar.add_range_holidays", &int_64_numpy, start_year, end_year, unit)
+    }
+
+    /// 祝日を読み込み直さずに利用する年の範囲を変更する
+    fn set_holiday_year_range(&self, py: Python, start_year: i32, end_year: i32) -> Result<(), Error> {
+        bindings::set_holiday_year_range(py, &self.core, "Calendar.set_holiday_year_range", start_year, end_year)
+    }
+
+    /// カレンダーをコンパイル済みの形式で取得する
+    fn dump_compiled_calendar<'p>(&self, py: Python<'p>, fingerprint: &[u8]) -> Result<&'p PyBytes, Error> {
+        Ok(bindings::dump_compiled_calendar(py, &self.core.load(), fingerprint))
+    }
+
+    /// コンパイル済みのカレンダーを読み込む．バージョンあるいは指紋が一致しない場合はFalse
+    fn load_compiled_calendar(&self, py: Python, compiled: &PyAny, fingerprint: &[u8]) -> PyResult<bool> {
+        bindings::load_compiled_calendar(py, &self.core, "Calendar.load_compiled_calendar", compiled, fingerprint)
+    }
+
+    /// 休日曜日の更新
+    fn set_holiday_weekdays(&self, py: Python, holiday_weekday_numbers: HashSet<usize>) -> Result<(), Error> {
+        bindings::set_holiday_weekdays(py, &self.core, "Calendar.set_holiday_weekdays", &holiday_weekday_numbers)
+    }
+
+    /// 営業時間境界の更新
+    fn set_intraday_borders(&self, py: Python, intraday_borders: Vec<HashMap<&str, &PyTime>>) -> Result<(), Error> {
+        bindings::set_intraday_borders(py, &self.core, "Calendar.set_intraday_borders", &intraday_borders)
+    }
+
+    /// タイムゾーンの更新(オフセットの遷移テーブル)．空の場合はタイムゾーンを設定しない
+    fn set_utc_offset_table(&self, py: Python, transitions: Vec<i64>, offsets: Vec<i64>) -> Result<(), Error> {
+        bindings::set_utc_offset_table(py, &self.core, "Calendar.set_utc_offset_table", transitions, offsets)
+    }
+
+    /// タイムゾーンが設定されているかどうか
+    fn has_timezone(&self) -> bool {
+        self.core.load().has_timezone()
+    }
+
+    /// カレンダーの版の番号．祝日・休日曜日・営業時間境界・タイムゾーンが変更されるごとに変わる
+    fn get_calendar_version(&self) -> u64 {
+        self.core.load().version()
+    }
+
+    /// 祝日データの取得
+    #[args(as_array="false")]
+    fn get_range_holidays(&self, py: Python, as_array: bool) -> PyResult<PyObject> {
+        days_to_py_output(py, self.core.load().range_holidays_days(), as_array)
+    }
+
+    /// 利用する年の範囲の取得
+    fn get_holiday_year_range(&self) -> (i32, i32) {
+        let core = self.core.load();
+        (core.start_year(), core.end_year())
+    }
+
+    /// 休日曜日データの取得
+    fn get_holiday_weekdays(&self) -> Result<HashSet<u32>, Error> {
+        Ok(bindings::holiday_weekday_numbers(&self.core.load()))
+    }
+
+    /// 営業時間境界の取得
+    fn get_intraday_borders<'p>(&self, py: Python<'p>) -> Result<Vec<HashMap<String, &'p PyTime>>, Error> {
+        Ok(borders_chrono_to_py(py, self.core.load().intraday_borders()))
+    }
+
+    /// start_dateからend_dateまでの営業日を取得
+    #[args(closed="\"left\"", as_array="false")]
+    fn get_workdays(
+        &self,
+        py: Python,
+        start_date: &PyDate,
+        end_date: &PyDate,
+        closed: &str,
+        as_array: bool
+    ) -> PyResult<PyObject> {
+        bindings::get_workdays(py, &self.core.load(), "Calendar.get_workdays", start_date, end_date, closed, as_array)
+    }
+
+    /// select_dateが営業日であるか判定
+    fn check_workday(&self, py: Python, select_date: &PyDate) -> Result<bool, Error> {
+        bindings::check_workday(py, &self.core.load(), "Calendar.check_workday", select_date)
+    }
+
+    /// select_dateからdays分の次の営業日を取得
+    #[args(days="1")]
+    fn get_next_workday<'p>(&self, py: Python<'p>, select_date: &PyDate, days: i32) -> Result<&'p PyDate, Error> {
+        bindings::get_next_workday(py, &self.core.load(), "Calendar.get_next_workday", select_date, days)
+    }
+
+    /// select_dateからdays分の前の営業日を取得
+    #[args(days="1")]
+    fn get_previous_workday<'p>(&self, py: Python<'p>, select_date: &PyDate, days: i32) -> Result<&'p PyDate, Error> {
+        bindings::get_previous_workday(py, &self.core.load(), "Calendar.get_previous_workday", select_date, days)
+    }
+
+    /// 最近の営業日を取得
+    #[args(is_after="true")]
+    fn get_near_workday<'p>(&self, py: Python<'p>, select_date: &PyDate, is_after: bool) -> Result<&'p PyDate, Error> {
+        bindings::get_near_workday(py, &self.core.load(), "Calendar.get_near_workday", select_date, is_after)
+    }
+
+    /// start_dateからdays分だけの営業日のリストを取得
+    #[args(as_array="false")]
+    fn get_workdays_number(&self, py: Python, start_date: &PyDate, days: i32, as_array: bool) -> PyResult<PyObject> {
+        bindings::get_workdays_number(py, &self.core.load(), "Calendar.get_workdays_number", start_date, days, as_array)
+    }
+
+    /// start_dateからend_dateまでの営業日数を取得
+    #[args(closed="\"left\"")]
+    fn count_workdays(&self, py: Python, start_date: &PyDate, end_date: &PyDate, closed: &str) -> Result<i64, Error> {
+        bindings::count_workdays(py, &self.core.load(), "Calendar.count_workdays", start_date, end_date, closed)
+    }
+
+    /// select_dateの営業日の序数を取得
+    fn get_workday_ordinal(&self, py: Python, select_date: &PyDate) -> Result<i64, Error> {
+        bindings::get_workday_ordinal(py, &self.core.load(), "Calendar.get_workday_ordinal", select_date)
+    }
+
+    /// 営業日の序数から営業日を取得
+    fn get_workday_from_ordinal<'p>(&self, py: Python<'p>, ordinal: i64) -> Result<&'p PyDate, Error> {
+        bindings::get_workday_from_ordinal(py, &self.core.load(), "Calendar.get_workday_from_ordinal", ordinal)
+    }
+
+    /// select_datetimeが営業日・営業時間内であるかどうかを判定
+    fn check_workday_intraday_naive(&self, py: Python, select_datetime: &PyDateTime) -> Result<bool, Error> {
+        bindings::check_workday_intraday(py, &self.core.load(), "Calendar.check_workday_intraday", select_datetime)
+    }
+
+    /// 次の営業日・営業時間内のdatetimeをその状態とともに取得
+    fn get_next_border_workday_intraday_naive<'p>(
+        &self,
+        py: Python<'p>,
+        select_datetime: &PyDateTime
+    ) -> Result<(&'p PyDateTime, String), Error> {
+        bindings::get_next_border_workday_intraday(py, &self.core.load(), "Calendar.get_next_border_workday_intraday", select_datetime)
+    }
+
+    /// 前の営業日・営業時間内のdatetimeをその状態とともに取得
+    #[args(force_is_end="false")]
+    fn get_previous_border_workday_intraday_naive<'p>(
+        &self,
+        py: Python<'p>,
+        select_datetime: &PyDateTime,
+        force_is_end: bool
+    ) -> Result<(&'p PyDateTime, String), Error> {
+        bindings::get_previous_border_workday_intraday(py, &self.core.load(), "Calendar.get_previous_border_workday_intraday", select_datetime, force_is_end)
+    }
+
+    /// 最近の営業日・営業時間内のdatetimeをその状態とともに取得
+    #[args(is_after="true")]
+    fn get_near_workday_intraday_naive<'p>(
+        &self,
+        py: Python<'p>,
+        select_datetime: &PyDateTime,
+        is_after: bool
+    ) -> Result<(&'p PyDateTime, String), Error> {
+        bindings::get_near_workday_intraday(py, &self.core.load(), "Calendar.get_near_workday_intraday", select_datetime, is_after)
+    }
+
+    /// 営業日・営業時間を考慮しDateTimeを加算する
+    fn add_workday_intraday_datetime_naive<'p>(
+        &self,
+        py: Python<'p>,
+        select_datetime: &PyDateTime,
+        delta_time: &PyDelta
+    ) -> Result<&'p PyDateTime, Error> {
+        bindings::add_workday_intraday_datetime(py, &self.core.load(), "Calendar.add_workday_intraday_datetime", select_datetime, delta_time)
+    }
+
+    /// start_datetimeからend_datetimeの営業日・営業時間を取得
+    fn get_timedelta_workdays_intraday_naive<'p>(
+        &self,
+        py: Python<'p>,
+        start_datetime: &PyDateTime,
+        end_datetime: &PyDateTime
+    ) -> Result<&'p PyDelta, Error> {
+        bindings::get_timedelta_workdays_intraday(py, &self.core.load(), "Calendar.get_timedelta_workdays_intraday", start_datetime, end_datetime)
+    }
+
+    /// np.datetime64のndarrayから営業日のものをboolとして抽出
+    #[args(unit="\"s\"", out="None", utc="false", assume_sorted="false")]
+    fn extract_workdays_bool_naive<'p>(
+        &self,
+        py: Python<'p>,
+        int_64_numpy: PyReadonlyArray<i64,Ix1>,
+        unit: &str,
+        out: Option<&'p PyArray<bool,Ix1>>,
+        utc: bool,
+        assume_sorted: bool
+    ) -> Result<&'p PyArray<bool,Ix1>, Error> {
+        bindings::extract_bool(py, &self.core.load(), "Calendar.extract_workdays_bool", ExtractKind::Workdays, &int_64_numpy, unit, out, utc, assume_sorted)
+    }
+
+    /// np.datetime64のndarrayから営業時間のものをboolとして抽出
+    #[args(unit="\"s\"", out="None", utc="false", assume_sorted="false")]
+    fn extract_intraday_bool_naive<'p>(
+        &self,
+        py: Python<'p>,
+        int_64_numpy: PyReadonlyArray<i64,Ix1>,
+        unit: &str,
+        out: Option<&'p PyArray<bool,Ix1>>,
+        utc: bool,
+        assume_sorted: bool
+    ) -> Result<&'p PyArray<bool,Ix1>, Error> {
+        bindings::extract_bool(py, &self.core.load(), "Calendar.extract_intraday_bool", ExtractKind::Intraday, &int_64_numpy, unit, out, utc, assume_sorted)
+    }
+
+    /// np.datetime64のndarrayから営業日・営業時間のものをboolとして抽出
+    #[args(unit="\"s\"", out="None", utc="false", assume_sorted="false")]
+    fn extract_workdays_intraday_bool_naive<'p>(
+        &self,
+        py: Python<'p>,
+        int_64_numpy: PyReadonlyArray<i64,Ix1>,
+        unit: &str,
+        out: Option<&'p PyArray<bool,Ix1>>,
+        utc: bool,
+        assume_sorted: bool
+    ) -> Result<&'p PyArray<bool,Ix1>, Error> {
+        bindings::extract_bool(py, &self.core.load(), "Calendar.extract_workdays_intraday_bool", ExtractKind::WorkdaysIntraday, &int_64_numpy, unit, out, utc, assume_sorted)
+    }
+
+    /// 昇順にソートされたnp.datetime64のndarrayから，営業日・営業時間の要素が連続する範囲を取得
+    #[args(unit="\"s\"", utc="false")]
+    fn extract_workdays_intraday_ranges_naive<'p>(
+        &self,
+        py: Python<'p>,
+        int_64_numpy: PyReadonlyArray<i64,Ix1>,
+        unit: &str,
+        utc: bool
+    ) -> Result<&'p PyArray<i64,Ix1>, Error> {
+        bindings::extract_workdays_intraday_ranges(py, &self.core.load(), "Calendar.extract_workdays_intraday_ranges", &int_64_numpy, unit, utc)
+    }
+
+    /// np.datetime64のndarrayの各要素が含まれる営業時間(セッション)の通し番号を取得
+    #[args(unit="\"s\"", utc="false")]
+    fn get_session_numbers_naive<'p>(
+        &self,
+        py: Python<'p>,
+        int_64_numpy: PyReadonlyArray<i64,Ix1>,
+        unit: &str,
+        utc: bool
+    ) -> Result<&'p PyArray<i64,Ix1>, Error> {
+        bindings::get_session_numbers(py, &self.core.load(), "Calendar.get_session_numbers", &int_64_numpy, unit, utc)
+    }
+
+    /// np.datetime64のndarrayの各要素の営業時間のラベルを同じスナップショットから取得
+    #[args(unit="\"s\"", utc="false")]
+    fn get_workday_session_labels_naive<'p>(
+        &self,
+        py: Python<'p>,
+        int_64_numpy: PyReadonlyArray<i64,Ix1>,
+        unit: &str,
+        utc: bool
+    ) -> Result<bindings::SessionLabelArrays<'p>, Error> {
+        bindings::get_workday_session_labels(py, &self.core.load(), "Calendar.get_workday_session_labels", &int_64_numpy, unit, utc)
+    }
+
+    /// np.datetime64のndarrayの各要素に営業日・営業時間を考慮してnp.timedelta64を加算する
+    #[args(unit="\"s\"", delta_unit="\"s\"")]
+    fn add_workday_intraday_array_naive<'p>(
+        &self,
+        py: Python<'p>,
+        int_64_numpy: PyReadonlyArray<i64,Ix1>,
+        deltas: &PyAny,
+        unit: &str,
+        delta_unit: &str
+    ) -> Result<&'p PyArray<i64,Ix1>, Error> {
+        bindings::add_workday_intraday_array(py, &self.core.load(), "Calendar.add_workday_intraday_array", &int_64_numpy, deltas, unit, delta_unit)
+    }
+
+    /// 開始日時と終了日時のnp.datetime64のndarrayの各組の営業日・営業時間の時間差を取得
+    #[args(start_unit="\"s\"", end_unit="\"s\"")]
+    fn get_timedelta_workdays_intraday_array_naive<'p>(
+        &self,
+        py: Python<'p>,
+        start_int_64_numpy: PyReadonlyArray<i64,Ix1>,
+        end_int_64_numpy: PyReadonlyArray<i64,Ix1>,
+        start_unit: &str,
+        end_unit: &str
+    ) -> Result<&'p PyArray<i64,Ix1>, Error> {
+        bindings::get_timedelta_workdays_intraday_array(py, &self.core.load(), "Calendar.get_timedelta_workdays_intraday_array", &start_int_64_numpy, &end_int_64_numpy, start_unit, end_unit)
+    }
+
+    /// 開始日と終了日のnp.datetime64のndarrayの各組の営業日数を取得
+    #[args(start_unit="\"s\"", end_unit="\"s\"", closed="\"left\"")]
+    fn count_workdays_array_naive<'p>(
+        &self,
+        py: Python<'p>,
+        start_int_64_numpy: PyReadonlyArray<i64,Ix1>,
+        end_int_64_numpy: PyReadonlyArray<i64,Ix1>,
+        start_unit: &str,
+        end_unit: &str,
+        closed: &str
+    ) -> Result<&'p PyArray<i64,Ix1>, Error> {
+        bindings::count_workdays_array(py, &self.core.load(), "Calendar.count_workdays_array", &start_int_64_numpy, &end_int_64_numpy, start_unit, end_unit, closed)
+    }
+
+    /// np.datetime64のndarrayの各要素の営業日の序数を取得
+    #[args(unit="\"s\"")]
+    fn get_workday_ordinal_array_naive<'p>(
+        &self,
+        py: Python<'p>,
+        int_64_numpy: PyReadonlyArray<i64,Ix1>,
+        unit: &str
+    ) -> Result<&'p PyArray<i64,Ix1>, Error> {
+        bindings::get_workday_ordinal_array(py, &self.core.load(), "Calendar.get_workday_ordinal_array", &int_64_numpy, unit)
+    }
+
+    /// 営業日の序数のndarrayから営業日を取得
+    fn get_workday_from_ordinal_array_naive<'p>(
+        &self,
+        py: Python<'p>,
+        ordinals: PyReadonlyArray<i64,Ix1>
+    ) -> Result<&'p PyArray<i64,Ix1>, Error> {
+        bindings::get_workday_from_ordinal_array(py, &self.core.load(), "Calendar.get_workday_from_ordinal_array", &ordinals)
+    }
+
+    /// np.datetime64のndarrayの各要素を営業秒の軸に変換
+    #[args(unit="\"s\"")]
+    fn to_business_time_naive<'p>(
+        &self,
+        py: Python<'p>,
+        int_64_numpy: PyReadonlyArray<i64,Ix1>,
+        unit: &str
+    ) -> Result<&'p PyArray<i64,Ix1>, Error> {
+        bindings::to_business_time(py, &self.core.load(), "Calendar.to_business_time", &int_64_numpy, unit)
+    }
+
+    /// 営業秒の軸の値のndarrayを日時に変換
+    #[args(unit="\"s\"")]
+    fn from_business_time_naive<'p>(
+        &self,
+        py: Python<'p>,
+        int_64_numpy: PyReadonlyArray<i64,Ix1>,
+        unit: &str
+    ) -> Result<&'p PyArray<i64,Ix1>, Error> {
+        bindings::from_business_time(py, &self.core.load(), "Calendar.from_business_time", &int_64_numpy, unit)
+    }
+
+    /// np.datetime64のndarrayの各要素からdays分の次の営業日を取得
+    #[args(unit="\"s\"", days="None")]
+    fn get_next_workday_array_naive<'p>(
+        &self,
+        py: Python<'p>,
+        int_64_numpy: PyReadonlyArray<i64,Ix1>,
+        unit: &str,
+        days: Option<&PyAny>
+    ) -> Result<&'p PyArray<i64,Ix1>, Error> {
+        bindings::get_next_workday_array(py, &self.core.load(), "Calendar.get_next_workday_array", &int_64_numpy, unit, days)
+    }
+
+    /// np.datetime64のndarrayの各要素からdays分の前の営業日を取得
+    #[args(unit="\"s\"", days="None")]
+    fn get_previous_workday_array_naive<'p>(
+        &self,
+        py: Python<'p>,
+        int_64_numpy: PyReadonlyArray<i64,Ix1>,
+        unit: &str,
+        days: Option<&PyAny>
+    ) -> Result<&'p PyArray<i64,Ix1>, Error> {
+        bindings::get_previous_workday_array(py, &self.core.load(), "Calendar.get_previous_workday_array", &int_64_numpy, unit, days)
+    }
+
+    /// np.datetime64のndarrayの各要素の最近の営業日を取得
+    #[args(unit="\"s\"", is_after="true")]
+    fn get_near_workday_array_naive<'p>(
+        &self,
+        py: Python<'p>,
+        int_64_numpy: PyReadonlyArray<i64,Ix1>,
+        unit: &str,
+        is_after: bool
+    ) -> Result<&'p PyArray<i64,Ix1>, Error> {
+        bindings::get_near_workday_array(py, &self.core.load(), "Calendar.get_near_workday_array", &int_64_numpy, unit, is_after)
+    }
+
+    /// np.datetime64のndarrayの各要素の最近の営業日・営業時間内の日時を取得
+    #[args(unit="\"s\"", is_after="true")]
+    fn get_near_workday_intraday_array_naive<'p>(
+        &self,
+        py: Python<'p>,
+        int_64_numpy: PyReadonlyArray<i64,Ix1>,
+        unit: &str,
+        is_after: bool
+    ) -> Result<&'p PyArray<i64,Ix1>, Error> {
+        bindings::get_near_workday_intraday_array(py, &self.core.load(), "Calendar.get_near_workday_intraday_array", &int_64_numpy, unit, is_after)
+    }
+
+    /// 営業日の各営業時間の開始からfreq_seconds間隔の日時を取得
+    #[args(closed="\"left\"", unit="\"ns\"", offset="0", length="None")]
+    fn workday_intraday_range_naive<'p>(
+        &self,
+        py: Python<'p>,
+        start_datetime: &PyDateTime,
+        end_datetime: &PyDateTime,
+        freq_seconds: i64,
+        closed: &str,
+        unit: &str,
+        offset: usize,
+        length: Option<usize>
+    ) -> Result<&'p PyArray<i64,Ix1>, Error> {
+        bindings::workday_intraday_range(py, &self.core.load(), "Calendar.workday_intraday_range", start_datetime, end_datetime, freq_seconds, closed, unit, offset, length)
+    }
+
+    /// workday_intraday_range_naiveの結果の要素数を取得
+    #[args(closed="\"left\"")]
+    fn count_workday_intraday_range(
+        &self,
+        start_datetime: &PyDateTime,
+        end_datetime: &PyDateTime,
+        freq_seconds: i64,
+        closed: &str
+    ) -> Result<i64, Error> {
+        bindings::count_workday_intraday_range(&self.core.load(), start_datetime, end_datetime, freq_seconds, closed)
+    }
+}
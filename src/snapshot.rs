@@ -0,0 +1,54 @@
+use std::sync::{Arc, Mutex};
+
+use arc_swap::ArcSwap;
+use pyo3::prelude::*;
+
+use crate::calendar::CalendarCore;
+use crate::error::Error;
+
+/// 変更しないカレンダーのスナップショットをアトミックに差し替えて公開する．
+/// 読み込みはロックせず，更新は直列化する
+pub struct CalendarSnapshot {
+    current: ArcSwap<CalendarCore>,
+    writer: Mutex<()>
+}
+
+impl CalendarSnapshot {
+    pub fn new(core: CalendarCore) -> Self {
+        CalendarSnapshot {current: ArcSwap::from_pointee(core), writer: Mutex::new(())}
+    }
+
+    /// 現在のスナップショット．ロックせずに取得でき，保持している間は更新の影響を受けない
+    pub fn load(&self) -> Arc<CalendarCore> {
+        self.current.load_full()
+    }
+
+    /// 現在のスナップショットから新しいカレンダーをfで作成し，成功した場合にアトミックに公開する．
+    /// 作成中はGILを解放し，読み込みは以前のスナップショットを利用して待たない
+    /// 
+    /// Return
+    /// 前計算テーブルが変わったかどうか(版の番号が同じ場合は公開しない)
+    pub fn replace<F>(&self, py: Python, f: F) -> Result<bool, Error>
+    where F: FnOnce(&CalendarCore) -> Result<CalendarCore, Error> + Send {
+        py.allow_threads(||{
+            let _writer = self.writer.lock().unwrap();
+            let current = self.current.load();
+            let calendar = f(&current)?;
+            if calendar.version() == current.version() {
+                return Ok(false);
+            }
+            self.current.store(Arc::new(calendar));
+            Ok(true)
+        })
+    }
+
+    /// 現在のスナップショットの複製をfで変更して公開する．replaceと同様に前計算テーブルが変わったかどうかを返す
+    pub fn update<F>(&self, py: Python, f: F) -> Result<bool, Error>
+    where F: FnOnce(&mut CalendarCore) -> Result<(), Error> + Send {
+        self.replace(py, |current|{
+            let mut calendar = current.clone();
+            f(&mut calendar)?;
+            Ok(calendar)
+        })
+    }
+}
@@ -1,329 +1,936 @@
-import unittest
-import numpy as np
-import datetime
-from datetime import timedelta
-import pandas as pd
-from pathlib import Path
-from pytz import timezone
-
-from py_workdays import get_workdays
-from py_workdays import check_workday, get_next_workday, get_previous_workday, get_workdays_number, get_near_workday
-from py_workdays import extract_workdays_bool, extract_intraday_bool, extract_workdays_intraday_bool
-from py_workdays import check_workday_intraday, get_near_workday_intraday, get_next_border_workday_intraday, get_previous_border_workday_intraday
-from py_workdays import add_workday_intraday_datetime, get_timedelta_workdays_intraday
-from py_workdays import config
-
-
-def true_holidays_2021() -> np.ndarray:
-    holidays_list = [datetime.date(2021,1,1),
-                     datetime.date(2021,1,11),
-                     datetime.date(2021,2,11),
-                     datetime.date(2021,2,23),
-                     datetime.date(2021,3,20),
-                     datetime.date(2021,4,29),
-                     datetime.date(2021,5,3),
-                     datetime.date(2021,5,4),
-                     datetime.date(2021,5,5),
-                     datetime.date(2021,7,22),
-                     datetime.date(2021,7,23),
-                     datetime.date(2021,8,8),
-                     datetime.date(2021,8,9),  #振替
-                     datetime.date(2021,9,20),
-                     datetime.date(2021,9,23),
-                     datetime.date(2021,11,3),
-                     datetime.date(2021,11,23)
-                    ]
-
-    return np.array(holidays_list)
-
-
-class TestWorkdays(unittest.TestCase):
-    @classmethod
-    def setUpClass(cls) -> None:
-        config.holiday_start_year = 2021
-        config.holiday_weekdays = [5,6]
-        config.intraday_borders = [{"start":datetime.time(9,0), "end":datetime.time(11,30)},
-                                   {"start":datetime.time(12,30), "end":datetime.time(15,0)}]
-        
-        
-    def test_related_workdays(self) -> None:
-        # get_workdays, get_not_workdays
-        all_date = pd.date_range(datetime.date(2021,1,1), datetime.date(2021,12,31), freq="D").date # type: ignore
-        all_weekdays = np.array([item.weekday() for item in all_date])
-        
-        is_hoildays = np.in1d(all_date, true_holidays_2021())  # type: ignore
-        is_hoilday_weekdays = np.logical_or.reduce([all_weekdays==holiday_weekday for holiday_weekday in config.holiday_weekdays])  # 祝日曜日
-        
-        is_not_workdays = is_hoildays | is_hoilday_weekdays
-        is_workdays = (~is_hoildays) & (~is_hoilday_weekdays)
-        
-        true_not_workdays = all_date[is_not_workdays]
-        true_workdays = all_date[is_workdays]
-        
-        workdays_array = np.array(get_workdays(datetime.date(2021,1,1), datetime.date(2022,1,1)))
-        
-        self.assertTrue(np.array_equal(workdays_array, true_workdays))
-        
-        # get_workdays_number
-        # 祝日始まり
-        workdays_50_array = np.array(get_workdays_number(datetime.date(2021,1,1), 50))
-        self.assertTrue(np.array_equal(workdays_50_array, true_workdays[:50]))
-        
-        # 営業日始まり
-        workdays_50_array = np.array(get_workdays_number(datetime.date(2021,1,4), 50))  # 1月4日は一番最初の営業日
-        self.assertTrue(np.array_equal(workdays_50_array, true_workdays[:50]))
-        
-        # check_workday
-        checked_workdays = [check_workday(one_date) for one_date in true_workdays]
-        self.assertTrue(all(checked_workdays))
-        checked_not_workdays = [check_workday(one_date) for one_date in true_not_workdays]
-        self.assertFalse(any(checked_not_workdays))
-        
-        # get_next_workday
-        #from IPython.core.debugger import Pdb; Pdb().set_trace()
-        # 祝日始まり
-        workdays_array = np.array([get_next_workday(datetime.date(2021,1,1), i) for i in range(1,len(true_workdays)+1)])
-        self.assertTrue(np.array_equal(workdays_array, true_workdays))
-        # 営業日始まり
-        workdays_array = np.array([get_next_workday(datetime.date(2021,1,4), i) for i in range(1,len(true_workdays))])
-        self.assertTrue(np.array_equal(workdays_array, true_workdays[1:]))   # get_next_workdaysは初日は含めないので
-        
-        # get_previous_workday
-        # 祝日始まり
-        workdays_array = np.array([get_previous_workday(datetime.date(2022,1,1), i) for i in range(1,len(true_workdays)+1)])
-        self.assertTrue(np.array_equal(workdays_array[::-1], true_workdays))
-        # 営業日始まり
-        workdays_array = np.array([get_previous_workday(datetime.date(2021,12,31), i) for i in range(1,len(true_workdays))])
-        self.assertTrue(np.array_equal(workdays_array[::-1], true_workdays[:-1]))
-        
-        # get_near_workday
-        near_workday = get_near_workday(datetime.date(2021,1,1), is_after=True)
-        self.assertEqual(near_workday, datetime.date(2021,1,4))
-        near_workday = get_near_workday(datetime.date(2021,1,1), is_after=False)
-        self.assertEqual(near_workday, datetime.date(2020,12,31))
-        
-    def test_related_extract(self) -> None:
-        all_date: np.ndarray = pd.date_range(datetime.date(2021,1,1), datetime.date(2021,12,31), freq="D").date  # type: ignore
-        all_weekdays = np.array([item.weekday() for item in all_date])
-        
-        is_hoildays = np.in1d(all_date, true_holidays_2021())  # type: ignore
-        is_hoilday_weekdays = np.logical_or.reduce([all_weekdays==holiday_weekday for holiday_weekday in config.holiday_weekdays])  # 祝日曜日
-        
-        is_not_workdays = is_hoildays | is_hoilday_weekdays
-        
-        true_not_workdays = all_date[is_not_workdays] 
-        
-        
-        dt_index = pd.date_range(datetime.datetime(2021,1,1,0,0,0), datetime.datetime(2021,12,31,23,59,0), freq="T")
-        nan_df = pd.DataFrame(None, index=dt_index)
-        nan_df["column1"] = np.nan
-        extracted_df = nan_df.loc[extract_workdays_bool(nan_df.index)]
-        # 抽出したpd.DataFrameのdateが非営業日に含まれない
-        self.assertFalse(np.any(
-            np.in1d(
-                extracted_df.index.date,   # type:ignore
-                true_not_workdays
-            )
-        ))
-        
-        # 日中以外のある時間のデータの長さが0
-        extracted_df = nan_df.loc[extract_intraday_bool(nan_df.index)]
-        self.assertEqual(len(extracted_df.at_time(datetime.time(8,0)).index),0)
-        
-        # 両方チェック
-        jst = timezone("Asia/Tokyo")
-        nan_df.index = nan_df.index.tz_localize(jst)  # type:ignore
-        extracted_df = nan_df.loc[extract_workdays_intraday_bool(nan_df.index)]
-        self.assertFalse(np.any(
-            np.in1d(
-                extracted_df.index.date,   # type:ignore
-                true_not_workdays
-            )
-        ))
-        self.assertEqual(len(extracted_df.at_time(datetime.time(8,0)).index),0)
-    
-    def test_related_datetime_raw(self) -> None:        
-        # check_workday_intraday
-        self.assertTrue(check_workday_intraday(datetime.datetime(2021,1,4,10,0,0)))
-        self.assertFalse(check_workday_intraday(datetime.datetime(2021,1,1,10,0,0)))
-        self.assertFalse(check_workday_intraday(datetime.datetime(2021,1,4,0,0,0)))
-        
-        # get_next_border_workday_intraday
-        next_border_workday_intraday_tuple = get_next_border_workday_intraday(datetime.datetime(2021,1,1,10,0,0))
-        self.assertEqual(next_border_workday_intraday_tuple, (datetime.datetime(2021, 1, 4, 9, 0), 'border_start'))
-        next_border_workday_intraday_tuple = get_next_border_workday_intraday(datetime.datetime(2021,1,4,9,0,0))
-        self.assertEqual(next_border_workday_intraday_tuple, (datetime.datetime(2021, 1, 4, 11, 30), 'border_end'))
-        next_border_workday_intraday_tuple = get_next_border_workday_intraday(datetime.datetime(2021,1,4,11,30,0))
-        self.assertEqual(next_border_workday_intraday_tuple, (datetime.datetime(2021, 1, 4, 12, 30), 'border_start'))
-        
-        # get_previous_border_workday_intraday
-        previous_border_workday_intraday_tuple = get_previous_border_workday_intraday(datetime.datetime(2021,1,1,10,0,0))
-        self.assertEqual(previous_border_workday_intraday_tuple, (datetime.datetime(2020, 12, 31, 15, 0), 'border_end'))
-        previous_border_workday_intraday_tuple = get_previous_border_workday_intraday(datetime.datetime(2021,12,31,12,30,0))
-        self.assertEqual(previous_border_workday_intraday_tuple, (datetime.datetime(2021, 12, 31, 11, 30), 'border_end'))       
-        previous_border_workday_intraday_tuple = get_previous_border_workday_intraday(datetime.datetime(2021,12,31,15,0,0))
-        self.assertEqual(previous_border_workday_intraday_tuple, (datetime.datetime(2021, 12, 31, 15, 0), 'border_end'))
-        previous_border_workday_intraday_tuple = get_previous_border_workday_intraday(datetime.datetime(2021,12,31,15,0,0), force_is_end=True)
-        self.assertEqual(previous_border_workday_intraday_tuple, (datetime.datetime(2021, 12, 31, 12, 30), 'border_start'))
-        
-        # get_near_workday_ntraday
-        near_workday_intraday_tuple = get_near_workday_intraday(datetime.datetime(2021,1,1,10,0,0), is_after=True)
-        self.assertEqual((datetime.datetime(2021,1,4,9,0,0), "border_start"), near_workday_intraday_tuple)
-        near_workday_intraday_tuple = get_near_workday_intraday(datetime.datetime(2021,1,1,10,0,0), is_after=False)
-        self.assertEqual((datetime.datetime(2020,12,31,15,0,0), "border_end"), near_workday_intraday_tuple)
-                
-        # add_workday_intraday_datetime
-        datetime_range = pd.date_range(start=datetime.datetime(2021,1,1,0,0,0), end=datetime.datetime(2021,2,1,0,0,0), closed="left", freq="5T")
-        extracted_datetime_range: pd.DatetimeIndex = datetime_range[extract_workdays_intraday_bool(datetime_range)]
-        extracted_datetime_range_array = extracted_datetime_range.to_pydatetime()  # type: ignore
-        
-        datetime_list = [datetime.datetime(2021, 1, 4, 9, 0)]
-        for i in range(1,len(extracted_datetime_range)):
-            datetime_list.append(add_workday_intraday_datetime(datetime.datetime(2021, 1, 1, 0, 0), timedelta(minutes=5)*i))
-        addded_dateteime_array = np.array(datetime_list)
-        self.assertTrue(np.array_equal(extracted_datetime_range_array, addded_dateteime_array))
-        
-        # sub_workday_intraday_datetime
-        datetime_list = []
-        for i in range(1,len(extracted_datetime_range)+1):
-            datetime_list.append(add_workday_intraday_datetime(datetime.datetime(2021, 2, 1, 0, 0), -timedelta(minutes=5)*i))
-        subed_dateteime_array = np.array(datetime_list[::-1])
-        self.assertTrue(np.array_equal(extracted_datetime_range_array, subed_dateteime_array))
-        
-        # get_timedelta_workdays_intraday
-        start_datetime = datetime.datetime(2021,1,4,9,0,0)
-        end_datetime = datetime.datetime(2021,12,31,9,0,0)
-        delta_time = get_timedelta_workdays_intraday(start_datetime, end_datetime)
-        self.assertEqual(datetime.datetime(2021,12,31,9,0,0), add_workday_intraday_datetime(start_datetime, delta_time))
-        
-        start_datetime = datetime.datetime(2021,1,4,14,0,0)
-        end_datetime = datetime.datetime(2021,12,31,10,0,0)
-        delta_time = get_timedelta_workdays_intraday(start_datetime, end_datetime)
-        self.assertEqual(datetime.datetime(2021,12,31,10,0,0), add_workday_intraday_datetime(start_datetime, delta_time))
-        
-        start_datetime = datetime.datetime(2021,1,4,15,0,0)
-        end_datetime = datetime.datetime(2021,12,31,15,0,0)
-        delta_time = get_timedelta_workdays_intraday(start_datetime, end_datetime)
-        self.assertEqual(datetime.datetime(2022, 1, 3, 9, 0), add_workday_intraday_datetime(start_datetime, delta_time))
-        
-        start_datetime = datetime.datetime(2021,1,4,14,0,0)
-        end_datetime = datetime.datetime(2021,12,31,15,0,0)
-        delta_time = get_timedelta_workdays_intraday(start_datetime, end_datetime)
-        self.assertEqual(datetime.datetime(2021,1,4,14,0,0), add_workday_intraday_datetime(end_datetime, -delta_time))
-        
-        start_datetime = datetime.datetime(2021,1,4,10,0,0)
-        end_datetime = datetime.datetime(2021,12,31,14,0,0)
-        delta_time = get_timedelta_workdays_intraday(start_datetime, end_datetime)
-        self.assertEqual(datetime.datetime(2021,1,4,10,0,0), add_workday_intraday_datetime(end_datetime, -delta_time))
-        
-        start_datetime = datetime.datetime(2021,1,4,9,0,0)
-        end_datetime = datetime.datetime(2021,12,31,9,0,0)
-        delta_time = get_timedelta_workdays_intraday(start_datetime, end_datetime)
-        self.assertEqual(datetime.datetime(2021,1,4,9,0,0), add_workday_intraday_datetime(end_datetime, -delta_time))
-        
-    def test_related_datetime_jst(self) -> None:
-        jst = timezone("Asia/Tokyo")
-        
-        # check_workday_intraday
-        self.assertTrue(check_workday_intraday(jst.localize(datetime.datetime(2021,1,4,10,0,0))))
-        self.assertFalse(check_workday_intraday(jst.localize(datetime.datetime(2021,1,1,10,0,0))))
-        self.assertFalse(check_workday_intraday(jst.localize(datetime.datetime(2021,1,4,0,0,0))))
-        
-        # get_next_border_workday_intraday
-        next_border_workday_intraday_tuple = get_next_border_workday_intraday(jst.localize(datetime.datetime(2021,1,1,10,0,0)))
-        self.assertEqual(next_border_workday_intraday_tuple, (jst.localize(datetime.datetime(2021, 1, 4, 9, 0)), 'border_start'))
-        next_border_workday_intraday_tuple = get_next_border_workday_intraday(jst.localize(datetime.datetime(2021,1,4,9,0,0)))
-        self.assertEqual(next_border_workday_intraday_tuple, (jst.localize(datetime.datetime(2021, 1, 4, 11, 30)), 'border_end'))
-        next_border_workday_intraday_tuple = get_next_border_workday_intraday(jst.localize(datetime.datetime(2021,1,4,11,30,0)))
-        self.assertEqual(next_border_workday_intraday_tuple, (jst.localize(datetime.datetime(2021, 1, 4, 12, 30)), 'border_start'))
-        
-        # get_previous_border_workday_intraday
-        previous_border_workday_intraday_tuple = get_previous_border_workday_intraday(jst.localize(datetime.datetime(2021,1,1,10,0,0)))
-        self.assertEqual(previous_border_workday_intraday_tuple, (jst.localize(datetime.datetime(2020, 12, 31, 15, 0)), 'border_end'))
-        previous_border_workday_intraday_tuple = get_previous_border_workday_intraday(jst.localize(datetime.datetime(2021,12,31,12,30,0)))
-        self.assertEqual(previous_border_workday_intraday_tuple, (jst.localize(datetime.datetime(2021, 12, 31, 11, 30)), 'border_end'))
-        previous_border_workday_intraday_tuple = get_previous_border_workday_intraday(jst.localize(datetime.datetime(2021,12,31,15,0,0)))
-        self.assertEqual(previous_border_workday_intraday_tuple, (jst.localize(datetime.datetime(2021, 12, 31, 15, 0)), 'border_end'))
-        previous_border_workday_intraday_tuple = get_previous_border_workday_intraday(jst.localize(datetime.datetime(2021,12,31,15,0,0)), force_is_end=True)
-        self.assertEqual(previous_border_workday_intraday_tuple, (jst.localize(datetime.datetime(2021, 12, 31, 12, 30)), 'border_start'))
-        
-        # get_near_workday_ntraday
-        near_workday_intraday_tuple = get_near_workday_intraday(jst.localize(datetime.datetime(2021,1,1,10,0,0)), is_after=True)
-        self.assertEqual((jst.localize(datetime.datetime(2021,1,4,9,0,0)), "border_start"), near_workday_intraday_tuple)
-        near_workday_intraday_tuple = get_near_workday_intraday(jst.localize(datetime.datetime(2021,1,1,10,0,0)), is_after=False)
-        self.assertEqual((jst.localize(datetime.datetime(2020,12,31,15,0,0)), "border_end"), near_workday_intraday_tuple)
-                
-        # add_workday_intraday_datetime
-        datetime_range = pd.date_range(start=jst.localize(datetime.datetime(2021,1,1,0,0,0)), end=jst.localize(datetime.datetime(2021,2,1,0,0,0)), closed="left", freq="5T")
-        extracted_datetime_range: pd.DatetimeIndex = datetime_range[extract_workdays_intraday_bool(datetime_range)]
-        extracted_datetime_range_array = extracted_datetime_range.to_pydatetime()  # type: ignore
-        
-        datetime_list = [jst.localize(datetime.datetime(2021, 1, 4, 9, 0))]
-        for i in range(1,len(extracted_datetime_range)):
-            datetime_list.append(add_workday_intraday_datetime(jst.localize(datetime.datetime(2021, 1, 1, 0, 0)), timedelta(minutes=5)*i))
-        addded_dateteime_array = np.array(datetime_list)
-        self.assertTrue(np.array_equal(extracted_datetime_range_array, addded_dateteime_array))
-        
-        # sub_workday_intraday_datetime
-        datetime_list = []
-        for i in range(1,len(extracted_datetime_range)+1):
-            datetime_list.append(add_workday_intraday_datetime(jst.localize(datetime.datetime(2021, 2, 1, 0, 0)), -timedelta(minutes=5)*i))
-        subed_dateteime_array = np.array(datetime_list[::-1])
-        self.assertTrue(np.array_equal(extracted_datetime_range_array, subed_dateteime_array))
-        
-        # get_timedelta_workdays_intraday
-        start_datetime = jst.localize(datetime.datetime(2021,1,4,9,0,0))
-        end_datetime = jst.localize(datetime.datetime(2021,12,31,9,0,0))
-        delta_time = get_timedelta_workdays_intraday(start_datetime, end_datetime)
-        self.assertEqual(jst.localize(datetime.datetime(2021,12,31,9,0,0)), add_workday_intraday_datetime(start_datetime, delta_time))
-        
-        start_datetime = jst.localize(datetime.datetime(2021,1,4,14,0,0))
-        end_datetime = jst.localize(datetime.datetime(2021,12,31,10,0,0))
-        delta_time = get_timedelta_workdays_intraday(start_datetime, end_datetime)
-        self.assertEqual(jst.localize(datetime.datetime(2021,12,31,10,0,0)), add_workday_intraday_datetime(start_datetime, delta_time))
-        
-        start_datetime = jst.localize(datetime.datetime(2021,1,4,15,0,0))
-        end_datetime = jst.localize(datetime.datetime(2021,12,31,15,0,0))
-        delta_time = get_timedelta_workdays_intraday(start_datetime, end_datetime)
-        self.assertEqual(jst.localize(datetime.datetime(2022, 1, 3, 9, 0)), add_workday_intraday_datetime(start_datetime, delta_time))
-        
-        start_datetime = jst.localize(datetime.datetime(2021,1,4,14,0,0))
-        end_datetime = jst.localize(datetime.datetime(2021,12,31,15,0,0))
-        delta_time = get_timedelta_workdays_intraday(start_datetime, end_datetime)
-        self.assertEqual(jst.localize(datetime.datetime(2021,1,4,14,0,0)), add_workday_intraday_datetime(end_datetime, -delta_time))
-        
-        start_datetime = jst.localize(datetime.datetime(2021,1,4,10,0,0))
-        end_datetime = jst.localize(datetime.datetime(2021,12,31,14,0,0))
-        delta_time = get_timedelta_workdays_intraday(start_datetime, end_datetime)
-        self.assertEqual(jst.localize(datetime.datetime(2021,1,4,10,0,0)), add_workday_intraday_datetime(end_datetime, -delta_time))
-        
-        start_datetime = jst.localize(datetime.datetime(2021,1,4,9,0,0))
-        end_datetime = jst.localize(datetime.datetime(2021,12,31,9,0,0))
-        delta_time = get_timedelta_workdays_intraday(start_datetime, end_datetime)
-        self.assertEqual(jst.localize(datetime.datetime(2021,1,4,9,0,0)), add_workday_intraday_datetime(end_datetime, -delta_time))     
-
-
-class TestOption(unittest.TestCase):
-    def test_make_workdays(self) -> None:
-        #optionを設定するだけで休日が更新される．
-        config.holiday_start_year = 2021
-        config.holiday_end_year = 2021
-        self.assertTrue(np.array_equal(np.array(config.range_holidays), true_holidays_2021()))
-        
-    def test_append_source_path(self) -> None:
-        temp_source_path = Path("./py_workdays/source/temp.csv")
-        # 存在しない祝日を記したcsvファイルを追加
-        dt_index = pd.DatetimeIndex([datetime.date(1900,1,1)])
-        new_holiday_df = pd.DataFrame({"holiday_name":["元日"]}, index=dt_index)
-        new_holiday_df.to_csv(temp_source_path, header=False)
-        
-        config.holiday_start_year = 1900  # このタイミングで1900年にしておく
-        
-        config.csv_source_paths.append(temp_source_path)  # csvパスを追加
-        #print(config.range_holidays)
-        self.assertEqual(config.range_holidays[0], datetime.date(1900,1,1))
-        
-        temp_source_path.unlink()
-
-if __name__ == "__main__":
+import unittest
+import asyncio
+import http.server
+import importlib.util
+import threading
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import datetime
+from datetime import timedelta
+import pandas as pd
+from pathlib import Path
+from pytz import timezone
+from zoneinfo import ZoneInfo
+
+from py_workdays import get_workdays
+from py_workdays import check_workday, get_next_workday, get_previous_workday, get_workdays_number, get_near_workday
+from py_workdays import extract_workdays_bool, extract_intraday_bool, extract_workdays_intraday_bool, extract_workdays_intraday_ranges
+from py_workdays import check_workday_intraday, get_near_workday_intraday, get_next_border_workday_intraday, get_previous_border_workday_intraday
+from py_workdays import add_workday_intraday_datetime, get_timedelta_workdays_intraday
+from py_workdays import count_workdays, get_workday_ordinal, get_workday_from_ordinal
+from py_workdays import count_workdays_array, get_workday_ordinal_array, get_workday_from_ordinal_array
+from py_workdays import config, initialize_source
+from py_workdays.extract import _utc_offset_table
+from py_workdays import set_parallel_config, get_parallel_config
+from py_workdays import set_scalar_cache_config, get_scalar_cache_info
+from py_workdays.py_workdays import get_calendar_version, set_holiday_weekdays as rust_set_holiday_weekdays
+from py_workdays import set_metrics_config, get_metrics_snapshot, reset_metrics
+from py_workdays import get_next_workday_array, get_previous_workday_array, get_near_workday_array
+from py_workdays import add_workday_intraday_array, get_timedelta_workdays_intraday_array
+from py_workdays import to_business_time, from_business_time
+from py_workdays import get_near_workday_intraday_array, WorkdayIntradayOffset
+from py_workdays import get_workday_session_labels
+from py_workdays import workday_intraday_range, iter_workday_intraday_range
+from py_workdays import SessionCursor, PyWorkdaysError
+from py_workdays import refresh_holidays
+
+
+def true_holidays_2021() -> np.ndarray:
+    holidays_list = [datetime.date(2021,1,1),
+                     datetime.date(2021,1,11),
+                     datetime.date(2021,2,11),
+                     datetime.date(2021,2,23),
+                     datetime.date(2021,3,20),
+                     datetime.date(2021,4,29),
+                     datetime.date(2021,5,3),
+                     datetime.date(2021,5,4),
+                     datetime.date(2021,5,5),
+                     datetime.date(2021,7,22),
+                     datetime.date(2021,7,23),
+                     datetime.date(2021,8,8),
+                     datetime.date(2021,8,9),  #振替
+                     datetime.date(2021,9,20),
+                     datetime.date(2021,9,23),
+                     datetime.date(2021,11,3),
+                     datetime.date(2021,11,23)
+                    ]
+
+    return np.array(holidays_list)
+
+
+def setUpModule() -> None:
+    initialize_source()  # importでは通信しない
+
+
+class TestWorkdays(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        config.holiday_start_year = 2021
+        config.holiday_weekdays = [5,6]
+        config.intraday_borders = [{"start":datetime.time(9,0), "end":datetime.time(11,30)},
+                                   {"start":datetime.time(12,30), "end":datetime.time(15,0)}]
+        
+        
+    def test_related_workdays(self) -> None:
+        # get_workdays, get_not_workdays
+        all_date = pd.date_range(datetime.date(2021,1,1), datetime.date(2021,12,31), freq="D").date # type: ignore
+        all_weekdays = np.array([item.weekday() for item in all_date])
+        
+        is_hoildays = np.in1d(all_date, true_holidays_2021())  # type: ignore
+        is_hoilday_weekdays = np.logical_or.reduce([all_weekdays==holiday_weekday for holiday_weekday in config.holiday_weekdays])  # 祝日曜日
+        
+        is_not_workdays = is_hoildays | is_hoilday_weekdays
+        is_workdays = (~is_hoildays) & (~is_hoilday_weekdays)
+        
+        true_not_workdays = all_date[is_not_workdays]
+        true_workdays = all_date[is_workdays]
+        
+        workdays_array = np.array(get_workdays(datetime.date(2021,1,1), datetime.date(2022,1,1)))
+        
+        self.assertTrue(np.array_equal(workdays_array, true_workdays))
+        
+        # get_workdays_number
+        # 祝日始まり
+        workdays_50_array = np.array(get_workdays_number(datetime.date(2021,1,1), 50))
+        self.assertTrue(np.array_equal(workdays_50_array, true_workdays[:50]))
+        
+        # 営業日始まり
+        workdays_50_array = np.array(get_workdays_number(datetime.date(2021,1,4), 50))  # 1月4日は一番最初の営業日
+        self.assertTrue(np.array_equal(workdays_50_array, true_workdays[:50]))
+        
+        # check_workday
+        checked_workdays = [check_workday(one_date) for one_date in true_workdays]
+        self.assertTrue(all(checked_workdays))
+        checked_not_workdays = [check_workday(one_date) for one_date in true_not_workdays]
+        self.assertFalse(any(checked_not_workdays))
+        
+        # get_next_workday
+        #from IPython.core.debugger import Pdb; Pdb().set_trace()
+        # 祝日始まり
+        workdays_array = np.array([get_next_workday(datetime.date(2021,1,1), i) for i in range(1,len(true_workdays)+1)])
+        self.assertTrue(np.array_equal(workdays_array, true_workdays))
+        # 営業日始まり
+        workdays_array = np.array([get_next_workday(datetime.date(2021,1,4), i) for i in range(1,len(true_workdays))])
+        self.assertTrue(np.array_equal(workdays_array, true_workdays[1:]))   # get_next_workdaysは初日は含めないので
+        
+        # get_previous_workday
+        # 祝日始まり
+        workdays_array = np.array([get_previous_workday(datetime.date(2022,1,1), i) for i in range(1,len(true_workdays)+1)])
+        self.assertTrue(np.array_equal(workdays_array[::-1], true_workdays))
+        # 営業日始まり
+        workdays_array = np.array([get_previous_workday(datetime.date(2021,12,31), i) for i in range(1,len(true_workdays))])
+        self.assertTrue(np.array_equal(workdays_array[::-1], true_workdays[:-1]))
+        
+        # get_near_workday
+        near_workday = get_near_workday(datetime.date(2021,1,1), is_after=True)
+        self.assertEqual(near_workday, datetime.date(2021,1,4))
+        near_workday = get_near_workday(datetime.date(2021,1,1), is_after=False)
+        self.assertEqual(near_workday, datetime.date(2020,12,31))
+        
+    def test_workdays_as_array(self) -> None:
+        start_date = datetime.date(2021,1,1)
+        end_date = datetime.date(2022,1,1)
+        for closed in ["left", "both"]:
+            workdays_array = get_workdays(start_date, end_date, closed=closed, as_array=True)
+            self.assertEqual(workdays_array.dtype, np.dtype("datetime64[D]"))
+            self.assertTrue(np.array_equal(workdays_array, np.array(get_workdays(start_date, end_date, closed=closed), dtype="datetime64[D]")))
+
+        self.assertTrue(np.array_equal(
+            get_workdays_number(start_date, -30, as_array=True),
+            np.array(get_workdays_number(start_date, -30), dtype="datetime64[D]")
+        ))
+        self.assertEqual(len(get_workdays(end_date, start_date, as_array=True)), 0)
+
+    def test_count_workdays_and_ordinal(self) -> None:
+        start_date = datetime.date(2021,1,1)
+        for end_date in [datetime.date(2021,1,1), datetime.date(2021,1,4), datetime.date(2021,12,31), datetime.date(2030,6,1)]:
+            for closed in ["left", "right", "both", "not"]:
+                self.assertEqual(count_workdays(start_date, end_date, closed=closed), len(get_workdays(start_date, end_date, closed=closed)))
+        self.assertEqual(count_workdays(datetime.date(2021,2,1), datetime.date(2021,1,1)), 0)
+
+        # 序数の往復
+        workdays = get_workdays(datetime.date(2020,12,1), datetime.date(2022,2,1))
+        ordinals = [get_workday_ordinal(workday) for workday in workdays]
+        self.assertEqual(ordinals, list(range(ordinals[0], ordinals[0]+len(workdays))))
+        self.assertEqual([get_workday_from_ordinal(ordinal) for ordinal in ordinals], workdays)
+        self.assertEqual(get_workday_ordinal(datetime.date(2021,1,1)), get_workday_ordinal(datetime.date(2021,1,4)))  # 祝日は次の営業日と同じ
+        self.assertEqual(get_workday_from_ordinal(get_workday_ordinal(datetime.date(2021,1,8))+1), get_next_workday(datetime.date(2021,1,8)))
+
+        # 配列版
+        all_date = pd.date_range(datetime.date(2021,1,1), datetime.date(2021,12,31), freq="D")
+        end_dates = all_date + pd.Timedelta(days=45)
+        true_counts = np.array([count_workdays(start, end, closed="both") for start, end in zip(all_date.date, end_dates.date)])  # type: ignore
+        self.assertTrue(np.array_equal(count_workdays_array(all_date, end_dates, closed="both"), true_counts))
+
+        ordinal_array = get_workday_ordinal_array(all_date)
+        self.assertTrue(np.array_equal(ordinal_array, np.array([get_workday_ordinal(one_date) for one_date in all_date.date])))  # type: ignore
+        self.assertTrue(np.array_equal(
+            get_workday_from_ordinal_array(ordinal_array + 5),
+            np.array([get_workday_from_ordinal(ordinal) for ordinal in ordinal_array + 5], dtype="datetime64[D]")
+        ))
+
+    def test_workdays_array(self) -> None:
+        all_date = pd.date_range(datetime.date(2021,1,1), datetime.date(2021,12,31), freq="D")
+        py_dates = list(all_date.date)  # type: ignore
+
+        # スカラーの日数
+        true_next = np.array([get_next_workday(one_date, 3) for one_date in py_dates], dtype="datetime64[D]")
+        self.assertTrue(np.array_equal(get_next_workday_array(all_date, days=3), true_next))
+        true_previous = np.array([get_previous_workday(one_date, 2) for one_date in py_dates], dtype="datetime64[D]")
+        self.assertTrue(np.array_equal(get_previous_workday_array(all_date.values.astype("datetime64[D]"), days=2), true_previous))
+
+        # 要素ごとの日数
+        days = np.arange(len(py_dates)) % 5
+        true_next = np.array([get_next_workday(one_date, int(one_days)) for one_date, one_days in zip(py_dates, days)], dtype="datetime64[D]")
+        self.assertTrue(np.array_equal(get_next_workday_array(all_date, days=days), true_next))
+
+        # get_near_workday_array
+        true_near = np.array([get_near_workday(one_date, is_after=False) for one_date in py_dates], dtype="datetime64[D]")
+        self.assertTrue(np.array_equal(get_near_workday_array(all_date, is_after=False), true_near))
+
+        # NaTはNaTのまま，長さの異なるdaysはエラー
+        with_nat = np.array(["2021-01-01T10:00:00", "NaT"], dtype="datetime64[s]")
+        self.assertTrue(np.array_equal(get_next_workday_array(with_nat), np.array(["2021-01-04", "NaT"], dtype="datetime64[D]"), equal_nan=True))
+        with self.assertRaises(Exception):
+            get_next_workday_array(all_date, days=np.array([1, 2]))
+
+    def test_related_extract(self) -> None:
+        all_date: np.ndarray = pd.date_range(datetime.date(2021,1,1), datetime.date(2021,12,31), freq="D").date  # type: ignore
+        all_weekdays = np.array([item.weekday() for item in all_date])
+        
+        is_hoildays = np.in1d(all_date, true_holidays_2021())  # type: ignore
+        is_hoilday_weekdays = np.logical_or.reduce([all_weekdays==holiday_weekday for holiday_weekday in config.holiday_weekdays])  # 祝日曜日
+        
+        is_not_workdays = is_hoildays | is_hoilday_weekdays
+        
+        true_not_workdays = all_date[is_not_workdays] 
+        
+        
+        dt_index = pd.date_range(datetime.datetime(2021,1,1,0,0,0), datetime.datetime(2021,12,31,23,59,0), freq="T")
+        nan_df = pd.DataFrame(None, index=dt_index)
+        nan_df["column1"] = np.nan
+        extracted_df = nan_df.loc[extract_workdays_bool(nan_df.index)]
+        # 抽出したpd.DataFrameのdateが非営業日に含まれない
+        self.assertFalse(np.any(
+            np.in1d(
+                extracted_df.index.date,   # type:ignore
+                true_not_workdays
+            )
+        ))
+        
+        # 日中以外のある時間のデータの長さが0
+        extracted_df = nan_df.loc[extract_intraday_bool(nan_df.index)]
+        self.assertEqual(len(extracted_df.at_time(datetime.time(8,0)).index),0)
+        
+        # 両方チェック
+        jst = timezone("Asia/Tokyo")
+        nan_df.index = nan_df.index.tz_localize(jst)  # type:ignore
+        extracted_df = nan_df.loc[extract_workdays_intraday_bool(nan_df.index)]
+        self.assertFalse(np.any(
+            np.in1d(
+                extracted_df.index.date,   # type:ignore
+                true_not_workdays
+            )
+        ))
+        self.assertEqual(len(extracted_df.at_time(datetime.time(8,0)).index),0)
+
+    def test_extract_datetime64(self) -> None:
+        dt_index = pd.date_range(datetime.datetime(2021,1,1,0,0,0), datetime.datetime(2021,2,1,0,0,0), freq="T")
+        true_bool = np.array([check_workday_intraday(one_datetime) for one_datetime in dt_index.to_pydatetime()])
+
+        # datetime64[ns]のndarrayをそのまま与えられる
+        self.assertTrue(np.array_equal(extract_workdays_intraday_bool(dt_index.values), true_bool))
+        # 秒単位のndarray
+        self.assertTrue(np.array_equal(extract_workdays_intraday_bool(dt_index.values.astype("datetime64[s]")), true_bool))
+
+        # outに書き込む
+        out = np.zeros(len(dt_index), dtype=bool)
+        returned = extract_workdays_intraday_bool(dt_index, out=out)
+        self.assertIs(returned, out)
+        self.assertTrue(np.array_equal(out, true_bool))
+
+        extract_workdays_bool(dt_index, out=out)
+        self.assertTrue(np.array_equal(out, np.array([check_workday(one_date) for one_date in dt_index.date])))  # type: ignore
+
+        with self.assertRaises(Exception):
+            extract_intraday_bool(dt_index, out=np.zeros(10, dtype=bool))
+
+    def test_extract_sorted(self) -> None:
+        dt_index = pd.date_range(datetime.datetime(2021,1,1,0,0,0), datetime.datetime(2021,2,1,0,0,0), freq="7s")
+        dt_index = dt_index.append(pd.DatetimeIndex([pd.NaT, pd.NaT]))  # ソートではNaTは最後になる
+
+        # ソート済みの高速化は要素ごとの判定と一致する
+        for extract_func in [extract_workdays_bool, extract_intraday_bool, extract_workdays_intraday_bool]:
+            self.assertTrue(np.array_equal(extract_func(dt_index, assume_sorted=True), extract_func(dt_index)))
+            self.assertTrue(np.array_equal(extract_func(dt_index.values.astype("datetime64[ms]"), assume_sorted=True), extract_func(dt_index)))
+
+        # 範囲をつなげるとブールのマスクと一致する
+        true_bool = extract_workdays_intraday_bool(dt_index)
+        ranges = extract_workdays_intraday_ranges(dt_index)
+        self.assertEqual(ranges.shape[1], 2)
+        self.assertTrue(np.array_equal(np.concatenate([np.arange(start, stop) for start, stop in ranges]), np.flatnonzero(true_bool)))
+        self.assertTrue(np.all(ranges[1:, 0] > ranges[:-1, 1]))  # 隣接する範囲はまとめる
+        self.assertEqual(extract_workdays_intraday_ranges(dt_index[:0]).shape, (0, 2))
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+    def test_extract_arrow(self) -> None:
+        import pyarrow as pa
+        dt_index = pd.date_range(datetime.datetime(2021,1,1,0,0,0), datetime.datetime(2021,1,8,0,0,0), freq="37min")
+        true_bool = extract_workdays_intraday_bool(dt_index)
+
+        # 単位ごとにチャンクに分けても結果は一致する
+        chunked = pa.chunked_array([
+            pa.array(dt_index.values[:100].astype("datetime64[ms]")),
+            pa.array(dt_index.values[100:].astype("datetime64[us]")).cast(pa.timestamp("ms"))
+        ])
+        extracted = extract_workdays_intraday_bool(chunked, assume_sorted=True)
+        self.assertIsInstance(extracted, pa.ChunkedArray)
+        self.assertEqual(extracted.num_chunks, 2)
+        self.assertTrue(np.array_equal(extracted.to_numpy(), true_bool))
+
+        # スライスとnull
+        array = pa.array(list(dt_index[:50]) + [None], type=pa.timestamp("s"))
+        extracted = extract_workdays_intraday_bool(array.slice(10))
+        self.assertIsInstance(extracted, pa.BooleanArray)
+        self.assertTrue(np.array_equal(extracted.to_numpy(zero_copy_only=False)[:-1], true_bool[10:50]))
+        self.assertEqual(extracted.null_count, 1)
+
+        # ソート済みの途中のnullは判定に使わない
+        sorted_with_null = pa.array(list(dt_index[:50]) + [None] + list(dt_index[50:]), type=pa.timestamp("s"))
+        for assume_sorted in (False, True):
+            extracted = extract_workdays_intraday_bool(sorted_with_null, assume_sorted=assume_sorted).to_numpy(zero_copy_only=False)
+            self.assertTrue(np.array_equal(np.delete(extracted, 50), true_bool))
+            self.assertIsNone(extracted[50])
+
+        # awareの場合はそのタイムゾーンのローカル時間で判定する
+        aware_index = dt_index.tz_localize("Asia/Tokyo")
+        aware_array = pa.array(aware_index)
+        self.assertTrue(np.array_equal(extract_workdays_intraday_bool(aware_array).to_numpy(zero_copy_only=False), true_bool))
+    
+    def test_metrics(self) -> None:
+        events = []
+        set_metrics_config(enabled=True, callback=events.append)
+        try:
+            reset_metrics()
+            check_workday(datetime.date(2021,1,3))
+            check_workday(datetime.date(2021,1,4))
+            extract_workdays_intraday_bool(pd.date_range(datetime.datetime(2021,1,4), periods=10, freq="1h"))
+            get_next_workday_array(pd.date_range(datetime.date(2021,1,1), periods=5, freq="D"))
+            config.holiday_weekdays = [5, 6]  # 変更がない場合は再構築しない
+            self.assertNotIn("set_holiday_weekdays", get_metrics_snapshot()["rebuilds"])
+            config.holiday_weekdays = [6]  # 休日曜日の更新
+            config.holiday_weekdays = [5, 6]
+            snapshot = get_metrics_snapshot()
+            self.assertTrue(snapshot["enabled"])
+            self.assertEqual(snapshot["functions"]["check_workday"]["calls"], 2)
+            self.assertEqual(snapshot["functions"]["check_workday"]["elements"], 0)
+            self.assertGreaterEqual(snapshot["functions"]["check_workday"]["conversion_seconds"], 0.0)
+            self.assertEqual(snapshot["functions"]["extract_workdays_intraday_bool"]["elements"], 10)
+            self.assertEqual(snapshot["functions"]["get_next_workday_array"]["elements"], 5)
+            self.assertEqual(snapshot["rebuilds"]["set_holiday_weekdays"]["count"], 2)
+            self.assertIn({"kind": "rebuild", "name": "set_holiday_weekdays", "seconds": snapshot["rebuilds"]["set_holiday_weekdays"]["seconds"]}, events)
+        finally:
+            set_metrics_config(enabled=False)
+
+        # 無効の場合は計測しない
+        reset_metrics()
+        check_workday(datetime.date(2021,1,4))
+        self.assertEqual(get_metrics_snapshot(), {"enabled": False, "functions": {}, "rebuilds": {}})
+
+    def test_scalar_cache(self) -> None:
+        set_scalar_cache_config(maxsize=2)
+        try:
+            info = get_scalar_cache_info()
+            self.assertEqual(check_workday(datetime.date(2021,1,2)), False)
+            self.assertEqual(check_workday(datetime.date(2021,1,2)), False)
+            self.assertEqual(get_scalar_cache_info()["hits"], info["hits"] + 1)
+            self.assertEqual(get_scalar_cache_info()["misses"], info["misses"] + 1)
+
+            # 最も古く使われたものから削除される
+            get_next_workday(datetime.date(2021,1,1))
+            get_near_workday(datetime.date(2021,1,1))
+            self.assertEqual(get_scalar_cache_info()["currsize"], 2)
+
+            # awareなdatetimeはタイムゾーンごとに保持する
+            jst = timezone("Asia/Tokyo")
+            select_datetime = datetime.datetime(2021,1,1,0,0,0)
+            self.assertEqual(get_near_workday_intraday(jst.localize(select_datetime)), (jst.localize(datetime.datetime(2021,1,4,9,0,0)), "border_start"))
+            self.assertEqual(get_near_workday_intraday(select_datetime), (datetime.datetime(2021,1,4,9,0,0), "border_start"))
+
+            # 休日曜日を変更するとclearされる
+            config.holiday_weekdays = [6]
+            self.assertEqual(get_scalar_cache_info()["currsize"], 0)
+            self.assertEqual(check_workday(datetime.date(2021,1,2)), True)
+
+            # Rust側の関数で直接変更した場合も古い結果を返さない
+            version = get_calendar_version()
+            rust_set_holiday_weekdays({5, 6})
+            self.assertNotEqual(get_calendar_version(), version)
+            self.assertEqual(check_workday(datetime.date(2021,1,2)), False)
+            rust_set_holiday_weekdays({6})
+            self.assertEqual(check_workday(datetime.date(2021,1,2)), True)
+        finally:
+            config.holiday_weekdays = [5,6]
+            rust_set_holiday_weekdays({5, 6})
+            set_scalar_cache_config()
+        self.assertEqual(check_workday(datetime.date(2021,1,2)), False)
+
+    def test_concurrent_update(self) -> None:
+        # 更新中の読み込みは更新前か更新後のどちらかのカレンダーの結果となる
+        dt_index = pd.date_range(datetime.datetime(2021,1,1,0,0,0), datetime.datetime(2021,3,1,0,0,0), freq="1h")
+        before_bool = extract_workdays_bool(dt_index)
+        config.holiday_weekdays = [6]
+        after_bool = extract_workdays_bool(dt_index)
+        config.holiday_weekdays = [5,6]
+
+        def query(_: int) -> bool:
+            extracted = extract_workdays_bool(dt_index)
+            is_consistent = np.array_equal(extracted, before_bool) or np.array_equal(extracted, after_bool)
+            return is_consistent and check_workday(datetime.date(2021,1,4))
+
+        try:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = [executor.submit(lambda: list(map(query, range(50)))) for _ in range(4)]
+                for i in range(20):
+                    config.holiday_weekdays = [6] if i % 2 == 0 else [5,6]
+                results = [result for future in futures for result in future.result()]
+        finally:
+            config.holiday_weekdays = [5,6]
+        self.assertTrue(all(results))
+
+    def test_extract_timezone(self) -> None:
+        jst_index = pd.date_range(datetime.datetime(2021,1,1,0,0,0), datetime.datetime(2021,2,1,0,0,0), freq="7T")
+        true_bool = extract_workdays_intraday_bool(jst_index)
+        utc_index = jst_index.tz_localize("Asia/Tokyo").tz_convert("UTC")
+
+        # タイムゾーンが設定されていない場合，UTCの値は与えられない
+        with self.assertRaises(Exception):
+            extract_workdays_intraday_bool(utc_index.tz_localize(None).values, utc=True)
+
+        config.timezone = "Asia/Tokyo"
+        try:
+            # awareなDatetimeIndexは設定したタイムゾーンで判定する
+            self.assertTrue(np.array_equal(extract_workdays_intraday_bool(utc_index), true_bool))
+            self.assertTrue(np.array_equal(extract_workdays_intraday_bool(utc_index.tz_convert("America/New_York")), true_bool))
+            # naiveなUTCの値
+            self.assertTrue(np.array_equal(extract_workdays_intraday_bool(utc_index.tz_localize(None).values, utc=True), true_bool))
+            self.assertTrue(np.array_equal(extract_workdays_intraday_bool(utc_index, assume_sorted=True), true_bool))
+            self.assertTrue(np.array_equal(
+                extract_workdays_bool(utc_index.tz_localize(None).values.astype("datetime64[s]"), utc=True),
+                extract_workdays_bool(jst_index)
+            ))
+            self.assertTrue(np.array_equal(extract_intraday_bool(utc_index), extract_intraday_bool(jst_index)))
+        finally:
+            config.timezone = None
+
+        # 夏時間のあるタイムゾーン
+        config.timezone = "America/New_York"
+        try:
+            ny_index = pd.date_range(datetime.datetime(2021,3,1,0,0,0), datetime.datetime(2021,4,1,0,0,0), freq="7T")
+            utc_index = ny_index.tz_localize("America/New_York", ambiguous="NaT", nonexistent="NaT").dropna().tz_convert("UTC")
+            self.assertTrue(np.array_equal(
+                extract_workdays_intraday_bool(utc_index),
+                extract_workdays_intraday_bool(utc_index.tz_convert("America/New_York").tz_localize(None))
+            ))
+        finally:
+            config.timezone = None
+
+        # pytz以外のtzinfoは同じ名前のpytzのタイムゾーンの遷移テーブルを利用する
+        ny_zoneinfo = ZoneInfo("America/New_York")
+        for expected, actual in zip(_utc_offset_table("America/New_York"), _utc_offset_table(ny_zoneinfo)):
+            self.assertTrue(np.array_equal(expected, actual))
+        fixed_transitions, fixed_offsets = _utc_offset_table(datetime.timezone(timedelta(hours=9)))
+        self.assertEqual((fixed_transitions.tolist(), fixed_offsets.tolist()), ([0], [9*3600]))
+
+    def test_extract_parallel(self) -> None:
+        dt_index = pd.date_range(datetime.datetime(2021,1,1,0,0,0), datetime.datetime(2021,2,1,0,0,0), freq="T")
+
+        set_parallel_config(threads=1)
+        serial_bool = extract_workdays_intraday_bool(dt_index)
+
+        set_parallel_config(threads=4, min_chunk_length=1000)
+        self.assertEqual(get_parallel_config(), {"threads":4, "min_chunk_length":1000})
+        parallel_bool = extract_workdays_intraday_bool(dt_index)
+        self.assertTrue(np.array_equal(serial_bool, parallel_bool))
+
+        set_parallel_config()  # デフォルトに戻す
+        self.assertEqual(get_parallel_config()["threads"], 0)
+
+    def test_add_workday_intraday_array(self) -> None:
+        dt_index = pd.date_range(datetime.datetime(2021,1,1,0,0,0), datetime.datetime(2021,1,15,0,0,0), freq="17T")
+        py_datetimes = list(dt_index.to_pydatetime())
+
+        # スカラーのtimedelta
+        true_added = pd.DatetimeIndex([add_workday_intraday_datetime(one_datetime, timedelta(hours=2)) for one_datetime in py_datetimes])
+        self.assertTrue(add_workday_intraday_array(dt_index, timedelta(hours=2)).equals(true_added))
+        self.assertTrue(np.array_equal(
+            add_workday_intraday_array(dt_index.values, np.timedelta64(2, "h")),
+            true_added.values.astype("datetime64[s]")
+        ))
+
+        # 要素ごとのtimedelta(負の値を含む)
+        deltas = pd.to_timedelta((np.arange(len(dt_index)) % 9 - 4) * 1000, unit="s")
+        true_added = pd.DatetimeIndex([add_workday_intraday_datetime(one_datetime, one_delta) for one_datetime, one_delta in zip(py_datetimes, deltas.to_pytimedelta())])
+        self.assertTrue(add_workday_intraday_array(dt_index, deltas).equals(true_added))
+
+        # awareなDatetimeIndexは同じタイムゾーンで返る
+        jst = timezone("Asia/Tokyo")
+        aware_index = dt_index.tz_localize(jst)
+        true_added = pd.DatetimeIndex([add_workday_intraday_datetime(jst.localize(one_datetime), timedelta(hours=2)) for one_datetime in py_datetimes])
+        added = add_workday_intraday_array(aware_index, timedelta(hours=2))
+        self.assertEqual(str(added.tz), "Asia/Tokyo")
+        self.assertTrue(added.equals(true_added))
+
+    def test_workday_intraday_range(self) -> None:
+        start_datetime = datetime.datetime(2020,12,30,10,10,0)
+        end_datetime = datetime.datetime(2021,1,6,12,30,0)
+        for closed in ["left", "right", "both", "not"]:
+            # 営業日ごとに営業時間のdate_rangeを作成したものと一致する
+            true_index_list = []
+            for workday in get_workdays(start_datetime.date(), end_datetime.date(), closed="both"):
+                for border in config.intraday_borders:
+                    session_range = pd.date_range(
+                        datetime.datetime.combine(workday, border["start"]),
+                        datetime.datetime.combine(workday, border["end"]),
+                        freq="5min",
+                        inclusive={"left": "left", "right": "right", "both": "both", "not": "neither"}[closed]
+                    )
+                    true_index_list.append(session_range[(session_range >= start_datetime) & (session_range <= end_datetime)])
+            true_index = true_index_list[0].append(true_index_list[1:])
+
+            range_index = workday_intraday_range(start_datetime, end_datetime, "5min", closed=closed)
+            self.assertTrue(range_index.equals(true_index))
+
+            # 分割して取得したものを連結すると一致する
+            chunks = list(iter_workday_intraday_range(start_datetime, end_datetime, timedelta(minutes=5), closed=closed, chunk_size=100))
+            self.assertTrue(all(len(chunk) <= 100 for chunk in chunks))
+            self.assertTrue(chunks[0].append(chunks[1:]).equals(true_index))
+
+        # awareな場合は同じタイムゾーン
+        jst = timezone("Asia/Tokyo")
+        aware_index = workday_intraday_range(jst.localize(start_datetime), jst.localize(end_datetime), "1h", name="bar")
+        self.assertEqual(str(aware_index.tz), "Asia/Tokyo")
+        self.assertEqual(aware_index.name, "bar")
+        self.assertTrue(aware_index.tz_localize(None).equals(workday_intraday_range(start_datetime, end_datetime, "1h")))
+
+        self.assertEqual(len(workday_intraday_range(end_datetime, start_datetime, "5min")), 0)
+        with self.assertRaises(ValueError):
+            workday_intraday_range(start_datetime, end_datetime, "500ms")
+
+    def test_session_cursor(self) -> None:
+        cursor = SessionCursor()
+        with self.assertRaises(PyWorkdaysError):
+            cursor.is_intraday
+
+        # 判定・次の境界はスカラーの関数と一致する
+        dt_index = pd.date_range(datetime.datetime(2020,12,30,8,0,0), datetime.datetime(2021,1,6,16,0,0), freq="7min")
+        for select_datetime in dt_index[::5].to_pydatetime():
+            self.assertEqual(cursor.update(select_datetime), check_workday_intraday(select_datetime))
+            self.assertEqual(cursor.next_border, get_next_border_workday_intraday(select_datetime))
+            self.assertEqual(cursor.seconds_to_next_border, int((cursor.next_border[0] - select_datetime).total_seconds()))
+
+        # マイクロバッチ・整数でも一致する
+        cursor.reset()
+        int_64_values = dt_index.values.astype("datetime64[s]").view(np.int64)
+        is_intraday = np.concatenate([cursor.update_array(batch) for batch in np.array_split(int_64_values, 7)])
+        self.assertTrue(np.array_equal(is_intraday, extract_workdays_intraday_bool(dt_index)))
+        self.assertEqual(cursor.update_timestamp(int(int_64_values[0]) * 1000, unit="ms"), is_intraday[0])
+
+    def test_workday_session_labels(self) -> None:
+        dt_index = pd.date_range(datetime.datetime(2021,1,1,0,0,0), datetime.datetime(2021,1,15,0,0,0), freq="17T")
+        labels = get_workday_session_labels(dt_index)
+
+        # 営業時間外は-1
+        is_intraday = extract_workdays_intraday_bool(dt_index)
+        self.assertTrue(np.array_equal(labels.codes >= 0, is_intraday))
+        self.assertTrue(np.array_equal(labels.workday_codes >= 0, is_intraday))
+        self.assertTrue(np.array_equal(labels.session_indices >= 0, is_intraday))
+
+        # 各要素はコードのセッションの開始・終了の間にあり，その営業日・営業時間の番号をもつ
+        codes = labels.codes[is_intraday]
+        values = dt_index.values[is_intraday].astype("datetime64[s]")
+        self.assertTrue(np.all(labels.session_starts[codes] <= values))
+        self.assertTrue(np.all(values < labels.session_ends[codes]))
+        self.assertTrue(np.array_equal(labels.workdays[labels.workday_codes[is_intraday]], values.astype("datetime64[D]")))
+        border_starts = np.array([datetime.datetime.combine(datetime.date(2021,1,4), border["start"]) for border in config.intraday_borders], dtype="datetime64[s]")
+        self.assertTrue(np.array_equal(
+            labels.session_starts[codes] - labels.workdays[labels.workday_codes[is_intraday]].astype("datetime64[s]"),
+            border_starts[labels.session_indices[is_intraday]] - np.datetime64("2021-01-04T00:00:00")
+        ))
+
+        # bincountでセッションごとの個数
+        counts = np.bincount(codes, minlength=len(labels.session_starts))
+        self.assertEqual(counts.sum(), is_intraday.sum())
+        self.assertEqual(labels.session_starts[0], np.datetime64("2021-01-04T09:00:00"))
+
+        # 営業時間内の要素がない場合は空のテーブル
+        holiday_labels = get_workday_session_labels(pd.DatetimeIndex([datetime.datetime(2021,1,2,10,0,0), pd.NaT]))
+        self.assertTrue(np.array_equal(holiday_labels.codes, np.array([-1, -1])))
+        self.assertEqual(len(holiday_labels.session_starts), 0)
+        self.assertEqual(holiday_labels.workdays.dtype, np.dtype("datetime64[D]"))
+
+    def test_workday_intraday_offset(self) -> None:
+        dt_index = pd.date_range(datetime.datetime(2021,1,1,0,0,0), datetime.datetime(2021,1,15,0,0,0), freq="17T", name="timestamp")
+        py_datetimes = list(dt_index.to_pydatetime())
+        offset = WorkdayIntradayOffset(timedelta(hours=2))
+
+        # add_workday_intraday_datetimeと一致
+        true_added = pd.DatetimeIndex([add_workday_intraday_datetime(one_datetime, timedelta(hours=2)) for one_datetime in py_datetimes], name="timestamp")
+        self.assertTrue((dt_index + offset).equals(true_added))
+        self.assertTrue((dt_index.to_series() + offset).equals(true_added.to_series(index=dt_index)))
+        self.assertTrue(dt_index.workdays.add(timedelta(hours=2)).equals(true_added))
+        self.assertEqual(py_datetimes[1] + offset, true_added[1].to_pydatetime())
+        self.assertEqual(pd.Timestamp(py_datetimes[1]) + offset, true_added[1])
+
+        true_subtracted = pd.DatetimeIndex([add_workday_intraday_datetime(one_datetime, timedelta(hours=-2)) for one_datetime in py_datetimes], name="timestamp")
+        self.assertTrue((dt_index - offset).equals(true_subtracted))
+
+        # rollforward・rollbackはget_near_workday_intradayと一致
+        for is_after, rolled in [(True, offset.rollforward(dt_index)), (False, offset.rollback(dt_index))]:
+            true_rolled = pd.DatetimeIndex([get_near_workday_intraday(one_datetime, is_after)[0] for one_datetime in py_datetimes], name="timestamp")
+            self.assertTrue(rolled.equals(true_rolled))
+            self.assertTrue(get_near_workday_intraday_array(dt_index, is_after).equals(true_rolled.rename(None)))
+        self.assertTrue(dt_index.to_series().workdays.is_on_offset().equals(pd.Series(extract_workdays_intraday_bool(dt_index), index=dt_index)))
+
+        # date_range
+        date_index = WorkdayIntradayOffset(timedelta(minutes=30)).date_range(datetime.datetime(2021,1,1,0,0,0), end=datetime.datetime(2021,1,4,13,0,0))
+        true_date_index = pd.DatetimeIndex(
+            list(pd.date_range(datetime.datetime(2021,1,4,9,0,0), datetime.datetime(2021,1,4,11,0,0), freq="30T"))
+            + list(pd.date_range(datetime.datetime(2021,1,4,12,30,0), datetime.datetime(2021,1,4,13,0,0), freq="30T"))
+        )
+        self.assertTrue(date_index.equals(true_date_index))
+        self.assertTrue(WorkdayIntradayOffset(timedelta(minutes=30)).date_range(datetime.datetime(2021,1,1,0,0,0), periods=len(true_date_index)).equals(true_date_index))
+
+    def test_timedelta_workdays_intraday_array(self) -> None:
+        start_index = pd.date_range(datetime.datetime(2020,12,1,0,0,0), datetime.datetime(2021,2,1,0,0,0), freq="37T")
+        end_index = start_index + pd.to_timedelta((np.arange(len(start_index)) % 400 - 100) * 3, unit="h")
+
+        true_delta = np.array([
+            get_timedelta_workdays_intraday(start_datetime, end_datetime)
+            for start_datetime, end_datetime in zip(start_index.to_pydatetime(), end_index.to_pydatetime())
+        ], dtype="timedelta64[ns]")
+        self.assertTrue(np.array_equal(get_timedelta_workdays_intraday_array(start_index, end_index), true_delta))
+
+        # 単位の異なるndarray，長い期間
+        long_delta = get_timedelta_workdays_intraday_array(
+            np.array(["2021-01-01T00:00:00"], dtype="datetime64[s]"),
+            np.array(["2031-01-01T00:00:00.000"], dtype="datetime64[ms]")
+        )
+        self.assertEqual(
+            long_delta[0],
+            np.timedelta64(get_timedelta_workdays_intraday(datetime.datetime(2021,1,1), datetime.datetime(2031,1,1)))
+        )
+
+        with self.assertRaises(Exception):
+            get_timedelta_workdays_intraday_array(start_index, end_index[:10])
+
+    def test_business_time(self) -> None:
+        dt_index = pd.date_range(datetime.datetime(2020,12,25,0,0,0), datetime.datetime(2021,2,1,0,0,0), freq="13T")
+        business_time = to_business_time(dt_index)
+        self.assertEqual(business_time.dtype, np.dtype("timedelta64[ns]"))
+
+        # 差が営業時間の長さとなる
+        true_delta = np.array([
+            get_timedelta_workdays_intraday(start_datetime, end_datetime)
+            for start_datetime, end_datetime in zip(dt_index[:-1].to_pydatetime(), dt_index[1:].to_pydatetime())
+        ], dtype="timedelta64[ns]")
+        self.assertTrue(np.array_equal(np.diff(business_time), true_delta))
+
+        # 逆変換は営業時間内ならそのまま，営業時間外なら次の営業時間の開始
+        true_back = np.array([
+            add_workday_intraday_datetime(one_datetime, timedelta(0))
+            for one_datetime in dt_index.to_pydatetime()
+        ], dtype="datetime64[ns]")
+        self.assertTrue(np.array_equal(from_business_time(business_time), true_back))
+
+        # 営業秒での加算はadd_workday_intraday_datetimeと同じ
+        added = from_business_time(business_time + np.timedelta64(3, "h"))
+        self.assertTrue(np.array_equal(added, add_workday_intraday_array(dt_index, timedelta(hours=3)).values))
+
+        # 1秒未満も保持する
+        sub_second = np.array(["2021-01-04T10:00:00.250"], dtype="datetime64[ms]")
+        self.assertTrue(np.array_equal(from_business_time(to_business_time(sub_second)), sub_second))
+
+    def test_related_datetime_raw(self) -> None:        
+        # check_workday_intraday
+        self.assertTrue(check_workday_intraday(datetime.datetime(2021,1,4,10,0,0)))
+        self.assertFalse(check_workday_intraday(datetime.datetime(2021,1,1,10,0,0)))
+        self.assertFalse(check_workday_intraday(datetime.datetime(2021,1,4,0,0,0)))
+        
+        # get_next_border_workday_intraday
+        next_border_workday_intraday_tuple = get_next_border_workday_intraday(datetime.datetime(2021,1,1,10,0,0))
+        self.assertEqual(next_border_workday_intraday_tuple, (datetime.datetime(2021, 1, 4, 9, 0), 'border_start'))
+        next_border_workday_intraday_tuple = get_next_border_workday_intraday(datetime.datetime(2021,1,4,9,0,0))
+        self.assertEqual(next_border_workday_intraday_tuple, (datetime.datetime(2021, 1, 4, 11, 30), 'border_end'))
+        next_border_workday_intraday_tuple = get_next_border_workday_intraday(datetime.datetime(2021,1,4,11,30,0))
+        self.assertEqual(next_border_workday_intraday_tuple, (datetime.datetime(2021, 1, 4, 12, 30), 'border_start'))
+        
+        # get_previous_border_workday_intraday
+        previous_border_workday_intraday_tuple = get_previous_border_workday_intraday(datetime.datetime(2021,1,1,10,0,0))
+        self.assertEqual(previous_border_workday_intraday_tuple, (datetime.datetime(2020, 12, 31, 15, 0), 'border_end'))
+        previous_border_workday_intraday_tuple = get_previous_border_workday_intraday(datetime.datetime(2021,12,31,12,30,0))
+        self.assertEqual(previous_border_workday_intraday_tuple, (datetime.datetime(2021, 12, 31, 11, 30), 'border_end'))       
+        previous_border_workday_intraday_tuple = get_previous_border_workday_intraday(datetime.datetime(2021,12,31,15,0,0))
+        self.assertEqual(previous_border_workday_intraday_tuple, (datetime.datetime(2021, 12, 31, 15, 0), 'border_end'))
+        previous_border_workday_intraday_tuple = get_previous_border_workday_intraday(datetime.datetime(2021,12,31,15,0,0), force_is_end=True)
+        self.assertEqual(previous_border_workday_intraday_tuple, (datetime.datetime(2021, 12, 31, 12, 30), 'border_start'))
+        
+        # get_near_workday_ntraday
+        near_workday_intraday_tuple = get_near_workday_intraday(datetime.datetime(2021,1,1,10,0,0), is_after=True)
+        self.assertEqual((datetime.datetime(2021,1,4,9,0,0), "border_start"), near_workday_intraday_tuple)
+        near_workday_intraday_tuple = get_near_workday_intraday(datetime.datetime(2021,1,1,10,0,0), is_after=False)
+        self.assertEqual((datetime.datetime(2020,12,31,15,0,0), "border_end"), near_workday_intraday_tuple)
+                
+        # add_workday_intraday_datetime
+        datetime_range = pd.date_range(start=datetime.datetime(2021,1,1,0,0,0), end=datetime.datetime(2021,2,1,0,0,0), closed="left", freq="5T")
+        extracted_datetime_range: pd.DatetimeIndex = datetime_range[extract_workdays_intraday_bool(datetime_range)]
+        extracted_datetime_range_array = extracted_datetime_range.to_pydatetime()  # type: ignore
+        
+        datetime_list = [datetime.datetime(2021, 1, 4, 9, 0)]
+        for i in range(1,len(extracted_datetime_range)):
+            datetime_list.append(add_workday_intraday_datetime(datetime.datetime(2021, 1, 1, 0, 0), timedelta(minutes=5)*i))
+        addded_dateteime_array = np.array(datetime_list)
+        self.assertTrue(np.array_equal(extracted_datetime_range_array, addded_dateteime_array))
+        
+        # sub_workday_intraday_datetime
+        datetime_list = []
+        for i in range(1,len(extracted_datetime_range)+1):
+            datetime_list.append(add_workday_intraday_datetime(datetime.datetime(2021, 2, 1, 0, 0), -timedelta(minutes=5)*i))
+        subed_dateteime_array = np.array(datetime_list[::-1])
+        self.assertTrue(np.array_equal(extracted_datetime_range_array, subed_dateteime_array))
+        
+        # get_timedelta_workdays_intraday
+        start_datetime = datetime.datetime(2021,1,4,9,0,0)
+        end_datetime = datetime.datetime(2021,12,31,9,0,0)
+        delta_time = get_timedelta_workdays_intraday(start_datetime, end_datetime)
+        self.assertEqual(datetime.datetime(2021,12,31,9,0,0), add_workday_intraday_datetime(start_datetime, delta_time))
+        
+        start_datetime = datetime.datetime(2021,1,4,14,0,0)
+        end_datetime = datetime.datetime(2021,12,31,10,0,0)
+        delta_time = get_timedelta_workdays_intraday(start_datetime, end_datetime)
+        self.assertEqual(datetime.datetime(2021,12,31,10,0,0), add_workday_intraday_datetime(start_datetime, delta_time))
+        
+        start_datetime = datetime.datetime(2021,1,4,15,0,0)
+        end_datetime = datetime.datetime(2021,12,31,15,0,0)
+        delta_time = get_timedelta_workdays_intraday(start_datetime, end_datetime)
+        self.assertEqual(datetime.datetime(2022, 1, 3, 9, 0), add_workday_intraday_datetime(start_datetime, delta_time))
+        
+        start_datetime = datetime.datetime(2021,1,4,14,0,0)
+        end_datetime = datetime.datetime(2021,12,31,15,0,0)
+        delta_time = get_timedelta_workdays_intraday(start_datetime, end_datetime)
+        self.assertEqual(datetime.datetime(2021,1,4,14,0,0), add_workday_intraday_datetime(end_datetime, -delta_time))
+        
+        start_datetime = datetime.datetime(2021,1,4,10,0,0)
+        end_datetime = datetime.datetime(2021,12,31,14,0,0)
+        delta_time = get_timedelta_workdays_intraday(start_datetime, end_datetime)
+        self.assertEqual(datetime.datetime(2021,1,4,10,0,0), add_workday_intraday_datetime(end_datetime, -delta_time))
+        
+        start_datetime = datetime.datetime(2021,1,4,9,0,0)
+        end_datetime = datetime.datetime(2021,12,31,9,0,0)
+        delta_time = get_timedelta_workdays_intraday(start_datetime, end_datetime)
+        self.assertEqual(datetime.datetime(2021,1,4,9,0,0), add_workday_intraday_datetime(end_datetime, -delta_time))
+        
+    def test_related_datetime_jst(self) -> None:
+        jst = timezone("Asia/Tokyo")
+        
+        # check_workday_intraday
+        self.assertTrue(check_workday_intraday(jst.localize(datetime.datetime(2021,1,4,10,0,0))))
+        self.assertFalse(check_workday_intraday(jst.localize(datetime.datetime(2021,1,1,10,0,0))))
+        self.assertFalse(check_workday_intraday(jst.localize(datetime.datetime(2021,1,4,0,0,0))))
+        
+        # get_next_border_workday_intraday
+        next_border_workday_intraday_tuple = get_next_border_workday_intraday(jst.localize(datetime.datetime(2021,1,1,10,0,0)))
+        self.assertEqual(next_border_workday_intraday_tuple, (jst.localize(datetime.datetime(2021, 1, 4, 9, 0)), 'border_start'))
+        next_border_workday_intraday_tuple = get_next_border_workday_intraday(jst.localize(datetime.datetime(2021,1,4,9,0,0)))
+        self.assertEqual(next_border_workday_intraday_tuple, (jst.localize(datetime.datetime(2021, 1, 4, 11, 30)), 'border_end'))
+        next_border_workday_intraday_tuple = get_next_border_workday_intraday(jst.localize(datetime.datetime(2021,1,4,11,30,0)))
+        self.assertEqual(next_border_workday_intraday_tuple, (jst.localize(datetime.datetime(2021, 1, 4, 12, 30)), 'border_start'))
+        
+        # get_previous_border_workday_intraday
+        previous_border_workday_intraday_tuple = get_previous_border_workday_intraday(jst.localize(datetime.datetime(2021,1,1,10,0,0)))
+        self.assertEqual(previous_border_workday_intraday_tuple, (jst.localize(datetime.datetime(2020, 12, 31, 15, 0)), 'border_end'))
+        previous_border_workday_intraday_tuple = get_previous_border_workday_intraday(jst.localize(datetime.datetime(2021,12,31,12,30,0)))
+        self.assertEqual(previous_border_workday_intraday_tuple, (jst.localize(datetime.datetime(2021, 12, 31, 11, 30)), 'border_end'))
+        previous_border_workday_intraday_tuple = get_previous_border_workday_intraday(jst.localize(datetime.datetime(2021,12,31,15,0,0)))
+        self.assertEqual(previous_border_workday_intraday_tuple, (jst.localize(datetime.datetime(2021, 12, 31, 15, 0)), 'border_end'))
+        previous_border_workday_intraday_tuple = get_previous_border_workday_intraday(jst.localize(datetime.datetime(2021,12,31,15,0,0)), force_is_end=True)
+        self.assertEqual(previous_border_workday_intraday_tuple, (jst.localize(datetime.datetime(2021, 12, 31, 12, 30)), 'border_start'))
+        
+        # get_near_workday_ntraday
+        near_workday_intraday_tuple = get_near_workday_intraday(jst.localize(datetime.datetime(2021,1,1,10,0,0)), is_after=True)
+        self.assertEqual((jst.localize(datetime.datetime(2021,1,4,9,0,0)), "border_start"), near_workday_intraday_tuple)
+        near_workday_intraday_tuple = get_near_workday_intraday(jst.localize(datetime.datetime(2021,1,1,10,0,0)), is_after=False)
+        self.assertEqual((jst.localize(datetime.datetime(2020,12,31,15,0,0)), "border_end"), near_workday_intraday_tuple)
+                
+        # add_workday_intraday_datetime
+        datetime_range = pd.date_range(start=jst.localize(datetime.datetime(2021,1,1,0,0,0)), end=jst.localize(datetime.datetime(2021,2,1,0,0,0)), closed="left", freq="5T")
+        extracted_datetime_range: pd.DatetimeIndex = datetime_range[extract_workdays_intraday_bool(datetime_range)]
+        extracted_datetime_range_array = extracted_datetime_range.to_pydatetime()  # type: ignore
+        
+        datetime_list = [jst.localize(datetime.datetime(2021, 1, 4, 9, 0))]
+        for i in range(1,len(extracted_datetime_range)):
+            datetime_list.append(add_workday_intraday_datetime(jst.localize(datetime.datetime(2021, 1, 1, 0, 0)), timedelta(minutes=5)*i))
+        addded_dateteime_array = np.array(datetime_list)
+        self.assertTrue(np.array_equal(extracted_datetime_range_array, addded_dateteime_array))
+        
+        # sub_workday_intraday_datetime
+        datetime_list = []
+        for i in range(1,len(extracted_datetime_range)+1):
+            datetime_list.append(add_workday_intraday_datetime(jst.localize(datetime.datetime(2021, 2, 1, 0, 0)), -timedelta(minutes=5)*i))
+        subed_dateteime_array = np.array(datetime_list[::-1])
+        self.assertTrue(np.array_equal(extracted_datetime_range_array, subed_dateteime_array))
+        
+        # get_timedelta_workdays_intraday
+        start_datetime = jst.localize(datetime.datetime(2021,1,4,9,0,0))
+        end_datetime = jst.localize(datetime.datetime(2021,12,31,9,0,0))
+        delta_time = get_timedelta_workdays_intraday(start_datetime, end_datetime)
+        self.assertEqual(jst.localize(datetime.datetime(2021,12,31,9,0,0)), add_workday_intraday_datetime(start_datetime, delta_time))
+        
+        start_datetime = jst.localize(datetime.datetime(2021,1,4,14,0,0))
+        end_datetime = jst.localize(datetime.datetime(2021,12,31,10,0,0))
+        delta_time = get_timedelta_workdays_intraday(start_datetime, end_datetime)
+        self.assertEqual(jst.localize(datetime.datetime(2021,12,31,10,0,0)), add_workday_intraday_datetime(start_datetime, delta_time))
+        
+        start_datetime = jst.localize(datetime.datetime(2021,1,4,15,0,0))
+        end_datetime = jst.localize(datetime.datetime(2021,12,31,15,0,0))
+        delta_time = get_timedelta_workdays_intraday(start_datetime, end_datetime)
+        self.assertEqual(jst.localize(datetime.datetime(2022, 1, 3, 9, 0)), add_workday_intraday_datetime(start_datetime, delta_time))
+        
+        start_datetime = jst.localize(datetime.datetime(2021,1,4,14,0,0))
+        end_datetime = jst.localize(datetime.datetime(2021,12,31,15,0,0))
+        delta_time = get_timedelta_workdays_intraday(start_datetime, end_datetime)
+        self.assertEqual(jst.localize(datetime.datetime(2021,1,4,14,0,0)), add_workday_intraday_datetime(end_datetime, -delta_time))
+        
+        start_datetime = jst.localize(datetime.datetime(2021,1,4,10,0,0))
+        end_datetime = jst.localize(datetime.datetime(2021,12,31,14,0,0))
+        delta_time = get_timedelta_workdays_intraday(start_datetime, end_datetime)
+        self.assertEqual(jst.localize(datetime.datetime(2021,1,4,10,0,0)), add_workday_intraday_datetime(end_datetime, -delta_time))
+        
+        start_datetime = jst.localize(datetime.datetime(2021,1,4,9,0,0))
+        end_datetime = jst.localize(datetime.datetime(2021,12,31,9,0,0))
+        delta_time = get_timedelta_workdays_intraday(start_datetime, end_datetime)
+        self.assertEqual(jst.localize(datetime.datetime(2021,1,4,9,0,0)), add_workday_intraday_datetime(end_datetime, -delta_time))     
+
+
+class TestOption(unittest.TestCase):
+    def test_make_workdays(self) -> None:
+        #optionを設定するだけで休日が更新される．
+        config.holiday_start_year = 2021
+        config.holiday_end_year = 2021
+        self.assertTrue(np.array_equal(np.array(config.range_holidays), true_holidays_2021()))
+        
+    def test_config_batch(self) -> None:
+        start_year = config.holiday_start_year
+        with config.batch():
+            config.holiday_weekdays = [6]
+            config.holiday_start_year = 2022
+            # withブロックを抜けるまで反映しない
+            self.assertFalse(check_workday(datetime.date(2021,1,2)))
+        self.assertEqual(config.range_holidays[0], datetime.date(2022,1,1))
+        self.assertTrue(check_workday(datetime.date(2022,1,8)))
+
+        # 範囲を広げると読み込み直さずに祝日が利用される
+        config.holiday_start_year = 2021
+        self.assertTrue(np.all(np.in1d(true_holidays_2021(), config.range_holidays)))  # type: ignore
+
+        with config.batch():
+            config.holiday_weekdays = [5,6]
+            config.holiday_start_year = start_year
+        self.assertFalse(check_workday(datetime.date(2022,1,8)))
+
+    def test_lazy_import(self) -> None:
+        # importではnumpy・pandasの読み込み・祝日の読み込みをしない
+        lazy_import_code = "\n".join([
+            "import sys, datetime",
+            "import py_workdays",
+            "print('pandas' in sys.modules, 'numpy' in sys.modules, py_workdays.config._is_holidays_loaded)",
+            "py_workdays.check_workday(datetime.date(2021,1,4))",
+            "print(py_workdays.config._is_holidays_loaded)",
+        ])
+        output = subprocess.run([sys.executable, "-c", lazy_import_code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.split(), ["False", "False", "False", "True"])
+
+    def test_set_holidays_before_load(self) -> None:
+        # 初めて参照する前に設定した祝日は遅延読み込みで上書きされない
+        set_before_load_code = "\n".join([
+            "import datetime",
+            "import py_workdays",
+            "from py_workdays.py_workdays import set_range_holidays",
+            "set_range_holidays([datetime.date(2021,1,5)], 2021, 2021)",
+            "print(py_workdays.check_workday(datetime.date(2021,1,5)), py_workdays.check_workday(datetime.date(2021,1,1)))",
+        ])
+        output = subprocess.run([sys.executable, "-c", set_before_load_code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.split(), ["False", "True"])
+
+    def test_append_source_path(self) -> None:
+        temp_source_path = Path("./py_workdays/source/temp.csv")
+        # 存在しない祝日を記したcsvファイルを追加
+        dt_index = pd.DatetimeIndex([datetime.date(1900,1,1)])
+        new_holiday_df = pd.DataFrame({"holiday_name":["元日"]}, index=dt_index)
+        new_holiday_df.to_csv(temp_source_path, header=False)
+        
+        config.holiday_start_year = 1900  # このタイミングで1900年にしておく
+        
+        config.csv_source_paths.append(temp_source_path)  # csvパスを追加
+        #print(config.range_holidays)
+        self.assertEqual(config.range_holidays[0], datetime.date(1900,1,1))
+        
+        temp_source_path.unlink()
+
+    def test_refresh_holidays(self) -> None:
+        # 内閣府の形式のcsvを配信するローカルのサーバー
+        served = {"body": "国民の祝日・休日月日,国民の祝日・休日名称\r\n2021/1/5,テスト休日\r\n".encode("cp932"), "etag": '"v1"'}
+
+        class SourceHandler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if served["etag"] is not None and self.headers.get("If-None-Match") == served["etag"]:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                if served["etag"] is not None:
+                    self.send_header("ETag", served["etag"])
+                self.end_headers()
+                self.wfile.write(served["body"])
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), SourceHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        temp_source_path = Path("./py_workdays/source/refresh_temp.csv")
+        original_source_url = config.holiday_source_url
+        original_source_paths = list(config.csv_source_paths)
+        try:
+            config.holiday_source_url = f"http://127.0.0.1:{server.server_port}/syukujitsu.csv"
+            self.assertTrue(asyncio.run(refresh_holidays(temp_source_path)))
+            self.assertEqual(temp_source_path.read_text(encoding="utf-8"), "2021-01-05,テスト休日\n")
+            config.csv_source_paths = original_source_paths + [temp_source_path]
+            self.assertEqual(check_workday(datetime.date(2021,1,5)), False)
+
+            # ETagが同じ場合・内容が同じ場合は置き換えない
+            self.assertFalse(asyncio.run(refresh_holidays(temp_source_path)))
+            served["etag"] = None
+            self.assertFalse(asyncio.run(refresh_holidays(temp_source_path)))
+
+            # 変更されていればカレンダーも更新する
+            served["body"] = "2021/1/6,テスト休日\n".encode("utf-8")
+            self.assertTrue(asyncio.run(refresh_holidays(temp_source_path)))
+            self.assertEqual(check_workday(datetime.date(2021,1,5)), True)
+            self.assertEqual(check_workday(datetime.date(2021,1,6)), False)
+
+            # 不正なデータは置き換えない
+            served["body"] = "2021/13/1,テスト休日\n".encode("utf-8")
+            with self.assertRaises(ValueError):
+                asyncio.run(refresh_holidays(temp_source_path))
+            self.assertEqual(check_workday(datetime.date(2021,1,6)), False)
+        finally:
+            server.shutdown()
+            config.holiday_source_url = original_source_url
+            config.csv_source_paths = original_source_paths
+            temp_source_path.unlink(missing_ok=True)
+
+if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,246 @@
+import unittest
+import datetime
+import importlib.util
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import pandas as pd
+import numpy as np
+from pytz import timezone
+
+from py_workdays import Calendar, config, initialize_source, PyWorkdaysError, SessionCursor
+from py_workdays import set_metrics_config, get_metrics_snapshot, reset_metrics
+from py_workdays.compiled import _set_holidays_compiled
+from py_workdays import get_workdays, check_workday_intraday, extract_workdays_intraday_bool, add_workday_intraday_datetime
+
+
+def setUpModule() -> None:
+    initialize_source()  # importでは通信しない
+
+
+class TestCalendar(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        config.holiday_start_year = 2021
+        config.holiday_weekdays = [5,6]
+        config.intraday_borders = [{"start":datetime.time(9,0), "end":datetime.time(11,30)},
+                                   {"start":datetime.time(12,30), "end":datetime.time(15,0)}]
+
+        csv_paths = [str(one_path) for one_path in config.csv_source_paths if one_path.exists()]
+        cls.tse = Calendar(holidays_csv_paths=csv_paths, start_year=2021, end_year=config.holiday_end_year)
+        cls.night = Calendar(
+            holidays_csv_paths=csv_paths,
+            start_year=2021,
+            end_year=config.holiday_end_year,
+            intraday_borders=[{"start":datetime.time(16,30), "end":datetime.time(23,0)}]
+        )
+
+    def test_same_as_module(self) -> None:
+        start_date = datetime.date(2021,1,1)
+        end_date = datetime.date(2022,1,1)
+        self.assertEqual(self.tse.get_workdays(start_date, end_date), get_workdays(start_date, end_date))
+        self.assertEqual(self.tse.get_range_holidays(), config.range_holidays)
+        self.assertTrue(np.array_equal(
+            self.tse.get_range_holidays(as_array=True),
+            np.array(config.range_holidays, dtype="datetime64[D]")
+        ))
+
+        dt_index = pd.date_range(datetime.datetime(2021,1,1,0,0,0), datetime.datetime(2021,3,1,0,0,0), freq="T")
+        self.assertTrue(np.array_equal(
+            self.tse.extract_workdays_intraday_bool(dt_index),
+            extract_workdays_intraday_bool(dt_index)
+        ))
+
+        select_datetime = datetime.datetime(2021,1,1,0,0,0)
+        self.assertEqual(
+            self.tse.add_workday_intraday_datetime(select_datetime, datetime.timedelta(hours=2)),
+            add_workday_intraday_datetime(select_datetime, datetime.timedelta(hours=2))
+        )
+
+    def test_side_by_side(self) -> None:
+        select_datetime = datetime.datetime(2021,1,4,20,0,0)
+        self.assertFalse(self.tse.check_workday_intraday(select_datetime))
+        self.assertTrue(self.night.check_workday_intraday(select_datetime))
+        self.assertFalse(check_workday_intraday(select_datetime))  # モジュールの設定は変化しない
+
+        jst = timezone("Asia/Tokyo")
+        next_border = self.night.get_next_border_workday_intraday(jst.localize(datetime.datetime(2021,1,1,0,0,0)))
+        self.assertEqual(next_border, (jst.localize(datetime.datetime(2021,1,4,16,30)), "border_start"))
+
+        added = self.night.add_workday_intraday_datetime(datetime.datetime(2021,1,4,22,0,0), datetime.timedelta(hours=2))
+        self.assertEqual(added, datetime.datetime(2021,1,5,17,30))
+
+    def test_timezone(self) -> None:
+        calendar = Calendar(start_year=2021, end_year=2021, timezone="Asia/Tokyo")
+        self.assertEqual(calendar.timezone, "Asia/Tokyo")
+        self.assertFalse(self.tse.has_timezone())
+
+        jst_index = pd.date_range(datetime.datetime(2021,1,1,0,0,0), datetime.datetime(2021,1,15,0,0,0), freq="T")
+        utc_index = jst_index.tz_localize("Asia/Tokyo").tz_convert("UTC")
+        self.assertTrue(np.array_equal(
+            calendar.extract_workdays_intraday_bool(utc_index.tz_localize(None).values, utc=True),
+            calendar.extract_workdays_intraday_bool(jst_index)
+        ))
+
+        calendar.timezone = None
+        self.assertFalse(calendar.has_timezone())
+
+    def test_scalar_cache(self) -> None:
+        calendar = Calendar(start_year=2021, end_year=2021)
+        calendar.set_scalar_cache_config(maxsize=10)
+        self.assertTrue(calendar.check_workday(datetime.date(2021,1,1)))
+        self.assertTrue(calendar.check_workday(datetime.date(2021,1,1)))
+        self.assertEqual(calendar.get_scalar_cache_info()["hits"], 1)
+
+        calendar.add_range_holidays([datetime.date(2021,1,1)], 2021, 2021)
+        self.assertFalse(calendar.check_workday(datetime.date(2021,1,1)))
+        self.assertEqual(calendar.get_next_workday(datetime.date(2020,12,31)), datetime.date(2021,1,4))
+
+    def test_session_cursor(self) -> None:
+        calendar = Calendar(start_year=2021, end_year=2021)
+        cursor = SessionCursor(calendar)
+        self.assertTrue(cursor.update(datetime.datetime(2021,1,1,10,0,0)))
+        self.assertEqual(cursor.next_border, (datetime.datetime(2021,1,1,11,30,0), "border_end"))
+        self.assertFalse(SessionCursor(self.night).update(datetime.datetime(2021,1,1,10,0,0)))
+
+        # カレンダーを変更すると境界を越えなくても再計算する
+        calendar.add_range_holidays([datetime.date(2021,1,1)], 2021, 2021)
+        self.assertFalse(cursor.update(datetime.datetime(2021,1,1,10,0,1)))
+        self.assertEqual(cursor.next_border, (datetime.datetime(2021,1,4,9,0,0), "border_start"))
+
+    def test_compiled_calendar(self) -> None:
+        csv_paths = [str(one_path.resolve()) for one_path in config.csv_source_paths if one_path.exists()]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            compiled_path = Path(temp_dir) / "calendar.compiled"
+            compiled_calendar = Calendar(start_year=2021, end_year=2021)
+            self.assertFalse(_set_holidays_compiled(compiled_calendar, csv_paths, 2021, 2022, compiled_path))  # コンパイル
+            self.assertTrue(compiled_path.exists())
+
+            loaded_calendar = Calendar(start_year=2021, end_year=2021)
+            self.assertTrue(_set_holidays_compiled(loaded_calendar, csv_paths, 2020, 2022, compiled_path))  # メモリマップで読み込む
+            self.assertEqual(loaded_calendar.holiday_start_year, 2020)
+            self.assertEqual(loaded_calendar.get_holiday_year_range(), (2020, 2022))
+            self.assertEqual(
+                loaded_calendar.get_workdays(datetime.date(2020,1,1), datetime.date(2023,1,1)),
+                Calendar(holidays_csv_paths=csv_paths, start_year=2020, end_year=2022).get_workdays(datetime.date(2020,1,1), datetime.date(2023,1,1))
+            )
+
+        compiled = np.frombuffer(compiled_calendar.dump_compiled_calendar(b"source"), dtype=np.uint8)
+        self.assertFalse(loaded_calendar.load_compiled_calendar(compiled, b"other source"))
+        with self.assertRaises(PyWorkdaysError):
+            loaded_calendar.load_compiled_calendar(compiled[:-1], b"source")
+        corrupted = compiled.copy()
+        corrupted[-8] ^= 1  # 累積の営業日数がテーブルと矛盾する
+        with self.assertRaises(PyWorkdaysError):
+            loaded_calendar.load_compiled_calendar(corrupted, b"source")
+
+        weekday_position = 8 + 4 + 8 + len(b"source") + 8 + 8  # マジックナンバー・バージョン・指紋・年の範囲の後
+        border_position = weekday_position + 8 + 8
+        table_length = (datetime.date(2023,1,1) - datetime.date(2021,1,1)).days
+        table_position = len(compiled) - 8 * (table_length + 1) - table_length
+        corrupted_list = [compiled.copy() for _ in range(3)]
+        corrupted_list[0][weekday_position:weekday_position+8] = np.frombuffer(np.int64(0b111_1111).tobytes(), dtype=np.uint8)  # 全曜日が休日
+        corrupted_list[1][border_position+8:border_position+16] = compiled[border_position:border_position+8]  # 開始と終了が同じ境界
+        corrupted_list[2][table_position:] = 0  # 累積と矛盾しないすべて休日のテーブル
+        for corrupted in corrupted_list:
+            with self.assertRaises(PyWorkdaysError):
+                loaded_calendar.load_compiled_calendar(corrupted, b"source")
+
+    def test_setting(self) -> None:
+        calendar = Calendar(start_year=2021, end_year=2021)
+        self.assertEqual(calendar.get_range_holidays(), [])
+        self.assertTrue(calendar.check_workday(datetime.date(2021,1,1)))
+
+        calendar.add_range_holidays([datetime.date(2021,1,1)], 2021, 2021)
+        self.assertFalse(calendar.check_workday(datetime.date(2021,1,1)))
+        self.assertEqual(calendar.holiday_start_year, 2021)
+
+        calendar.set_holiday_weekdays({6})
+        self.assertEqual(calendar.get_holiday_weekdays(), {6})
+        self.assertTrue(calendar.check_workday(datetime.date(2021,1,2)))  # 土曜日
+
+    def test_metrics(self) -> None:
+        calendar = Calendar(start_year=2021, end_year=2021)
+        set_metrics_config(enabled=True)
+        try:
+            reset_metrics()
+            calendar.set_holiday_weekdays({5, 6})  # 変更がない場合は再構築しない
+            calendar.set_holiday_weekdays({6})
+            calendar.check_workday(datetime.date(2021,1,2))
+            calendar.get_next_workday_array(pd.date_range(datetime.date(2021,1,1), periods=5, freq="D"))
+            snapshot = get_metrics_snapshot()
+            self.assertEqual(snapshot["rebuilds"]["Calendar.set_holiday_weekdays"]["count"], 1)
+            self.assertEqual(snapshot["functions"]["Calendar.check_workday"]["calls"], 1)
+            self.assertEqual(snapshot["functions"]["Calendar.get_next_workday_array"]["elements"], 5)
+            self.assertNotIn("check_workday", snapshot["functions"])
+        finally:
+            set_metrics_config(enabled=False)
+            reset_metrics()
+
+    def test_concurrent_update(self) -> None:
+        # 更新中の参照はロックの競合で失敗せず，更新前か更新後のどちらかのカレンダーの結果となる
+        calendar = Calendar(start_year=2021, end_year=2021)
+        dt_index = pd.date_range(datetime.datetime(2021,1,1,0,0,0), datetime.datetime(2021,3,1,0,0,0), freq="1h")
+        before_bool = calendar.extract_workdays_bool(dt_index)
+        calendar.set_holiday_weekdays({6})
+        after_bool = calendar.extract_workdays_bool(dt_index)
+
+        def query(_: int) -> bool:
+            extracted = calendar.extract_workdays_bool(dt_index)
+            is_consistent = np.array_equal(extracted, before_bool) or np.array_equal(extracted, after_bool)
+            return is_consistent and calendar.check_workday(datetime.date(2021,1,4))
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(lambda: list(map(query, range(50)))) for _ in range(4)]
+            for i in range(20):
+                calendar.set_holiday_weekdays({6} if i % 2 == 0 else {5,6})
+            results = [result for future in futures for result in future.result()]
+        self.assertTrue(all(results))
+
+    def test_array_holidays(self) -> None:
+        csv_paths = [str(one_path.resolve()) for one_path in config.csv_source_paths if one_path.exists()]
+        list_calendar = Calendar(holidays_csv_paths=csv_paths, start_year=2020, end_year=2022)
+        holidays = list_calendar.get_range_holidays(as_array=True)
+        start_date, end_date = datetime.date(2020,1,1), datetime.date(2023,1,1)
+
+        # datetime64のndarray(NaTは無視する)・DatetimeIndexはリストと同じ結果
+        array_calendar = Calendar(start_year=2020, end_year=2022)
+        array_calendar.set_range_holidays(np.append(holidays, np.datetime64("NaT")), 2020, 2022)
+        self.assertEqual(array_calendar.get_workdays(start_date, end_date), list_calendar.get_workdays(start_date, end_date))
+        index_calendar = Calendar(start_year=2020, end_year=2022)
+        index_calendar.set_range_holidays(pd.DatetimeIndex(holidays).tz_localize("Asia/Tokyo"), 2020, 2022)
+        self.assertEqual(index_calendar.get_range_holidays(), list_calendar.get_range_holidays())
+
+        # 差分の更新は作り直した場合と同じ
+        new_holidays = np.array(["2021-06-01T10:00:00", "2023-01-02T00:00:00"], dtype="datetime64[s]")
+        array_calendar.add_range_holidays(new_holidays, 2020, 2022)
+        list_calendar.add_range_holidays([datetime.date(2021,6,1), datetime.date(2023,1,2)], 2020, 2022)
+        self.assertFalse(array_calendar.check_workday(datetime.date(2021,6,1)))
+        self.assertEqual(array_calendar.get_workdays(start_date, end_date), list_calendar.get_workdays(start_date, end_date))
+        self.assertEqual(array_calendar.count_workdays(start_date, end_date), list_calendar.count_workdays(start_date, end_date))
+
+        array_calendar.set_range_holidays(holidays[holidays >= np.datetime64("2021-01-01")], 2019, 2022)
+        self.assertEqual(array_calendar.holiday_start_year, 2019)
+        self.assertTrue(array_calendar.check_workday(datetime.date(2021,6,1)))
+        self.assertTrue(array_calendar.check_workday(datetime.date(2020,1,2)))
+        self.assertFalse(array_calendar.check_workday(datetime.date(2021,1,1)))
+        rebuilt_calendar = Calendar(start_year=2019, end_year=2022)
+        rebuilt_calendar.set_range_holidays(holidays[holidays >= np.datetime64("2021-01-01")].tolist(), 2019, 2022)
+        self.assertEqual(
+            array_calendar.get_workdays_number(datetime.date(2019,1,1), 900),
+            rebuilt_calendar.get_workdays_number(datetime.date(2019,1,1), 900)
+        )
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+    def test_arrow_holidays(self) -> None:
+        import pyarrow as pa
+        holidays = [datetime.date(2021,1,1), None, datetime.date(2021,1,4)]
+        for arrow_holidays in [pa.array(holidays, type=pa.date32()), pa.chunked_array([pa.array(holidays, type=pa.date64())])]:
+            calendar = Calendar(start_year=2021, end_year=2021)
+            calendar.set_range_holidays(arrow_holidays, 2021, 2021)
+            self.assertEqual(calendar.get_range_holidays(), [datetime.date(2021,1,1), datetime.date(2021,1,4)])
+            self.assertEqual(calendar.get_next_workday(datetime.date(2020,12,31)), datetime.date(2021,1,5))
+
+
+if __name__ == "__main__":
+    unittest.main()